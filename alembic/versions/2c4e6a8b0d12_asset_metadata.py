@@ -0,0 +1,53 @@
+"""asset metadata and keyset indexes
+
+Revision ID: 2c4e6a8b0d12
+Revises: 1b2c3d4e5f60
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2c4e6a8b0d12"
+down_revision: Union[str, Sequence[str], None] = "1b2c3d4e5f60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The placeholder table only ever held an id column; replace it.
+    op.drop_table("assets")
+    op.create_table(
+        "assets",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "dataset_id",
+            sa.Integer(),
+            sa.ForeignKey("datasets.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("object_key", sa.String(length=1024), nullable=False),
+        sa.Column("size_bytes", sa.BigInteger(), nullable=True),
+        sa.Column("content_hash", sa.String(length=64), nullable=True),
+        sa.Column("mime_type", sa.String(length=255), nullable=True),
+        sa.Column("width", sa.Integer(), nullable=True),
+        sa.Column("height", sa.Integer(), nullable=True),
+        sa.Column("status", sa.String(length=32), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.UniqueConstraint("dataset_id", "object_key", name="uq_assets_dataset_object_key"),
+    )
+    op.create_index("ix_assets_dataset_id_id", "assets", ["dataset_id", "id"])
+    op.create_index("ix_assets_dataset_id_status_id", "assets", ["dataset_id", "status", "id"])
+    op.create_index("ix_assets_content_hash", "assets", ["content_hash"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_assets_content_hash", table_name="assets")
+    op.drop_index("ix_assets_dataset_id_status_id", table_name="assets")
+    op.drop_index("ix_assets_dataset_id_id", table_name="assets")
+    op.drop_table("assets")
+    op.create_table("assets", sa.Column("id", sa.Integer(), primary_key=True))
@@ -0,0 +1,67 @@
+"""job queue table
+
+Revision ID: 3d5f7a9c1e23
+Revises: 2c4e6a8b0d12
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3d5f7a9c1e23"
+down_revision: Union[str, Sequence[str], None] = "2c4e6a8b0d12"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The placeholder table only ever held an id column; replace it.
+    op.drop_table("jobs")
+    op.create_table(
+        "jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("type", sa.String(length=64), nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("priority", sa.Integer(), nullable=False),
+        sa.Column(
+            "project_id",
+            sa.Integer(),
+            sa.ForeignKey("projects.id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+        sa.Column("tenant_id", sa.Integer(), nullable=True),
+        sa.Column("created_by", sa.Integer(), nullable=True),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("progress", sa.JSON(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("max_attempts", sa.Integer(), nullable=False),
+        sa.Column("lease_owner", sa.String(length=128), nullable=True),
+        sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "ix_jobs_status_priority_id",
+        "jobs",
+        ["status", sa.text("priority DESC"), "id"],
+    )
+    op.create_index(
+        "ix_jobs_status_lease_expires_at", "jobs", ["status", "lease_expires_at"]
+    )
+    op.create_index("ix_jobs_project_id_id", "jobs", ["project_id", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_project_id_id", table_name="jobs")
+    op.drop_index("ix_jobs_status_lease_expires_at", table_name="jobs")
+    op.drop_index("ix_jobs_status_priority_id", table_name="jobs")
+    op.drop_table("jobs")
+    op.create_table("jobs", sa.Column("id", sa.Integer(), primary_key=True))
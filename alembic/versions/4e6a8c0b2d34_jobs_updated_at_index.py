@@ -0,0 +1,25 @@
+"""index jobs.updated_at for event streams
+
+Revision ID: 4e6a8c0b2d34
+Revises: 3d5f7a9c1e23
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4e6a8c0b2d34"
+down_revision: Union[str, Sequence[str], None] = "3d5f7a9c1e23"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_jobs_updated_at", "jobs", ["updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_updated_at", table_name="jobs")
@@ -0,0 +1,49 @@
+"""predictions table
+
+Revision ID: 5a7c9e1b3f45
+Revises: 4e6a8c0b2d34
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5a7c9e1b3f45"
+down_revision: Union[str, Sequence[str], None] = "4e6a8c0b2d34"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "predictions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "job_id",
+            sa.Integer(),
+            sa.ForeignKey("jobs.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "asset_id",
+            sa.Integer(),
+            sa.ForeignKey("assets.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("model", sa.String(length=1024), nullable=False),
+        sa.Column("label", sa.Integer(), nullable=True),
+        sa.Column("score", sa.Float(), nullable=True),
+        sa.Column("output", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.UniqueConstraint("job_id", "asset_id", name="uq_predictions_job_asset"),
+    )
+    op.create_index("ix_predictions_asset_id", "predictions", ["asset_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_predictions_asset_id", table_name="predictions")
+    op.drop_table("predictions")
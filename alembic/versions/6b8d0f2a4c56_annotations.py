@@ -0,0 +1,57 @@
+"""annotations table
+
+Revision ID: 6b8d0f2a4c56
+Revises: 5a7c9e1b3f45
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6b8d0f2a4c56"
+down_revision: Union[str, Sequence[str], None] = "5a7c9e1b3f45"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "annotations",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "dataset_id",
+            sa.Integer(),
+            sa.ForeignKey("datasets.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "asset_id",
+            sa.Integer(),
+            sa.ForeignKey("assets.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("key", sa.String(length=64), nullable=False),
+        sa.Column("kind", sa.String(length=16), nullable=False),
+        sa.Column("label", sa.String(length=255), nullable=False),
+        sa.Column("score", sa.Float(), nullable=True),
+        sa.Column("bbox", sa.JSON(), nullable=True),
+        sa.Column("geometry", sa.JSON(), nullable=True),
+        sa.Column("attributes", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.UniqueConstraint("asset_id", "key", name="uq_annotations_asset_key"),
+    )
+    op.create_index(
+        "ix_annotations_dataset_id_asset_id_id",
+        "annotations",
+        ["dataset_id", "asset_id", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_annotations_dataset_id_asset_id_id", table_name="annotations")
+    op.drop_table("annotations")
@@ -0,0 +1,49 @@
+"""content-addressed blobs
+
+Revision ID: 7c9e1a3b5d67
+Revises: 6b8d0f2a4c56
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7c9e1a3b5d67"
+down_revision: Union[str, Sequence[str], None] = "6b8d0f2a4c56"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "blobs",
+        sa.Column("sha256", sa.String(length=64), primary_key=True),
+        sa.Column("size_bytes", sa.BigInteger(), nullable=True),
+        sa.Column("mime_type", sa.String(length=255), nullable=True),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("ref_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("stored_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_blobs_ref_count", "blobs", ["ref_count"])
+    op.add_column("assets", sa.Column("blob_sha256", sa.String(length=64), nullable=True))
+    op.create_foreign_key(
+        "fk_assets_blob_sha256_blobs",
+        "assets",
+        "blobs",
+        ["blob_sha256"],
+        ["sha256"],
+    )
+    op.create_index("ix_assets_blob_sha256", "assets", ["blob_sha256"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_assets_blob_sha256", table_name="assets")
+    op.drop_constraint("fk_assets_blob_sha256_blobs", "assets", type_="foreignkey")
+    op.drop_column("assets", "blob_sha256")
+    op.drop_index("ix_blobs_ref_count", table_name="blobs")
+    op.drop_table("blobs")
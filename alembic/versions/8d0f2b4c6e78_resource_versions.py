@@ -0,0 +1,31 @@
+"""resource version counters for conditional list GETs
+
+Revision ID: 8d0f2b4c6e78
+Revises: 7c9e1a3b5d67
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8d0f2b4c6e78"
+down_revision: Union[str, Sequence[str], None] = "7c9e1a3b5d67"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "resource_versions",
+        sa.Column("scope", sa.String(length=128), primary_key=True),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("resource_versions")
@@ -0,0 +1,43 @@
+"""durable buffer of bucket notifications awaiting ingestion
+
+Revision ID: 9e1a3c5d7f80
+Revises: 8d0f2b4c6e78
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9e1a3c5d7f80"
+down_revision: Union[str, Sequence[str], None] = "8d0f2b4c6e78"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ingest_events",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("object_key", sa.String(length=1024), nullable=False),
+        sa.Column("dataset_id", sa.Integer(), nullable=True),
+        sa.Column("blob_sha256", sa.String(length=64), nullable=True),
+        sa.Column("size_bytes", sa.BigInteger(), nullable=True),
+        sa.Column("mime_type", sa.String(length=255), nullable=True),
+        sa.Column("event_time", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("lease_owner", sa.String(length=128), nullable=True),
+        sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "ix_ingest_events_lease_expires_at_id",
+        "ingest_events",
+        ["lease_expires_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ingest_events_lease_expires_at_id", table_name="ingest_events")
+    op.drop_table("ingest_events")
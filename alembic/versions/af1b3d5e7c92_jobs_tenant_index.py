@@ -0,0 +1,29 @@
+"""index jobs by status and tenant for fair-share dispatch
+
+Revision ID: af1b3d5e7c92
+Revises: 9e1a3c5d7f80
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "af1b3d5e7c92"
+down_revision: Union[str, Sequence[str], None] = "9e1a3c5d7f80"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_jobs_status_tenant_id_created_at",
+        "jobs",
+        ["status", "tenant_id", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_status_tenant_id_created_at", table_name="jobs")
@@ -0,0 +1,32 @@
+"""record the tenant and creator of each project
+
+Revision ID: b0c2e4a6d8f1
+Revises: af1b3d5e7c92
+Create Date: 2026-10-18 00:00:00.000000
+
+Existing projects keep NULL owners, which no user can access; assign
+them a tenant (or creator) to make their datasets reachable again.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b0c2e4a6d8f1"
+down_revision: Union[str, Sequence[str], None] = "af1b3d5e7c92"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("projects", sa.Column("tenant_id", sa.Integer(), nullable=True))
+    op.add_column("projects", sa.Column("created_by", sa.Integer(), nullable=True))
+    op.create_index("ix_projects_tenant_id", "projects", ["tenant_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_projects_tenant_id", table_name="projects")
+    op.drop_column("projects", "created_by")
+    op.drop_column("projects", "tenant_id")
@@ -0,0 +1,46 @@
+"""count failed ingest attempts and dead-letter poison events
+
+Revision ID: c1d3e5f7a9b0
+Revises: b0c2e4a6d8f1
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c1d3e5f7a9b0"
+down_revision: Union[str, Sequence[str], None] = "b0c2e4a6d8f1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "ingest_events",
+        sa.Column("status", sa.String(length=16), nullable=False, server_default="pending"),
+    )
+    op.add_column(
+        "ingest_events",
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.drop_index("ix_ingest_events_lease_expires_at_id", table_name="ingest_events")
+    op.create_index(
+        "ix_ingest_events_status_lease_expires_at_id",
+        "ingest_events",
+        ["status", "lease_expires_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ingest_events_status_lease_expires_at_id", table_name="ingest_events")
+    op.create_index(
+        "ix_ingest_events_lease_expires_at_id",
+        "ingest_events",
+        ["lease_expires_at", "id"],
+    )
+    op.drop_column("ingest_events", "attempts")
+    op.drop_column("ingest_events", "status")
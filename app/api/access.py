@@ -0,0 +1,43 @@
+# app/api/access.py
+"""Ownership checks shared by routes that take a project or dataset id.
+
+Projects and datasets of other tenants (or users) answer 404 like missing
+ones, so ids do not leak.
+"""
+from fastapi import HTTPException, status
+
+from app.core.context import UserContext
+from app.models.orm.dataset import Dataset
+from app.models.orm.project import Project
+from app.services.user_dataset_service import UserDatasetService
+from app.services.user_project_service import UserProjectService
+
+
+async def require_project(
+    svc: UserProjectService,
+    project_id: int,
+    ctx: UserContext,
+) -> Project:
+    """Return the project if the caller may access it, else answer 404."""
+    try:
+        return await svc.get_project_for_user(project_id, ctx)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(exc),
+        ) from exc
+
+
+async def require_dataset(
+    svc: UserDatasetService,
+    dataset_id: int,
+    ctx: UserContext,
+) -> Dataset:
+    """Return the dataset if the caller may access it, else answer 404."""
+    try:
+        return await svc.get_dataset_for_user(dataset_id, ctx)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(exc),
+        ) from exc
@@ -0,0 +1,72 @@
+# app/api/conditional.py
+"""Conditional GETs for list endpoints.
+
+A listing's ETag comes from its change counter (see
+``app.repositories.resource_version_repository``), so revalidating costs
+one primary-key lookup and, when nothing changed, an empty 304. With
+``list_cache_ttl_seconds`` set, the serialized body and its ETag are also
+kept in process, and repeat requests within the TTL touch no database.
+"""
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any
+
+from fastapi import Request, Response, status
+from pydantic import TypeAdapter
+
+from app.core.config import settings
+from app.core.list_cache import ListResponseCache
+
+list_cache = ListResponseCache(
+    max_entries=settings.list_cache_max_entries,
+    ttl_seconds=settings.list_cache_ttl_seconds,
+)
+
+NOT_MODIFIED = {
+    status.HTTP_304_NOT_MODIFIED: {"description": "Unchanged since the ETag in If-None-Match"},
+}
+
+
+def listing_etag(scope: str, version: int) -> str:
+    return f'"{scope}.{version}"'
+
+
+async def conditional_listing(
+    request: Request,
+    cache_key: str,
+    version: Callable[[], Awaitable[tuple[str, int]]],
+    rows: Callable[[], Awaitable[Sequence[Any]]],
+    adapter: TypeAdapter[Any],
+) -> Response:
+    """Answer a list GET with 304 when the client's ETag is current, else with the list."""
+    cached = list_cache.get(cache_key)
+    if cached is None:
+        # Version before rows: the rows are then at least as new as the ETag says.
+        etag = listing_etag(*await version())
+        if _matches(request, etag):
+            return _not_modified(etag)
+        body = adapter.dump_json(adapter.validate_python(await rows(), from_attributes=True))
+        list_cache.put(cache_key, etag, body)
+    else:
+        etag, body = cached
+        if _matches(request, etag):
+            return _not_modified(etag)
+    return Response(content=body, media_type="application/json", headers=_headers(etag))
+
+
+def _matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored.
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_headers(etag))
+
+
+def _headers(etag: str) -> dict[str, str]:
+    # no-cache: clients may store the list but must revalidate before using it.
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
@@ -1,52 +1,123 @@
 # app/api/deps.py
+import httpx
 from fastapi import Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.infrastructure.db import get_db
+from app.infrastructure.db import get_async_db, get_db
+from app.infrastructure.http import http_clients
 from app.services.auth_service import AuthService
-from app.repositories.user_repository import UserRepository
-from app.repositories.project_repository import ProjectRepository
-from app.repositories.dataset_repository import DatasetRepository
+from app.repositories.user_repository import AsyncUserRepository
+from app.repositories.project_repository import AsyncProjectRepository
+from app.repositories.dataset_repository import AsyncDatasetRepository, DatasetRepository
+from app.repositories.asset_repository import AssetRepository
+from app.repositories.annotation_repository import AnnotationRepository
+from app.repositories.blob_repository import BlobRepository
+from app.repositories.job_repository import JobRepository
+from app.repositories.resource_version_repository import AsyncResourceVersionRepository
+from app.infrastructure.queue import get_job_broker
+from app.services.job_service import JobService
+from app.services.asset_service import AssetService
+from app.services.annotation_service import AnnotationService
 from app.services.presign_service import PresignService
-from app.infrastructure.storage import StorageClient
+from app.services.thumbnail_service import ThumbnailService
+from app.infrastructure.storage import StorageClient, storage_registry
 from app.services.user_project_service import UserProjectService
 from app.services.user_dataset_service import UserDatasetService
 
 
+def get_http_client() -> httpx.AsyncClient:
+    """Provide the shared outbound HTTP client."""
+    return http_clients.get()
+
+
 def get_auth_service(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+    http_client: httpx.AsyncClient = Depends(get_http_client),
 ) -> AuthService:
     """Provide AuthService instance."""
-    repo = UserRepository(db=db)
-    return AuthService(user_repo=repo)
+    repo = AsyncUserRepository(db=db)
+    return AuthService(user_repo=repo, http_client=http_client)
 
 
 def get_user_project_service(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> UserProjectService:
     """Provide UserProjectService instance."""
-    repo = ProjectRepository(db=db)
-    return UserProjectService(project_repo=repo)
+    repo = AsyncProjectRepository(db=db)
+    return UserProjectService(
+        project_repo=repo,
+        version_repo=AsyncResourceVersionRepository(db=db),
+    )
 
 
 def get_user_dataset_service(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> UserDatasetService:
     """Provide UserDatasetService instance."""
-    repo = DatasetRepository(db=db)
-    return UserDatasetService(dataset_repo=repo)
+    repo = AsyncDatasetRepository(db=db)
+    return UserDatasetService(
+        dataset_repo=repo,
+        version_repo=AsyncResourceVersionRepository(db=db),
+    )
 
 
-def get_presign_service(
-    db: Session = Depends(get_db),
-) -> PresignService:
-    """Provide PresignService instance."""
-    dataset_repo = DatasetRepository(db=db)
+def get_storage_client() -> StorageClient:
+    """Provide the shared, process-wide StorageClient."""
     try:
-        storage = StorageClient()
+        return storage_registry.get()
     except ValueError as exc:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail=str(exc),
         ) from exc
-    return PresignService(storage=storage, dataset_repo=dataset_repo)
+
+
+def get_presign_service(
+    db: Session = Depends(get_db),
+    storage: StorageClient = Depends(get_storage_client),
+) -> PresignService:
+    """Provide PresignService instance."""
+    dataset_repo = DatasetRepository(db=db)
+    return PresignService(
+        storage=storage,
+        dataset_repo=dataset_repo,
+        blob_repo=BlobRepository(db=db),
+        asset_repo=AssetRepository(db=db),
+    )
+
+
+def get_thumbnail_service(
+    db: Session = Depends(get_db),
+    storage: StorageClient = Depends(get_storage_client),
+) -> ThumbnailService:
+    """Provide ThumbnailService instance."""
+    return ThumbnailService(storage=storage, asset_repo=AssetRepository(db=db))
+
+
+def get_asset_service(
+    db: Session = Depends(get_db),
+) -> AssetService:
+    """Provide AssetService instance."""
+    return AssetService(
+        asset_repo=AssetRepository(db=db),
+        dataset_repo=DatasetRepository(db=db),
+    )
+
+
+def get_annotation_service(
+    db: Session = Depends(get_db),
+) -> AnnotationService:
+    """Provide AnnotationService instance."""
+    return AnnotationService(
+        annotation_repo=AnnotationRepository(db=db),
+        asset_repo=AssetRepository(db=db),
+        dataset_repo=DatasetRepository(db=db),
+    )
+
+
+def get_job_service(
+    db: Session = Depends(get_db),
+) -> JobService:
+    """Provide JobService instance."""
+    return JobService(job_repo=JobRepository(db=db), broker=get_job_broker())
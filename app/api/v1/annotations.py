@@ -0,0 +1,98 @@
+import json
+from collections.abc import Iterator
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from app.api.access import require_dataset
+from app.api.deps import get_annotation_service, get_user_dataset_service
+from app.core.context import UserContext, get_user_context
+from app.infrastructure.db import SessionLocal
+from app.models.schemas.annotation import (
+    AnnotationBulkUpsert,
+    AnnotationBulkUpsertResponse,
+    AnnotationRead,
+)
+from app.repositories.annotation_repository import AnnotationRepository
+from app.repositories.asset_repository import AssetRepository
+from app.repositories.dataset_repository import DatasetRepository
+from app.services.annotation_service import AnnotationService
+from app.services.user_dataset_service import UserDatasetService
+
+router = APIRouter()
+
+
+@router.get(
+    "/",
+    summary="Stream all annotations of a dataset",
+    responses={
+        200: {
+            "model": AnnotationRead,
+            "content": {"application/x-ndjson": {}},
+            "description": "One AnnotationRead object per line, grouped by asset",
+        }
+    },
+)
+async def stream_annotations(
+    dataset_id: int = Query(..., description="Dataset ID"),
+    ctx: UserContext = Depends(get_user_context),
+    datasets: UserDatasetService = Depends(get_user_dataset_service),
+) -> StreamingResponse:
+    """Return every annotation of a dataset in one NDJSON response.
+
+    Rows come from a single ordered query and are written as they are read,
+    so memory use does not grow with the dataset.
+    """
+    await require_dataset(datasets, dataset_id, ctx)
+    return StreamingResponse(
+        _ndjson_lines(dataset_id),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.post(
+    "/bulk",
+    response_model=AnnotationBulkUpsertResponse,
+    summary="Create or update many annotations of a dataset",
+)
+async def bulk_upsert_annotations(
+    payload: AnnotationBulkUpsert,
+    ctx: UserContext = Depends(get_user_context),
+    datasets: UserDatasetService = Depends(get_user_dataset_service),
+    svc: AnnotationService = Depends(get_annotation_service),
+) -> AnnotationBulkUpsertResponse:
+    """Write up to 10,000 annotations in one transaction.
+
+    Annotations are matched on ``(asset_id, key)``: existing ones are
+    replaced, new ones inserted. Masks are stored as compact COCO RLE.
+    """
+    await require_dataset(datasets, payload.dataset_id, ctx)
+    try:
+        upserted = await run_in_threadpool(
+            svc.upsert,
+            payload.dataset_id,
+            payload.annotations,
+        )
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(exc),
+        ) from exc
+    return AnnotationBulkUpsertResponse(dataset_id=payload.dataset_id, upserted=upserted)
+
+
+def _ndjson_lines(dataset_id: int) -> Iterator[str]:
+    # Runs in a worker thread for the whole response, with its own session:
+    # the request's session may be closed before streaming finishes.
+    db = SessionLocal()
+    try:
+        svc = AnnotationService(
+            annotation_repo=AnnotationRepository(db=db),
+            asset_repo=AssetRepository(db=db),
+            dataset_repo=DatasetRepository(db=db),
+        )
+        for record in svc.stream_dataset(dataset_id):
+            yield json.dumps(record, separators=(",", ":")) + "\n"
+    finally:
+        db.close()
@@ -1,11 +1,185 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import json
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict
+from datetime import datetime, timezone
 
-from app.api.deps import get_presign_service
-from app.models.schemas.asset import PresignRequest, PresignResponse
-from app.services.presign_service import PresignService
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import RedirectResponse, StreamingResponse
+
+from app.api.access import require_dataset
+from app.api.deps import (
+    get_asset_service,
+    get_presign_service,
+    get_thumbnail_service,
+    get_user_dataset_service,
+)
+from app.core.context import UserContext, get_user_context
+from app.core.derivatives import UnsupportedImageError
+from app.core.pagination import CursorPage, InvalidCursorError
+from app.models.schemas.asset import (
+    AssetRead,
+    AssetStatus,
+    BatchPresignItem,
+    BatchPresignRequest,
+    BatchPresignResponse,
+    ContentPresignItem,
+    ContentPresignRequest,
+    ContentPresignResponse,
+    MultipartCompleteRequest,
+    MultipartCompleteResponse,
+    MultipartCreateRequest,
+    MultipartCreateResponse,
+    MultipartListPartsResponse,
+    MultipartPartUrl,
+    MultipartPartsRequest,
+    MultipartPartsResponse,
+    MultipartUploadedPart,
+    MultipartUploadRef,
+    PresignRequest,
+    PresignResponse,
+    PyramidRead,
+    ReadPresignItem,
+    ReadPresignRequest,
+    ReadPresignResponse,
+    ThumbnailRead,
+)
+from app.infrastructure.storage import StorageError
+from app.services.asset_service import AssetService
+from app.services.presign_service import (
+    ContentFile,
+    InvalidUploadError,
+    PresignResult,
+    PresignService,
+)
+from app.services.thumbnail_service import AssetNotReadyError, ThumbnailService
+from app.services.user_dataset_service import UserDatasetService
 
 router = APIRouter()
 
+
+@router.get(
+    "/",
+    response_model=CursorPage[AssetRead],
+    summary="List assets of a dataset",
+)
+async def list_assets(
+    dataset_id: int = Query(..., description="Dataset ID"),
+    limit: int = Query(default=100, ge=1, le=1000, description="Page size"),
+    cursor: str | None = Query(default=None, description="Cursor from the previous page"),
+    status_filter: AssetStatus | None = Query(
+        default=None,
+        alias="status",
+        description="Only return assets in this status",
+    ),
+    ctx: UserContext = Depends(get_user_context),
+    datasets: UserDatasetService = Depends(get_user_dataset_service),
+    svc: AssetService = Depends(get_asset_service),
+) -> CursorPage[AssetRead]:
+    """List a dataset's assets in id order using keyset (cursor) pagination."""
+    await require_dataset(datasets, dataset_id, ctx)
+    try:
+        assets, next_cursor = await run_in_threadpool(
+            svc.list_assets,
+            dataset_id=dataset_id,
+            limit=limit,
+            cursor=cursor,
+            status=status_filter,
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(exc),
+        ) from exc
+
+    return CursorPage[AssetRead](
+        items=[AssetRead.model_validate(asset) for asset in assets],
+        next_cursor=next_cursor,
+    )
+
+
+@router.get(
+    "/{asset_id}/thumbnail",
+    response_model=ThumbnailRead,
+    summary="Presigned URL of an asset thumbnail",
+    responses={307: {"description": "Redirect to the thumbnail when redirect=true"}},
+)
+async def get_thumbnail(
+    asset_id: int,
+    size: int = Query(default=256, ge=1, le=4096, description="Longest side wanted, in px"),
+    expires_in: int = Query(default=3600, ge=60, le=7 * 24 * 3600),
+    redirect: bool = Query(default=False, description="Answer with a redirect to the image"),
+    ctx: UserContext = Depends(get_user_context),
+    svc: ThumbnailService = Depends(get_thumbnail_service),
+):
+    """Return a read URL for the smallest configured thumbnail of at least ``size``.
+
+    Thumbnails that do not exist yet are rendered before answering, so the
+    first request for a new asset can take a moment.
+    """
+    with _derivative_errors():
+        thumbnail = await run_in_threadpool(
+            svc.thumbnail_url,
+            asset_id=asset_id,
+            ctx=ctx,
+            size=size,
+            expires_in=expires_in,
+        )
+    if redirect:
+        return RedirectResponse(thumbnail.url, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+    return ThumbnailRead(**asdict(thumbnail))
+
+
+@router.get(
+    "/{asset_id}/pyramid",
+    response_model=PyramidRead,
+    summary="Tile layout of a large image",
+)
+async def get_pyramid(
+    asset_id: int,
+    ctx: UserContext = Depends(get_user_context),
+    svc: ThumbnailService = Depends(get_thumbnail_service),
+) -> PyramidRead:
+    """Describe the tile pyramid of an asset; fetch tiles from the tiles endpoint."""
+    with _derivative_errors():
+        manifest = await run_in_threadpool(svc.pyramid, asset_id, ctx)
+    return PyramidRead(asset_id=asset_id, **manifest)
+
+
+@router.get(
+    "/{asset_id}/tiles/{level}/{col}/{row}",
+    status_code=status.HTTP_307_TEMPORARY_REDIRECT,
+    summary="Redirect to one pyramid tile",
+)
+async def get_tile(
+    asset_id: int,
+    level: int,
+    col: int,
+    row: int,
+    expires_in: int = Query(default=3600, ge=60, le=7 * 24 * 3600),
+    ctx: UserContext = Depends(get_user_context),
+    svc: ThumbnailService = Depends(get_thumbnail_service),
+) -> RedirectResponse:
+    """Redirect to a presigned read of a tile, so it can be used as an image source."""
+    with _derivative_errors():
+        url = await run_in_threadpool(
+            svc.tile_url,
+            asset_id=asset_id,
+            ctx=ctx,
+            level=level,
+            col=col,
+            row=row,
+            expires_in=expires_in,
+        )
+    return RedirectResponse(url, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+
+
 @router.post(
     "/presign",
     response_model=PresignResponse,
@@ -13,9 +187,12 @@ router = APIRouter()
 )
 async def presign_asset_upload(
     payload: PresignRequest,
+    ctx: UserContext = Depends(get_user_context),
+    datasets: UserDatasetService = Depends(get_user_dataset_service),
     svc: PresignService = Depends(get_presign_service),
 ) -> PresignResponse:
     """Return a presigned upload URL for a dataset asset."""
+    await require_dataset(datasets, payload.dataset_id, ctx)
     try:
         upload_url, object_key, bucket = svc.presign_upload(
             dataset_id=payload.dataset_id,
@@ -28,3 +205,348 @@ async def presign_asset_upload(
         ) from exc
 
     return PresignResponse(upload_url=upload_url, object_key=object_key, bucket=bucket)
+
+
+@router.post(
+    "/presign/batch",
+    response_model=BatchPresignResponse,
+    summary="Generate presigned upload URLs for many assets of one dataset",
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def presign_asset_upload_batch(
+    payload: BatchPresignRequest,
+    stream: bool = Query(
+        default=False,
+        description="Stream one JSON object per line instead of a single document",
+    ),
+    ctx: UserContext = Depends(get_user_context),
+    datasets: UserDatasetService = Depends(get_user_dataset_service),
+    svc: PresignService = Depends(get_presign_service),
+):
+    """Return presigned upload URLs for a batch of files.
+
+    Files that cannot be signed carry an ``error`` instead of failing the request.
+    """
+    await require_dataset(datasets, payload.dataset_id, ctx)
+    try:
+        results = await run_in_threadpool(
+            svc.presign_upload_batch,
+            dataset_id=payload.dataset_id,
+            filenames=payload.filenames,
+            expires_in=payload.expires_in,
+        )
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(exc),
+        ) from exc
+
+    if stream:
+        return StreamingResponse(
+            _ndjson_lines(results),
+            media_type="application/x-ndjson",
+        )
+
+    items = await run_in_threadpool(lambda: [_as_item(result) for result in results])
+    return BatchPresignResponse(
+        dataset_id=payload.dataset_id,
+        bucket=svc.storage.bucket,
+        items=items,
+        failed=sum(1 for item in items if item.error is not None),
+    )
+
+
+@router.post(
+    "/presign/content",
+    response_model=ContentPresignResponse,
+    summary="Add files by content hash; presign uploads only for unknown content",
+)
+async def presign_content_upload(
+    payload: ContentPresignRequest,
+    ctx: UserContext = Depends(get_user_context),
+    datasets: UserDatasetService = Depends(get_user_dataset_service),
+    svc: PresignService = Depends(get_presign_service),
+) -> ContentPresignResponse:
+    """Register files by SHA-256 and return upload URLs for content not yet stored.
+
+    Identical bytes are stored once under ``blobs/`` and shared by every
+    asset that has them. Items with ``exists`` were already uploaded in the
+    dataset's project and need no upload; their assets are ready to use
+    straight away. Content from other projects is never reused without an
+    upload.
+    """
+    await require_dataset(datasets, payload.dataset_id, ctx)
+    files = [
+        ContentFile(
+            filename=file.filename,
+            sha256=file.sha256,
+            size_bytes=file.size_bytes,
+            mime_type=file.content_type,
+        )
+        for file in payload.files
+    ]
+    with _storage_errors():
+        results = await run_in_threadpool(
+            svc.presign_content_batch,
+            dataset_id=payload.dataset_id,
+            files=files,
+            expires_in=payload.expires_in,
+        )
+    items = [ContentPresignItem(**asdict(result)) for result in results]
+    return ContentPresignResponse(
+        dataset_id=payload.dataset_id,
+        bucket=svc.storage.bucket,
+        items=items,
+        uploads=sum(1 for item in items if item.upload_url is not None),
+        reused=sum(1 for item in items if item.exists),
+        failed=sum(1 for item in items if item.error is not None),
+    )
+
+
+@router.post(
+    "/presign/read",
+    response_model=ReadPresignResponse,
+    summary="Generate presigned download URLs for many assets of one dataset",
+)
+async def presign_asset_reads(
+    payload: ReadPresignRequest,
+    ctx: UserContext = Depends(get_user_context),
+    datasets: UserDatasetService = Depends(get_user_dataset_service),
+    svc: PresignService = Depends(get_presign_service),
+) -> ReadPresignResponse:
+    """Return a download URL per asset, e.g. for every asset on a dataset page.
+
+    URLs are reused until they pass ``presign_cache_reuse_fraction`` of their
+    lifetime, so repeated page loads get the same URLs (and browser cache
+    hits) without signing again.
+    """
+    await require_dataset(datasets, payload.dataset_id, ctx)
+    with _storage_errors():
+        results = await run_in_threadpool(
+            svc.presign_read_batch,
+            dataset_id=payload.dataset_id,
+            object_keys=payload.object_keys,
+            expires_in=payload.expires_in,
+        )
+    items = [
+        ReadPresignItem(
+            object_key=result.object_key,
+            url=result.url,
+            expires_at=(
+                datetime.fromtimestamp(result.expires_at, timezone.utc)
+                if result.expires_at is not None
+                else None
+            ),
+            error=result.error,
+        )
+        for result in results
+    ]
+    return ReadPresignResponse(
+        dataset_id=payload.dataset_id,
+        items=items,
+        failed=sum(1 for item in items if item.error is not None),
+    )
+
+
+@router.post(
+    "/multipart",
+    response_model=MultipartCreateResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Start a multipart upload and presign its part URLs",
+)
+async def create_multipart_upload(
+    payload: MultipartCreateRequest,
+    ctx: UserContext = Depends(get_user_context),
+    datasets: UserDatasetService = Depends(get_user_dataset_service),
+    svc: PresignService = Depends(get_presign_service),
+) -> MultipartCreateResponse:
+    """Start a multipart upload for a large dataset asset."""
+    await require_dataset(datasets, payload.dataset_id, ctx)
+    with _storage_errors():
+        upload = await run_in_threadpool(
+            svc.start_multipart_upload,
+            dataset_id=payload.dataset_id,
+            filename=payload.filename,
+            part_count=payload.part_count,
+            content_type=payload.content_type,
+            expires_in=payload.expires_in,
+        )
+    return MultipartCreateResponse(
+        upload_id=upload.upload_id,
+        object_key=upload.object_key,
+        bucket=upload.bucket,
+        parts=_part_urls(upload.part_urls),
+    )
+
+
+@router.post(
+    "/multipart/parts",
+    response_model=MultipartPartsResponse,
+    summary="Presign part URLs of an existing multipart upload",
+)
+async def presign_multipart_parts(
+    payload: MultipartPartsRequest,
+    ctx: UserContext = Depends(get_user_context),
+    datasets: UserDatasetService = Depends(get_user_dataset_service),
+    svc: PresignService = Depends(get_presign_service),
+) -> MultipartPartsResponse:
+    """Presign selected parts again, e.g. after the original URLs expired."""
+    await require_dataset(datasets, payload.dataset_id, ctx)
+    with _storage_errors():
+        part_urls = await run_in_threadpool(
+            svc.presign_upload_parts,
+            dataset_id=payload.dataset_id,
+            object_key=payload.object_key,
+            upload_id=payload.upload_id,
+            part_numbers=payload.part_numbers,
+            expires_in=payload.expires_in,
+        )
+    return MultipartPartsResponse(parts=_part_urls(part_urls))
+
+
+@router.get(
+    "/multipart/parts",
+    response_model=MultipartListPartsResponse,
+    summary="List parts already uploaded, for resuming",
+)
+async def list_multipart_parts(
+    dataset_id: int = Query(..., description="Dataset ID"),
+    object_key: str = Query(..., description="Storage object key"),
+    upload_id: str = Query(..., description="Multipart upload id"),
+    ctx: UserContext = Depends(get_user_context),
+    datasets: UserDatasetService = Depends(get_user_dataset_service),
+    svc: PresignService = Depends(get_presign_service),
+) -> MultipartListPartsResponse:
+    """Return the parts the store already holds so a client can skip them."""
+    await require_dataset(datasets, dataset_id, ctx)
+    with _storage_errors():
+        parts = await run_in_threadpool(
+            svc.list_uploaded_parts,
+            dataset_id=dataset_id,
+            object_key=object_key,
+            upload_id=upload_id,
+        )
+    return MultipartListPartsResponse(
+        upload_id=upload_id,
+        object_key=object_key,
+        parts=[MultipartUploadedPart(**part) for part in parts],
+    )
+
+
+@router.post(
+    "/multipart/complete",
+    response_model=MultipartCompleteResponse,
+    summary="Complete a multipart upload",
+)
+async def complete_multipart_upload(
+    payload: MultipartCompleteRequest,
+    ctx: UserContext = Depends(get_user_context),
+    datasets: UserDatasetService = Depends(get_user_dataset_service),
+    svc: PresignService = Depends(get_presign_service),
+) -> MultipartCompleteResponse:
+    """Assemble the uploaded parts into the final object."""
+    await require_dataset(datasets, payload.dataset_id, ctx)
+    with _storage_errors():
+        etag = await run_in_threadpool(
+            svc.complete_multipart_upload,
+            dataset_id=payload.dataset_id,
+            object_key=payload.object_key,
+            upload_id=payload.upload_id,
+            parts=[(part.part_number, part.etag) for part in payload.parts],
+        )
+    return MultipartCompleteResponse(
+        object_key=payload.object_key,
+        bucket=svc.storage.bucket,
+        etag=etag,
+    )
+
+
+@router.post(
+    "/multipart/abort",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Abort a multipart upload",
+)
+async def abort_multipart_upload(
+    payload: MultipartUploadRef,
+    ctx: UserContext = Depends(get_user_context),
+    datasets: UserDatasetService = Depends(get_user_dataset_service),
+    svc: PresignService = Depends(get_presign_service),
+) -> None:
+    """Abort an upload and discard its stored parts."""
+    await require_dataset(datasets, payload.dataset_id, ctx)
+    with _storage_errors():
+        await run_in_threadpool(
+            svc.abort_multipart_upload,
+            dataset_id=payload.dataset_id,
+            object_key=payload.object_key,
+            upload_id=payload.upload_id,
+        )
+
+
+@contextmanager
+def _storage_errors() -> Iterator[None]:
+    try:
+        yield
+    except InvalidUploadError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=str(exc),
+        ) from exc
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(exc),
+        ) from exc
+    except StorageError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=str(exc),
+        ) from exc
+
+
+@contextmanager
+def _derivative_errors() -> Iterator[None]:
+    try:
+        yield
+    except UnsupportedImageError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=str(exc),
+        ) from exc
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(exc),
+        ) from exc
+    except StorageError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=str(exc),
+        ) from exc
+    except AssetNotReadyError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(exc),
+        ) from exc
+
+
+def _part_urls(part_urls: list[tuple[int, str]]) -> list[MultipartPartUrl]:
+    return [
+        MultipartPartUrl(part_number=number, upload_url=url) for number, url in part_urls
+    ]
+
+
+def _as_item(result: PresignResult) -> BatchPresignItem:
+    return BatchPresignItem(
+        filename=result.filename,
+        upload_url=result.upload_url,
+        object_key=result.object_key,
+        error=result.error,
+    )
+
+
+def _ndjson_lines(results: Iterator[PresignResult]) -> Iterator[str]:
+    # Synchronous iterator: Starlette drains it in a worker thread, so signing
+    # thousands of keys does not stall the event loop.
+    for result in results:
+        yield json.dumps(_as_item(result).model_dump(exclude_none=True)) + "\n"
@@ -1,26 +1,54 @@
 # app/api/v1/datasets.py
-from typing import Sequence
+from typing import Any
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import TypeAdapter
 
-from app.api.deps import get_user_dataset_service
-from app.models.schemas.dataset import DatasetCreate, DatasetRead
+from app.api.access import require_dataset
+from app.api.conditional import NOT_MODIFIED, conditional_listing, list_cache
+from app.api.deps import get_job_service, get_user_dataset_service
+from app.core.context import UserContext, get_user_context
+from app.models.schemas.dataset import (
+    DatasetCreate,
+    DatasetExportRequest,
+    DatasetImportRequest,
+    DatasetRead,
+    DatasetThumbnailsRequest,
+)
+from app.models.schemas.job import JobCreate, JobRead
+from app.services.job_service import JobQuotaExceededError, JobService
 from app.services.user_dataset_service import UserDatasetService
+from app.workers.dataset_import import ImportSpec
 
 router = APIRouter()
 
+_DATASET_LIST = TypeAdapter(list[DatasetRead])
+
 
 @router.get(
     "/",
     response_model=list[DatasetRead],
     summary="List datasets for a project",
+    responses=NOT_MODIFIED,
 )
 async def list_datasets(
+    request: Request,
     project_id: int = Query(..., description="Project ID"),
     svc: UserDatasetService = Depends(get_user_dataset_service),
-) -> Sequence[DatasetRead]:
-    """List datasets belonging to the given project."""
-    return svc.list_datasets_for_user(project_id=project_id)
+) -> Response:
+    """List datasets belonging to the given project.
+
+    Send the last ``ETag`` in ``If-None-Match`` to get an empty 304 when
+    nothing changed.
+    """
+    return await conditional_listing(
+        request,
+        _list_cache_key(project_id),
+        version=lambda: svc.datasets_version(project_id=project_id),
+        rows=lambda: svc.list_datasets_for_user(project_id=project_id),
+        adapter=_DATASET_LIST,
+    )
 
 
 @router.post(
@@ -34,4 +62,127 @@ async def create_dataset(
     svc: UserDatasetService = Depends(get_user_dataset_service),
 ) -> DatasetRead:
     """Create a dataset under a project."""
-    return svc.create_dataset_for_user(payload)
+    dataset = await svc.create_dataset_for_user(payload)
+    list_cache.invalidate(_list_cache_key(payload.project_id))
+    return dataset
+
+
+@router.post(
+    "/{dataset_id}/export",
+    response_model=JobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Export a dataset to COCO, YOLO or WebDataset",
+)
+async def export_dataset(
+    dataset_id: int,
+    payload: DatasetExportRequest,
+    ctx: UserContext = Depends(get_user_context),
+    svc: UserDatasetService = Depends(get_user_dataset_service),
+    jobs: JobService = Depends(get_job_service),
+) -> JobRead:
+    """Queue an export job; its result lists the object keys it wrote."""
+    return await _submit_dataset_job(
+        "export",
+        dataset_id,
+        payload.model_dump(exclude={"priority"}),
+        payload.priority,
+        ctx,
+        svc,
+        jobs,
+    )
+
+
+@router.post(
+    "/{dataset_id}/import",
+    response_model=JobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Import the files of an archive in the bucket",
+)
+async def import_dataset(
+    dataset_id: int,
+    payload: DatasetImportRequest,
+    ctx: UserContext = Depends(get_user_context),
+    svc: UserDatasetService = Depends(get_user_dataset_service),
+    jobs: JobService = Depends(get_job_service),
+) -> JobRead:
+    """Queue an import job that unpacks, deduplicates and registers the files.
+
+    Upload the archive into the dataset first (e.g. with a multipart upload
+    to ``datasets/{dataset_id}/...``), then pass its key.
+    """
+    job_payload = payload.model_dump(exclude={"priority"})
+    try:
+        ImportSpec.from_payload({"dataset_id": dataset_id, **job_payload})
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=str(exc),
+        ) from exc
+    return await _submit_dataset_job(
+        "import",
+        dataset_id,
+        job_payload,
+        payload.priority,
+        ctx,
+        svc,
+        jobs,
+    )
+
+
+@router.post(
+    "/{dataset_id}/thumbnails",
+    response_model=JobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Render thumbnails and image pyramids for a dataset",
+)
+async def render_dataset_thumbnails(
+    dataset_id: int,
+    payload: DatasetThumbnailsRequest,
+    ctx: UserContext = Depends(get_user_context),
+    svc: UserDatasetService = Depends(get_user_dataset_service),
+    jobs: JobService = Depends(get_job_service),
+) -> JobRead:
+    """Queue a job that renders derivatives of every uploaded image in the dataset.
+
+    New uploads get theirs on ingest; use this to backfill older assets or
+    to re-render after changing the thumbnail settings.
+    """
+    return await _submit_dataset_job(
+        "thumbnails",
+        dataset_id,
+        payload.model_dump(exclude={"priority"}),
+        payload.priority,
+        ctx,
+        svc,
+        jobs,
+    )
+
+
+def _list_cache_key(project_id: int) -> str:
+    return f"datasets:{project_id}"
+
+
+async def _submit_dataset_job(
+    job_type: str,
+    dataset_id: int,
+    job_payload: dict[str, Any],
+    priority: int,
+    ctx: UserContext,
+    svc: UserDatasetService,
+    jobs: JobService,
+) -> JobRead:
+    dataset = await require_dataset(svc, dataset_id, ctx)
+    job_spec = JobCreate(
+        type=job_type,
+        project_id=dataset.project_id,
+        priority=priority,
+        payload={"dataset_id": dataset_id, **job_payload},
+    )
+    try:
+        job = await run_in_threadpool(jobs.submit_job, job_spec, ctx)
+    except JobQuotaExceededError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(exc),
+        ) from exc
+    return JobRead.model_validate(job)
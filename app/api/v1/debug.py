@@ -1,11 +1,36 @@
 # app/api/v1/debug.py
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, status
+from app.api.deps import get_job_service
 from app.core.config import settings
+from app.core.context import get_user_context
+from app.services.job_service import JobService
+from app.telemetry.metrics import metrics
 
 router = APIRouter()
 
 
+def _metrics_enabled() -> None:
+    # Answer as if the route did not exist, before asking for credentials.
+    if not settings.debug_metrics_enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+
 @router.get("/env")
 def debug_env():
     """Return the current environment settings for debugging purposes."""
     return {"environment": settings.env}
+
+
+@router.get(
+    "/metrics",
+    dependencies=[Depends(_metrics_enabled), Depends(get_user_context)],
+)
+def debug_metrics(jobs: JobService = Depends(get_job_service)):
+    """Return in-process metrics (cache hit rates, queue depths, ...).
+
+    Job queue gauges are read from the database on each call, since the
+    workers that dispatch jobs run in other processes. Disabled unless
+    ``DEBUG_METRICS_ENABLED`` is set, and then only for authenticated callers.
+    """
+    jobs.record_queue_metrics()
+    return metrics.snapshot()
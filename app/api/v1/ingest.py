@@ -0,0 +1,75 @@
+# app/api/v1/ingest.py
+import secrets
+
+from fastapi import APIRouter, Header, HTTPException, Request, status
+
+from app.core.config import settings
+from app.models.schemas.ingest import IngestAccepted
+from app.services.ingest_service import (
+    IngestBackpressureError,
+    asset_ingest_queue,
+    parse_bucket_notification,
+)
+
+router = APIRouter()
+
+
+@router.post(
+    "/s3-events",
+    response_model=IngestAccepted,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Receive S3/MinIO bucket notifications",
+)
+async def receive_bucket_notification(
+    request: Request,
+    authorization: str | None = Header(default=None),
+) -> IngestAccepted:
+    """Store object-created events under ``datasets/{id}/`` and ``blobs/`` for ingestion.
+
+    Events are committed before the 202, so an acknowledged notification is
+    not lost if the process stops before writing its assets.
+
+    Point a MinIO webhook target at this endpoint and set its ``auth_token``
+    to ``INGEST_WEBHOOK_TOKEN``.
+    """
+    _check_webhook_token(authorization)
+
+    try:
+        payload = await request.json()
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Notification body must be JSON",
+        ) from exc
+    if not isinstance(payload, dict):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Notification body must be a JSON object",
+        )
+
+    events, ignored = parse_bucket_notification(payload, bucket=settings.minio_bucket)
+    try:
+        accepted = await asset_ingest_queue.submit(events)
+    except IngestBackpressureError as exc:
+        # MinIO retries failed deliveries, so shedding load here is safe.
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+        ) from exc
+    return IngestAccepted(accepted=accepted, ignored=ignored)
+
+
+def _check_webhook_token(authorization: str | None) -> None:
+    expected = settings.ingest_webhook_token
+    if not expected:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Ingest webhook is not configured",
+        )
+    # MinIO sends either the bare token or "Bearer <token>" depending on version.
+    supplied = (authorization or "").removeprefix("Bearer ").strip()
+    if not secrets.compare_digest(supplied, expected):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid webhook token",
+        )
@@ -1,8 +1,210 @@
-from fastapi import APIRouter
+import json
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from app.api.access import require_dataset, require_project
+from app.api.deps import get_job_service, get_user_dataset_service, get_user_project_service
+from app.core.config import settings
+from app.core.context import UserContext, get_user_context
+from app.infrastructure.db import SessionLocal
+from app.models.orm.job import JOB_FINAL_STATUSES
+from app.models.schemas.job import JobCreate, JobRead, JobStatus, TenantQueueStats
+from app.repositories.job_repository import JobRepository
+from app.services.job_events import JobEvent, JobSubscription, job_event, job_event_hub
+from app.services.job_service import JobQuotaExceededError, JobService
+from app.services.user_dataset_service import UserDatasetService
+from app.services.user_project_service import UserProjectService
+from app.workers.handlers import DATASET_JOB_TYPES
 
 router = APIRouter()
 
-@router.get("/")
-async def list_jobs():
-    """TODO: List jobs."""
-    raise NotImplementedError
+
+@router.get("/", response_model=list[JobRead], summary="List jobs")
+def list_jobs(
+    project_id: int | None = Query(default=None, description="Only jobs of this project"),
+    status_filter: JobStatus | None = Query(default=None, alias="status"),
+    limit: int = Query(default=50, ge=1, le=500),
+    before_id: int | None = Query(default=None, description="Return jobs older than this id"),
+    ctx: UserContext = Depends(get_user_context),
+    svc: JobService = Depends(get_job_service),
+) -> list[JobRead]:
+    """List the caller's jobs newest first."""
+    jobs = svc.list_jobs(
+        ctx,
+        project_id=project_id,
+        status=status_filter,
+        limit=limit,
+        before_id=before_id,
+    )
+    return [JobRead.model_validate(job) for job in jobs]
+
+
+@router.post(
+    "/",
+    response_model=JobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Submit a job",
+)
+async def submit_job(
+    payload: JobCreate,
+    ctx: UserContext = Depends(get_user_context),
+    projects: UserProjectService = Depends(get_user_project_service),
+    datasets: UserDatasetService = Depends(get_user_dataset_service),
+    svc: JobService = Depends(get_job_service),
+) -> JobRead:
+    """Queue a job and return immediately; poll or subscribe for its status.
+
+    Jobs that work on a dataset need ``payload.dataset_id`` of a dataset the
+    caller may access and are filed under its project; other jobs may name
+    one of the caller's projects.
+    """
+    if payload.type in DATASET_JOB_TYPES:
+        dataset = await require_dataset(datasets, payload.payload["dataset_id"], ctx)
+        if payload.project_id not in (None, dataset.project_id):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                detail=f"Dataset {dataset.id} is not in project {payload.project_id}",
+            )
+        payload = payload.model_copy(update={"project_id": dataset.project_id})
+    elif payload.project_id is not None:
+        await require_project(projects, payload.project_id, ctx)
+    try:
+        job = await run_in_threadpool(svc.submit_job, payload, ctx)
+    except JobQuotaExceededError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(exc),
+        ) from exc
+    return JobRead.model_validate(job)
+
+
+@router.get("/stats", response_model=list[TenantQueueStats], summary="Queue stats of your tenant")
+def queue_stats(
+    window_seconds: float = Query(default=3600, gt=0, le=86400),
+    ctx: UserContext = Depends(get_user_context),
+    svc: JobService = Depends(get_job_service),
+) -> list[TenantQueueStats]:
+    """Queue depth, running jobs and recent wait times of the caller's tenant.
+
+    Every tenant's queue is exported as metrics on ``/debug/metrics``.
+    """
+    return svc.queue_stats(window_seconds=window_seconds, ctx=ctx)
+
+
+@router.get("/events", summary="Stream status events of a project's jobs")
+async def project_job_events(
+    request: Request,
+    project_id: int = Query(..., description="Project whose jobs to follow"),
+    ctx: UserContext = Depends(get_user_context),
+) -> StreamingResponse:
+    """Server-Sent Events: one ``job`` event per status or progress change.
+
+    Only the caller's jobs are streamed, as in ``GET /jobs``.
+    """
+    subscription = job_event_hub.subscribe(project_id=project_id)
+    return _event_stream(request, subscription, [], ctx, until_final=False)
+
+
+@router.get("/{job_id}/events", summary="Stream status events of a job")
+async def job_events(
+    request: Request,
+    job_id: int,
+    ctx: UserContext = Depends(get_user_context),
+) -> StreamingResponse:
+    """Server-Sent Events: the current state, then every change until the job ends."""
+    # Subscribe before reading the snapshot so no change falls in between.
+    subscription = job_event_hub.subscribe(job_id=job_id)
+    snapshot = await run_in_threadpool(_load_job_event, job_id)
+    if snapshot is None or not _visible(ctx, snapshot):
+        subscription.close()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job {job_id} not found",
+        )
+    job_event_hub.remember(snapshot)
+    return _event_stream(request, subscription, [snapshot], ctx, until_final=True)
+
+
+@router.get("/{job_id}", response_model=JobRead, summary="Get a job")
+def get_job(
+    job_id: int,
+    ctx: UserContext = Depends(get_user_context),
+    svc: JobService = Depends(get_job_service),
+) -> JobRead:
+    try:
+        return JobRead.model_validate(svc.get_job(job_id, ctx))
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(exc),
+        ) from exc
+
+
+@router.post("/{job_id}/cancel", response_model=JobRead, summary="Cancel a queued job")
+def cancel_job(
+    job_id: int,
+    ctx: UserContext = Depends(get_user_context),
+    svc: JobService = Depends(get_job_service),
+) -> JobRead:
+    try:
+        return JobRead.model_validate(svc.cancel_job(job_id, ctx))
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(exc),
+        ) from exc
+    except RuntimeError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(exc),
+        ) from exc
+
+
+def _load_job_event(job_id: int) -> JobEvent | None:
+    # A short-lived session: the stream must not hold a pooled connection.
+    db = SessionLocal()
+    try:
+        job = JobRepository(db=db).get(job_id)
+        return job_event(job) if job is not None else None
+    finally:
+        db.close()
+
+
+def _visible(ctx: UserContext, event: JobEvent) -> bool:
+    return ctx.can_access(event.get("tenant_id"), event.get("created_by"))
+
+
+def _event_stream(
+    request: Request,
+    subscription: JobSubscription,
+    initial: list[JobEvent],
+    ctx: UserContext,
+    until_final: bool,
+) -> StreamingResponse:
+    async def events() -> AsyncIterator[str]:
+        try:
+            pending = list(initial)
+            while True:
+                for event in pending:
+                    yield f"event: job\ndata: {json.dumps(event)}\n\n"
+                    if until_final and event["status"] in JOB_FINAL_STATUSES:
+                        return
+                event = await subscription.get(timeout=settings.job_events_keepalive_seconds)
+                if event is None:
+                    if await request.is_disconnected():
+                        return
+                    yield ": keep-alive\n\n"
+                    pending = []
+                else:
+                    pending = [event] if _visible(ctx, event) else []
+        finally:
+            subscription.close()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,25 +1,47 @@
 # app/api/v1/projects.py
-from typing import Sequence
-
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, Response, status
+from pydantic import TypeAdapter
 
+from app.api.conditional import NOT_MODIFIED, conditional_listing, list_cache
 from app.api.deps import get_user_project_service
+from app.core.context import UserContext, get_user_context
 from app.models.schemas.project import ProjectCreate, ProjectRead
+from app.repositories.resource_version_repository import projects_scope
 from app.services.user_project_service import UserProjectService
 
 
 router = APIRouter()
 
+_PROJECT_LIST = TypeAdapter(list[ProjectRead])
+
+
+def _list_cache_key(ctx: UserContext) -> str:
+    return projects_scope(ctx.tenant_id, ctx.user_id)
+
 
 @router.get(
-    "/", response_model=list[ProjectRead], summary="List projects for the current user"
+    "/",
+    response_model=list[ProjectRead],
+    summary="List projects for the current user",
+    responses=NOT_MODIFIED,
 )
 async def list_projects(
+    request: Request,
+    ctx: UserContext = Depends(get_user_context),
     svc: UserProjectService = Depends(get_user_project_service),
-) -> Sequence[ProjectRead]:
-    """List projects for the current user/tenant."""
-    projects = svc.list_projects_for_user(user=None)  # TODO: wire current user
-    return projects
+) -> Response:
+    """List projects for the current user/tenant.
+
+    Send the last ``ETag`` in ``If-None-Match`` to get an empty 304 when
+    nothing changed.
+    """
+    return await conditional_listing(
+        request,
+        _list_cache_key(ctx),
+        version=lambda: svc.projects_version(ctx),
+        rows=lambda: svc.list_projects_for_user(ctx),
+        adapter=_PROJECT_LIST,
+    )
 
 
 @router.post(
@@ -30,8 +52,10 @@ async def list_projects(
 )
 async def create_project(
     payload: ProjectCreate,
+    ctx: UserContext = Depends(get_user_context),
     svc: UserProjectService = Depends(get_user_project_service),
 ) -> ProjectRead:
     """Create a project for the current user/tenant."""
-    project = svc.create_project(payload=payload, user=None)  # TODO: wire current user
+    project = await svc.create_project(payload=payload, ctx=ctx)
+    list_cache.invalidate(_list_cache_key(ctx))
     return project
@@ -1,10 +1,12 @@
 from fastapi import APIRouter
-from . import auth, projects, datasets, assets, jobs, debug
+from . import auth, projects, datasets, assets, annotations, jobs, debug, ingest
 
 api_v1_router = APIRouter()
 api_v1_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_v1_router.include_router(projects.router, prefix="/projects", tags=["projects"])
 api_v1_router.include_router(datasets.router, prefix="/datasets", tags=["datasets"])
 api_v1_router.include_router(assets.router, prefix="/assets", tags=["assets"])
+api_v1_router.include_router(annotations.router, prefix="/annotations", tags=["annotations"])
+api_v1_router.include_router(ingest.router, prefix="/ingest", tags=["ingest"])
 api_v1_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
 api_v1_router.include_router(debug.router, prefix="/debug", tags=["debug"])
@@ -1,3 +1,64 @@
+import argparse
+
+from app.infrastructure.db import SessionLocal, init_db
+from app.models.orm.dataset import Dataset
+from app.models.orm.project import Project
+from app.repositories.resource_version_repository import (
+    ResourceVersionRepository,
+    datasets_scope,
+    projects_scope,
+)
+
+
+def create_demo_data() -> None:
+    """Create a demo project with two datasets unless they already exist."""
+    db = SessionLocal()
+    try:
+        project = db.query(Project).first()
+        if project is None:
+            project = Project(
+                name="Demo project",
+                description="Automatically created",
+            )
+            db.add(project)
+            ResourceVersionRepository(db).bump(projects_scope(None, None))
+            db.commit()
+            db.refresh(project)
+
+        # only create datasets if none exist
+        if not db.query(Dataset).filter(Dataset.project_id == project.id).first():
+            db.add_all(
+                [
+                    Dataset(
+                        project_id=project.id,
+                        name="Demo dataset 1",
+                        description="First demo dataset",
+                    ),
+                    Dataset(
+                        project_id=project.id,
+                        name="Demo dataset 2",
+                        description="Second demo dataset",
+                    ),
+                ]
+            )
+            ResourceVersionRepository(db).bump(datasets_scope(project.id))
+            db.commit()
+    finally:
+        db.close()
+
+
 def main() -> None:
-    """TODO: Dev helper commands (e.g., create demo data)."""
-    raise NotImplementedError
+    """Dev helper commands (e.g., create demo data)."""
+    parser = argparse.ArgumentParser(prog="python -m app.cli.dev")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("init-db", help="Create missing tables (dev databases only)")
+    commands.add_parser("seed", help="Create missing tables and demo data")
+    args = parser.parse_args()
+
+    init_db()
+    if args.command == "seed":
+        create_demo_data()
+
+
+if __name__ == "__main__":
+    main()
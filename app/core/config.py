@@ -1,9 +1,25 @@
+from pydantic import model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+PRODUCTION_ENVS = frozenset({"prod", "production"})
+
 
 class Settings(BaseSettings):
     env: str = "dev"
+    log_level: str = "INFO"
+    # Startup behaviour; unset values follow `env` (dev: on, prod: off / verify).
+    db_auto_create: bool | None = None
+    seed_demo_data: bool | None = None
+    verify_schema_on_startup: bool | None = None
+    startup_time_budget_ms: float = 2000.0
     database_url: str = "sqlite:///./mlv1sion.db"
+    # Defaults to database_url with an async driver (asyncpg / aiosqlite).
+    async_database_url: str | None = None
+    database_pool_size: int = 10
+    database_max_overflow: int = 20
+    database_pool_timeout_seconds: float = 30.0
+    database_pool_recycle_seconds: int = 1800
+    database_pool_pre_ping: bool = True
     s3_endpoint_url: str | None = None
     s3_access_key: str | None = None
     # MinIO / S3-compatible storage
@@ -13,18 +29,113 @@ class Settings(BaseSettings):
     minio_bucket: str | None = None
     minio_region: str = "us-east-1"
     minio_use_ssl: bool = False
+    minio_max_pool_connections: int = 50
+    minio_connect_timeout_seconds: float = 5.0
+    minio_read_timeout_seconds: float = 60.0
+    minio_max_attempts: int = 3
+    minio_probe_on_startup: bool = True
+    # Presigned GET URLs are reused while this share of their lifetime
+    # has not passed yet; 0 signs every request afresh.
+    presign_cache_reuse_fraction: float = 0.5
+    presign_cache_max_entries: int = 100_000
+    # Bucket notification ingestion
+    ingest_webhook_token: str | None = None
+    ingest_batch_size: int = 500
+    ingest_flush_interval_seconds: float = 1.0
+    ingest_max_pending: int = 50_000
+    # Failed events are retried after 5s, 10s, 20s, ... and dead-lettered
+    # after this many failures.
+    ingest_max_attempts: int = 8
+    ingest_retry_seconds: float = 5.0
+    # Password hashing
+    bcrypt_rounds: int = 12
+    password_hash_workers: int = 4
+    password_hash_max_pending: int = 32
+    # Job queue
+    job_broker: str = "local"  # "local" (in-process) or "redis"
+    redis_url: str | None = None
+    job_lease_seconds: float = 60.0
+    job_poll_interval_seconds: float = 2.0
+    job_max_attempts: int = 3
+    job_worker_processes: int = 2
+    # Fair-share scheduling across tenants; 0 disables a cap.
+    job_tenant_max_running: int = 8
+    job_project_max_running: int = 4
+    job_tenant_max_queued: int = 10_000
+    job_tenant_weights: dict[int, float] = {}  # tenant id -> share, default 1.0
+    # Inference worker
+    inference_decode_workers: int = 4
+    inference_decode_processes: int = 0  # 0 decodes on the fetch threads
+    inference_prefetch: int = 64
+    inference_intra_op_threads: int = 0  # 0 lets ONNX Runtime decide
+    # Dataset export
+    export_fetch_workers: int = 8
+    export_part_size_mb: int = 16  # multipart part size, at least 5
+    # Dataset import
+    import_workers: int = 8
+    import_max_member_mb: int = 256
+    # Thumbnails and image pyramids
+    thumbnail_sizes: list[int] = [128, 256, 512]
+    thumbnail_quality: int = 85
+    thumbnail_workers: int = 4
+    thumbnail_on_ingest: bool = True
+    thumbnail_pyramid_min_px: int = 4096  # longer side; 0 disables pyramids
+    # Largest original (width x height) decoded for thumbnails; larger ones
+    # answer 415. Guards against decompression bombs, so keep it finite.
+    thumbnail_max_image_pixels: int = 178_956_970  # Pillow's own hard limit
+    # Limit for thumbnails jobs that build pyramids, which exist for very
+    # large images; decoding needs about 3 bytes per pixel.
+    thumbnail_pyramid_max_image_pixels: int = 1_000_000_000
+    thumbnail_tile_size: int = 512
+    thumbnail_cache_max_entries: int = 100_000
+    # Job event streams (SSE)
+    job_events_poll_interval_seconds: float = 1.0
+    job_events_queue_size: int = 100
+    job_events_keepalive_seconds: float = 15.0
     jwt_secret_key: str = "your-secret-key"
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
     refresh_token_expire_days: int = 7
+    token_cache_max_entries: int = 10_000
+    token_cache_ttl_seconds: float = 60.0
+    # Serve /api/v1/debug/metrics (authenticated); off unless asked for.
+    debug_metrics_enabled: bool = False
+    # In-process cache of project/dataset listings; 0 leaves only ETags.
+    # Other API processes see new rows after at most this long.
+    list_cache_ttl_seconds: float = 0.0
+    list_cache_max_entries: int = 1000
     google_client_id: str | None = None
     google_client_secret: str | None = None
     google_redirect_uri: str | None = None
     github_client_id: str | None = None
     github_client_secret: str | None = None
     github_redirect_uri: str | None = None
+    # Outbound HTTP (OAuth providers)
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry_seconds: float = 30.0
+    google_oauth_timeout_seconds: float = 10.0
+    github_oauth_timeout_seconds: float = 10.0
+    oauth_http_retries: int = 2
+    oauth_http_backoff_seconds: float = 0.25
     frontend_app_url: str = "http://localhost:5173"
 
+    @property
+    def is_production(self) -> bool:
+        return self.env.lower() in PRODUCTION_ENVS
+
+    @model_validator(mode="after")
+    def _apply_env_defaults(self) -> "Settings":
+        # Production leaves schema to Alembic and never seeds demo rows.
+        dev = not self.is_production
+        if self.db_auto_create is None:
+            self.db_auto_create = dev
+        if self.seed_demo_data is None:
+            self.seed_demo_data = dev
+        if self.verify_schema_on_startup is None:
+            self.verify_schema_on_startup = not dev
+        return self
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -1,5 +1,6 @@
 # app/core/context.py
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional, Tuple
 
 from fastapi import Depends
@@ -14,8 +15,23 @@ class UserContext:
     roles: Tuple[str, ...]
     permissions: Tuple[str, ...]
 
+    def can_access(self, tenant_id: Optional[int], created_by: Optional[int]) -> bool:
+        """Whether a row owned by ``tenant_id``/``created_by`` is visible here.
+
+        Rows are shared within a tenant; rows without one belong to their creator.
+        """
+        if self.tenant_id is not None:
+            return tenant_id == self.tenant_id
+        return tenant_id is None and created_by == self.user_id
+
 
 def get_user_context(current: AuthUser = Depends(get_current_user)) -> UserContext:
+    return _user_context(current)
+
+
+@lru_cache(maxsize=4096)
+def _user_context(current: AuthUser) -> UserContext:
+    # AuthUser is frozen and hashable; reuse contexts for the same principal.
     return UserContext(
         user_id=current.id,
         tenant_id=current.tenant_id,
@@ -0,0 +1,216 @@
+# app/core/derivatives.py
+"""Thumbnails and tiled image pyramids derived from original images.
+
+Derivatives live next to each other under ``derived/{storage key}/``:
+
+* ``thumb-{size}.jpg``: the image scaled to fit a ``size`` x ``size`` box
+  (never enlarged);
+* ``pyramid.json`` and ``tiles/{level}/{col}_{row}.jpg``: for large images,
+  tiles of ``tile_size`` pixels at full resolution (level 0) and at every
+  halving of it, down to the level that fits in one tile.
+
+Keys follow the storage key of the original, so content-addressed assets
+share their derivatives across datasets. Pixels are kept in stored order
+(EXIF orientation is not applied), matching annotation coordinates.
+Images with more than 8 bits per sample (16-bit or float grayscale, as
+from machine-vision cameras) are stretched linearly from their darkest
+to their brightest value, so they do not render as a clipped white field.
+
+Originals above ``max_pixels`` are refused before any pixel is decoded.
+Pillow's own process-wide ``MAX_IMAGE_PIXELS`` check (about 179 MP) still
+applies on top and would reject the very images pyramids are for, so
+``allow_image_pixels`` raises it once at startup to the largest configured
+limit (see ``thumbnail_max_image_pixels`` and
+``thumbnail_pyramid_max_image_pixels``); it is never lowered or lifted.
+"""
+import io
+import math
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+from PIL import Image, UnidentifiedImageError
+
+DERIVED_PREFIX = "derived/"
+DERIVATIVE_CONTENT_TYPE = "image/jpeg"
+# Modes with more than 8 bits per sample; converting them clips at 255.
+_HIGH_DEPTH_MODES = ("I", "I;16", "I;16L", "I;16B", "I;16N", "F")
+
+
+class UnsupportedImageError(ValueError):
+    """Raised when an original cannot be decoded as an image."""
+
+
+def allow_image_pixels(max_pixels: int) -> None:
+    """Raise Pillow's global decompression-bomb limit to at least ``max_pixels``.
+
+    Pillow warns above the limit and refuses twice that. Call once at
+    startup, before any thread opens images; the limit is never lowered.
+    """
+    current = Image.MAX_IMAGE_PIXELS
+    if current is not None and current < max_pixels:
+        Image.MAX_IMAGE_PIXELS = max_pixels
+
+
+def derivative_prefix(storage_key: str) -> str:
+    return f"{DERIVED_PREFIX}{storage_key}/"
+
+
+def thumbnail_key(storage_key: str, size: int) -> str:
+    return f"{derivative_prefix(storage_key)}thumb-{size}.jpg"
+
+
+def pyramid_key(storage_key: str) -> str:
+    return f"{derivative_prefix(storage_key)}pyramid.json"
+
+
+def tile_key(storage_key: str, level: int, col: int, row: int) -> str:
+    return f"{derivative_prefix(storage_key)}tiles/{level}/{col}_{row}.jpg"
+
+
+def pick_size(requested: int, sizes: Sequence[int]) -> int:
+    """The smallest configured size that is at least ``requested``, else the largest."""
+    ordered = sorted(sizes)
+    return next((size for size in ordered if size >= requested), ordered[-1])
+
+
+@dataclass
+class Rendition:
+    """Encoded derivatives of one image."""
+
+    width: int
+    height: int
+    thumbnails: dict[int, bytes] = field(default_factory=dict)
+    pyramid: dict[str, Any] | None = None
+    # Lazily encoded ``(level, col, row, jpeg)`` tiles; empty without a pyramid.
+    tiles: Iterator[tuple[int, int, int, bytes]] = field(default_factory=lambda: iter(()))
+
+
+def render(
+    data: bytes,
+    sizes: Sequence[int],
+    quality: int = 85,
+    pyramid_min_px: int | None = None,
+    tile_size: int = 512,
+    max_pixels: int = 178_956_970,
+) -> Rendition:
+    """Decode an image once and encode its thumbnails and, if large enough, its pyramid.
+
+    Images whose longer side reaches ``pyramid_min_px`` get a pyramid; pass
+    None to never build one. Without a pyramid JPEG originals are decoded
+    at a reduced scale, which is most of the cost for large photos. Images
+    of more than ``max_pixels`` raise ``UnsupportedImageError``.
+    """
+    try:
+        # Image.open only parses the header; no pixel is decoded before the check.
+        image = Image.open(io.BytesIO(data))
+        width, height = image.size
+        if width * height > max_pixels:
+            raise UnsupportedImageError(
+                f"Image of {width}x{height} pixels exceeds the limit of {max_pixels} pixels"
+            )
+        tiled = pyramid_min_px is not None and max(width, height) >= pyramid_min_px
+        if not tiled:
+            largest = max(sizes)
+            image.draft("RGB", (largest, largest))
+        pixels = _displayable(image)
+    except Image.DecompressionBombError as exc:
+        raise UnsupportedImageError(str(exc)) from exc
+    except (UnidentifiedImageError, OSError) as exc:
+        raise UnsupportedImageError(f"Cannot decode image: {exc}") from exc
+
+    rendition = Rendition(width=width, height=height)
+    # Largest first, each scaled from the previous one rather than the original.
+    current = pixels
+    for size in sorted(set(sizes), reverse=True):
+        current = current.copy()
+        current.thumbnail((size, size), Image.LANCZOS, reducing_gap=3.0)
+        rendition.thumbnails[size] = _jpeg(current, quality)
+    if tiled:
+        rendition.pyramid = pyramid_manifest(width, height, tile_size)
+        rendition.tiles = _tiles(pixels, tile_size, quality)
+    return rendition
+
+
+def pyramid_manifest(width: int, height: int, tile_size: int) -> dict[str, Any]:
+    """Describe the levels of a pyramid over a ``width`` x ``height`` image."""
+    levels = []
+    level = 0
+    while True:
+        levels.append(
+            {
+                "level": level,
+                "width": width,
+                "height": height,
+                "cols": math.ceil(width / tile_size),
+                "rows": math.ceil(height / tile_size),
+            }
+        )
+        if width <= tile_size and height <= tile_size:
+            break
+        # Image.reduce rounds up, so odd sizes keep their last pixel.
+        width, height = math.ceil(width / 2), math.ceil(height / 2)
+        level += 1
+    return {
+        "width": levels[0]["width"],
+        "height": levels[0]["height"],
+        "tile_size": tile_size,
+        "format": "jpeg",
+        "levels": levels,
+    }
+
+
+def _tiles(
+    image: Image.Image,
+    tile_size: int,
+    quality: int,
+) -> Iterator[tuple[int, int, int, bytes]]:
+    level = 0
+    while True:
+        width, height = image.size
+        for row in range(math.ceil(height / tile_size)):
+            for col in range(math.ceil(width / tile_size)):
+                box = (
+                    col * tile_size,
+                    row * tile_size,
+                    min(width, (col + 1) * tile_size),
+                    min(height, (row + 1) * tile_size),
+                )
+                yield level, col, row, _jpeg(image.crop(box), quality)
+        if width <= tile_size and height <= tile_size:
+            return
+        # A 2x2 box filter per level: cheap and good enough for zoomed-out views.
+        image = image.reduce(2)
+        level += 1
+
+
+def _displayable(image: Image.Image) -> Image.Image:
+    if image.mode in _HIGH_DEPTH_MODES:
+        return _stretch_to_8bit(image)
+    if image.mode in ("RGB", "L"):
+        image.load()
+        return image
+    if image.mode in ("RGBA", "LA", "P", "PA"):
+        # Flatten transparency onto white; JPEG has no alpha channel.
+        rgba = image.convert("RGBA")
+        canvas = Image.new("RGB", rgba.size, (255, 255, 255))
+        canvas.paste(rgba, mask=rgba.getchannel("A"))
+        return canvas
+    return image.convert("RGB")
+
+
+def _stretch_to_8bit(image: Image.Image) -> Image.Image:
+    """Map the value range of a high-depth grayscale image linearly onto 0..255."""
+    values = np.asarray(image, dtype=np.float32)
+    low, high = float(values.min()), float(values.max())
+    scale = 255.0 / (high - low) if high > low else 0.0
+    values -= low
+    values *= scale
+    return Image.fromarray(np.rint(values).astype(np.uint8))
+
+
+def _jpeg(image: Image.Image, quality: int) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=quality, optimize=True)
+    return buffer.getvalue()
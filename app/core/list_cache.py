@@ -0,0 +1,60 @@
+# app/core/list_cache.py
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+
+from app.telemetry.metrics import metrics
+
+
+class ListResponseCache:
+    """Short-lived cache of serialized list responses and their ETags, by scope.
+
+    Writes in this process invalidate their scope at once; writes made by
+    other processes show up once the entry's ``ttl_seconds`` run out. A TTL
+    of 0 disables the cache.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[str, bytes, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, scope: str) -> tuple[str, bytes] | None:
+        """The cached ``(etag, body)`` of a scope, if still fresh."""
+        if self._ttl <= 0:
+            return None
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(scope)
+            if entry is None or entry[2] <= now:
+                self._entries.pop(scope, None)
+                metrics.inc("list_cache_misses")
+                return None
+            self._entries.move_to_end(scope)
+        metrics.inc("list_cache_hits")
+        return entry[0], entry[1]
+
+    def put(self, scope: str, etag: str, body: bytes) -> None:
+        if self._ttl <= 0 or self._max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[scope] = (etag, body, self._clock() + self._ttl)
+            self._entries.move_to_end(scope)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, scope: str) -> None:
+        with self._lock:
+            self._entries.pop(scope, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
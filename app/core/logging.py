@@ -1,3 +1,14 @@
+import logging
+
+from app.core.config import settings
+
+
 def setup_logging() -> None:
-    """TODO: Configure logging/structlog."""
-    pass
+    """Configure root logging once; TODO: switch to structlog."""
+    root = logging.getLogger()
+    if root.handlers:
+        return
+    logging.basicConfig(
+        level=settings.log_level.upper(),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
@@ -1,6 +1,45 @@
-from pydantic import BaseModel
+import base64
+import binascii
+import json
+from typing import Any, Generic, TypeVar
+
+from pydantic import BaseModel, Field
+
+T = TypeVar("T")
+
 
 class PaginationParams(BaseModel):
     """Basic pagination params."""
     limit: int = 50
     offset: int = 0
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded or does not apply."""
+
+
+class CursorPage(BaseModel, Generic[T]):
+    """One page of a keyset-paginated listing."""
+    items: list[T]
+    next_cursor: str | None = Field(
+        default=None,
+        description="Opaque cursor for the next page; absent on the last page",
+    )
+
+
+def encode_cursor(position: dict[str, Any]) -> str:
+    """Encode a keyset position as an opaque, URL-safe cursor."""
+    raw = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> dict[str, Any]:
+    """Decode a cursor from ``encode_cursor``; raise ``InvalidCursorError`` if malformed."""
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise InvalidCursorError("Malformed cursor") from exc
+    if not isinstance(position, dict):
+        raise InvalidCursorError("Malformed cursor")
+    return position
@@ -0,0 +1,149 @@
+# app/core/rle.py
+"""Run-length encoding of binary masks, compatible with COCO.
+
+Masks are flattened in column-major (Fortran) order and stored as the
+lengths of alternating runs of zeros and ones, starting with zeros. The
+compact string form is the one ``pycocotools`` uses: each count is stored
+as the difference to the count two places earlier, in 5-bit groups, one
+printable character per group. A 1000x1000 mask of a few blobs takes tens
+of bytes instead of a megabyte.
+"""
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+
+
+class InvalidRLEError(ValueError):
+    """Raised when an RLE does not describe a mask of its declared size."""
+
+
+def encode(mask: np.ndarray) -> dict[str, Any]:
+    """Encode a 2-D mask (any dtype, non-zero = set) as a compact COCO RLE."""
+    if mask.ndim != 2:
+        raise InvalidRLEError("Mask must be two-dimensional")
+    height, width = mask.shape
+    return {"size": [height, width], "counts": compress(mask_counts(mask))}
+
+
+def decode(rle: dict[str, Any]) -> np.ndarray:
+    """Decode an RLE (compact or uncompressed counts) to a uint8 mask."""
+    height, width = _size(rle)
+    counts = np.asarray(counts_of(rle), dtype=np.int64)
+    if counts.sum() != height * width:
+        raise InvalidRLEError("RLE counts do not add up to the mask size")
+    values = np.arange(len(counts), dtype=np.int64) % 2
+    flat = np.repeat(values.astype(np.uint8), counts)
+    return flat.reshape((height, width), order="F")
+
+
+def mask_counts(mask: np.ndarray) -> list[int]:
+    """Run lengths of a mask in column-major order, starting with zeros."""
+    flat = np.asarray(mask, dtype=bool).ravel(order="F")
+    if flat.size == 0:
+        return [0]
+    # Positions where the value changes, plus both ends.
+    edges = np.flatnonzero(flat[1:] != flat[:-1]) + 1
+    bounds = np.concatenate(([0], edges, [flat.size]))
+    counts = np.diff(bounds).tolist()
+    return [0, *counts] if flat[0] else counts
+
+
+def counts_of(rle: dict[str, Any]) -> list[int]:
+    """The integer run lengths of an RLE, whichever form its counts are in."""
+    counts = rle.get("counts")
+    if isinstance(counts, str):
+        return decompress(counts)
+    if isinstance(counts, Sequence) and all(isinstance(c, int) and c >= 0 for c in counts):
+        return list(counts)
+    raise InvalidRLEError("RLE counts must be a string or a list of non-negative integers")
+
+
+def normalize(rle: dict[str, Any]) -> dict[str, Any]:
+    """Validate an RLE and return it in compact form."""
+    height, width = _size(rle)
+    counts = counts_of(rle)
+    if sum(counts) != height * width:
+        raise InvalidRLEError("RLE counts do not add up to the mask size")
+    return {"size": [height, width], "counts": compress(counts)}
+
+
+def area(rle: dict[str, Any]) -> int:
+    """Number of set pixels."""
+    return sum(counts_of(rle)[1::2])
+
+
+def bbox(rle: dict[str, Any]) -> list[float] | None:
+    """``[x, y, width, height]`` of the set pixels, or None for an empty mask."""
+    height, _ = _size(rle)
+    counts = np.asarray(counts_of(rle), dtype=np.int64)
+    ends = np.cumsum(counts)
+    starts = ends - counts
+    # Runs of ones are the odd-indexed ones; skip empty runs.
+    ones = np.arange(len(counts)) % 2 == 1
+    ones &= counts > 0
+    if not ones.any():
+        return None
+    first = starts[ones]
+    last = ends[ones] - 1
+    x0, x1 = int((first // height).min()), int((last // height).max())
+    # A run spanning a column boundary covers every row in between.
+    if (last // height > first // height).any():
+        y0, y1 = 0, height - 1
+    else:
+        y0, y1 = int((first % height).min()), int((last % height).max())
+    return [float(x0), float(y0), float(x1 - x0 + 1), float(y1 - y0 + 1)]
+
+
+def compress(counts: Sequence[int]) -> str:
+    """COCO's compact string form of a list of run lengths."""
+    out = []
+    for index, count in enumerate(counts):
+        value = count - counts[index - 2] if index > 2 else count
+        more = True
+        while more:
+            char = value & 0x1F
+            value >>= 5
+            more = value != -1 if char & 0x10 else value != 0
+            if more:
+                char |= 0x20
+            out.append(chr(char + 48))
+    return "".join(out)
+
+
+def decompress(text: str) -> list[int]:
+    """Inverse of ``compress``."""
+    counts: list[int] = []
+    pos = 0
+    try:
+        while pos < len(text):
+            value = 0
+            shift = 0
+            more = True
+            while more:
+                char = ord(text[pos]) - 48
+                value |= (char & 0x1F) << shift
+                more = bool(char & 0x20)
+                pos += 1
+                shift += 5
+                if not more and char & 0x10:
+                    value |= -1 << shift
+            if len(counts) > 2:
+                value += counts[-2]
+            if value < 0:
+                raise InvalidRLEError("RLE counts must not be negative")
+            counts.append(value)
+    except IndexError as exc:
+        raise InvalidRLEError("Truncated RLE string") from exc
+    return counts
+
+
+def _size(rle: dict[str, Any]) -> tuple[int, int]:
+    size = rle.get("size")
+    if (
+        not isinstance(size, Sequence)
+        or len(size) != 2
+        or not all(isinstance(v, int) and v >= 0 for v in size)
+    ):
+        raise InvalidRLEError("RLE size must be [height, width]")
+    return int(size[0]), int(size[1])
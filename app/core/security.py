@@ -1,7 +1,9 @@
 # app/core/security.py
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional, Tuple
+from typing import Callable, Optional, Tuple, TypeVar
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
@@ -9,8 +11,13 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings  # you already have Settings
+from app.core.token_cache import VerifiedTokenCache
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.bcrypt_rounds,
+)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
@@ -31,6 +38,66 @@ def hash_password(plain_password: str) -> str:
     return pwd_context.hash(plain_password)
 
 
+T = TypeVar("T")
+
+
+class PasswordHasher:
+    """Run bcrypt off the event loop on a small, bounded thread pool.
+
+    bcrypt spends 100+ ms of CPU per call but releases the GIL, so a few
+    threads keep the loop responsive. Calls beyond ``max_pending`` in flight
+    are rejected with 503 instead of queueing without bound.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int) -> None:
+        self._max_workers = max_workers
+        self._max_pending = max_pending
+        self._pending = 0
+        self._executor: ThreadPoolExecutor | None = None
+
+    async def hash(self, plain_password: str) -> str:
+        return await self._run(hash_password, plain_password)
+
+    async def verify_and_update(
+        self,
+        plain_password: str,
+        hashed_password: str,
+    ) -> tuple[bool, str | None]:
+        """Verify a password; also return a new hash if the stored one is outdated."""
+        return await self._run(pwd_context.verify_and_update, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _run(self, func: Callable[..., T], *args: object) -> T:
+        # Only touched from the event loop thread, so no lock is needed.
+        if self._pending >= self._max_pending:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many concurrent authentication requests",
+                headers={"Retry-After": "1"},
+            )
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers,
+                thread_name_prefix="password-hash",
+            )
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self._pending -= 1
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending,
+)
+
+
 def _encode_token(
     auth: AuthUser,
     expires_delta: timedelta,
@@ -70,6 +137,12 @@ def create_refresh_token(auth: AuthUser) -> str:
 
 
 def decode_token(token: str, expected_type: str = "access") -> AuthUser:
+    auth, _ = _decode_verified(token, expected_type)
+    return auth
+
+
+def _decode_verified(token: str, expected_type: str) -> tuple[AuthUser, float]:
+    """Verify a token; return the principal and its expiry as a Unix timestamp."""
     try:
         payload = jwt.decode(
             token,
@@ -96,14 +169,33 @@ def decode_token(token: str, expected_type: str = "access") -> AuthUser:
             detail="Invalid token payload",
         )
 
-    return AuthUser(
+    auth = AuthUser(
         id=user_id,
         tenant_id=payload.get("tenant_id"),
         roles=tuple(payload.get("roles", [])),
         permissions=tuple(payload.get("permissions", [])),
     )
+    # jwt.decode has already rejected expired tokens when "exp" is present.
+    expires_at = payload.get("exp")
+    return auth, float(expires_at) if isinstance(expires_at, (int, float)) else float("inf")
+
+
+access_token_cache: VerifiedTokenCache[AuthUser] = VerifiedTokenCache(
+    max_entries=settings.token_cache_max_entries,
+    ttl_seconds=settings.token_cache_ttl_seconds,
+)
 
 
 def get_current_user(token: str = Depends(oauth2_scheme)) -> AuthUser:
-    """FastAPI dependency: decode Bearer token into AuthUser."""
-    return decode_token(token, expected_type="access")
+    """FastAPI dependency: decode Bearer token into AuthUser.
+
+    Verified access tokens are cached, so repeated requests with the same
+    token skip JWT parsing and signature verification.
+    """
+    cached = access_token_cache.get(token)
+    if cached is not None:
+        return cached
+
+    auth, expires_at = _decode_verified(token, expected_type="access")
+    access_token_cache.put(token, auth, token_expires_at=expires_at, subject=auth.id)
+    return auth
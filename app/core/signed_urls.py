@@ -0,0 +1,81 @@
+# app/core/signed_urls.py
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+
+from app.telemetry.metrics import metrics
+
+
+@dataclass(frozen=True)
+class SignedUrl:
+    url: str
+    expires_at: float  # epoch seconds
+
+    def expires_in(self, now: float | None = None) -> int:
+        """Whole seconds of validity left."""
+        return max(0, int(self.expires_at - (time.time() if now is None else now)))
+
+
+class SignedUrlCache:
+    """Bounded LRU of presigned URLs, handed out again until close to expiry.
+
+    A URL is reused while at least ``1 - reuse_fraction`` of its lifetime
+    is left, so callers always get a reasonable share of what they asked
+    for. Signing costs an HMAC chain per URL; reusing URLs also keeps them
+    stable across page loads, so browsers can cache the downloads.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        reuse_fraction: float,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._max_entries = max_entries
+        self._reuse_fraction = reuse_fraction
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[SignedUrl, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_entries > 0 and self._reuse_fraction > 0
+
+    def get(self, key: Hashable) -> SignedUrl | None:
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                metrics.inc("signed_url_cache_misses")
+                return None
+            signed, reuse_until = entry
+            if reuse_until <= now:
+                del self._entries[key]
+                metrics.inc("signed_url_cache_expirations")
+                metrics.inc("signed_url_cache_misses")
+                return None
+            self._entries.move_to_end(key)
+        metrics.inc("signed_url_cache_hits")
+        return signed
+
+    def put(self, key: Hashable, signed: SignedUrl, signed_at: float) -> None:
+        if not self.enabled:
+            return
+        reuse_until = signed_at + (signed.expires_at - signed_at) * self._reuse_fraction
+        evicted = 0
+        with self._lock:
+            self._entries[key] = (signed, reuse_until)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            size = len(self._entries)
+        if evicted:
+            metrics.inc("signed_url_cache_evictions", evicted)
+        metrics.set_gauge("signed_url_cache_size", size)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,94 @@
+# app/core/token_cache.py
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Generic, TypeVar
+
+from app.telemetry.metrics import metrics
+
+V = TypeVar("V")
+
+
+class VerifiedTokenCache(Generic[V]):
+    """Bounded LRU of verified bearer tokens and their decoded principal.
+
+    Entries are keyed by the SHA-256 digest of the token, so raw tokens are
+    never held in memory, and expire at the token's own ``exp`` or after
+    ``ttl_seconds``, whichever comes first. The TTL bounds how long a
+    revoked token could still be honoured if ``invalidate`` is not called.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[bytes, tuple[V, float, int | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> V | None:
+        key = self._digest(token)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                metrics.inc("token_cache_misses")
+                return None
+            value, expires_at, _ = entry
+            if expires_at <= now:
+                del self._entries[key]
+                metrics.inc("token_cache_expirations")
+                metrics.inc("token_cache_misses")
+                return None
+            self._entries.move_to_end(key)
+        metrics.inc("token_cache_hits")
+        return value
+
+    def put(
+        self,
+        token: str,
+        value: V,
+        token_expires_at: float,
+        subject: int | None = None,
+    ) -> None:
+        if self._max_entries <= 0:
+            return
+        expires_at = min(token_expires_at, self._clock() + self._ttl)
+        key = self._digest(token)
+        evicted = 0
+        with self._lock:
+            self._entries[key] = (value, expires_at, subject)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            size = len(self._entries)
+        if evicted:
+            metrics.inc("token_cache_evictions", evicted)
+        metrics.set_gauge("token_cache_size", size)
+
+    def invalidate(self, token: str) -> None:
+        """Forget one token, e.g. on logout or revocation."""
+        with self._lock:
+            self._entries.pop(self._digest(token), None)
+
+    def invalidate_subject(self, subject: int) -> None:
+        """Forget every cached token issued to ``subject`` (a user id)."""
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry[2] == subject]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
@@ -1,16 +1,91 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
+from typing import Any
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy import create_engine
 from app.core.config import settings
 from app.models.orm.base import Base
-from app.models.orm import project  # noqa: F401  # register model
-from app.models.orm import dataset  # noqa: F401  # register model
 
-engine = create_engine(settings.database_url, echo=False, future=True)
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def _pool_options(url: str) -> dict[str, Any]:
+    """Connection pool settings; SQLite keeps SQLAlchemy's own pool defaults."""
+    options: dict[str, Any] = {
+        "pool_pre_ping": settings.database_pool_pre_ping,
+        "pool_recycle": settings.database_pool_recycle_seconds,
+    }
+    if make_url(url).get_backend_name() != "sqlite":
+        options.update(
+            pool_size=settings.database_pool_size,
+            max_overflow=settings.database_max_overflow,
+            pool_timeout=settings.database_pool_timeout_seconds,
+        )
+    return options
+
+
+def resolve_async_database_url() -> str:
+    """Return the async URL, deriving it from ``database_url`` when unset."""
+    if settings.async_database_url:
+        return settings.async_database_url
+    url = make_url(settings.database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver known for database backend {backend!r}")
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+engine = create_engine(
+    settings.database_url,
+    echo=False,
+    future=True,
+    **_pool_options(settings.database_url),
+)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
-# DEV ONLY: auto-create tables until Alembic is set up
-Base.metadata.create_all(bind=engine)
+
+def init_db() -> None:
+    """DEV ONLY: create missing tables; production schema is managed by Alembic."""
+    from app.models import orm  # noqa: F401  # register every model
+
+    Base.metadata.create_all(bind=engine)
+
+_async_engine: AsyncEngine | None = None
+_async_sessionmaker: async_sessionmaker[AsyncSession] | None = None
+
+
+def get_async_engine() -> AsyncEngine:
+    """Return the process-wide async engine, creating it on first use.
+
+    Created lazily so importing this module does not require the async
+    driver unless an async session is actually requested.
+    """
+    global _async_engine
+    if _async_engine is None:
+        url = resolve_async_database_url()
+        _async_engine = create_async_engine(url, echo=False, **_pool_options(url))
+    return _async_engine
+
+
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        _async_sessionmaker = async_sessionmaker(
+            bind=get_async_engine(),
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    return _async_sessionmaker
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -20,3 +95,19 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI dependency that yields an async DB session."""
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+async def dispose_engines() -> None:
+    """Close pooled connections of both engines."""
+    global _async_engine, _async_sessionmaker
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_sessionmaker = None
+    engine.dispose()
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+from typing import Any
+
+import httpx
+
+from app.core.config import settings
+
+# Statuses worth retrying for idempotent requests.
+RETRYABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class HttpClientManager:
+    """Owns the process-wide ``httpx.AsyncClient`` for outbound API calls.
+
+    One client means one connection pool: keep-alive connections (and HTTP/2
+    when the ``h2`` package is installed) are reused across requests instead
+    of paying a TCP and TLS handshake per call.
+    """
+
+    def __init__(self) -> None:
+        self._client: httpx.AsyncClient | None = None
+
+    def get(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=importlib.util.find_spec("h2") is not None,
+                limits=httpx.Limits(
+                    max_connections=settings.http_max_connections,
+                    max_keepalive_connections=settings.http_max_keepalive_connections,
+                    keepalive_expiry=settings.http_keepalive_expiry_seconds,
+                ),
+                timeout=httpx.Timeout(10.0),
+            )
+        return self._client
+
+    async def close(self) -> None:
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+
+
+http_clients = HttpClientManager()
+
+
+async def request_with_retry(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    *,
+    timeout: float,
+    retries: int,
+    backoff: float,
+    **kwargs: Any,
+) -> httpx.Response:
+    """Send a request, retrying transient failures with exponential backoff.
+
+    Connection failures are always retried because the request never left
+    this process. Read timeouts and 429/5xx gateway statuses are retried only
+    for idempotent methods; an OAuth code exchange must not be replayed.
+    """
+    idempotent = method.upper() in IDEMPOTENT_METHODS
+    attempt = 0
+    while True:
+        try:
+            response = await client.request(method, url, timeout=timeout, **kwargs)
+        except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout):
+            if attempt >= retries:
+                raise
+        except (httpx.ReadTimeout, httpx.RemoteProtocolError):
+            if not idempotent or attempt >= retries:
+                raise
+        else:
+            if (
+                not idempotent
+                or response.status_code not in RETRYABLE_STATUS_CODES
+                or attempt >= retries
+            ):
+                return response
+            await response.aclose()
+
+        await asyncio.sleep(backoff * (2**attempt))
+        attempt += 1
@@ -0,0 +1,33 @@
+from pathlib import Path
+
+from sqlalchemy.engine import Engine
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+def expected_heads() -> set[str]:
+    """Return the head revisions of the Alembic scripts shipped with the app."""
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    return set(ScriptDirectory.from_config(Config(str(ALEMBIC_INI))).get_heads())
+
+
+def current_heads(engine: Engine) -> set[str]:
+    """Return the revisions recorded in the database's alembic_version table."""
+    from alembic.runtime.migration import MigrationContext
+
+    with engine.connect() as connection:
+        return set(MigrationContext.configure(connection).get_current_heads())
+
+
+def verify_schema_revision(engine: Engine) -> None:
+    """Raise ``RuntimeError`` unless the database is migrated to the latest revision."""
+    expected = expected_heads()
+    current = current_heads(engine)
+    if current != expected:
+        raise RuntimeError(
+            "Database schema is not at the expected revision "
+            f"(database: {sorted(current) or 'none'}, code: {sorted(expected)}); "
+            "run `alembic upgrade head`."
+        )
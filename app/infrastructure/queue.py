@@ -0,0 +1,117 @@
+"""Job brokers: wake idle workers when new jobs are queued.
+
+The jobs table stays the source of truth (see ``JobRepository.claim_next``);
+a broker only carries "there may be work" signals so workers need not poll
+the database in a tight loop. Without a broker signal, workers still find
+jobs by polling every ``job_poll_interval_seconds``.
+
+Brokers also publish job status events for ``app.services.job_events``.
+"""
+from __future__ import annotations
+
+import json
+import threading
+from typing import Any, Protocol
+
+from app.core.config import settings
+
+JOB_EVENTS_CHANNEL = "mlv1sion:jobs:events"
+
+
+class JobBroker(Protocol):
+    def notify(self, job_id: int, priority: int = 0) -> None:
+        """Announce that ``job_id`` was queued."""
+
+    def wait(self, timeout: float) -> bool:
+        """Block up to ``timeout`` seconds for an announcement; True if one arrived."""
+
+    def publish(self, event: dict[str, Any]) -> None:
+        """Publish a job status event to API processes."""
+
+    def close(self) -> None:
+        """Release broker resources."""
+
+
+class LocalJobBroker:
+    """In-process broker for development, tests and single-process deployments."""
+
+    def __init__(self) -> None:
+        self._pending = 0
+        self._cond = threading.Condition()
+
+    def notify(self, job_id: int, priority: int = 0) -> None:
+        with self._cond:
+            self._pending += 1
+            self._cond.notify()
+
+    def wait(self, timeout: float) -> bool:
+        with self._cond:
+            if not self._pending:
+                self._cond.wait(timeout)
+            if self._pending:
+                self._pending -= 1
+                return True
+            return False
+
+    def publish(self, event: dict[str, Any]) -> None:
+        # Other processes cannot be reached; the event hub polls the table.
+        pass
+
+    def close(self) -> None:
+        with self._cond:
+            self._cond.notify_all()
+
+
+class RedisJobBroker:
+    """Broker backed by a Redis list; works across processes and hosts."""
+
+    def __init__(self, url: str, key: str = "mlv1sion:jobs:wakeup") -> None:
+        import redis  # optional dependency, only needed with JOB_BROKER=redis
+
+        self._redis = redis.Redis.from_url(url)
+        self._key = key
+
+    def notify(self, job_id: int, priority: int = 0) -> None:
+        self._redis.lpush(self._key, job_id)
+
+    def wait(self, timeout: float) -> bool:
+        # BRPOP takes whole seconds; 0 would block forever.
+        return self._redis.brpop([self._key], timeout=max(1, round(timeout))) is not None
+
+    def publish(self, event: dict[str, Any]) -> None:
+        self._redis.publish(JOB_EVENTS_CHANNEL, json.dumps(event))
+
+    def close(self) -> None:
+        self._redis.close()
+
+
+def create_job_broker() -> JobBroker:
+    """Build the broker selected by ``JOB_BROKER``."""
+    if settings.job_broker == "redis":
+        if not settings.redis_url:
+            raise ValueError("JOB_BROKER=redis requires REDIS_URL")
+        return RedisJobBroker(settings.redis_url)
+    if settings.job_broker == "local":
+        return LocalJobBroker()
+    raise ValueError(f"Unknown job broker {settings.job_broker!r}")
+
+
+_broker: JobBroker | None = None
+_broker_lock = threading.Lock()
+
+
+def get_job_broker() -> JobBroker:
+    """Return the process-wide broker, creating it on first use."""
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = create_job_broker()
+        return _broker
+
+
+def close_job_broker() -> None:
+    global _broker
+    with _broker_lock:
+        broker, _broker = _broker, None
+    if broker is not None:
+        broker.close()
@@ -1,12 +1,29 @@
 from __future__ import annotations
 
-from typing import Final
+import base64
+import hashlib
+import io
+import logging
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Final
 from urllib.parse import urlparse
 
 import boto3
 from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
 
 from app.core.config import settings
+from app.core.signed_urls import SignedUrl, SignedUrlCache
+
+logger = logging.getLogger(__name__)
+
+# S3 limits for multipart uploads.
+MIN_PART_NUMBER: Final = 1
+MAX_PART_NUMBER: Final = 10_000
+MIN_PART_SIZE: Final = 5 * 1024 * 1024
 
 
 class StorageClient:
@@ -20,6 +37,7 @@ class StorageClient:
         bucket: str | None = None,
         region: str | None = None,
         use_ssl: bool | None = None,
+        client: Any | None = None,
     ):
         self.endpoint: Final[str | None] = endpoint or settings.minio_endpoint
         self.access_key: Final[str | None] = access_key or settings.minio_access_key
@@ -42,31 +60,539 @@ class StorageClient:
             joined = ", ".join(missing)
             raise ValueError(f"Storage configuration is incomplete; missing: {joined}")
 
-        self._client = boto3.client(
+        self._client = client if client is not None else self._create_client()
+        self._read_urls = SignedUrlCache(
+            max_entries=settings.presign_cache_max_entries,
+            reuse_fraction=settings.presign_cache_reuse_fraction,
+        )
+
+    def _create_client(self) -> Any:
+        # A private session per client: the default boto3 session is not
+        # thread-safe, while the resulting client is.
+        session = boto3.session.Session()
+        return session.client(
             "s3",
             endpoint_url=self._build_endpoint_url(self.endpoint, self.use_ssl),
             aws_access_key_id=self.access_key,
             aws_secret_access_key=self.secret_key,
             region_name=self.region,
-            config=Config(signature_version="s3v4", s3={"addressing_style": "path"}),
+            config=Config(
+                signature_version="s3v4",
+                s3={"addressing_style": "path"},
+                max_pool_connections=settings.minio_max_pool_connections,
+                connect_timeout=settings.minio_connect_timeout_seconds,
+                read_timeout=settings.minio_read_timeout_seconds,
+                retries={"max_attempts": settings.minio_max_attempts, "mode": "standard"},
+                tcp_keepalive=True,
+            ),
             use_ssl=self.use_ssl,
         )
 
-    def presign_url(self, key: str, expires_in: int = 3600) -> str:
-        """Return a presigned PUT URL for uploading an object."""
+    def presign_url(
+        self,
+        key: str,
+        expires_in: int = 3600,
+        checksum_sha256: str | None = None,
+    ) -> str:
+        """Return a presigned PUT URL for uploading an object.
+
+        With ``checksum_sha256`` (hex) the store only accepts a body with that
+        digest; the client must send it base64-encoded in the
+        ``x-amz-checksum-sha256`` header.
+        """
         if not key:
             raise ValueError("Object key must be provided.")
+        params: dict[str, Any] = {"Bucket": self.bucket, "Key": key}
+        if checksum_sha256:
+            params["ChecksumSHA256"] = base64.b64encode(bytes.fromhex(checksum_sha256)).decode()
         return self._client.generate_presigned_url(
             ClientMethod="put_object",
-            Params={"Bucket": self.bucket, "Key": key},
+            Params=params,
             ExpiresIn=expires_in,
         )
 
+    def presign_get_url(self, key: str, expires_in: int = 3600) -> str:
+        """Return a presigned GET URL for reading an object."""
+        return self.presign_get(key, expires_in).url
+
+    def presign_get(self, key: str, expires_in: int = 3600) -> SignedUrl:
+        """Presign a GET, reusing an earlier URL for the same key and lifetime.
+
+        A reused URL has at least ``1 - presign_cache_reuse_fraction`` of
+        ``expires_in`` left; ``expires_at`` says exactly how much.
+        """
+        if not key:
+            raise ValueError("Object key must be provided.")
+        cache_key = (key, expires_in)
+        cached = self._read_urls.get(cache_key)
+        if cached is not None:
+            return cached
+        signed_at = time.time()
+        signed = SignedUrl(
+            url=self._client.generate_presigned_url(
+                ClientMethod="get_object",
+                Params={"Bucket": self.bucket, "Key": key},
+                ExpiresIn=expires_in,
+            ),
+            expires_at=signed_at + expires_in,
+        )
+        self._read_urls.put(cache_key, signed, signed_at)
+        return signed
+
+    def get_object(self, key: str) -> bytes:
+        """Download an object into memory."""
+        response = self._call("get_object", Bucket=self.bucket, Key=key)
+        body = response["Body"]
+        try:
+            return body.read()
+        except BotoCoreError as exc:
+            raise StorageError(f"get_object failed: {exc}") from exc
+        finally:
+            body.close()
+
+    def open_object(self, key: str) -> Any:
+        """Open an object for sequential reading; close the returned stream when done."""
+        return self._call("get_object", Bucket=self.bucket, Key=key)["Body"]
+
+    def open_ranged(self, key: str, buffer_size: int = 1024 * 1024) -> io.BufferedReader:
+        """Open an object as a seekable file served by ranged GETs.
+
+        Suits formats that need random access, such as the central directory
+        at the end of a zip file, without downloading the whole object.
+        """
+        raw = RangedObjectReader(self, key, self.object_size(key))
+        return io.BufferedReader(raw, buffer_size=buffer_size)
+
+    def object_size(self, key: str) -> int:
+        """Size of an object in bytes."""
+        return int(self._call("head_object", Bucket=self.bucket, Key=key)["ContentLength"])
+
+    def object_exists(self, key: str) -> bool:
+        """Whether an object exists; costs one HEAD request."""
+        try:
+            self.object_size(key)
+        except ValueError:
+            return False
+        return True
+
+    def get_object_range(self, key: str, start: int, length: int) -> bytes:
+        """Download ``length`` bytes of an object starting at ``start``."""
+        if length <= 0:
+            return b""
+        response = self._call(
+            "get_object",
+            Bucket=self.bucket,
+            Key=key,
+            Range=f"bytes={start}-{start + length - 1}",
+        )
+        body = response["Body"]
+        try:
+            return body.read()
+        except BotoCoreError as exc:
+            raise StorageError(f"get_object failed: {exc}") from exc
+        finally:
+            body.close()
+
+    def put_object(self, key: str, data: bytes, content_type: str | None = None) -> str | None:
+        """Upload a small object in one request; return its ETag."""
+        if not key:
+            raise ValueError("Object key must be provided.")
+        params: dict[str, Any] = {"Bucket": self.bucket, "Key": key, "Body": data}
+        if content_type:
+            params["ContentType"] = content_type
+        return self._call("put_object", **params).get("ETag")
+
+    def copy_object(self, source_key: str, key: str) -> None:
+        """Copy an object within the bucket, server-side."""
+        self._call(
+            "copy_object",
+            Bucket=self.bucket,
+            Key=key,
+            CopySource={"Bucket": self.bucket, "Key": source_key},
+        )
+
+    def delete_object(self, key: str) -> None:
+        """Delete an object; deleting a missing key is not an error."""
+        self._call("delete_object", Bucket=self.bucket, Key=key)
+
+    def create_multipart_upload(self, key: str, content_type: str | None = None) -> str:
+        """Start a multipart upload and return its upload id."""
+        if not key:
+            raise ValueError("Object key must be provided.")
+        params: dict[str, Any] = {"Bucket": self.bucket, "Key": key}
+        if content_type:
+            params["ContentType"] = content_type
+        response = self._call("create_multipart_upload", **params)
+        return response["UploadId"]
+
+    def presign_part_urls(
+        self,
+        key: str,
+        upload_id: str,
+        part_numbers: Iterable[int],
+        expires_in: int = 3600,
+    ) -> list[tuple[int, str]]:
+        """Return ``(part_number, url)`` pairs for uploading parts with PUT."""
+        urls = []
+        for part_number in part_numbers:
+            if not MIN_PART_NUMBER <= part_number <= MAX_PART_NUMBER:
+                raise ValueError(
+                    f"Part number must be between {MIN_PART_NUMBER} and {MAX_PART_NUMBER}."
+                )
+            url = self._client.generate_presigned_url(
+                ClientMethod="upload_part",
+                Params={
+                    "Bucket": self.bucket,
+                    "Key": key,
+                    "UploadId": upload_id,
+                    "PartNumber": part_number,
+                },
+                ExpiresIn=expires_in,
+            )
+            urls.append((part_number, url))
+        return urls
+
+    def upload_part(self, key: str, upload_id: str, part_number: int, data: bytes) -> str:
+        """Upload one part of a multipart upload; return its ETag."""
+        if not MIN_PART_NUMBER <= part_number <= MAX_PART_NUMBER:
+            raise ValueError(
+                f"Part number must be between {MIN_PART_NUMBER} and {MAX_PART_NUMBER}."
+            )
+        response = self._call(
+            "upload_part",
+            Bucket=self.bucket,
+            Key=key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=data,
+        )
+        return response["ETag"]
+
+    def complete_multipart_upload(
+        self,
+        key: str,
+        upload_id: str,
+        parts: Iterable[tuple[int, str]],
+    ) -> str | None:
+        """Assemble uploaded ``(part_number, etag)`` parts; return the object ETag."""
+        ordered = sorted(parts)
+        if not ordered:
+            raise ValueError("At least one part is required to complete an upload.")
+        response = self._call(
+            "complete_multipart_upload",
+            Bucket=self.bucket,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={
+                "Parts": [
+                    {"PartNumber": number, "ETag": etag} for number, etag in ordered
+                ]
+            },
+        )
+        return response.get("ETag")
+
+    def abort_multipart_upload(self, key: str, upload_id: str) -> None:
+        """Abort a multipart upload and discard its parts."""
+        self._call("abort_multipart_upload", Bucket=self.bucket, Key=key, UploadId=upload_id)
+
+    def list_parts(self, key: str, upload_id: str) -> list[dict[str, Any]]:
+        """Return the parts already stored for an upload, following pagination."""
+        parts: list[dict[str, Any]] = []
+        marker = 0
+        while True:
+            response = self._call(
+                "list_parts",
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                PartNumberMarker=marker,
+            )
+            parts.extend(
+                {
+                    "part_number": part["PartNumber"],
+                    "etag": part["ETag"],
+                    "size": part["Size"],
+                }
+                for part in response.get("Parts", [])
+            )
+            if not response.get("IsTruncated"):
+                return parts
+            marker = response["NextPartNumberMarker"]
+
+    def _call(self, operation: str, **params: Any) -> dict[str, Any]:
+        """Invoke a client operation, translating botocore failures."""
+        try:
+            return getattr(self._client, operation)(**params)
+        except ClientError as exc:
+            code = exc.response.get("Error", {}).get("Code", "")
+            if code in ("NoSuchUpload", "NoSuchKey", "404"):
+                raise ValueError(f"{operation}: {code}") from exc
+            raise StorageError(f"{operation} failed: {exc}") from exc
+        except BotoCoreError as exc:
+            raise StorageError(f"{operation} failed: {exc}") from exc
+
+    def check_health(self) -> None:
+        """Raise ``StorageError`` if the bucket cannot be reached."""
+        try:
+            self._client.head_bucket(Bucket=self.bucket)
+        except (BotoCoreError, ClientError) as exc:
+            raise StorageError(f"Bucket {self.bucket!r} is not reachable: {exc}") from exc
+
+    def close(self) -> None:
+        """Release pooled HTTP connections."""
+        close = getattr(self._client, "close", None)
+        if close is not None:
+            close()
+
     @staticmethod
     def _build_endpoint_url(endpoint: str, use_ssl: bool) -> str:
         """Ensure endpoint has scheme."""
-        parsed = urlparse(endpoint)
-        if parsed.scheme:
+        # urlparse("localhost:9000") reports "localhost" as the scheme, so look
+        # for an explicit "://" instead.
+        if "://" in endpoint and urlparse(endpoint).netloc:
             return endpoint
         scheme = "https" if use_ssl else "http"
         return f"{scheme}://{endpoint}"
+
+
+class StorageError(RuntimeError):
+    """Raised when the object store rejects or cannot serve a request."""
+
+
+class RangedObjectReader(io.RawIOBase):
+    """Seekable raw reader over an object, one ranged GET per read."""
+
+    def __init__(self, storage: StorageClient, key: str, size: int) -> None:
+        super().__init__()
+        self.storage = storage
+        self.key = key
+        self.size = size
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError("Negative seek position")
+        self._position = position
+        return position
+
+    def readinto(self, buffer: Any) -> int:
+        length = min(len(buffer), self.size - self._position)
+        if length <= 0:
+            return 0
+        data = self.storage.get_object_range(self.key, self._position, length)
+        buffer[: len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+
+class MultipartWriter:
+    """Write-only file object that streams into a multipart upload.
+
+    Bytes are buffered until a part of ``part_size`` is full; full parts are
+    uploaded on a background thread while the caller keeps writing, with at
+    most ``max_in_flight`` parts pending, so memory stays around
+    ``(max_in_flight + 1) * part_size`` however large the object gets.
+    ``close`` uploads the tail and completes the upload; leaving a ``with``
+    block on an exception aborts it instead.
+    """
+
+    def __init__(
+        self,
+        storage: StorageClient,
+        key: str,
+        content_type: str | None = None,
+        part_size: int = 16 * 1024 * 1024,
+        max_in_flight: int = 2,
+    ) -> None:
+        if part_size < MIN_PART_SIZE:
+            raise ValueError(f"Part size must be at least {MIN_PART_SIZE} bytes.")
+        self.storage = storage
+        self.key = key
+        self.part_size = part_size
+        self.bytes_written = 0
+        self.etag: str | None = None
+        self.closed = False
+        self._buffer = bytearray()
+        self._parts: list[Future[tuple[int, str]]] = []
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_in_flight,
+            thread_name_prefix="multipart",
+        )
+        self.upload_id = storage.create_multipart_upload(key, content_type=content_type)
+
+    def writable(self) -> bool:
+        return True
+
+    def flush(self) -> None:
+        pass
+
+    def write(self, data: Any) -> int:
+        if self.closed:
+            raise ValueError("Write to a closed MultipartWriter.")
+        view = memoryview(data).cast("B")
+        self._buffer += view
+        self.bytes_written += len(view)
+        while len(self._buffer) >= self.part_size:
+            part = bytes(self._buffer[: self.part_size])
+            del self._buffer[: self.part_size]
+            self._submit(part)
+        return len(view)
+
+    def close(self) -> None:
+        """Upload the remaining bytes and complete the upload."""
+        if self.closed:
+            return
+        try:
+            if self._buffer or not self._parts:
+                self._submit(bytes(self._buffer))
+                self._buffer.clear()
+            parts = [future.result() for future in self._parts]
+            self.etag = self.storage.complete_multipart_upload(self.key, self.upload_id, parts)
+        except BaseException:
+            self.abort()
+            raise
+        finally:
+            self._executor.shutdown(wait=True)
+            self.closed = True
+
+    def abort(self) -> None:
+        """Discard everything written so far."""
+        if self.closed:
+            return
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._buffer.clear()
+        try:
+            self.storage.abort_multipart_upload(self.key, self.upload_id)
+        except (StorageError, ValueError):
+            logger.warning("Could not abort multipart upload of %s", self.key, exc_info=True)
+        self.closed = True
+
+    def __enter__(self) -> MultipartWriter:
+        return self
+
+    def __exit__(self, exc_type: Any, *exc_info: Any) -> None:
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+    def _submit(self, data: bytes) -> None:
+        part_number = len(self._parts) + 1
+        # Fail fast instead of buffering more data after an upload failed.
+        for future in self._parts:
+            if future.done() and future.exception() is not None:
+                future.result()
+        self._slots.acquire()
+        future = self._executor.submit(self._upload, part_number, data)
+        future.add_done_callback(lambda _: self._slots.release())
+        self._parts.append(future)
+
+    def _upload(self, part_number: int, data: bytes) -> tuple[int, str]:
+        return part_number, self.storage.upload_part(self.key, self.upload_id, part_number, data)
+
+
+class StorageClientRegistry:
+    """Process-wide cache of ``StorageClient`` instances.
+
+    Building a boto3 client loads botocore service models and an endpoint
+    resolver, which is far too expensive to repeat per request. Clients are
+    keyed by endpoint, bucket, region and credentials and shared across
+    requests and threads until ``close`` is called on shutdown.
+    """
+
+    def __init__(self) -> None:
+        self._clients: dict[tuple[str | None, ...], StorageClient] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        endpoint: str | None = None,
+        access_key: str | None = None,
+        secret_key: str | None = None,
+        bucket: str | None = None,
+        region: str | None = None,
+        use_ssl: bool | None = None,
+    ) -> StorageClient:
+        """Return the shared client for the given (or configured) settings."""
+        key = self._key(endpoint, access_key, secret_key, bucket, region, use_ssl)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = StorageClient(
+                    endpoint=endpoint,
+                    access_key=access_key,
+                    secret_key=secret_key,
+                    bucket=bucket,
+                    region=region,
+                    use_ssl=use_ssl,
+                )
+                self._clients[key] = client
+        return client
+
+    def close(self) -> None:
+        """Close and forget every cached client."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            client.close()
+
+    @staticmethod
+    def _key(
+        endpoint: str | None,
+        access_key: str | None,
+        secret_key: str | None,
+        bucket: str | None,
+        region: str | None,
+        use_ssl: bool | None,
+    ) -> tuple[str | None, ...]:
+        secret = secret_key or settings.minio_secret_key
+        # Keep the raw secret out of the dictionary key.
+        secret_digest = hashlib.sha256(secret.encode()).hexdigest() if secret else None
+        return (
+            endpoint or settings.minio_endpoint,
+            access_key or settings.minio_access_key,
+            secret_digest,
+            bucket or settings.minio_bucket,
+            region or settings.minio_region,
+            str(settings.minio_use_ssl if use_ssl is None else use_ssl),
+        )
+
+
+storage_registry = StorageClientRegistry()
+
+
+def probe_storage() -> bool:
+    """Check that the configured bucket is reachable; log and return the outcome."""
+    try:
+        storage_registry.get().check_health()
+    except ValueError as exc:
+        logger.info("Object storage is not configured: %s", exc)
+        return False
+    except StorageError as exc:
+        logger.warning("Object storage health probe failed: %s", exc)
+        return False
+    logger.info("Object storage bucket %r is reachable", settings.minio_bucket)
+    return True
@@ -1,11 +1,103 @@
 # app/main.py
+import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
+
 from app.api.v1.router import api_v1_router
 from app.api import google_oauth
+from app.core.config import settings
+from app.core.logging import setup_logging
+from app.core.security import password_hasher
+from app.infrastructure.db import dispose_engines, engine, init_db
+from app.infrastructure.http import http_clients
+from app.infrastructure.queue import close_job_broker
+from app.infrastructure.storage import probe_storage, storage_registry
+from app.services.ingest_service import asset_ingest_queue
+from app.services.job_events import job_event_hub
+
+_IMPORT_STARTED = time.perf_counter()
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimer:
+    """Time named startup steps and report them against the configured budget."""
+
+    def __init__(self, started: float) -> None:
+        self._started = started
+        self._steps: list[tuple[str, float]] = []
+
+    @asynccontextmanager
+    async def step(self, name: str) -> AsyncIterator[None]:
+        began = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._steps.append((name, (time.perf_counter() - began) * 1000))
+
+    def report(self) -> float:
+        total_ms = (time.perf_counter() - self._started) * 1000
+        breakdown = ", ".join(f"{name}={ms:.0f}ms" for name, ms in self._steps)
+        budget_ms = settings.startup_time_budget_ms
+        if total_ms > budget_ms:
+            logger.warning(
+                "Startup took %.0f ms, over the %.0f ms budget (%s)",
+                total_ms,
+                budget_ms,
+                breakdown,
+            )
+        else:
+            logger.info("Startup took %.0f ms (%s)", total_ms, breakdown)
+        return total_ms
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    timer = StartupTimer(_IMPORT_STARTED)
+
+    # Schema side effects are opt-in: production leaves DDL to Alembic and
+    # only checks the recorded revision, once per worker.
+    if settings.db_auto_create:
+        async with timer.step("create_all"):
+            await run_in_threadpool(init_db)
+    if settings.verify_schema_on_startup:
+        from app.infrastructure.migrations import verify_schema_revision
+
+        async with timer.step("verify_schema"):
+            await run_in_threadpool(verify_schema_revision, engine)
+    if settings.seed_demo_data:
+        from app.cli.dev import create_demo_data
+
+        async with timer.step("seed_demo_data"):
+            await run_in_threadpool(create_demo_data)
+
+    if settings.minio_probe_on_startup:
+        # Build the shared S3 client once and check the bucket is reachable.
+        async with timer.step("storage_probe"):
+            await run_in_threadpool(probe_storage)
+    http_clients.get()
+    await asset_ingest_queue.start()
+
+    app.state.startup_ms = timer.report()
+    try:
+        yield
+    finally:
+        await asset_ingest_queue.stop()
+        await job_event_hub.close()
+        close_job_broker()
+        await http_clients.close()
+        password_hasher.shutdown()
+        storage_registry.close()
+        await dispose_engines()
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="mlv1sion API")
+    setup_logging()
+    app = FastAPI(title="mlv1sion API", lifespan=lifespan)
     # TODO: add middleware, exception handlers, etc.
     app.include_router(api_v1_router, prefix="/api/v1")
     app.include_router(google_oauth.router)
@@ -13,42 +105,3 @@ def create_app() -> FastAPI:
 
 
 app = create_app()
-
-
-@app.on_event("startup")
-def create_demo_data():
-    from app.infrastructure.db import SessionLocal
-    from app.models.orm.project import Project
-    from app.models.orm.dataset import Dataset
-
-    db = SessionLocal()
-    try:
-        project = db.query(Project).first()
-        if project is None:
-            project = Project(
-                name="Demo project",
-                description="Automatically created",
-            )
-            db.add(project)
-            db.commit()
-            db.refresh(project)
-
-        # only create datasets if none exist
-        if not db.query(Dataset).filter(Dataset.project_id == project.id).first():
-            db.add_all(
-                [
-                    Dataset(
-                        project_id=project.id,
-                        name="Demo dataset 1",
-                        description="First demo dataset",
-                    ),
-                    Dataset(
-                        project_id=project.id,
-                        name="Demo dataset 2",
-                        description="Second demo dataset",
-                    ),
-                ]
-            )
-            db.commit()
-    finally:
-        db.close()
@@ -0,0 +1,2 @@
+"""Image preprocessing shared by inference and training workers."""
+__all__: list[str] = []
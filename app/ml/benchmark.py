@@ -0,0 +1,130 @@
+"""Compare the preprocessing pipeline with a naive per-image PIL loop.
+
+Run with ``python -m app.ml.benchmark --images 512 --source 1280x960``.
+Synthetic JPEGs are generated in memory, so only decode and preprocessing
+are measured.
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import time
+from collections.abc import Callable
+
+import numpy as np
+from PIL import Image
+
+from app.ml.preprocessing import BatchBuffer, PreprocessConfig, PreprocessPool
+
+
+def make_jpegs(count: int, width: int, height: int, seed: int = 0) -> list[bytes]:
+    """Encode ``count`` noisy gradient images as JPEG."""
+    rng = np.random.default_rng(seed)
+    gradient = np.linspace(0, 255, width, dtype=np.float32)[None, :, None]
+    images = []
+    for _ in range(count):
+        noise = rng.normal(0, 20, size=(height, width, 3)).astype(np.float32)
+        pixels = np.clip(gradient + noise, 0, 255).astype(np.uint8)
+        buffer = io.BytesIO()
+        Image.fromarray(pixels).save(buffer, format="JPEG", quality=90)
+        images.append(buffer.getvalue())
+    return images
+
+
+def naive(images: list[bytes], config: PreprocessConfig, batch_size: int) -> int:
+    """Per-image PIL decode, float conversion and normalization, then np.stack."""
+    height, width = config.size
+    mean = np.asarray(config.mean, dtype=np.float32)
+    std = np.asarray(config.std, dtype=np.float32)
+    batches = 0
+    for start in range(0, len(images), batch_size):
+        arrays = []
+        for data in images[start : start + batch_size]:
+            image = Image.open(io.BytesIO(data)).convert("RGB").resize((width, height))
+            array = np.array(image).astype(np.float32) / 255.0
+            array = (array - mean) / std
+            arrays.append(array.transpose(2, 0, 1))
+        np.stack(arrays)
+        batches += 1
+    return batches
+
+
+def pipeline(
+    images: list[bytes],
+    config: PreprocessConfig,
+    batch_size: int,
+    pool: PreprocessPool | None,
+) -> int:
+    """Pooled decode into a reused BatchBuffer, vectorized normalization."""
+    from app.ml.preprocessing import decode_image
+
+    buffer = BatchBuffer(config, capacity=batch_size)
+    decoded = pool.map(images) if pool is not None else (decode_image(d, config) for d in images)
+    batches = row = 0
+    for image, _ in decoded:
+        buffer.put(row, image)
+        row += 1
+        if row == batch_size:
+            buffer.tensor(row)
+            batches, row = batches + 1, 0
+    if row:
+        buffer.tensor(row)
+        batches += 1
+    return batches
+
+
+def _time(name: str, count: int, run: Callable[[], int]) -> float:
+    began = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - began
+    rate = count / elapsed
+    print(f"{name:<28} {elapsed:8.3f} s  {rate:9.1f} images/s")
+    return rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.ml.benchmark")
+    parser.add_argument("--images", type=int, default=256)
+    parser.add_argument("--source", default="1280x960", help="Source WIDTHxHEIGHT")
+    parser.add_argument("--target", default="224x224", help="Model input WIDTHxHEIGHT")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--letterbox", action="store_true")
+    args = parser.parse_args()
+
+    src_w, src_h = (int(v) for v in args.source.lower().split("x"))
+    dst_w, dst_h = (int(v) for v in args.target.lower().split("x"))
+    config = PreprocessConfig(
+        size=(dst_h, dst_w),
+        mode="letterbox" if args.letterbox else "resize",
+    )
+    images = make_jpegs(args.images, src_w, src_h)
+    print(f"{len(images)} JPEGs {src_w}x{src_h} -> {dst_w}x{dst_h}, batch {args.batch_size}")
+
+    baseline = _time("naive PIL loop", len(images), lambda: naive(images, config, args.batch_size))
+    results = {
+        "pipeline, inline": _time(
+            "pipeline, inline",
+            len(images),
+            lambda: pipeline(images, config, args.batch_size, None),
+        )
+    }
+    with PreprocessPool(config, processes=args.processes, use_threads=True) as pool:
+        results["pipeline, threads"] = _time(
+            "pipeline, threads",
+            len(images),
+            lambda: pipeline(images, config, args.batch_size, pool),
+        )
+    with PreprocessPool(config, processes=args.processes) as pool:
+        pool.decode(images[0])  # start the worker processes outside the timing
+        results["pipeline, processes"] = _time(
+            "pipeline, processes",
+            len(images),
+            lambda: pipeline(images, config, args.batch_size, pool),
+        )
+    for name, rate in results.items():
+        print(f"{name:<28} {rate / baseline:6.2f}x naive")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""Decode → resize/letterbox → normalize → NCHW float32 batches.
+
+Decoding and resizing happen per image, in threads or worker processes
+(``PreprocessPool``); everything after that is done once per batch with
+vectorized NumPy into buffers that are allocated once and reused
+(``BatchBuffer``). Normalization folds ``/255``, ``-mean`` and ``/std``
+into a single multiply-add per element.
+
+Typical use::
+
+    config = PreprocessConfig(size=(224, 224))
+    buffer = BatchBuffer(config, capacity=32)
+    with PreprocessPool(config, processes=4) as pool:
+        for row, (image, _) in enumerate(pool.map(encoded_images)):
+            buffer.put(row, image)
+        tensor = buffer.tensor(len(encoded_images))
+"""
+from __future__ import annotations
+
+import io
+import multiprocessing
+import os
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Literal
+
+import numpy as np
+from PIL import Image
+
+IMAGENET_MEAN = (0.485, 0.456, 0.406)
+IMAGENET_STD = (0.229, 0.224, 0.225)
+
+ResizeMode = Literal["resize", "letterbox"]
+
+
+@dataclass(frozen=True)
+class PreprocessConfig:
+    size: tuple[int, int] = (224, 224)  # height, width
+    mode: ResizeMode = "resize"
+    mean: tuple[float, float, float] = IMAGENET_MEAN
+    std: tuple[float, float, float] = IMAGENET_STD
+    pad_value: int = 114
+    resample: int = Image.BILINEAR
+
+
+@dataclass(frozen=True)
+class ImageMeta:
+    """How an image was mapped into the model input, to map outputs back."""
+
+    width: int
+    height: int
+    scale_x: float
+    scale_y: float
+    pad_x: int = 0
+    pad_y: int = 0
+
+
+def decode_image(data: bytes, config: PreprocessConfig) -> tuple[np.ndarray, ImageMeta]:
+    """Decode an encoded image to an RGB uint8 HWC array of ``config.size``."""
+    height, width = config.size
+    with Image.open(io.BytesIO(data)) as image:
+        orig_w, orig_h = image.size
+        if config.mode == "letterbox":
+            scale = min(width / orig_w, height / orig_h)
+            target = (max(1, round(orig_w * scale)), max(1, round(orig_h * scale)))
+        else:
+            target = (width, height)
+        # Let the JPEG decoder downscale by a power of two while decoding.
+        image.draft("RGB", target)
+        rgb = image.convert("RGB")
+    if rgb.size != target:
+        rgb = rgb.resize(target, config.resample)
+    pixels = np.asarray(rgb, dtype=np.uint8)
+
+    if config.mode != "letterbox":
+        meta = ImageMeta(orig_w, orig_h, width / orig_w, height / orig_h)
+        return pixels, meta
+    canvas = np.full((height, width, 3), config.pad_value, dtype=np.uint8)
+    pad_x = (width - target[0]) // 2
+    pad_y = (height - target[1]) // 2
+    canvas[pad_y : pad_y + target[1], pad_x : pad_x + target[0]] = pixels
+    meta = ImageMeta(orig_w, orig_h, scale, scale, pad_x, pad_y)
+    return canvas, meta
+
+
+class BatchBuffer:
+    """Preallocated staging (uint8 NHWC) and output (float32 NCHW) buffers.
+
+    ``tensor`` returns a view into the output buffer that is overwritten by
+    the next call; copy it if it has to outlive the batch.
+    """
+
+    def __init__(self, config: PreprocessConfig, capacity: int) -> None:
+        height, width = config.size
+        self.capacity = capacity
+        self.images = np.empty((capacity, height, width, 3), dtype=np.uint8)
+        self._out = np.empty((capacity, 3, height, width), dtype=np.float32)
+        std = np.asarray(config.std, dtype=np.float32)
+        mean = np.asarray(config.mean, dtype=np.float32)
+        # (x / 255 - mean) / std == x * scale + bias
+        self._scale = (1.0 / (255.0 * std)).reshape(1, 3, 1, 1)
+        self._bias = (-mean / std).reshape(1, 3, 1, 1)
+
+    def put(self, row: int, image: np.ndarray) -> None:
+        self.images[row] = image
+
+    def tensor(self, count: int) -> np.ndarray:
+        """Normalize the first ``count`` staged images into an NCHW batch."""
+        out = self._out[:count]
+        np.multiply(self.images[:count].transpose(0, 3, 1, 2), self._scale, out=out)
+        np.add(out, self._bias, out=out)
+        return out
+
+
+# Callers (API, job workers) run threads; a forked child could inherit a
+# lock one of them held and deadlock, so workers start from a clean process.
+_PROCESS_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+class PreprocessPool:
+    """Decodes images on worker processes (or threads) and yields arrays.
+
+    Processes sidestep the GIL for the Python-level parts of decoding and
+    resizing; threads avoid pickling and suit small images or callers that
+    already run in a process pool. Processes are started with forkserver
+    (spawn where that is unavailable), never forked from the caller.
+    """
+
+    def __init__(
+        self,
+        config: PreprocessConfig,
+        processes: int | None = None,
+        use_threads: bool = False,
+    ) -> None:
+        self.config = config
+        workers = processes or os.cpu_count() or 1
+        self._executor: Executor = (
+            ThreadPoolExecutor(max_workers=workers, thread_name_prefix="preprocess")
+            if use_threads
+            else ProcessPoolExecutor(max_workers=workers, mp_context=_PROCESS_CONTEXT)
+        )
+        self._workers = workers
+
+    def submit(self, data: bytes) -> Future[tuple[np.ndarray, ImageMeta]]:
+        return self._executor.submit(decode_image, data, self.config)
+
+    def decode(self, data: bytes) -> tuple[np.ndarray, ImageMeta]:
+        return self.submit(data).result()
+
+    def map(self, items: Iterable[bytes]) -> Iterator[tuple[np.ndarray, ImageMeta]]:
+        """Decode ``items`` in order, keeping about two tasks per worker in flight."""
+        pending: deque[Future[tuple[np.ndarray, ImageMeta]]] = deque()
+        for data in items:
+            pending.append(self.submit(data))
+            if len(pending) >= 2 * self._workers:
+                yield pending.popleft().result()
+        for future in pending:
+            yield future.result()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> PreprocessPool:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def preprocess_batch(
+    items: Iterable[bytes],
+    config: PreprocessConfig,
+    pool: PreprocessPool | None = None,
+) -> tuple[np.ndarray, list[ImageMeta]]:
+    """Decode and normalize encoded images into a new NCHW float32 batch."""
+    items = list(items)
+    buffer = BatchBuffer(config, capacity=len(items))
+    decoded = pool.map(items) if pool is not None else (decode_image(d, config) for d in items)
+    metas = []
+    for row, (image, meta) in enumerate(decoded):
+        buffer.put(row, image)
+        metas.append(meta)
+    return buffer.tensor(len(items)), metas
@@ -1,9 +1,25 @@
 from .user import User
 from .project import Project
 from .dataset import Dataset
+from .blob import Blob
 from .asset import Asset
 from .job import Job
+from .prediction import Prediction
+from .annotation import Annotation
+from .resource_version import ResourceVersion
+from .ingest_event import IngestEvent
 
 
 """SQLAlchemy ORM models."""
-__all__: list[str] = ["User", "Project", "Dataset", "Asset", "Job"]
+__all__: list[str] = [
+    "User",
+    "Project",
+    "Dataset",
+    "Blob",
+    "Asset",
+    "Job",
+    "Prediction",
+    "Annotation",
+    "ResourceVersion",
+    "IngestEvent",
+]
@@ -0,0 +1,44 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import JSON, DateTime, Float, ForeignKey, Index, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.orm.base import Base
+
+ANNOTATION_KIND_BOX = "box"
+ANNOTATION_KIND_POLYGON = "polygon"
+ANNOTATION_KIND_MASK = "mask"
+ANNOTATION_KIND_CLASS = "class"
+
+
+class Annotation(Base):
+    __tablename__ = "annotations"
+    __table_args__ = (
+        # Bulk upserts match on the client's key, unique within an asset.
+        UniqueConstraint("asset_id", "key", name="uq_annotations_asset_key"),
+        # A dataset's annotations are read in one ordered index scan.
+        Index("ix_annotations_dataset_id_asset_id_id", "dataset_id", "asset_id", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    # Denormalized from the asset so dataset reads need no join.
+    dataset_id: Mapped[int] = mapped_column(ForeignKey("datasets.id", ondelete="CASCADE"))
+    asset_id: Mapped[int] = mapped_column(ForeignKey("assets.id", ondelete="CASCADE"))
+    key: Mapped[str] = mapped_column(String(64))
+    kind: Mapped[str] = mapped_column(String(16))
+    label: Mapped[str] = mapped_column(String(255))
+    score: Mapped[float | None] = mapped_column(Float, nullable=True)
+    bbox: Mapped[list[float] | None] = mapped_column(JSON, nullable=True)  # x, y, w, h
+    # Polygon: {"points": [[x, y], ...]}; mask: compact COCO RLE (app.core.rle).
+    geometry: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+    attributes: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=datetime.utcnow,
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+    )
@@ -1,8 +1,57 @@
+from datetime import datetime
+
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import Mapped, mapped_column
+
 from app.models.orm.base import Base
+from app.models.orm.blob import blob_object_key
+
+ASSET_STATUS_PENDING = "pending"
+ASSET_STATUS_UPLOADED = "uploaded"
+ASSET_STATUS_READY = "ready"
+ASSET_STATUS_FAILED = "failed"
+
 
 class Asset(Base):
     __tablename__ = "assets"
+    __table_args__ = (
+        UniqueConstraint("dataset_id", "object_key", name="uq_assets_dataset_object_key"),
+        # Keyset pagination walks (dataset_id, id); the status variant serves
+        # filtered listings without a sort.
+        Index("ix_assets_dataset_id_id", "dataset_id", "id"),
+        Index("ix_assets_dataset_id_status_id", "dataset_id", "status", "id"),
+        Index("ix_assets_content_hash", "content_hash"),
+        Index("ix_assets_blob_sha256", "blob_sha256"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    # TODO: add fields (dataset_id, filename, status, etc.)
+    dataset_id: Mapped[int] = mapped_column(ForeignKey("datasets.id", ondelete="CASCADE"))
+    object_key: Mapped[str] = mapped_column(String(1024))
+    size_bytes: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    # Set when the bytes live in content-addressed storage rather than at object_key.
+    blob_sha256: Mapped[str | None] = mapped_column(
+        ForeignKey("blobs.sha256"),
+        nullable=True,
+    )
+    mime_type: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    width: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    height: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    status: Mapped[str] = mapped_column(String(32), default=ASSET_STATUS_PENDING)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=datetime.utcnow,
+    )
+
+    @property
+    def storage_key(self) -> str:
+        """Where the asset's bytes are stored."""
+        return blob_object_key(self.blob_sha256) if self.blob_sha256 else self.object_key
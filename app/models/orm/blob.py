@@ -0,0 +1,52 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.orm.base import Base
+
+BLOB_STATUS_PENDING = "pending"
+BLOB_STATUS_STORED = "stored"
+BLOB_KEY_PREFIX = "blobs/"
+# Uploads land here first and are copied to the blob key once ingested.
+BLOB_UPLOAD_PREFIX = "blobs/incoming/"
+
+
+def blob_object_key(sha256: str) -> str:
+    """Storage key of content-addressed bytes; fanned out to keep prefixes small."""
+    return f"{BLOB_KEY_PREFIX}{sha256[:2]}/{sha256[2:4]}/{sha256}"
+
+
+def blob_upload_key(project_id: int, sha256: str) -> str:
+    """Where a project uploads content it does not have yet."""
+    return f"{BLOB_UPLOAD_PREFIX}{project_id}/{sha256}"
+
+
+def blob_sha256_of(key: str) -> str | None:
+    """The hash a blob key was built from, or None for any other key."""
+    if not key.startswith(BLOB_KEY_PREFIX):
+        return None
+    sha256 = key.rpartition("/")[2]
+    return sha256 if blob_object_key(sha256) == key else None
+
+
+class Blob(Base):
+    """Content-addressed object, shared by every asset with the same bytes."""
+
+    __tablename__ = "blobs"
+    __table_args__ = (
+        # Garbage collection looks for blobs nothing points at any more.
+        Index("ix_blobs_ref_count", "ref_count"),
+    )
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    size_bytes: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    mime_type: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    status: Mapped[str] = mapped_column(String(16), default=BLOB_STATUS_PENDING)
+    # Number of assets linked to this blob.
+    ref_count: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=datetime.utcnow,
+    )
+    stored_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
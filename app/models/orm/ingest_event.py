@@ -0,0 +1,36 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.orm.base import Base
+
+INGEST_STATUS_PENDING = "pending"
+# Failed ``ingest_max_attempts`` times; kept for inspection and never claimed
+# again. Set the status back to pending to retry.
+INGEST_STATUS_DEAD = "dead"
+
+
+class IngestEvent(Base):
+    """An acknowledged bucket notification that has not been written as assets yet."""
+
+    __tablename__ = "ingest_events"
+    __table_args__ = (
+        # Flushers claim the oldest pending events that nobody holds a lease on.
+        Index("ix_ingest_events_status_lease_expires_at_id", "status", "lease_expires_at", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    object_key: Mapped[str] = mapped_column(String(1024))
+    dataset_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    blob_sha256: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    size_bytes: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    mime_type: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    event_time: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    status: Mapped[str] = mapped_column(String(16), default=INGEST_STATUS_PENDING)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    lease_owner: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    lease_expires_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
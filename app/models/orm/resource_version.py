@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.orm.base import Base
+
+
+class ResourceVersion(Base):
+    """Change counter of one listing, e.g. all projects or one project's datasets."""
+
+    __tablename__ = "resource_versions"
+
+    scope: Mapped[str] = mapped_column(String(128), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=datetime.utcnow,
+    )
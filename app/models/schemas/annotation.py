@@ -0,0 +1,78 @@
+from datetime import datetime
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from app.core import rle
+
+AnnotationKind = Literal["box", "polygon", "mask", "class"]
+
+
+class MaskRLE(BaseModel):
+    size: list[int] = Field(..., min_length=2, max_length=2, description="[height, width]")
+    counts: str | list[int] = Field(
+        ...,
+        description="COCO RLE counts, compact string or list of run lengths",
+    )
+
+
+class AnnotationWrite(BaseModel):
+    asset_id: int
+    key: str = Field(
+        ...,
+        min_length=1,
+        max_length=64,
+        description="Client-chosen id, unique per asset; writing the same key updates",
+    )
+    kind: AnnotationKind
+    label: str = Field(..., min_length=1, max_length=255)
+    score: float | None = None
+    bbox: list[float] | None = Field(
+        default=None,
+        min_length=4,
+        max_length=4,
+        description="[x, y, width, height]; derived for polygons and masks when omitted",
+    )
+    points: list[tuple[float, float]] | None = Field(default=None, description="Polygon vertices")
+    mask: MaskRLE | None = None
+    attributes: dict[str, Any] | None = None
+
+    @field_validator("mask")
+    @classmethod
+    def _compact_mask(cls, value: MaskRLE | None) -> MaskRLE | None:
+        # Always store the compact form, whatever the client sent.
+        return MaskRLE(**rle.normalize(value.model_dump())) if value is not None else None
+
+    @model_validator(mode="after")
+    def _geometry_matches_kind(self) -> "AnnotationWrite":
+        if self.kind == "box" and self.bbox is None:
+            raise ValueError("Box annotations need a bbox")
+        if self.kind == "polygon" and (self.points is None or len(self.points) < 3):
+            raise ValueError("Polygon annotations need at least three points")
+        if self.kind == "mask" and self.mask is None:
+            raise ValueError("Mask annotations need a mask")
+        return self
+
+
+class AnnotationBulkUpsert(BaseModel):
+    dataset_id: int = Field(..., description="Dataset every annotated asset belongs to")
+    annotations: list[AnnotationWrite] = Field(..., min_length=1, max_length=10_000)
+
+
+class AnnotationBulkUpsertResponse(BaseModel):
+    dataset_id: int
+    upserted: int = Field(..., description="Annotations inserted or updated")
+
+
+class AnnotationRead(BaseModel):
+    id: int
+    asset_id: int
+    key: str
+    kind: AnnotationKind
+    label: str
+    score: float | None = None
+    bbox: list[float] | None = None
+    points: list[tuple[float, float]] | None = None
+    mask: MaskRLE | None = None
+    attributes: dict[str, Any] | None = None
+    updated_at: datetime | None = None
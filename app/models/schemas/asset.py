@@ -1,5 +1,10 @@
+from datetime import datetime
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
+AssetStatus = Literal["pending", "uploaded", "ready", "failed"]
+
 
 class PresignRequest(BaseModel):
     dataset_id: int = Field(..., description="Dataset ID to upload into")
@@ -10,3 +15,216 @@ class PresignResponse(BaseModel):
     upload_url: str = Field(..., description="Presigned URL for uploading the asset")
     object_key: str = Field(..., description="Storage object key within the bucket")
     bucket: str = Field(..., description="Target bucket for the upload")
+
+
+class BatchPresignRequest(BaseModel):
+    dataset_id: int = Field(..., description="Dataset ID to upload into")
+    filenames: list[str] = Field(
+        ...,
+        min_length=1,
+        max_length=10_000,
+        description="Object names within the dataset",
+    )
+    expires_in: int = Field(
+        default=3600,
+        ge=60,
+        le=7 * 24 * 3600,
+        description="Lifetime of each presigned URL in seconds",
+    )
+
+
+class BatchPresignItem(BaseModel):
+    filename: str = Field(..., description="Object name as submitted")
+    upload_url: str | None = Field(default=None, description="Presigned upload URL")
+    object_key: str | None = Field(default=None, description="Storage object key")
+    error: str | None = Field(default=None, description="Why this file could not be signed")
+
+
+class BatchPresignResponse(BaseModel):
+    dataset_id: int
+    bucket: str = Field(..., description="Target bucket for the uploads")
+    items: list[BatchPresignItem]
+    failed: int = Field(..., description="Number of items that carry an error")
+
+
+class ContentPresignFile(BaseModel):
+    filename: str = Field(..., description="Object name within the dataset")
+    sha256: str = Field(
+        ...,
+        pattern=r"^[0-9a-f]{64}$",
+        description="Lowercase hex SHA-256 of the file's bytes",
+    )
+    size_bytes: int | None = Field(default=None, ge=0)
+    content_type: str | None = Field(default=None, description="MIME type of the file")
+
+
+class ContentPresignRequest(BaseModel):
+    dataset_id: int = Field(..., description="Dataset ID to add the files to")
+    files: list[ContentPresignFile] = Field(..., min_length=1, max_length=10_000)
+    expires_in: int = Field(default=3600, ge=60, le=7 * 24 * 3600)
+
+
+class ContentPresignItem(BaseModel):
+    filename: str = Field(..., description="Object name as submitted")
+    sha256: str
+    object_key: str | None = Field(default=None, description="Asset key within the dataset")
+    blob_key: str | None = Field(default=None, description="Storage key of the content")
+    exists: bool = Field(
+        default=False,
+        description="Content was already uploaded in this project; nothing to upload",
+    )
+    upload_url: str | None = Field(
+        default=None,
+        description=(
+            "Presigned PUT URL for the content, given once per unknown hash; send the "
+            "digest base64-encoded in the x-amz-checksum-sha256 header"
+        ),
+    )
+    error: str | None = Field(default=None, description="Why this file could not be added")
+
+
+class ContentPresignResponse(BaseModel):
+    dataset_id: int
+    bucket: str
+    items: list[ContentPresignItem]
+    uploads: int = Field(..., description="Number of upload URLs issued")
+    reused: int = Field(..., description="Files whose content the project already had")
+    failed: int = Field(..., description="Number of items that carry an error")
+
+
+class ReadPresignRequest(BaseModel):
+    dataset_id: int = Field(..., description="Dataset the assets belong to")
+    object_keys: list[str] = Field(
+        ...,
+        min_length=1,
+        max_length=10_000,
+        description="Asset object keys, as listed by GET /assets",
+    )
+    expires_in: int = Field(
+        default=3600,
+        ge=60,
+        le=7 * 24 * 3600,
+        description="Requested lifetime; a cached URL may have less left, see expires_at",
+    )
+
+
+class ReadPresignItem(BaseModel):
+    object_key: str
+    url: str | None = Field(default=None, description="Presigned GET URL")
+    expires_at: datetime | None = None
+    error: str | None = Field(default=None, description="Why this asset could not be signed")
+
+
+class ReadPresignResponse(BaseModel):
+    dataset_id: int
+    items: list[ReadPresignItem]
+    failed: int = Field(..., description="Number of items that carry an error")
+
+
+class MultipartCreateRequest(BaseModel):
+    dataset_id: int = Field(..., description="Dataset ID to upload into")
+    filename: str = Field(..., description="Object name within the dataset")
+    part_count: int = Field(
+        ...,
+        ge=1,
+        le=10_000,
+        description="Number of parts; every part but the last must be at least 5 MiB",
+    )
+    content_type: str | None = Field(default=None, description="MIME type of the object")
+    expires_in: int = Field(default=3600, ge=60, le=7 * 24 * 3600)
+
+
+class MultipartPartUrl(BaseModel):
+    part_number: int
+    upload_url: str = Field(..., description="Presigned URL for uploading this part with PUT")
+
+
+class MultipartCreateResponse(BaseModel):
+    upload_id: str
+    object_key: str
+    bucket: str
+    parts: list[MultipartPartUrl]
+
+
+class MultipartUploadRef(BaseModel):
+    dataset_id: int = Field(..., description="Dataset the upload belongs to")
+    object_key: str = Field(..., description="Storage object key returned on creation")
+    upload_id: str = Field(..., description="Multipart upload id returned on creation")
+
+
+class MultipartPartsRequest(MultipartUploadRef):
+    part_numbers: list[int] = Field(..., min_length=1, max_length=10_000)
+    expires_in: int = Field(default=3600, ge=60, le=7 * 24 * 3600)
+
+
+class MultipartPartsResponse(BaseModel):
+    parts: list[MultipartPartUrl]
+
+
+class MultipartCompletedPart(BaseModel):
+    part_number: int = Field(..., ge=1, le=10_000)
+    etag: str = Field(..., description="ETag header returned by the part upload")
+
+
+class MultipartCompleteRequest(MultipartUploadRef):
+    parts: list[MultipartCompletedPart] = Field(..., min_length=1, max_length=10_000)
+
+
+class MultipartCompleteResponse(BaseModel):
+    object_key: str
+    bucket: str
+    etag: str | None = None
+
+
+class MultipartUploadedPart(BaseModel):
+    part_number: int
+    etag: str
+    size: int
+
+
+class MultipartListPartsResponse(BaseModel):
+    upload_id: str
+    object_key: str
+    parts: list[MultipartUploadedPart]
+
+
+class AssetRead(BaseModel):
+    id: int
+    dataset_id: int
+    object_key: str
+    size_bytes: int | None = None
+    content_hash: str | None = None
+    mime_type: str | None = None
+    width: int | None = None
+    height: int | None = None
+    status: AssetStatus
+    created_at: datetime | None = None
+
+    class Config:
+        from_attributes = True
+
+
+class ThumbnailRead(BaseModel):
+    asset_id: int
+    size: int = Field(..., description="Box the thumbnail fits in, in pixels")
+    object_key: str
+    url: str = Field(..., description="Presigned GET URL")
+    expires_in: int
+    generated: bool = Field(..., description="Rendered by this request rather than found")
+
+
+class PyramidLevel(BaseModel):
+    level: int = Field(..., description="0 is full resolution; each level halves the previous")
+    width: int
+    height: int
+    cols: int
+    rows: int
+
+
+class PyramidRead(BaseModel):
+    asset_id: int
+    width: int
+    height: int
+    tile_size: int
+    format: str
+    levels: list[PyramidLevel]
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
 
@@ -15,3 +17,41 @@ class DatasetRead(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class DatasetExportRequest(BaseModel):
+    format: Literal["coco", "yolo", "webdataset"] = Field(..., description="Output format")
+    status: Literal["pending", "uploaded", "ready", "failed"] | None = Field(
+        default=None,
+        description="Only export assets in this status",
+    )
+    include_images: bool = Field(
+        default=False,
+        description="Add images to a YOLO archive; WebDataset shards always contain them",
+    )
+    shard_size_mb: int = Field(default=512, ge=16, le=16_384, description="WebDataset shard size")
+    priority: int = Field(default=0, ge=-100, le=100)
+
+
+class DatasetImportRequest(BaseModel):
+    archive_key: str = Field(
+        ...,
+        min_length=1,
+        description=(
+            "Bucket key of a .zip or .tar[.gz|.bz2|.xz] archive to unpack; "
+            "must lie under datasets/{dataset_id}/"
+        ),
+    )
+    prefix: str | None = Field(
+        default=None,
+        description="Folder within the dataset to unpack into, ending in '/'",
+    )
+    priority: int = Field(default=0, ge=-100, le=100)
+
+
+class DatasetThumbnailsRequest(BaseModel):
+    force: bool = Field(
+        default=False,
+        description="Render again even where thumbnails and pyramids already exist",
+    )
+    priority: int = Field(default=0, ge=-100, le=100)
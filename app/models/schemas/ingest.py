@@ -0,0 +1,6 @@
+from pydantic import BaseModel, Field
+
+
+class IngestAccepted(BaseModel):
+    accepted: int = Field(..., description="Object-created events stored for ingestion")
+    ignored: int = Field(..., description="Records that do not describe a dataset object")
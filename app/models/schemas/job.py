@@ -1,8 +1,64 @@
-from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from app.workers.handlers import DATASET_JOB_TYPES, JOB_HANDLERS
+
+JobStatus = Literal["queued", "running", "succeeded", "failed", "cancelled"]
+
+
+class JobCreate(BaseModel):
+    type: str = Field(..., description="Job type, e.g. 'inference'")
+    project_id: int | None = Field(default=None, description="Project the job belongs to")
+    priority: int = Field(default=0, ge=-100, le=100, description="Higher runs first")
+    payload: dict[str, Any] = Field(default_factory=dict, description="Type-specific input")
+    max_attempts: int | None = Field(default=None, ge=1, le=10)
+
+    @field_validator("type")
+    @classmethod
+    def _known_type(cls, value: str) -> str:
+        if value not in JOB_HANDLERS:
+            known = ", ".join(sorted(JOB_HANDLERS))
+            raise ValueError(f"Unknown job type {value!r}; expected one of: {known}")
+        return value
+
+    @model_validator(mode="after")
+    def _names_its_dataset(self) -> "JobCreate":
+        dataset_id = self.payload.get("dataset_id")
+        if self.type in DATASET_JOB_TYPES and (
+            not isinstance(dataset_id, int) or isinstance(dataset_id, bool)
+        ):
+            raise ValueError(f"{self.type} jobs need an integer dataset_id in the payload")
+        return self
+
 
 class JobRead(BaseModel):
     id: int
-    status: str | None = None  # TODO
+    type: str
+    status: JobStatus
+    priority: int
+    project_id: int | None = None
+    tenant_id: int | None = None
+    created_by: int | None = None
+    payload: dict[str, Any] = Field(default_factory=dict)
+    result: dict[str, Any] | None = None
+    progress: dict[str, Any] | None = None
+    error: str | None = None
+    attempts: int
+    created_at: datetime | None = None
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
 
     class Config:
         from_attributes = True
+
+
+class TenantQueueStats(BaseModel):
+    tenant_id: int | None = None
+    queued: int
+    running: int
+    oldest_queued_seconds: float | None = None
+    started_in_window: int = 0
+    avg_wait_seconds: float | None = None
+    max_wait_seconds: float | None = None
@@ -0,0 +1,78 @@
+from collections.abc import Iterator, Mapping, Sequence
+from typing import Any
+
+from sqlalchemy import Row, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.orm.annotation import Annotation
+
+# Rows per INSERT statement; keeps bound parameters under SQLite's limit.
+UPSERT_CHUNK_SIZE = 500
+
+STREAM_COLUMNS = (
+    Annotation.id,
+    Annotation.asset_id,
+    Annotation.key,
+    Annotation.kind,
+    Annotation.label,
+    Annotation.score,
+    Annotation.bbox,
+    Annotation.geometry,
+    Annotation.attributes,
+    Annotation.updated_at,
+)
+
+
+class AnnotationRepository:
+    """Data access for annotations."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def upsert(self, rows: Sequence[Mapping[str, Any]]) -> int:
+        """Insert or update annotations by ``(asset_id, key)`` in one transaction.
+
+        Rows are written with multi-row ``INSERT ... ON CONFLICT DO UPDATE``
+        statements of ``UPSERT_CHUNK_SIZE`` rows, so thousands of
+        annotations take a handful of round trips.
+        """
+        if not rows:
+            return 0
+        insert = postgresql.insert if self._dialect == "postgresql" else sqlite.insert
+        for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            stmt = insert(Annotation).values(list(rows[start : start + UPSERT_CHUNK_SIZE]))
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Annotation.asset_id, Annotation.key],
+                set_={
+                    "kind": stmt.excluded.kind,
+                    "label": stmt.excluded.label,
+                    "score": stmt.excluded.score,
+                    "bbox": stmt.excluded.bbox,
+                    "geometry": stmt.excluded.geometry,
+                    "attributes": stmt.excluded.attributes,
+                    "updated_at": stmt.excluded.updated_at,
+                },
+            )
+            self.db.execute(stmt)
+        self.db.commit()
+        return len(rows)
+
+    def stream_dataset(self, dataset_id: int, batch_size: int = 1000) -> Iterator[Row[Any]]:
+        """Yield every annotation of a dataset ordered by asset, as plain rows.
+
+        One query over the ``(dataset_id, asset_id, id)`` index, fetched
+        ``batch_size`` rows at a time (a server-side cursor where the driver
+        supports one), without building ORM objects.
+        """
+        stmt = (
+            select(*STREAM_COLUMNS)
+            .where(Annotation.dataset_id == dataset_id)
+            .order_by(Annotation.asset_id, Annotation.id)
+            .execution_options(yield_per=batch_size)
+        )
+        yield from self.db.execute(stmt)
+
+    @property
+    def _dialect(self) -> str:
+        return self.db.get_bind().dialect.name
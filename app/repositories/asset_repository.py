@@ -1,12 +1,214 @@
+from collections.abc import Iterable, Iterator, Mapping, Sequence
 from typing import Any
+
+from sqlalchemy import Row, bindparam, case, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
+from app.models.orm.asset import (
+    ASSET_STATUS_FAILED,
+    ASSET_STATUS_PENDING,
+    ASSET_STATUS_UPLOADED,
+    Asset,
+)
+from app.models.orm.blob import blob_object_key, blob_sha256_of
+from app.models.orm.dataset import Dataset
+from app.models.orm.project import Project
+
+# Core table for executemany updates; ORM updates with a parameter list
+# would expect primary-key rows.
+_ASSETS = Asset.__table__
+
+
 class AssetRepository:
     """Data access for assets."""
 
     def __init__(self, db: Session):
         self.db = db
 
-    def list_assets(self, dataset_id: int) -> list[Any]:
-        """TODO: Implement query."""
-        raise NotImplementedError
+    def list_assets(
+        self,
+        dataset_id: int,
+        limit: int,
+        after_id: int | None = None,
+        status: str | None = None,
+    ) -> Sequence[Asset]:
+        """Return up to ``limit`` assets of a dataset with ids greater than ``after_id``.
+
+        Seeks on the ``(dataset_id[, status], id)`` index, so the cost of a
+        page does not depend on how deep into the dataset it is.
+        """
+        stmt = select(Asset).where(Asset.dataset_id == dataset_id)
+        if status is not None:
+            stmt = stmt.where(Asset.status == status)
+        if after_id is not None:
+            stmt = stmt.where(Asset.id > after_id)
+        stmt = stmt.order_by(Asset.id).limit(limit)
+        return self.db.scalars(stmt).all()
+
+    def stream_dataset(
+        self,
+        dataset_id: int,
+        status: str | None = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Row[Any]]:
+        """Yield a dataset's assets in id order as plain rows, ``batch_size`` at a time.
+
+        Uses a server-side cursor where the driver supports one, so the
+        whole dataset is never held in memory.
+        """
+        stmt = select(
+            Asset.id,
+            Asset.object_key,
+            Asset.mime_type,
+            Asset.width,
+            Asset.height,
+            Asset.blob_sha256,
+        ).where(Asset.dataset_id == dataset_id)
+        if status is not None:
+            stmt = stmt.where(Asset.status == status)
+        stmt = stmt.order_by(Asset.id).execution_options(yield_per=batch_size)
+        yield from self.db.execute(stmt)
+
+    def content_hashes(self, dataset_id: int) -> set[str]:
+        """Content hashes already recorded for a dataset's assets."""
+        stmt = (
+            select(Asset.content_hash)
+            .where(Asset.dataset_id == dataset_id, Asset.content_hash.is_not(None))
+            .execution_options(yield_per=10_000)
+        )
+        return set(self.db.scalars(stmt))
+
+    def count_assets(self, dataset_id: int, status: str | None = None) -> int:
+        """Number of assets in a dataset, optionally with a given status."""
+        stmt = select(func.count()).select_from(Asset).where(Asset.dataset_id == dataset_id)
+        if status is not None:
+            stmt = stmt.where(Asset.status == status)
+        return int(self.db.scalar(stmt) or 0)
+
+    def ids_in_dataset(self, dataset_id: int, asset_ids: Iterable[int]) -> set[int]:
+        """Return the subset of ``asset_ids`` that belong to the dataset."""
+        ids = list(set(asset_ids))
+        found: set[int] = set()
+        for start in range(0, len(ids), 1000):
+            found.update(
+                self.db.scalars(
+                    select(Asset.id).where(
+                        Asset.dataset_id == dataset_id,
+                        Asset.id.in_(ids[start : start + 1000]),
+                    )
+                )
+            )
+        return found
+
+    def locate(self, dataset_id: int, object_keys: Iterable[str]) -> dict[str, tuple[str, str]]:
+        """Storage key and status of those of ``object_keys`` that are assets of the dataset."""
+        keys = list(set(object_keys))
+        found: dict[str, tuple[str, str]] = {}
+        for start in range(0, len(keys), 1000):
+            rows = self.db.execute(
+                select(Asset.object_key, Asset.blob_sha256, Asset.status).where(
+                    Asset.dataset_id == dataset_id,
+                    Asset.object_key.in_(keys[start : start + 1000]),
+                )
+            )
+            for object_key, blob_sha256, status in rows:
+                storage_key = blob_object_key(blob_sha256) if blob_sha256 else object_key
+                found[object_key] = (storage_key, status)
+        return found
+
+    def get(self, asset_id: int) -> Asset | None:
+        """Fetch an asset by id."""
+        return self.db.get(Asset, asset_id)
+
+    def get_with_project(self, asset_id: int) -> tuple[Asset, Project] | None:
+        """Fetch an asset together with the project that owns its dataset."""
+        row = self.db.execute(
+            select(Asset, Project)
+            .join(Dataset, Dataset.id == Asset.dataset_id)
+            .join(Project, Project.id == Dataset.project_id)
+            .where(Asset.id == asset_id)
+        ).one_or_none()
+        return (row[0], row[1]) if row is not None else None
+
+    def upsert_uploaded(self, rows: Sequence[Mapping[str, Any]]) -> None:
+        """Insert or refresh assets whose objects arrived in storage, in one statement.
+
+        Each row needs ``dataset_id`` and ``object_key`` and may carry
+        ``size_bytes``, ``mime_type`` and ``content_hash``. Re-delivering the same object is
+        harmless: the row is updated in place, and assets that already moved
+        past ``uploaded`` keep their status.
+        """
+        if not rows:
+            return
+        values = [
+            {
+                "dataset_id": row["dataset_id"],
+                "object_key": row["object_key"],
+                "size_bytes": row.get("size_bytes"),
+                "mime_type": row.get("mime_type"),
+                "content_hash": row.get("content_hash"),
+                "status": ASSET_STATUS_UPLOADED,
+                "created_at": row["created_at"],
+            }
+            for row in rows
+        ]
+        insert = postgresql.insert if self._dialect == "postgresql" else sqlite.insert
+        stmt = insert(Asset).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Asset.dataset_id, Asset.object_key],
+            set_={
+                "size_bytes": stmt.excluded.size_bytes,
+                "mime_type": stmt.excluded.mime_type,
+                # Notifications carry no hash; keep one recorded by an import.
+                "content_hash": func.coalesce(stmt.excluded.content_hash, Asset.content_hash),
+                "status": case(
+                    (
+                        Asset.status.in_([ASSET_STATUS_PENDING, ASSET_STATUS_FAILED]),
+                        ASSET_STATUS_UPLOADED,
+                    ),
+                    else_=Asset.status,
+                ),
+            },
+        )
+        self.db.execute(stmt)
+        self.db.commit()
+
+    def set_dimensions(self, sizes: Mapping[str, tuple[int, int]]) -> None:
+        """Record image sizes by storage key on assets that have none yet.
+
+        A blob key sets the size of every asset linked to that blob.
+        """
+        if not sizes:
+            return
+        by_object: list[dict[str, Any]] = []
+        by_blob: list[dict[str, Any]] = []
+        for key, (width, height) in sizes.items():
+            sha256 = blob_sha256_of(key)
+            params = {"d_key": sha256 or key, "d_width": width, "d_height": height}
+            (by_blob if sha256 else by_object).append(params)
+        unset = _ASSETS.c.width.is_(None)
+        dimensions = {"width": bindparam("d_width"), "height": bindparam("d_height")}
+        if by_object:
+            self.db.execute(
+                update(_ASSETS)
+                .where(
+                    _ASSETS.c.object_key == bindparam("d_key"),
+                    _ASSETS.c.blob_sha256.is_(None),
+                    unset,
+                )
+                .values(**dimensions),
+                by_object,
+            )
+        if by_blob:
+            self.db.execute(
+                update(_ASSETS)
+                .where(_ASSETS.c.blob_sha256 == bindparam("d_key"), unset)
+                .values(**dimensions),
+                by_blob,
+            )
+        self.db.commit()
+
+    @property
+    def _dialect(self) -> str:
+        return self.db.get_bind().dialect.name
@@ -0,0 +1,208 @@
+from collections import Counter
+from collections.abc import Collection, Iterable, Mapping, Sequence
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.orm.asset import (
+    ASSET_STATUS_PENDING,
+    ASSET_STATUS_READY,
+    ASSET_STATUS_UPLOADED,
+    Asset,
+)
+from app.models.orm.blob import BLOB_STATUS_STORED, Blob
+from app.models.orm.dataset import Dataset
+
+# Keys per IN (...) list.
+_CHUNK_SIZE = 500
+# Core table for executemany updates; ORM updates with a parameter list
+# would expect full primary-key rows.
+_BLOBS = Blob.__table__
+
+
+class BlobRepository:
+    """Data access for content-addressed blobs and the assets linked to them."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_many(self, hashes: Iterable[str]) -> dict[str, Blob]:
+        """Blobs by SHA-256 for those of ``hashes`` that are known."""
+        keys = list(set(hashes))
+        found: dict[str, Blob] = {}
+        for start in range(0, len(keys), _CHUNK_SIZE):
+            stmt = select(Blob).where(Blob.sha256.in_(keys[start : start + _CHUNK_SIZE]))
+            found.update((blob.sha256, blob) for blob in self.db.scalars(stmt))
+        return found
+
+    def owned(self, project_id: int, hashes: Iterable[str]) -> set[str]:
+        """Those of ``hashes`` a project has uploaded, i.e. has readable assets for.
+
+        Only these may be linked without an upload: whether a blob is
+        stored for some other project is never revealed.
+        """
+        keys = list(set(hashes))
+        found: set[str] = set()
+        for start in range(0, len(keys), _CHUNK_SIZE):
+            stmt = (
+                select(Asset.blob_sha256)
+                .join(Dataset, Dataset.id == Asset.dataset_id)
+                .where(
+                    Dataset.project_id == project_id,
+                    Asset.blob_sha256.in_(keys[start : start + _CHUNK_SIZE]),
+                    Asset.status.in_((ASSET_STATUS_UPLOADED, ASSET_STATUS_READY)),
+                )
+                .distinct()
+            )
+            found.update(self.db.scalars(stmt))
+        return found
+
+    def link_assets(
+        self,
+        dataset_id: int,
+        rows: Sequence[Mapping[str, Any]],
+        available: Collection[str] = (),
+    ) -> None:
+        """Point assets of a dataset at blobs, in one transaction.
+
+        Each row needs ``object_key`` and ``sha256`` and may carry
+        ``size_bytes`` and ``mime_type``. Missing blobs are created as
+        pending; assets are created or re-pointed, ``uploaded`` when their
+        hash is in ``available`` (see ``owned``) and ``pending`` otherwise;
+        reference counts of the new and any previously linked blobs are
+        adjusted.
+        """
+        if not rows:
+            return
+        now = datetime.utcnow()
+        insert = postgresql.insert if self._dialect == "postgresql" else sqlite.insert
+
+        blobs = {
+            row["sha256"]: {
+                "sha256": row["sha256"],
+                "size_bytes": row.get("size_bytes"),
+                "mime_type": row.get("mime_type"),
+                "ref_count": 0,
+                "created_at": now,
+            }
+            for row in rows
+        }
+        self.db.execute(
+            insert(Blob).values(list(blobs.values())).on_conflict_do_nothing(
+                index_elements=[Blob.sha256]
+            )
+        )
+
+        keys = [row["object_key"] for row in rows]
+        previous: dict[str, str | None] = {}
+        for start in range(0, len(keys), _CHUNK_SIZE):
+            previous.update(
+                self.db.execute(
+                    select(Asset.object_key, Asset.blob_sha256).where(
+                        Asset.dataset_id == dataset_id,
+                        Asset.object_key.in_(keys[start : start + _CHUNK_SIZE]),
+                    )
+                ).tuples().all()
+            )
+
+        values = [
+            {
+                "dataset_id": dataset_id,
+                "object_key": row["object_key"],
+                "blob_sha256": row["sha256"],
+                "content_hash": row["sha256"],
+                "size_bytes": row.get("size_bytes"),
+                "mime_type": row.get("mime_type"),
+                "status": (
+                    ASSET_STATUS_UPLOADED if row["sha256"] in available else ASSET_STATUS_PENDING
+                ),
+                "created_at": now,
+            }
+            for row in rows
+        ]
+        for start in range(0, len(values), _CHUNK_SIZE):
+            stmt = insert(Asset).values(values[start : start + _CHUNK_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Asset.dataset_id, Asset.object_key],
+                set_={
+                    "blob_sha256": stmt.excluded.blob_sha256,
+                    "content_hash": stmt.excluded.content_hash,
+                    "size_bytes": stmt.excluded.size_bytes,
+                    "mime_type": stmt.excluded.mime_type,
+                    "status": stmt.excluded.status,
+                },
+            )
+            self.db.execute(stmt)
+
+        deltas: Counter[str] = Counter()
+        for row in rows:
+            old = previous.get(row["object_key"])
+            if old != row["sha256"]:
+                deltas[row["sha256"]] += 1
+                if old is not None:
+                    deltas[old] -= 1
+        self._add_refs(deltas)
+        self.db.commit()
+
+    def mark_stored(self, project_id: int, blobs: Sequence[Mapping[str, Any]]) -> int:
+        """Record that a project uploaded blobs and release its pending assets.
+
+        Each row needs ``sha256`` and may carry ``size_bytes``. Assets of
+        other projects waiting for the same content stay pending until
+        they upload it themselves. Returns the number of assets that
+        became ``uploaded``.
+        """
+        if not blobs:
+            return 0
+        now = datetime.utcnow()
+        hashes = [blob["sha256"] for blob in blobs]
+        self.db.execute(
+            update(_BLOBS)
+            .where(_BLOBS.c.sha256 == bindparam("b_sha256"))
+            .values(
+                status=BLOB_STATUS_STORED,
+                stored_at=now,
+                size_bytes=func.coalesce(bindparam("b_size"), _BLOBS.c.size_bytes),
+            ),
+            [{"b_sha256": blob["sha256"], "b_size": blob.get("size_bytes")} for blob in blobs],
+        )
+        released = 0
+        for start in range(0, len(hashes), _CHUNK_SIZE):
+            released += self.db.execute(
+                update(Asset)
+                .where(
+                    Asset.blob_sha256.in_(hashes[start : start + _CHUNK_SIZE]),
+                    Asset.status == ASSET_STATUS_PENDING,
+                    Asset.dataset_id.in_(
+                        select(Dataset.id).where(Dataset.project_id == project_id)
+                    ),
+                )
+                .values(status=ASSET_STATUS_UPLOADED)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+        self.db.commit()
+        return released
+
+    def unreferenced(self, limit: int = 1000) -> list[str]:
+        """Hashes of blobs no asset links to any more, for garbage collection."""
+        stmt = select(Blob.sha256).where(Blob.ref_count <= 0).limit(limit)
+        return list(self.db.scalars(stmt))
+
+    def _add_refs(self, deltas: Mapping[str, int]) -> None:
+        # Relative updates, so concurrent links to the same blob do not race.
+        params = [{"b_sha256": sha, "b_delta": delta} for sha, delta in deltas.items() if delta]
+        if not params:
+            return
+        self.db.execute(
+            update(_BLOBS)
+            .where(_BLOBS.c.sha256 == bindparam("b_sha256"))
+            .values(ref_count=_BLOBS.c.ref_count + bindparam("b_delta")),
+            params,
+        )
+
+    @property
+    def _dialect(self) -> str:
+        return self.db.get_bind().dialect.name
@@ -1,8 +1,16 @@
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models.orm.dataset import Dataset
+from app.models.orm.project import Project
+from app.repositories.resource_version_repository import (
+    AsyncResourceVersionRepository,
+    ResourceVersionRepository,
+    datasets_scope,
+)
 
 
 class DatasetRepository:
@@ -24,10 +32,62 @@ class DatasetRepository:
         """Fetch a dataset by id."""
         return self.db.query(Dataset).filter(Dataset.id == dataset_id).one_or_none()
 
+    def existing_ids(self, dataset_ids: Iterable[int]) -> set[int]:
+        """Return the subset of ``dataset_ids`` that exist."""
+        ids = set(dataset_ids)
+        if not ids:
+            return set()
+        return set(self.db.scalars(select(Dataset.id).where(Dataset.id.in_(ids))))
+
     def create(self, project_id: int, name: str, description: str | None = None) -> Dataset:
         """Create and persist a dataset."""
         dataset = Dataset(project_id=project_id, name=name, description=description)
         self.db.add(dataset)
+        ResourceVersionRepository(self.db).bump(datasets_scope(project_id))
         self.db.commit()
         self.db.refresh(dataset)
         return dataset
+
+
+class AsyncDatasetRepository:
+    """Async data access for datasets."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def list_by_project(self, project_id: int) -> Sequence[Dataset]:
+        """Return datasets for a given project."""
+        result = await self.db.scalars(
+            select(Dataset)
+            .where(Dataset.project_id == project_id)
+            .order_by(Dataset.id)
+        )
+        return result.all()
+
+    async def get(self, dataset_id: int) -> Dataset | None:
+        """Fetch a dataset by id."""
+        return await self.db.get(Dataset, dataset_id)
+
+    async def get_with_project(self, dataset_id: int) -> tuple[Dataset, Project] | None:
+        """Fetch a dataset together with the project that owns it."""
+        result = await self.db.execute(
+            select(Dataset, Project)
+            .join(Project, Project.id == Dataset.project_id)
+            .where(Dataset.id == dataset_id)
+        )
+        row = result.one_or_none()
+        return (row[0], row[1]) if row is not None else None
+
+    async def create(
+        self,
+        project_id: int,
+        name: str,
+        description: str | None = None,
+    ) -> Dataset:
+        """Create and persist a dataset."""
+        dataset = Dataset(project_id=project_id, name=name, description=description)
+        self.db.add(dataset)
+        await AsyncResourceVersionRepository(self.db).bump(datasets_scope(project_id))
+        await self.db.commit()
+        await self.db.refresh(dataset)
+        return dataset
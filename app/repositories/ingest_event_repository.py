@@ -0,0 +1,110 @@
+from collections.abc import Iterable, Mapping, Sequence
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models.orm.ingest_event import INGEST_STATUS_DEAD, INGEST_STATUS_PENDING, IngestEvent
+
+# Ids per IN (...) list.
+_CHUNK_SIZE = 500
+
+
+class IngestEventRepository:
+    """Data access for bucket notifications waiting to be written as assets.
+
+    Flushers lease events instead of deleting them when they take a batch,
+    and delete them only once the assets are written, so a flusher that
+    dies mid-batch leaves its events to another one when the lease ends.
+    A failed event keeps a lease until its retry is due, and events that
+    keep failing are dead-lettered instead of being claimed forever.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def add(self, rows: Sequence[Mapping[str, Any]]) -> None:
+        """Store events in one insert and commit."""
+        if not rows:
+            return
+        self.db.execute(insert(IngestEvent), list(rows))
+        self.db.commit()
+
+    def count(self) -> int:
+        """Number of events waiting to be written, claimed or not."""
+        stmt = (
+            select(func.count())
+            .select_from(IngestEvent)
+            .where(IngestEvent.status == INGEST_STATUS_PENDING)
+        )
+        return int(self.db.scalar(stmt) or 0)
+
+    def claim(self, owner: str, limit: int, lease_seconds: float) -> list[IngestEvent]:
+        """Lease up to ``limit`` of the oldest unleased pending events to ``owner``."""
+        now = datetime.utcnow()
+        free = (IngestEvent.status == INGEST_STATUS_PENDING) & (
+            IngestEvent.lease_expires_at.is_(None) | (IngestEvent.lease_expires_at < now)
+        )
+        ids = list(
+            self.db.scalars(
+                select(IngestEvent.id)
+                .where(free)
+                .order_by(IngestEvent.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+        )
+        if not ids:
+            self.db.rollback()
+            return []
+        # Compare-and-set, so concurrent claims stay exclusive without row locks.
+        self.db.execute(
+            update(IngestEvent)
+            .where(IngestEvent.id.in_(ids), free)
+            .values(lease_owner=owner, lease_expires_at=now + timedelta(seconds=lease_seconds))
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        stmt = (
+            select(IngestEvent)
+            .where(IngestEvent.id.in_(ids), IngestEvent.lease_owner == owner)
+            .order_by(IngestEvent.id)
+        )
+        return list(self.db.scalars(stmt))
+
+    def fail(self, event_id: int, max_attempts: int, retry_seconds: float) -> bool:
+        """Count a failed write of one event and commit.
+
+        The event is retried once ``retry_seconds`` (doubled per earlier
+        failure) have passed, or dead-lettered after ``max_attempts``
+        failures; returns whether it was dead-lettered.
+        """
+        event = self.db.get(IngestEvent, event_id)
+        if event is None:
+            return False
+        event.attempts += 1
+        event.lease_owner = None
+        if event.attempts >= max_attempts:
+            event.status = INGEST_STATUS_DEAD
+            event.lease_expires_at = None
+        else:
+            delay = retry_seconds * 2 ** (event.attempts - 1)
+            event.lease_expires_at = datetime.utcnow() + timedelta(seconds=delay)
+        self.db.commit()
+        return event.status == INGEST_STATUS_DEAD
+
+    def delete(self, ids: Iterable[int]) -> None:
+        """Forget events whose assets are written."""
+        self._execute_ids(
+            lambda chunk: delete(IngestEvent)
+            .where(IngestEvent.id.in_(chunk))
+            .execution_options(synchronize_session=False),
+            ids,
+        )
+
+    def _execute_ids(self, statement: Any, ids: Iterable[int]) -> None:
+        ids = list(ids)
+        for start in range(0, len(ids), _CHUNK_SIZE):
+            self.db.execute(statement(ids[start : start + _CHUNK_SIZE]))
+        self.db.commit()
@@ -1,12 +1,311 @@
+from collections.abc import Sequence
+from datetime import datetime, timedelta
 from typing import Any
+
+from sqlalchemy import case, func, select, update
 from sqlalchemy.orm import Session
 
+from app.models.orm.job import (
+    JOB_STATUS_CANCELLED,
+    JOB_STATUS_FAILED,
+    JOB_STATUS_QUEUED,
+    JOB_STATUS_RUNNING,
+    JOB_STATUS_SUCCEEDED,
+    Job,
+)
+
+# How many times claim_next retries after losing a race for a candidate.
+CLAIM_ATTEMPTS = 5
+
+# Sentinel for claim_next: do not filter by tenant (None means "no tenant").
+ANY_TENANT: Any = object()
+
+
 class JobRepository:
-    """Data access for jobs."""
+    """Data access for jobs.
+
+    The jobs table is the source of truth for the queue. Workers claim jobs
+    with a lease: ``SELECT ... FOR UPDATE SKIP LOCKED`` on PostgreSQL, plus
+    a compare-and-set ``UPDATE`` that keeps claims exclusive on databases
+    without row locks (SQLite).
+    """
 
     def __init__(self, db: Session):
         self.db = db
 
-    def list_jobs(self) -> list[Any]:
-        """TODO: Implement query."""
-        raise NotImplementedError
+    def create(
+        self,
+        type: str,
+        payload: dict[str, Any],
+        priority: int = 0,
+        project_id: int | None = None,
+        tenant_id: int | None = None,
+        created_by: int | None = None,
+        max_attempts: int = 3,
+    ) -> Job:
+        """Create and persist a queued job."""
+        job = Job(
+            type=type,
+            payload=payload,
+            priority=priority,
+            project_id=project_id,
+            tenant_id=tenant_id,
+            created_by=created_by,
+            max_attempts=max_attempts,
+            status=JOB_STATUS_QUEUED,
+        )
+        self.db.add(job)
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+
+    def get(self, job_id: int) -> Job | None:
+        """Fetch a job by id."""
+        return self.db.get(Job, job_id)
+
+    def list_jobs(
+        self,
+        project_id: int | None = None,
+        status: str | None = None,
+        limit: int = 50,
+        before_id: int | None = None,
+        tenant_id: int | None = None,
+        created_by: int | None = None,
+    ) -> Sequence[Job]:
+        """Return jobs newest first, optionally filtered, paging by ``before_id``.
+
+        ``tenant_id`` limits the list to that tenant's jobs; without it,
+        ``created_by`` limits it to that user's jobs outside any tenant.
+        """
+        stmt = select(Job)
+        if tenant_id is not None:
+            stmt = stmt.where(Job.tenant_id == tenant_id)
+        elif created_by is not None:
+            stmt = stmt.where(Job.tenant_id.is_(None), Job.created_by == created_by)
+        if project_id is not None:
+            stmt = stmt.where(Job.project_id == project_id)
+        if status is not None:
+            stmt = stmt.where(Job.status == status)
+        if before_id is not None:
+            stmt = stmt.where(Job.id < before_id)
+        return self.db.scalars(stmt.order_by(Job.id.desc()).limit(limit)).all()
+
+    def claim_next(
+        self,
+        worker_id: str,
+        lease_seconds: float,
+        job_types: Sequence[str] | None = None,
+        tenant_id: int | None = ANY_TENANT,
+        exclude_project_ids: Sequence[int] = (),
+    ) -> Job | None:
+        """Lease the highest-priority queued job to ``worker_id``, if any.
+
+        ``tenant_id`` restricts the claim to one tenant and
+        ``exclude_project_ids`` skips projects that are at their quota.
+        """
+        for _ in range(CLAIM_ATTEMPTS):
+            stmt = select(Job.id).where(Job.status == JOB_STATUS_QUEUED)
+            if job_types:
+                stmt = stmt.where(Job.type.in_(job_types))
+            if tenant_id is not ANY_TENANT:
+                stmt = stmt.where(_tenant_is(tenant_id))
+            if exclude_project_ids:
+                stmt = stmt.where(
+                    Job.project_id.is_(None) | Job.project_id.not_in(exclude_project_ids)
+                )
+            stmt = (
+                stmt.order_by(Job.priority.desc(), Job.id)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+            job_id = self.db.scalars(stmt).first()
+            if job_id is None:
+                self.db.rollback()
+                return None
+            if self._lease(job_id, worker_id, lease_seconds):
+                return self.get(job_id)
+        return None
+
+    def tenant_loads(
+        self,
+        job_types: Sequence[str] | None = None,
+    ) -> list[tuple[int | None, int, int, datetime | None]]:
+        """Per tenant: ``(tenant_id, queued, running, oldest queued created_at)``."""
+        is_queued = Job.status == JOB_STATUS_QUEUED
+        stmt = (
+            select(
+                Job.tenant_id,
+                func.sum(case((is_queued, 1), else_=0)),
+                func.sum(case((Job.status == JOB_STATUS_RUNNING, 1), else_=0)),
+                func.min(case((is_queued, Job.created_at), else_=None)),
+            )
+            .where(Job.status.in_([JOB_STATUS_QUEUED, JOB_STATUS_RUNNING]))
+            .group_by(Job.tenant_id)
+        )
+        if job_types:
+            stmt = stmt.where(Job.type.in_(job_types))
+        return [
+            (tenant_id, int(queued or 0), int(running or 0), oldest)
+            for tenant_id, queued, running, oldest in self.db.execute(stmt)
+        ]
+
+    def projects_at_capacity(self, max_running: int) -> list[int]:
+        """Return projects that already run ``max_running`` jobs or more."""
+        stmt = (
+            select(Job.project_id)
+            .where(Job.status == JOB_STATUS_RUNNING, Job.project_id.is_not(None))
+            .group_by(Job.project_id)
+            .having(func.count() >= max_running)
+        )
+        return list(self.db.scalars(stmt))
+
+    def count_queued(self, tenant_id: int | None) -> int:
+        """Number of queued jobs of one tenant."""
+        stmt = select(func.count()).select_from(Job).where(
+            Job.status == JOB_STATUS_QUEUED,
+            _tenant_is(tenant_id),
+        )
+        return int(self.db.scalar(stmt) or 0)
+
+    def recent_starts(
+        self,
+        since: datetime,
+    ) -> Sequence[tuple[int | None, datetime, datetime]]:
+        """``(tenant_id, created_at, started_at)`` of jobs started after ``since``."""
+        stmt = select(Job.tenant_id, Job.created_at, Job.started_at).where(
+            Job.started_at >= since
+        )
+        return [tuple(row) for row in self.db.execute(stmt)]
+
+    def changed_since(
+        self,
+        since: datetime | None,
+        job_ids: Sequence[int] = (),
+        project_ids: Sequence[int] = (),
+        limit: int = 500,
+    ) -> Sequence[Job]:
+        """Jobs of the given ids or projects updated at or after ``since``."""
+        if not job_ids and not project_ids:
+            return []
+        stmt = select(Job).where(Job.id.in_(job_ids) | Job.project_id.in_(project_ids))
+        if since is not None:
+            stmt = stmt.where(Job.updated_at >= since)
+        return self.db.scalars(stmt.order_by(Job.updated_at, Job.id).limit(limit)).all()
+
+    def latest_update(self) -> datetime | None:
+        """The most recent ``updated_at`` in the table."""
+        return self.db.scalar(select(func.max(Job.updated_at)))
+
+    def _lease(self, job_id: int, worker_id: str, lease_seconds: float) -> bool:
+        now = datetime.utcnow()
+        claimed = self.db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == JOB_STATUS_QUEUED)
+            .values(
+                status=JOB_STATUS_RUNNING,
+                lease_owner=worker_id,
+                lease_expires_at=now + timedelta(seconds=lease_seconds),
+                attempts=Job.attempts + 1,
+                started_at=now,
+            )
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        self.db.commit()
+        return claimed == 1
+
+    def heartbeat(
+        self,
+        job_id: int,
+        worker_id: str,
+        lease_seconds: float,
+        progress: dict[str, Any] | None = None,
+    ) -> bool:
+        """Extend a lease (and record progress); False if the lease was lost."""
+        values: dict[str, Any] = {
+            "lease_expires_at": datetime.utcnow() + timedelta(seconds=lease_seconds),
+        }
+        if progress is not None:
+            values["progress"] = progress
+        return self._update_owned(job_id, worker_id, **values)
+
+    def complete(self, job_id: int, worker_id: str, result: dict[str, Any] | None) -> bool:
+        """Mark a leased job as succeeded."""
+        return self._update_owned(
+            job_id,
+            worker_id,
+            status=JOB_STATUS_SUCCEEDED,
+            result=result,
+            finished_at=datetime.utcnow(),
+            lease_owner=None,
+            lease_expires_at=None,
+        )
+
+    def fail(self, job_id: int, worker_id: str, error: str) -> bool:
+        """Record a failed attempt; requeue the job unless attempts are exhausted."""
+        job = self.get(job_id)
+        if job is None or job.lease_owner != worker_id:
+            return False
+        retry = job.attempts < job.max_attempts
+        return self._update_owned(
+            job_id,
+            worker_id,
+            status=JOB_STATUS_QUEUED if retry else JOB_STATUS_FAILED,
+            error=error,
+            finished_at=None if retry else datetime.utcnow(),
+            lease_owner=None,
+            lease_expires_at=None,
+        )
+
+    def cancel(self, job_id: int) -> bool:
+        """Cancel a job that has not started yet."""
+        cancelled = self.db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == JOB_STATUS_QUEUED)
+            .values(status=JOB_STATUS_CANCELLED, finished_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        self.db.commit()
+        return cancelled == 1
+
+    def requeue_expired(self) -> int:
+        """Return jobs whose worker stopped renewing its lease to the queue."""
+        now = datetime.utcnow()
+        expired = (Job.status == JOB_STATUS_RUNNING) & (Job.lease_expires_at < now)
+        requeued = self.db.execute(
+            update(Job)
+            .where(expired, Job.attempts < Job.max_attempts)
+            .values(status=JOB_STATUS_QUEUED, lease_owner=None, lease_expires_at=None)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        self.db.execute(
+            update(Job)
+            .where(expired, Job.attempts >= Job.max_attempts)
+            .values(
+                status=JOB_STATUS_FAILED,
+                error="Lease expired",
+                finished_at=now,
+                lease_owner=None,
+                lease_expires_at=None,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        return requeued
+
+    def _update_owned(self, job_id: int, worker_id: str, **values: Any) -> bool:
+        updated = self.db.execute(
+            update(Job)
+            .where(
+                Job.id == job_id,
+                Job.status == JOB_STATUS_RUNNING,
+                Job.lease_owner == worker_id,
+            )
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        self.db.commit()
+        return updated == 1
+
+
+def _tenant_is(tenant_id: int | None):
+    return Job.tenant_id.is_(None) if tenant_id is None else Job.tenant_id == tenant_id
@@ -0,0 +1,29 @@
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+
+from app.models.orm.prediction import Prediction
+
+
+class PredictionRepository:
+    """Data access for model predictions."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def bulk_insert(self, rows: Sequence[Mapping[str, Any]]) -> None:
+        """Insert many predictions with one executemany round trip."""
+        if not rows:
+            return
+        self.db.execute(insert(Prediction), list(rows))
+        self.db.commit()
+
+    def delete_for_job(self, job_id: int) -> int:
+        """Remove the predictions of a job, e.g. before it is retried."""
+        deleted = self.db.execute(
+            delete(Prediction).where(Prediction.job_id == job_id)
+        ).rowcount
+        self.db.commit()
+        return deleted
@@ -1,9 +1,26 @@
 from collections.abc import Sequence
 from typing import Any
 
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models.orm.project import Project
+from app.repositories.resource_version_repository import (
+    AsyncResourceVersionRepository,
+    ResourceVersionRepository,
+    projects_scope,
+)
+
+
+def _owned_projects(tenant_id: int | None, created_by: int | None) -> Select:
+    """Projects of a tenant, or without one, the user's projects outside any tenant."""
+    stmt = select(Project)
+    if tenant_id is not None:
+        stmt = stmt.where(Project.tenant_id == tenant_id)
+    else:
+        stmt = stmt.where(Project.tenant_id.is_(None), Project.created_by == created_by)
+    return stmt.order_by(Project.id)
 
 
 class ProjectRepository:
@@ -12,14 +29,70 @@ class ProjectRepository:
     def __init__(self, db: Session):
         self.db = db
 
-    def create(self, name: str, description: str | None = None) -> Project:
+    def create(
+        self,
+        name: str,
+        description: str | None = None,
+        tenant_id: int | None = None,
+        created_by: int | None = None,
+    ) -> Project:
         """Create and persist a project."""
-        project = Project(name=name, description=description)
+        project = Project(
+            name=name,
+            description=description,
+            tenant_id=tenant_id,
+            created_by=created_by,
+        )
         self.db.add(project)
+        ResourceVersionRepository(self.db).bump(projects_scope(tenant_id, created_by))
         self.db.commit()
         self.db.refresh(project)
         return project
 
-    def list_projects(self) -> Sequence[Project]:
-        """TODO: Implement filters (tenant, user) later."""
-        return self.db.query(Project).all()
+    def list_projects(
+        self,
+        tenant_id: int | None = None,
+        created_by: int | None = None,
+    ) -> Sequence[Project]:
+        """List one owner's projects by id; see ``_owned_projects``."""
+        return self.db.scalars(_owned_projects(tenant_id, created_by)).all()
+
+
+class AsyncProjectRepository:
+    """Async data access for projects."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create(
+        self,
+        name: str,
+        description: str | None = None,
+        tenant_id: int | None = None,
+        created_by: int | None = None,
+    ) -> Project:
+        """Create and persist a project."""
+        project = Project(
+            name=name,
+            description=description,
+            tenant_id=tenant_id,
+            created_by=created_by,
+        )
+        self.db.add(project)
+        await AsyncResourceVersionRepository(self.db).bump(projects_scope(tenant_id, created_by))
+        await self.db.commit()
+        await self.db.refresh(project)
+        return project
+
+    async def get(self, project_id: int) -> Project | None:
+        """Fetch a project by id."""
+        return await self.db.get(Project, project_id)
+
+    async def list_projects(
+        self,
+        tenant_id: int | None = None,
+        created_by: int | None = None,
+    ) -> Sequence[Project]:
+        """List one owner's projects by id; see ``_owned_projects``."""
+        result = await self.db.scalars(_owned_projects(tenant_id, created_by))
+        return result.all()
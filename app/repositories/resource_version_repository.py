@@ -0,0 +1,69 @@
+"""Change counters behind conditional GETs of list endpoints.
+
+Each write that changes what a listing returns bumps that listing's
+counter in the same transaction, so a reader can tell whether anything
+changed with one primary-key lookup instead of re-reading the rows. The
+bump is staged on the caller's session and committed with its write.
+"""
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.orm.resource_version import ResourceVersion
+
+def projects_scope(tenant_id: int | None, created_by: int | None) -> str:
+    """Scope of one owner's project listing: a tenant, or a user outside any tenant."""
+    if tenant_id is not None:
+        return f"projects:tenant:{tenant_id}"
+    return f"projects:user:{created_by}"
+
+
+def datasets_scope(project_id: int) -> str:
+    return f"datasets:{project_id}"
+
+
+def _bump(scope: str, dialect: str):
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    stmt = insert(ResourceVersion).values(scope=scope, version=1, updated_at=datetime.utcnow())
+    return stmt.on_conflict_do_update(
+        index_elements=[ResourceVersion.scope],
+        set_={
+            "version": ResourceVersion.version + 1,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+
+
+class ResourceVersionRepository:
+    """Data access for listing change counters."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, scope: str) -> int:
+        """Current version of a scope; 0 if it never changed."""
+        stmt = select(ResourceVersion.version).where(ResourceVersion.scope == scope)
+        return int(self.db.scalar(stmt) or 0)
+
+    def bump(self, scope: str) -> None:
+        """Stage a version increment; it commits with the caller's transaction."""
+        self.db.execute(_bump(scope, self.db.get_bind().dialect.name))
+
+
+class AsyncResourceVersionRepository:
+    """Async data access for listing change counters."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get(self, scope: str) -> int:
+        """Current version of a scope; 0 if it never changed."""
+        stmt = select(ResourceVersion.version).where(ResourceVersion.scope == scope)
+        return int(await self.db.scalar(stmt) or 0)
+
+    async def bump(self, scope: str) -> None:
+        """Stage a version increment; it commits with the caller's transaction."""
+        await self.db.execute(_bump(scope, self.db.get_bind().dialect.name))
@@ -1,6 +1,8 @@
 # app/repositories/user_repository.py
 from typing import Optional
 
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models.orm.user import User
@@ -50,3 +52,54 @@ class UserRepository:
         self._db.commit()
         self._db.refresh(user)
         return user
+
+
+class AsyncUserRepository:
+    def __init__(self, db: AsyncSession) -> None:
+        self._db = db
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        return await self._first(select(User).where(User.email == email))
+
+    async def get_by_google_id(self, google_id: str) -> Optional[User]:
+        return await self._first(select(User).where(User.google_id == google_id))
+
+    async def get_by_github_id(self, github_id: str) -> Optional[User]:
+        return await self._first(select(User).where(User.github_id == github_id))
+
+    async def create(
+        self,
+        email: str,
+        password_hash: str | None = None,
+        google_id: str | None = None,
+        github_id: str | None = None,
+    ) -> User:
+        user = User(
+            email=email,
+            password_hash=password_hash,
+            google_id=google_id,
+            github_id=github_id,
+        )
+        return await self._save(user)
+
+    async def link_google_account(self, user: User, google_id: str) -> User:
+        user.google_id = google_id
+        return await self._save(user)
+
+    async def link_github_account(self, user: User, github_id: str) -> User:
+        user.github_id = github_id
+        return await self._save(user)
+
+    async def update_password_hash(self, user: User, password_hash: str) -> User:
+        user.password_hash = password_hash
+        return await self._save(user)
+
+    async def _first(self, stmt) -> Optional[User]:
+        result = await self._db.scalars(stmt.limit(1))
+        return result.first()
+
+    async def _save(self, user: User) -> User:
+        self._db.add(user)
+        await self._db.commit()
+        await self._db.refresh(user)
+        return user
@@ -0,0 +1,102 @@
+from collections.abc import Iterator, Sequence
+from datetime import datetime, timezone
+from typing import Any
+
+from app.core import rle
+from app.models.schemas.annotation import AnnotationWrite
+from app.repositories.annotation_repository import AnnotationRepository
+from app.repositories.asset_repository import AssetRepository
+from app.repositories.dataset_repository import DatasetRepository
+
+
+class AnnotationService:
+    """Bulk writes and dataset-wide reads of annotations."""
+
+    def __init__(
+        self,
+        annotation_repo: AnnotationRepository,
+        asset_repo: AssetRepository,
+        dataset_repo: DatasetRepository,
+    ):
+        self._annotation_repo = annotation_repo
+        self._asset_repo = asset_repo
+        self._dataset_repo = dataset_repo
+
+    def upsert(self, dataset_id: int, annotations: Sequence[AnnotationWrite]) -> int:
+        """Insert or update annotations of one dataset; return how many were written."""
+        self.ensure_dataset(dataset_id)
+        asset_ids = {annotation.asset_id for annotation in annotations}
+        missing = asset_ids - self._asset_repo.ids_in_dataset(dataset_id, asset_ids)
+        if missing:
+            shown = ", ".join(str(asset_id) for asset_id in sorted(missing)[:10])
+            raise ValueError(f"Assets not found in dataset {dataset_id}: {shown}")
+
+        now = datetime.now(timezone.utc)
+        # The last write of a key within one request wins.
+        rows = {
+            (annotation.asset_id, annotation.key): _row(dataset_id, annotation, now)
+            for annotation in annotations
+        }
+        return self._annotation_repo.upsert(list(rows.values()))
+
+    def stream_dataset(self, dataset_id: int) -> Iterator[dict[str, Any]]:
+        """Yield every annotation of a dataset, grouped by asset, as JSON-ready dicts."""
+        for row in self._annotation_repo.stream_dataset(dataset_id):
+            yield _record(row)
+
+    def ensure_dataset(self, dataset_id: int) -> None:
+        if self._dataset_repo.get(dataset_id) is None:
+            raise ValueError(f"Dataset {dataset_id} not found")
+
+
+def _row(dataset_id: int, annotation: AnnotationWrite, now: datetime) -> dict[str, Any]:
+    bbox = annotation.bbox
+    geometry = None
+    if annotation.kind == "polygon" and annotation.points:
+        geometry = {"points": [list(point) for point in annotation.points]}
+        if bbox is None:
+            xs = [x for x, _ in annotation.points]
+            ys = [y for _, y in annotation.points]
+            bbox = [min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys)]
+    elif annotation.kind == "mask" and annotation.mask is not None:
+        geometry = annotation.mask.model_dump()
+        if bbox is None:
+            bbox = rle.bbox(geometry)
+    return {
+        "dataset_id": dataset_id,
+        "asset_id": annotation.asset_id,
+        "key": annotation.key,
+        "kind": annotation.kind,
+        "label": annotation.label,
+        "score": annotation.score,
+        "bbox": bbox,
+        "geometry": geometry,
+        "attributes": annotation.attributes,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def _record(row: Any) -> dict[str, Any]:
+    # Plain dicts rather than AnnotationRead: validating every row through
+    # pydantic would dominate the cost of streaming a large dataset.
+    record: dict[str, Any] = {
+        "id": row.id,
+        "asset_id": row.asset_id,
+        "key": row.key,
+        "kind": row.kind,
+        "label": row.label,
+    }
+    if row.score is not None:
+        record["score"] = row.score
+    if row.bbox is not None:
+        record["bbox"] = row.bbox
+    if row.geometry is not None:
+        if row.kind == "polygon":
+            record["points"] = row.geometry["points"]
+        elif row.kind == "mask":
+            record["mask"] = row.geometry
+    if row.attributes is not None:
+        record["attributes"] = row.attributes
+    record["updated_at"] = row.updated_at.isoformat() if row.updated_at else None
+    return record
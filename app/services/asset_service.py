@@ -1,8 +1,46 @@
-from typing import Any
+from collections.abc import Sequence
+
+from app.core.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from app.models.orm.asset import Asset
+from app.repositories.asset_repository import AssetRepository
+from app.repositories.dataset_repository import DatasetRepository
+
 
 class AssetService:
     """Service for asset operations (listing, presigning, etc.)."""
 
-    def list_assets(self, dataset_id: int) -> list[Any]:
-        """TODO: Implement using AssetRepository."""
-        raise NotImplementedError
+    def __init__(self, asset_repo: AssetRepository, dataset_repo: DatasetRepository):
+        self._asset_repo = asset_repo
+        self._dataset_repo = dataset_repo
+
+    def list_assets(
+        self,
+        dataset_id: int,
+        limit: int = 100,
+        cursor: str | None = None,
+        status: str | None = None,
+    ) -> tuple[Sequence[Asset], str | None]:
+        """Return one page of a dataset's assets and the cursor of the next page."""
+        if self._dataset_repo.get(dataset_id) is None:
+            raise ValueError(f"Dataset {dataset_id} not found")
+
+        after_id = None
+        if cursor is not None:
+            position = decode_cursor(cursor)
+            after_id = position.get("id")
+            if not isinstance(after_id, int) or position.get("dataset_id") != dataset_id:
+                raise InvalidCursorError("Cursor does not belong to this listing")
+
+        # Fetch one extra row to learn whether another page exists.
+        rows = self._asset_repo.list_assets(
+            dataset_id=dataset_id,
+            limit=limit + 1,
+            after_id=after_id,
+            status=status,
+        )
+        if len(rows) <= limit:
+            return rows, None
+
+        page = rows[:limit]
+        next_cursor = encode_cursor({"dataset_id": dataset_id, "id": page[-1].id})
+        return page, next_cursor
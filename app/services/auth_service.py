@@ -1,6 +1,7 @@
 # app/services/auth_service.py
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timedelta
 import secrets
 from typing import Any, Callable, Literal
@@ -11,16 +12,16 @@ from fastapi import HTTPException, status
 from jose import JWTError, jwt
 
 from app.core.config import settings
+from app.infrastructure.http import http_clients, request_with_retry
 from app.core.security import (
     AuthUser,
-    verify_password,
-    hash_password,
+    password_hasher,
     create_access_token,
     create_refresh_token,
 )
 from app.models.orm.user import User
 from app.models.schemas.auth import LoginRequest, RegisterRequest, TokenResponse
-from app.repositories.user_repository import UserRepository
+from app.repositories.user_repository import AsyncUserRepository
 
 GOOGLE_AUTH_URL = "https://accounts.google.com/o/oauth2/v2/auth"
 GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
@@ -43,39 +44,55 @@ OAuthProvider = Literal["google", "github"]
 class AuthService:
     """Authentication and token management service."""
 
-    def __init__(self, user_repo: UserRepository) -> None:
+    def __init__(
+        self,
+        user_repo: AsyncUserRepository,
+        http_client: httpx.AsyncClient | None = None,
+    ) -> None:
         self._user_repo = user_repo
+        self._http = http_client or http_clients.get()
 
     async def register(self, payload: RegisterRequest) -> TokenResponse:
-        existing_user = self._user_repo.get_by_email(payload.email)
+        existing_user = await self._user_repo.get_by_email(payload.email)
         if existing_user:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="Email already registered",
             )
 
-        password_hash = hash_password(payload.password)
-        user = self._user_repo.create(
+        password_hash = await password_hasher.hash(payload.password)
+        user = await self._user_repo.create(
             email=payload.email,
             password_hash=password_hash,
         )
         return self._issue_tokens(user)
 
     async def login(self, payload: LoginRequest) -> TokenResponse:
-        user = self._user_repo.get_by_email(payload.email)
+        user = await self._user_repo.get_by_email(payload.email)
 
-        if (
-            not user
-            or not user.password_hash
-            or not verify_password(payload.password, user.password_hash)
-        ):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid email or password",
-            )
+        if not user or not user.password_hash:
+            raise self._invalid_credentials()
+
+        valid, new_hash = await password_hasher.verify_and_update(
+            payload.password,
+            user.password_hash,
+        )
+        if not valid:
+            raise self._invalid_credentials()
+
+        if new_hash:
+            # The configured bcrypt cost changed since this hash was stored.
+            user = await self._user_repo.update_password_hash(user, new_hash)
 
         return self._issue_tokens(user)
 
+    @staticmethod
+    def _invalid_credentials() -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid email or password",
+        )
+
     async def refresh(self, refresh_token: str) -> TokenResponse:
         from app.core.security import decode_token  # avoid cycle at top-level
 
@@ -184,7 +201,7 @@ class AuthService:
                 detail="Google email must be verified",
             )
 
-        user = self._get_or_create_google_user(email=email, google_id=google_id)
+        user = await self._get_or_create_google_user(email=email, google_id=google_id)
         return self._issue_tokens(user)
 
     async def login_with_github_code(self, code: str) -> TokenResponse:
@@ -196,7 +213,16 @@ class AuthService:
                 detail="Missing GitHub access token",
             )
 
-        profile = await self._fetch_github_userinfo(access_token)
+        # The email list is only needed when the profile hides the address,
+        # but fetching both at once saves a sequential round trip.
+        profile, primary_email = await asyncio.gather(
+            self._fetch_github_userinfo(access_token),
+            self._fetch_github_primary_email(access_token),
+            return_exceptions=True,
+        )
+        if isinstance(profile, BaseException):
+            raise profile
+
         github_id = profile.get("id")
         email = profile.get("email")
         github_id_str: str
@@ -211,14 +237,16 @@ class AuthService:
             )
 
         if not isinstance(email, str) or not email:
-            email = await self._fetch_github_primary_email(access_token)
+            if isinstance(primary_email, BaseException):
+                raise primary_email
+            email = primary_email
         if not isinstance(email, str) or not email:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="GitHub account must expose a verified email",
             )
 
-        user = self._get_or_create_github_user(email=email, github_id=github_id_str)
+        user = await self._get_or_create_github_user(email=email, github_id=github_id_str)
         return self._issue_tokens(user)
 
     def _issue_tokens(self, user: User) -> TokenResponse:
@@ -388,6 +416,28 @@ class AuthService:
         rebuilt = parsed._replace(fragment=fragment)
         return urlunparse(rebuilt)
 
+    async def _send(
+        self,
+        provider: OAuthProvider,
+        method: str,
+        url: str,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        timeout = (
+            settings.google_oauth_timeout_seconds
+            if provider == "google"
+            else settings.github_oauth_timeout_seconds
+        )
+        return await request_with_retry(
+            self._http,
+            method,
+            url,
+            timeout=timeout,
+            retries=settings.oauth_http_retries,
+            backoff=settings.oauth_http_backoff_seconds,
+            **kwargs,
+        )
+
     async def _exchange_google_code(self, code: str) -> dict[str, Any]:
         client_id, client_secret, redirect_uri = self._require_google_settings()
         data = {
@@ -399,13 +449,14 @@ class AuthService:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    GOOGLE_TOKEN_URL,
-                    data=data,
-                    headers={"Content-Type": "application/x-www-form-urlencoded"},
-                )
-                response.raise_for_status()
+            response = await self._send(
+                "google",
+                "POST",
+                GOOGLE_TOKEN_URL,
+                data=data,
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+            )
+            response.raise_for_status()
         except httpx.HTTPStatusError as exc:
             raise HTTPException(
                 status_code=status.HTTP_502_BAD_GATEWAY,
@@ -429,9 +480,8 @@ class AuthService:
     async def _fetch_google_userinfo(self, access_token: str) -> dict[str, Any]:
         headers = {"Authorization": f"Bearer {access_token}"}
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(GOOGLE_USERINFO_URL, headers=headers)
-                response.raise_for_status()
+            response = await self._send("google", "GET", GOOGLE_USERINFO_URL, headers=headers)
+            response.raise_for_status()
         except httpx.HTTPStatusError as exc:
             raise HTTPException(
                 status_code=status.HTTP_502_BAD_GATEWAY,
@@ -451,16 +501,16 @@ class AuthService:
             )
         return payload
 
-    def _get_or_create_google_user(self, email: str, google_id: str) -> User:
-        user = self._user_repo.get_by_google_id(google_id)
+    async def _get_or_create_google_user(self, email: str, google_id: str) -> User:
+        user = await self._user_repo.get_by_google_id(google_id)
         if user:
             return user
 
-        existing_email_user = self._user_repo.get_by_email(email)
+        existing_email_user = await self._user_repo.get_by_email(email)
         if existing_email_user:
-            return self._user_repo.link_google_account(existing_email_user, google_id)
+            return await self._user_repo.link_google_account(existing_email_user, google_id)
 
-        return self._user_repo.create(email=email, google_id=google_id)
+        return await self._user_repo.create(email=email, google_id=google_id)
 
     async def _exchange_github_code(self, code: str) -> dict[str, Any]:
         client_id, client_secret, redirect_uri = self._require_github_settings()
@@ -472,13 +522,14 @@ class AuthService:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    GITHUB_TOKEN_URL,
-                    data=data,
-                    headers={"Accept": "application/json"},
-                )
-                response.raise_for_status()
+            response = await self._send(
+                "github",
+                "POST",
+                GITHUB_TOKEN_URL,
+                data=data,
+                headers={"Accept": "application/json"},
+            )
+            response.raise_for_status()
         except httpx.HTTPStatusError as exc:
             raise HTTPException(
                 status_code=status.HTTP_502_BAD_GATEWAY,
@@ -504,9 +555,8 @@ class AuthService:
             "Accept": "application/vnd.github+json",
         }
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(GITHUB_USERINFO_URL, headers=headers)
-                response.raise_for_status()
+            response = await self._send("github", "GET", GITHUB_USERINFO_URL, headers=headers)
+            response.raise_for_status()
         except httpx.HTTPStatusError as exc:
             raise HTTPException(
                 status_code=status.HTTP_502_BAD_GATEWAY,
@@ -532,9 +582,8 @@ class AuthService:
             "Accept": "application/vnd.github+json",
         }
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(GITHUB_EMAILS_URL, headers=headers)
-                response.raise_for_status()
+            response = await self._send("github", "GET", GITHUB_EMAILS_URL, headers=headers)
+            response.raise_for_status()
         except httpx.HTTPStatusError as exc:
             raise HTTPException(
                 status_code=status.HTTP_502_BAD_GATEWAY,
@@ -574,13 +623,13 @@ class AuthService:
         any_verified = pick_email(payload, lambda entry: entry.get("verified") is True)
         return any_verified
 
-    def _get_or_create_github_user(self, email: str, github_id: str) -> User:
-        user = self._user_repo.get_by_github_id(github_id)
+    async def _get_or_create_github_user(self, email: str, github_id: str) -> User:
+        user = await self._user_repo.get_by_github_id(github_id)
         if user:
             return user
 
-        existing_email_user = self._user_repo.get_by_email(email)
+        existing_email_user = await self._user_repo.get_by_email(email)
         if existing_email_user:
-            return self._user_repo.link_github_account(existing_email_user, github_id)
+            return await self._user_repo.link_github_account(existing_email_user, github_id)
 
-        return self._user_repo.create(email=email, github_id=github_id)
+        return await self._user_repo.create(email=email, github_id=github_id)
@@ -0,0 +1,425 @@
+# app/services/ingest_service.py
+"""Record objects that land in storage as asset rows.
+
+MinIO (or any S3-compatible store) posts bucket notifications to the ingest
+webhook. Events are parsed here and stored in the ``ingest_events`` table
+before the webhook answers, so an acknowledged notification survives a
+crash or restart. A background task writes stored events as assets in
+batches, so ingesting 100k objects costs a few hundred bulk upserts rather
+than 100k single-row commits.
+
+Objects under ``datasets/{id}/`` become asset rows. Objects under
+``blobs/incoming/{project_id}/`` are content-addressed uploads (see
+``PresignService.presign_content_batch``): they are copied to their blob
+key unless that is stored already, the upload is deleted, and the assets
+of that project waiting for the content become ``uploaded``. Notifications
+for blob keys themselves are ignored, so one project's upload never
+releases another project's assets.
+
+With ``thumbnail_on_ingest`` each written batch also queues one
+``thumbnails`` job for the images in it (see ``app.workers.thumbnails``).
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import mimetypes
+import os
+import re
+import socket
+import uuid
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+from urllib.parse import unquote_plus
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.infrastructure.queue import get_job_broker
+from app.infrastructure.storage import StorageClient, storage_registry
+from app.models.orm.blob import BLOB_STATUS_STORED, blob_object_key
+from app.repositories.asset_repository import AssetRepository
+from app.repositories.blob_repository import BlobRepository
+from app.repositories.dataset_repository import DatasetRepository
+from app.repositories.ingest_event_repository import IngestEventRepository
+from app.repositories.job_repository import JobRepository
+from app.models.orm.ingest_event import IngestEvent
+from app.services.job_events import job_event
+
+logger = logging.getLogger(__name__)
+
+DATASET_KEY_PATTERN = re.compile(r"^datasets/(?P<dataset_id>\d+)/(?P<name>.+)$")
+BLOB_UPLOAD_KEY_PATTERN = re.compile(
+    r"^blobs/incoming/(?P<project_id>\d+)/(?P<sha256>[0-9a-f]{64})$"
+)
+
+# Derivatives are background work; jobs users submit go first.
+_THUMBNAIL_JOB_PRIORITY = -10
+
+
+@dataclass(frozen=True)
+class ObjectCreated:
+    """An object that finished uploading under a dataset or the blob upload prefix."""
+
+    dataset_id: int | None  # None for content-addressed uploads
+    object_key: str
+    size_bytes: int | None
+    mime_type: str | None
+    event_time: datetime
+    blob_sha256: str | None = None
+
+    @property
+    def blob_project_id(self) -> int | None:
+        """The project a content-addressed upload was made for."""
+        match = BLOB_UPLOAD_KEY_PATTERN.match(self.object_key)
+        return int(match.group("project_id")) if match else None
+
+
+class IngestBackpressureError(RuntimeError):
+    """Raised when too many events are waiting to be written."""
+
+
+# A claimed batch is retried by any flusher after this long without being written.
+_CLAIM_SECONDS = 300.0
+
+
+def parse_bucket_notification(
+    payload: Mapping[str, Any],
+    bucket: str | None = None,
+) -> tuple[list[ObjectCreated], int]:
+    """Extract object-created events for dataset keys from a notification body.
+
+    Returns the events and the number of records that were ignored (other
+    event types, other buckets or keys outside ``datasets/{id}/`` and
+    ``blobs/incoming/``).
+    """
+    records = payload.get("Records")
+    if not isinstance(records, list):
+        return [], 0
+
+    events: list[ObjectCreated] = []
+    ignored = 0
+    for record in records:
+        event = _parse_record(record, bucket)
+        if event is None:
+            ignored += 1
+        else:
+            events.append(event)
+    return events, ignored
+
+
+def _parse_record(record: Any, bucket: str | None) -> ObjectCreated | None:
+    if not isinstance(record, dict):
+        return None
+    event_name = record.get("eventName")
+    # MinIO reports "s3:ObjectCreated:Put", AWS "ObjectCreated:Put".
+    if not isinstance(event_name, str) or "ObjectCreated:" not in event_name:
+        return None
+
+    s3 = record.get("s3")
+    if not isinstance(s3, dict):
+        return None
+    record_bucket = (s3.get("bucket") or {}).get("name")
+    if bucket is not None and record_bucket != bucket:
+        return None
+
+    obj = s3.get("object") or {}
+    raw_key = obj.get("key")
+    if not isinstance(raw_key, str):
+        return None
+    key = unquote_plus(raw_key)
+    dataset_match = DATASET_KEY_PATTERN.match(key)
+    blob_match = BLOB_UPLOAD_KEY_PATTERN.match(key) if dataset_match is None else None
+    if dataset_match is None and blob_match is None:
+        return None
+
+    size = obj.get("size")
+    content_type = obj.get("contentType")
+    return ObjectCreated(
+        dataset_id=int(dataset_match.group("dataset_id")) if dataset_match else None,
+        object_key=key,
+        size_bytes=size if isinstance(size, int) else None,
+        mime_type=content_type if isinstance(content_type, str) and content_type else None,
+        event_time=_parse_event_time(record.get("eventTime")),
+        blob_sha256=blob_match.group("sha256") if blob_match else None,
+    )
+
+
+def _parse_event_time(value: Any) -> datetime:
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).replace(tzinfo=None)
+        except ValueError:
+            pass
+    return datetime.utcnow()
+
+
+class AssetIngestQueue:
+    """Store object-created events durably and write them as assets in batches.
+
+    ``submit`` stores events with one insert and returns once they are
+    committed. A background task started with ``start`` claims up to
+    ``batch_size`` stored events whenever that many were submitted or
+    ``flush_interval`` seconds have passed, and writes them as asset rows.
+    Claims are leases: events of a flusher that dies are written by any
+    API process once the lease ends. Repeated events for the same object
+    collapse into one row per batch, and writing an event twice is harmless.
+
+    When a batch fails, its events are written one at a time. An event
+    that fails on its own is retried with exponential back-off starting at
+    ``retry_seconds`` and dead-lettered after ``max_attempts`` failures, so
+    a poison event never holds up the events behind it.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_pending: int = 50_000,
+        claim_seconds: float = _CLAIM_SECONDS,
+        max_attempts: int = 8,
+        retry_seconds: float = 5.0,
+        storage_factory: Callable[[], StorageClient] | None = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._storage_factory = storage_factory or storage_registry.get
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._max_pending = max_pending
+        self._claim_seconds = claim_seconds
+        self._max_attempts = max_attempts
+        self._retry_seconds = retry_seconds
+        self._owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._submitted = 0
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    async def submit(self, events: Iterable[ObjectCreated]) -> int:
+        """Store events for ingestion; return how many were accepted."""
+        events = list(events)
+        if not events:
+            return 0
+        await asyncio.to_thread(self._store, events)
+        self._submitted += len(events)
+        if self._wakeup is not None and self._submitted >= self._batch_size:
+            self._wakeup.set()
+        return len(events)
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="asset-ingest")
+
+    async def stop(self) -> None:
+        """Stop the background task; stored events wait for the next flusher."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def flush(self) -> int:
+        """Write up to one batch of stored events; return how many were written."""
+        self._submitted = 0
+        return await asyncio.to_thread(self._flush_batch)
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                while await self.flush() == self._batch_size:
+                    pass
+            except Exception:
+                # Already logged; back off until the next interval.
+                continue
+
+    def _store(self, events: list[ObjectCreated]) -> None:
+        db = self._session_factory()
+        try:
+            repo = IngestEventRepository(db=db)
+            if self._max_pending and repo.count() + len(events) > self._max_pending:
+                raise IngestBackpressureError("Ingest backlog is full; retry later")
+            repo.add(
+                [
+                    {
+                        "object_key": event.object_key,
+                        "dataset_id": event.dataset_id,
+                        "blob_sha256": event.blob_sha256,
+                        "size_bytes": event.size_bytes,
+                        "mime_type": event.mime_type,
+                        "event_time": event.event_time,
+                    }
+                    for event in events
+                ]
+            )
+        finally:
+            db.close()
+
+    def _flush_batch(self) -> int:
+        db = self._session_factory()
+        try:
+            repo = IngestEventRepository(db=db)
+            claimed = repo.claim(self._owner, self._batch_size, self._claim_seconds)
+            if not claimed:
+                return 0
+            events = [(event.id, _object_created(event)) for event in claimed]
+            try:
+                self._write(db, _coalesce(event for _, event in events))
+            except Exception:
+                logger.warning(
+                    "Failed to ingest %d asset events; retrying them one by one",
+                    len(events),
+                    exc_info=True,
+                )
+                db.rollback()
+                return self._write_each(db, repo, events)
+            repo.delete(event_id for event_id, _ in events)
+            return len(events)
+        finally:
+            db.close()
+
+    def _write_each(
+        self,
+        db: Session,
+        repo: IngestEventRepository,
+        events: list[tuple[int, ObjectCreated]],
+    ) -> int:
+        """Write events one at a time, so one that keeps failing holds up no other."""
+        written: list[int] = []
+        for event_id, event in events:
+            try:
+                self._write(db, [event])
+            except Exception:
+                db.rollback()
+                if repo.fail(event_id, self._max_attempts, self._retry_seconds):
+                    logger.exception("Dead-lettered ingest event for %s", event.object_key)
+                else:
+                    logger.exception("Failed to ingest %s; will retry", event.object_key)
+                continue
+            written.append(event_id)
+        repo.delete(written)
+        return len(written)
+
+    def _write(self, db: Session, batch: list[ObjectCreated]) -> None:
+        blob_events = [event for event in batch if event.blob_project_id is not None]
+        if blob_events:
+            self._store_blobs(db, blob_events)
+        batch = [event for event in batch if event.dataset_id is not None]
+        known = DatasetRepository(db=db).existing_ids(event.dataset_id for event in batch)
+        rows = [
+            {
+                "dataset_id": event.dataset_id,
+                "object_key": event.object_key,
+                "size_bytes": event.size_bytes,
+                "mime_type": event.mime_type,
+                "created_at": event.event_time,
+            }
+            for event in batch
+            if event.dataset_id in known
+        ]
+        skipped = len(batch) - len(rows)
+        if skipped:
+            logger.warning("Dropped %d events for unknown datasets", skipped)
+        AssetRepository(db=db).upsert_uploaded(rows)
+        if settings.thumbnail_on_ingest:
+            self._queue_thumbnails(
+                db,
+                [
+                    blob_object_key(event.blob_sha256)
+                    for event in blob_events
+                    if _is_image(event.object_key, event.mime_type)
+                ]
+                + [
+                    row["object_key"]
+                    for row in rows
+                    if _is_image(row["object_key"], row["mime_type"])
+                ],
+            )
+
+    def _store_blobs(self, db: Session, events: list[ObjectCreated]) -> None:
+        """Move uploads to their blob keys and release the uploading projects' assets."""
+        storage = self._storage_factory()
+        repo = BlobRepository(db=db)
+        stored = {
+            sha
+            for sha, blob in repo.get_many(event.blob_sha256 for event in events).items()
+            if blob.status == BLOB_STATUS_STORED
+        }
+        by_project: dict[int, list[dict[str, Any]]] = {}
+        for event in events:
+            if event.blob_sha256 not in stored:
+                # The upload URL was bound to the digest, so the bytes match the key.
+                storage.copy_object(event.object_key, blob_object_key(event.blob_sha256))
+                stored.add(event.blob_sha256)
+            by_project.setdefault(event.blob_project_id, []).append(
+                {"sha256": event.blob_sha256, "size_bytes": event.size_bytes}
+            )
+        for project_id, blobs in by_project.items():
+            repo.mark_stored(project_id, blobs)
+        for event in events:
+            storage.delete_object(event.object_key)
+
+    def _queue_thumbnails(self, db: Session, keys: list[str]) -> None:
+        if not keys:
+            return
+        job = JobRepository(db=db).create(
+            type="thumbnails",
+            payload={"keys": keys},
+            priority=_THUMBNAIL_JOB_PRIORITY,
+        )
+        broker = get_job_broker()
+        broker.notify(job.id, job.priority)
+        broker.publish(job_event(job))
+
+
+def _object_created(event: IngestEvent) -> ObjectCreated:
+    return ObjectCreated(
+        dataset_id=event.dataset_id,
+        object_key=event.object_key,
+        size_bytes=event.size_bytes,
+        mime_type=event.mime_type,
+        event_time=event.event_time,
+        blob_sha256=event.blob_sha256,
+    )
+
+
+def _coalesce(events: Iterable[ObjectCreated]) -> list[ObjectCreated]:
+    """The latest event per object, in the order objects were first seen."""
+    latest: dict[tuple[int | None, str], ObjectCreated] = {}
+    for event in events:
+        latest[(event.dataset_id, event.object_key)] = event
+    return list(latest.values())
+
+
+def _is_image(object_key: str, mime_type: str | None) -> bool:
+    if mime_type in (None, "application/octet-stream"):
+        # Blob keys have no extension; let the job find out.
+        mime_type = mimetypes.guess_type(object_key)[0]
+    return mime_type is None or mime_type.startswith("image/")
+
+
+def _default_session_factory() -> Session:
+    from app.infrastructure.db import SessionLocal
+
+    return SessionLocal()
+
+
+asset_ingest_queue = AssetIngestQueue(
+    session_factory=_default_session_factory,
+    batch_size=settings.ingest_batch_size,
+    flush_interval=settings.ingest_flush_interval_seconds,
+    max_pending=settings.ingest_max_pending,
+    max_attempts=settings.ingest_max_attempts,
+    retry_seconds=settings.ingest_retry_seconds,
+)
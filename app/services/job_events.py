@@ -0,0 +1,272 @@
+"""Push job status changes to API clients.
+
+Each API process runs one ``JobEventHub``. It takes job changes from a
+single upstream source and fans every event out to the in-process
+subscribers of that job or project, so a status change costs the same
+whether one client or a thousand are listening:
+
+* with ``JOB_BROKER=redis``, workers and the API publish events on a Redis
+  channel (``JobBroker.publish``) and the hub subscribes to it;
+* otherwise the hub polls the jobs table for subscribed jobs and projects
+  whose ``updated_at`` moved, one query per poll interval and only while
+  someone is listening.
+
+Events are full ``JobRead`` snapshots, so a slow subscriber that misses
+intermediate events still ends up with the current state.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections import OrderedDict, defaultdict
+from collections.abc import Callable, Coroutine
+from datetime import datetime
+from typing import Any
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.infrastructure.queue import JOB_EVENTS_CHANNEL
+from app.models.orm.job import JOB_FINAL_STATUSES, Job
+from app.models.schemas.job import JobRead
+from app.repositories.job_repository import JobRepository
+from app.telemetry.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+JobEvent = dict[str, Any]
+
+# Fields that make an event worth delivering; lease renewals alone are not.
+_SIGNATURE_FIELDS = ("status", "progress", "attempts", "error", "result")
+_MAX_REMEMBERED_JOBS = 10_000
+
+
+def job_event(job: Job) -> JobEvent:
+    """Serialize a job into the event payload sent to clients."""
+    return JobRead.model_validate(job).model_dump(mode="json")
+
+
+class JobSubscription:
+    """A subscriber's view of the hub: the latest pending event per job.
+
+    At most ``maxsize`` jobs have an event waiting. A newer event of a job
+    replaces its queued one, which is safe because events are snapshots.
+    When ``maxsize`` other jobs are waiting, the oldest unfinished job's
+    event is dropped (its next change reaches the client again); final
+    events are never dropped, so every job's end is delivered.
+    """
+
+    def __init__(
+        self,
+        hub: JobEventHub,
+        job_id: int | None,
+        project_id: int | None,
+        maxsize: int,
+    ) -> None:
+        self.job_id = job_id
+        self.project_id = project_id
+        self._hub = hub
+        self._maxsize = maxsize
+        self._pending: OrderedDict[int, JobEvent] = OrderedDict()
+        self._ready = asyncio.Event()
+
+    async def get(self, timeout: float | None = None) -> JobEvent | None:
+        """Next event, or None if none arrived within ``timeout`` seconds."""
+        if not self._pending:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return self._pending.popitem(last=False)[1]
+
+    def offer(self, event: JobEvent) -> None:
+        job_id = event["id"]
+        if job_id in self._pending:
+            self._pending[job_id] = event
+            metrics.inc("job_events_coalesced")
+        else:
+            if len(self._pending) >= self._maxsize:
+                self._drop_oldest_unfinished()
+            self._pending[job_id] = event
+        self._ready.set()
+
+    def _drop_oldest_unfinished(self) -> None:
+        for job_id, queued in self._pending.items():
+            if queued.get("status") not in JOB_FINAL_STATUSES:
+                del self._pending[job_id]
+                metrics.inc("job_events_dropped")
+                return
+
+    def close(self) -> None:
+        self._hub._unsubscribe(self)
+
+
+class JobEventHub:
+    """Fans job events from one upstream source out to local subscribers."""
+
+    def __init__(
+        self,
+        source: Callable[[JobEventHub], Coroutine[Any, Any, None]] | None = None,
+        queue_size: int = 100,
+    ) -> None:
+        self._source = source
+        self._queue_size = queue_size
+        self._by_job: dict[int, set[JobSubscription]] = defaultdict(set)
+        self._by_project: dict[int, set[JobSubscription]] = defaultdict(set)
+        self._last: OrderedDict[int, tuple[Any, ...]] = OrderedDict()
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def job_ids(self) -> list[int]:
+        return list(self._by_job)
+
+    @property
+    def project_ids(self) -> list[int]:
+        return list(self._by_project)
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._by_job or self._by_project)
+
+    def subscribe(
+        self,
+        job_id: int | None = None,
+        project_id: int | None = None,
+    ) -> JobSubscription:
+        """Subscribe to one job or to every job of a project."""
+        if (job_id is None) == (project_id is None):
+            raise ValueError("Subscribe to exactly one of job_id or project_id")
+        subscription = JobSubscription(self, job_id, project_id, self._queue_size)
+        if job_id is not None:
+            self._by_job[job_id].add(subscription)
+        else:
+            self._by_project[project_id].add(subscription)
+        self._ensure_source()
+        metrics.set_gauge("job_event_subscribers", self._count())
+        return subscription
+
+    def publish(self, event: JobEvent) -> None:
+        """Deliver an event to the subscribers of its job and project."""
+        if not self.remember(event):
+            return
+        job_id = event["id"]
+        targets = set(self._by_job.get(job_id, ()))
+        project_id = event.get("project_id")
+        if project_id is not None:
+            targets.update(self._by_project.get(project_id, ()))
+        for subscription in targets:
+            subscription.offer(event)
+        metrics.inc("job_events_published")
+        metrics.inc("job_events_delivered", len(targets))
+
+    def remember(self, event: JobEvent) -> bool:
+        """Record an event as the job's latest state; False if nothing changed."""
+        job_id = event["id"]
+        signature = tuple(
+            json.dumps(event.get(field), sort_keys=True) for field in _SIGNATURE_FIELDS
+        )
+        if self._last.get(job_id) == signature:
+            return False
+        self._last[job_id] = signature
+        self._last.move_to_end(job_id)
+        while len(self._last) > _MAX_REMEMBERED_JOBS:
+            self._last.popitem(last=False)
+        return True
+
+    async def close(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def _unsubscribe(self, subscription: JobSubscription) -> None:
+        index, key = (
+            (self._by_job, subscription.job_id)
+            if subscription.job_id is not None
+            else (self._by_project, subscription.project_id)
+        )
+        subscribers = index.get(key)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del index[key]
+        metrics.set_gauge("job_event_subscribers", self._count())
+
+    def _count(self) -> int:
+        return sum(map(len, self._by_job.values())) + sum(map(len, self._by_project.values()))
+
+    def _ensure_source(self) -> None:
+        if self._source is None or (self._task is not None and not self._task.done()):
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run_source())
+
+    async def _run_source(self) -> None:
+        while True:
+            try:
+                await self._source(self)
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Job event source failed; restarting")
+                await asyncio.sleep(1.0)
+
+
+async def poll_job_table(hub: JobEventHub) -> None:
+    """Publish changes of subscribed jobs by polling ``jobs.updated_at``."""
+    from app.infrastructure.db import SessionLocal
+
+    def changed(since: datetime | None) -> tuple[list[JobEvent], datetime | None]:
+        db = SessionLocal()
+        try:
+            repo = JobRepository(db=db)
+            if since is None:
+                return [], repo.latest_update()
+            jobs = repo.changed_since(since, hub.job_ids, hub.project_ids)
+            latest = max((job.updated_at for job in jobs), default=since)
+            return [job_event(job) for job in jobs], latest
+        finally:
+            db.close()
+
+    # Timestamps come from the database rows, never this host's clock.
+    watermark: datetime | None = None
+    interval = settings.job_events_poll_interval_seconds
+    while True:
+        if not hub.has_subscribers:
+            # New subscribers read a snapshot first; start from "now" again.
+            watermark = None
+            await asyncio.sleep(interval)
+            continue
+        events, watermark = await run_in_threadpool(changed, watermark)
+        for event in events:
+            hub.publish(event)
+        await asyncio.sleep(interval)
+
+
+async def listen_redis(hub: JobEventHub) -> None:
+    """Publish events that workers and API processes send over Redis."""
+    import redis.asyncio as aioredis  # optional dependency, JOB_BROKER=redis
+
+    client = aioredis.Redis.from_url(settings.redis_url)
+    pubsub = client.pubsub()
+    try:
+        await pubsub.subscribe(JOB_EVENTS_CHANNEL)
+        async for message in pubsub.listen():
+            if message.get("type") == "message":
+                hub.publish(json.loads(message["data"]))
+    finally:
+        await pubsub.aclose()
+        await client.aclose()
+
+
+def create_job_event_hub() -> JobEventHub:
+    source = listen_redis if settings.job_broker == "redis" else poll_job_table
+    return JobEventHub(source=source, queue_size=settings.job_events_queue_size)
+
+
+job_event_hub = create_job_event_hub()
@@ -0,0 +1,102 @@
+"""Fair-share dispatch in front of the job queue.
+
+Workers do not simply take the highest-priority job: the scheduler first
+picks a tenant, then claims that tenant's best job. A tenant is eligible
+while it has queued work and runs fewer than ``max_running_per_tenant``
+jobs; among eligible tenants the one with the fewest running jobs per unit
+of weight goes first (ties: the longest-waiting queue). Projects at their
+own cap are skipped. Caps are checked before claiming, so concurrent
+workers can overshoot them by at most the number of workers.
+
+Queue metrics are not recorded here: workers run in their own processes,
+so the API derives them from the jobs table instead (see
+``JobService.record_queue_metrics``).
+"""
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+
+from app.core.config import settings
+from app.models.orm.job import Job
+from app.repositories.job_repository import JobRepository
+
+
+@dataclass(frozen=True)
+class TenantLoad:
+    tenant_id: int | None
+    queued: int
+    running: int
+    oldest_queued_at: datetime | None = None
+
+
+class FairShareScheduler:
+    """Chooses whose job a worker claims next."""
+
+    def __init__(
+        self,
+        max_running_per_tenant: int = 0,
+        max_running_per_project: int = 0,
+        weights: Mapping[int, float] | None = None,
+    ) -> None:
+        self.max_running_per_tenant = max_running_per_tenant
+        self.max_running_per_project = max_running_per_project
+        self._weights = dict(weights or {})
+
+    @classmethod
+    def from_settings(cls) -> FairShareScheduler:
+        return cls(
+            max_running_per_tenant=settings.job_tenant_max_running,
+            max_running_per_project=settings.job_project_max_running,
+            weights=settings.job_tenant_weights,
+        )
+
+    def weight(self, tenant_id: int | None) -> float:
+        weight = self._weights.get(tenant_id, 1.0) if tenant_id is not None else 1.0
+        return max(weight, 1e-6)
+
+    def order(self, loads: Sequence[TenantLoad]) -> list[int | None]:
+        """Eligible tenants, most under-served first."""
+        eligible = [
+            load
+            for load in loads
+            if load.queued > 0
+            and not (
+                self.max_running_per_tenant
+                and load.running >= self.max_running_per_tenant
+            )
+        ]
+        eligible.sort(
+            key=lambda load: (
+                load.running / self.weight(load.tenant_id),
+                load.oldest_queued_at or datetime.max,
+            )
+        )
+        return [load.tenant_id for load in eligible]
+
+    def claim_next(
+        self,
+        repo: JobRepository,
+        worker_id: str,
+        lease_seconds: float,
+        job_types: Sequence[str] | None = None,
+    ) -> Job | None:
+        """Lease the next job according to quotas and fair share."""
+        loads = [TenantLoad(*row) for row in repo.tenant_loads(job_types)]
+        full_projects = (
+            repo.projects_at_capacity(self.max_running_per_project)
+            if self.max_running_per_project
+            else []
+        )
+        for tenant_id in self.order(loads):
+            job = repo.claim_next(
+                worker_id,
+                lease_seconds,
+                job_types,
+                tenant_id=tenant_id,
+                exclude_project_ids=full_projects,
+            )
+            if job is not None:
+                return job
+        return None
@@ -1,12 +1,136 @@
-from typing import Any
+from collections import defaultdict
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.core.context import UserContext
+from app.infrastructure.queue import JobBroker
+from app.models.orm.job import Job
+from app.models.schemas.job import JobCreate, TenantQueueStats
+from app.repositories.job_repository import JobRepository
+from app.services.job_events import job_event
+from app.services.job_scheduler import TenantLoad
+from app.telemetry.metrics import metrics
+
+
+class JobQuotaExceededError(RuntimeError):
+    """Raised when a tenant already has too many jobs waiting."""
+
 
 class JobService:
     """Service for job submission and tracking."""
 
-    def list_jobs(self) -> list[Any]:
-        """TODO: Implement using JobRepository."""
-        raise NotImplementedError
+    def __init__(self, job_repo: JobRepository, broker: JobBroker):
+        self._repo = job_repo
+        self._broker = broker
+
+    def list_jobs(
+        self,
+        ctx: UserContext,
+        project_id: int | None = None,
+        status: str | None = None,
+        limit: int = 50,
+        before_id: int | None = None,
+    ) -> Sequence[Job]:
+        """Return the jobs visible to ``ctx``, newest first."""
+        return self._repo.list_jobs(
+            project_id=project_id,
+            status=status,
+            limit=limit,
+            before_id=before_id,
+            tenant_id=ctx.tenant_id,
+            created_by=ctx.user_id,
+        )
+
+    def get_job(self, job_id: int, ctx: UserContext) -> Job:
+        job = self._repo.get(job_id)
+        # Other tenants' jobs are reported as missing, not as forbidden.
+        if job is None or not ctx.can_access(job.tenant_id, job.created_by):
+            raise ValueError(f"Job {job_id} not found")
+        return job
+
+    def submit_job(self, job_spec: JobCreate, ctx: UserContext) -> Job:
+        """Queue a job and wake a worker; the job runs asynchronously."""
+        max_queued = settings.job_tenant_max_queued
+        if max_queued and self._repo.count_queued(ctx.tenant_id) >= max_queued:
+            raise JobQuotaExceededError(
+                f"Tenant already has {max_queued} queued jobs; retry when some have started"
+            )
+        job = self._repo.create(
+            type=job_spec.type,
+            payload=job_spec.payload,
+            priority=job_spec.priority,
+            project_id=job_spec.project_id,
+            tenant_id=ctx.tenant_id,
+            created_by=ctx.user_id,
+            max_attempts=job_spec.max_attempts or settings.job_max_attempts,
+        )
+        self._broker.notify(job.id, job.priority)
+        self._broker.publish(job_event(job))
+        return job
+
+    def queue_stats(
+        self,
+        window_seconds: float = 3600.0,
+        ctx: UserContext | None = None,
+    ) -> list[TenantQueueStats]:
+        """Queue depth per tenant and wait times of jobs started within the window.
+
+        With ``ctx`` only the caller's tenant is reported (callers without a
+        tenant share the ``None`` row).
+        """
+        now = datetime.utcnow()
+        loads = [TenantLoad(*row) for row in self._repo.tenant_loads()]
+        waits: dict[int | None, list[float]] = defaultdict(list)
+        for tenant_id, created_at, started_at in self._repo.recent_starts(
+            now - timedelta(seconds=window_seconds)
+        ):
+            waits[tenant_id].append(max((started_at - created_at).total_seconds(), 0.0))
+        if ctx is not None:
+            loads = [load for load in loads if load.tenant_id == ctx.tenant_id]
+            waits = {ctx.tenant_id: waits[ctx.tenant_id]} if ctx.tenant_id in waits else {}
+
+        stats = []
+        by_tenant = {load.tenant_id: load for load in loads}
+        for tenant_id in sorted(by_tenant.keys() | waits.keys(), key=lambda t: (t is None, t)):
+            load = by_tenant.get(tenant_id, TenantLoad(tenant_id, 0, 0))
+            tenant_waits = waits.get(tenant_id, [])
+            stats.append(
+                TenantQueueStats(
+                    tenant_id=tenant_id,
+                    queued=load.queued,
+                    running=load.running,
+                    oldest_queued_seconds=(
+                        (now - load.oldest_queued_at).total_seconds()
+                        if load.oldest_queued_at
+                        else None
+                    ),
+                    started_in_window=len(tenant_waits),
+                    avg_wait_seconds=(
+                        sum(tenant_waits) / len(tenant_waits) if tenant_waits else None
+                    ),
+                    max_wait_seconds=max(tenant_waits) if tenant_waits else None,
+                )
+            )
+        return stats
+
+    def record_queue_metrics(self, window_seconds: float = 3600.0) -> None:
+        """Set the queue gauges from the jobs table, shared by every worker process."""
+        for row in self.queue_stats(window_seconds=window_seconds):
+            tenant = row.tenant_id
+            metrics.set_gauge("job_queue_depth", row.queued, tenant=tenant)
+            metrics.set_gauge("jobs_running", row.running, tenant=tenant)
+            metrics.set_gauge(
+                "job_oldest_queued_seconds", row.oldest_queued_seconds or 0.0, tenant=tenant
+            )
+            metrics.set_gauge(
+                "job_max_wait_seconds", row.max_wait_seconds or 0.0, tenant=tenant
+            )
 
-    def submit_job(self, job_spec: Any) -> Any:
-        """TODO: Implement job submission."""
-        raise NotImplementedError
+    def cancel_job(self, job_id: int, ctx: UserContext) -> Job:
+        """Cancel a job of ``ctx`` that is still queued."""
+        job = self.get_job(job_id, ctx)
+        if not self._repo.cancel(job_id):
+            raise RuntimeError(f"Job {job_id} is {job.status} and can no longer be cancelled")
+        self._broker.publish(job_event(job))
+        return job
@@ -1,7 +1,71 @@
-from app.infrastructure.storage import StorageClient
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+
+from app.infrastructure.storage import MAX_PART_NUMBER, MIN_PART_NUMBER, StorageClient
+from app.models.orm.asset import ASSET_STATUS_READY, ASSET_STATUS_UPLOADED
+from app.models.orm.blob import blob_object_key, blob_upload_key
+from app.repositories.asset_repository import AssetRepository
+from app.repositories.blob_repository import BlobRepository
 from app.repositories.dataset_repository import DatasetRepository
 
 
+class InvalidUploadError(ValueError):
+    """Raised when an upload request is malformed, as opposed to naming something missing."""
+
+
+@dataclass(frozen=True)
+class PresignResult:
+    """Outcome of presigning a single file within a batch."""
+
+    filename: str
+    upload_url: str | None = None
+    object_key: str | None = None
+    error: str | None = None
+
+
+@dataclass(frozen=True)
+class ContentFile:
+    """A file announced by its hash before upload."""
+
+    filename: str
+    sha256: str
+    size_bytes: int | None = None
+    mime_type: str | None = None
+
+
+@dataclass(frozen=True)
+class ContentPresignResult:
+    """Outcome of adding one file by content hash."""
+
+    filename: str
+    sha256: str
+    object_key: str | None = None
+    blob_key: str | None = None
+    exists: bool = False
+    upload_url: str | None = None
+    error: str | None = None
+
+
+@dataclass(frozen=True)
+class ReadUrlResult:
+    """Outcome of signing a read of one asset within a batch."""
+
+    object_key: str
+    url: str | None = None
+    expires_at: float | None = None
+    error: str | None = None
+
+
+@dataclass(frozen=True)
+class MultipartUpload:
+    """A started multipart upload together with presigned part URLs."""
+
+    upload_id: str
+    object_key: str
+    bucket: str
+    part_urls: list[tuple[int, str]]
+
+
 class PresignService:
     """Service for generating presigned URLs."""
 
@@ -9,9 +73,13 @@ class PresignService:
         self,
         storage: StorageClient,
         dataset_repo: DatasetRepository,
+        blob_repo: BlobRepository | None = None,
+        asset_repo: AssetRepository | None = None,
     ):
         self.storage = storage
         self.dataset_repo = dataset_repo
+        self.blob_repo = blob_repo
+        self.asset_repo = asset_repo
 
     def presign_upload(self, dataset_id: int, filename: str) -> tuple[str, str, str]:
         """Return a presigned URL, key, and bucket for uploading an asset into a dataset."""
@@ -19,6 +87,266 @@ class PresignService:
         if dataset is None:
             raise ValueError(f"Dataset {dataset_id} not found")
 
-        key = f"datasets/{dataset.id}/{filename}"
+        key = dataset_object_key(dataset.id, filename)
         url = self.storage.presign_url(key)
         return url, key, self.storage.bucket
+
+    def presign_upload_batch(
+        self,
+        dataset_id: int,
+        filenames: Iterable[str],
+        expires_in: int = 3600,
+    ) -> Iterator[PresignResult]:
+        """Presign uploads for many files of one dataset.
+
+        The dataset is looked up once, before the first result is produced, so
+        a missing dataset raises ``ValueError`` eagerly. Problems with an
+        individual file are reported on its result instead of aborting the batch.
+        """
+        dataset = self._require_dataset(dataset_id)
+        return self._iter_presign(dataset.id, filenames, expires_in)
+
+    def _iter_presign(
+        self,
+        dataset_id: int,
+        filenames: Iterable[str],
+        expires_in: int,
+    ) -> Iterator[PresignResult]:
+        seen: set[str] = set()
+        for filename in filenames:
+            error = validate_filename(filename)
+            if error is None and filename in seen:
+                error = "Duplicate filename in batch"
+            if error is not None:
+                yield PresignResult(filename=filename, error=error)
+                continue
+            seen.add(filename)
+
+            key = dataset_object_key(dataset_id, filename)
+            try:
+                url = self.storage.presign_url(key, expires_in=expires_in)
+            except Exception as exc:  # noqa: BLE001 - reported per file
+                yield PresignResult(filename=filename, error=str(exc) or type(exc).__name__)
+                continue
+            yield PresignResult(filename=filename, upload_url=url, object_key=key)
+
+    def presign_content_batch(
+        self,
+        dataset_id: int,
+        files: Sequence[ContentFile],
+        expires_in: int = 3600,
+    ) -> list[ContentPresignResult]:
+        """Add files to a dataset by content hash, presigning only unknown content.
+
+        Every valid file becomes an asset linked to the blob of its hash at
+        once. Content the dataset's project has already uploaded is reused
+        and its asset is ``uploaded`` immediately. Anything else needs an
+        upload, even if another project stored the same bytes: knowing a
+        hash is not proof of having the content, and ``exists`` must not
+        tell whether someone else has it. One upload URL per distinct hash
+        is returned, bound to that digest and to the project, and the
+        assets stay ``pending`` until the upload is ingested.
+        """
+        if self.blob_repo is None:
+            raise RuntimeError("Content-addressed presigning needs a blob repository")
+        dataset = self._require_dataset(dataset_id)
+
+        results: list[ContentPresignResult | None] = []
+        accepted: list[ContentFile] = []
+        seen: set[str] = set()
+        for file in files:
+            error = validate_filename(file.filename)
+            if error is None and file.filename in seen:
+                error = "Duplicate filename in batch"
+            if error is not None:
+                results.append(ContentPresignResult(file.filename, file.sha256, error=error))
+                continue
+            seen.add(file.filename)
+            accepted.append(file)
+            results.append(None)
+
+        owned = self.blob_repo.owned(dataset.project_id, (file.sha256 for file in accepted))
+        self.blob_repo.link_assets(
+            dataset.id,
+            [
+                {
+                    "object_key": dataset_object_key(dataset.id, file.filename),
+                    "sha256": file.sha256,
+                    "size_bytes": file.size_bytes,
+                    "mime_type": file.mime_type,
+                }
+                for file in accepted
+            ],
+            available=owned,
+        )
+
+        signed: set[str] = set()
+        pending = iter(accepted)
+        for index, result in enumerate(results):
+            if result is not None:
+                continue
+            file = next(pending)
+            upload_url = None
+            if file.sha256 not in owned and file.sha256 not in signed:
+                upload_url = self.storage.presign_url(
+                    blob_upload_key(dataset.project_id, file.sha256),
+                    expires_in=expires_in,
+                    checksum_sha256=file.sha256,
+                )
+                signed.add(file.sha256)
+            results[index] = ContentPresignResult(
+                filename=file.filename,
+                sha256=file.sha256,
+                object_key=dataset_object_key(dataset.id, file.filename),
+                blob_key=blob_object_key(file.sha256),
+                exists=file.sha256 in owned,
+                upload_url=upload_url,
+            )
+        return results
+
+    def presign_read_batch(
+        self,
+        dataset_id: int,
+        object_keys: Sequence[str],
+        expires_in: int = 3600,
+    ) -> list[ReadUrlResult]:
+        """Presign downloads of many assets of one dataset.
+
+        Assets are looked up in one query, so content-addressed ones are
+        signed at their blob. Signatures come from the storage client's
+        cache where possible; keys that are not readable assets of the
+        dataset carry an ``error`` instead.
+        """
+        if self.asset_repo is None:
+            raise RuntimeError("Read presigning needs an asset repository")
+        dataset = self._require_dataset(dataset_id)
+        located = self.asset_repo.locate(dataset.id, object_keys)
+
+        results = []
+        for object_key in object_keys:
+            storage_key, status = located.get(object_key, (None, None))
+            if storage_key is None:
+                results.append(ReadUrlResult(object_key, error="Asset not found"))
+            elif status not in (ASSET_STATUS_UPLOADED, ASSET_STATUS_READY):
+                results.append(ReadUrlResult(object_key, error=f"Asset is {status}"))
+            else:
+                signed = self.storage.presign_get(storage_key, expires_in=expires_in)
+                results.append(ReadUrlResult(object_key, signed.url, signed.expires_at))
+        return results
+
+    def start_multipart_upload(
+        self,
+        dataset_id: int,
+        filename: str,
+        part_count: int,
+        content_type: str | None = None,
+        expires_in: int = 3600,
+    ) -> MultipartUpload:
+        """Create a multipart upload for a dataset asset and presign its part URLs."""
+        error = validate_filename(filename)
+        if error is not None:
+            raise InvalidUploadError(error)
+        dataset = self._require_dataset(dataset_id)
+
+        key = dataset_object_key(dataset.id, filename)
+        upload_id = self.storage.create_multipart_upload(key, content_type=content_type)
+        part_urls = self.storage.presign_part_urls(
+            key,
+            upload_id,
+            range(1, part_count + 1),
+            expires_in=expires_in,
+        )
+        return MultipartUpload(
+            upload_id=upload_id,
+            object_key=key,
+            bucket=self.storage.bucket,
+            part_urls=part_urls,
+        )
+
+    def presign_upload_parts(
+        self,
+        dataset_id: int,
+        object_key: str,
+        upload_id: str,
+        part_numbers: Iterable[int],
+        expires_in: int = 3600,
+    ) -> list[tuple[int, str]]:
+        """Presign (again) selected parts of an upload, e.g. to resume or retry."""
+        part_numbers = list(part_numbers)
+        if any(not MIN_PART_NUMBER <= number <= MAX_PART_NUMBER for number in part_numbers):
+            raise InvalidUploadError(
+                f"Part numbers must be between {MIN_PART_NUMBER} and {MAX_PART_NUMBER}"
+            )
+        self._require_dataset_key(dataset_id, object_key)
+        return self.storage.presign_part_urls(
+            object_key,
+            upload_id,
+            part_numbers,
+            expires_in=expires_in,
+        )
+
+    def list_uploaded_parts(
+        self,
+        dataset_id: int,
+        object_key: str,
+        upload_id: str,
+    ) -> list[dict]:
+        """Return parts the store already holds so a client can resume."""
+        self._require_dataset_key(dataset_id, object_key)
+        return self.storage.list_parts(object_key, upload_id)
+
+    def complete_multipart_upload(
+        self,
+        dataset_id: int,
+        object_key: str,
+        upload_id: str,
+        parts: Iterable[tuple[int, str]],
+    ) -> str | None:
+        """Assemble the uploaded parts into the final object."""
+        self._require_dataset_key(dataset_id, object_key)
+        return self.storage.complete_multipart_upload(object_key, upload_id, parts)
+
+    def abort_multipart_upload(
+        self,
+        dataset_id: int,
+        object_key: str,
+        upload_id: str,
+    ) -> None:
+        """Abort an upload and discard the parts stored so far."""
+        self._require_dataset_key(dataset_id, object_key)
+        self.storage.abort_multipart_upload(object_key, upload_id)
+
+    def _require_dataset(self, dataset_id: int):
+        dataset = self.dataset_repo.get(dataset_id)
+        if dataset is None:
+            raise ValueError(f"Dataset {dataset_id} not found")
+        return dataset
+
+    def _require_dataset_key(self, dataset_id: int, object_key: str) -> None:
+        check_dataset_key(dataset_id, object_key)
+        self._require_dataset(dataset_id)
+
+
+def dataset_object_key(dataset_id: int, filename: str) -> str:
+    """Storage key of a file within a dataset."""
+    return f"datasets/{dataset_id}/{filename}"
+
+
+def check_dataset_key(dataset_id: int, object_key: str) -> None:
+    """Raise ``InvalidUploadError`` unless ``object_key`` is a file of the dataset."""
+    prefix = dataset_object_key(dataset_id, "")
+    if not object_key.startswith(prefix) or validate_filename(object_key[len(prefix) :]):
+        raise InvalidUploadError(f"Object {object_key} does not belong to dataset {dataset_id}")
+
+
+def validate_filename(filename: str) -> str | None:
+    """Return an error message if ``filename`` cannot be used as an object name."""
+    if not filename or not filename.strip():
+        return "Filename must not be empty"
+    if filename.startswith("/") or "\\" in filename:
+        return "Filename must be a relative path"
+    if any(part in ("", ".", "..") for part in filename.split("/")):
+        return "Filename contains an invalid path segment"
+    if len(filename.encode("utf-8")) > 900:
+        return "Filename is too long"
+    return None
@@ -0,0 +1,246 @@
+"""Thumbnails and image pyramids: generation, lookup and presigned reads.
+
+Derivatives are normally rendered by ``thumbnails`` jobs, queued when
+uploads are ingested (see ``app.workers.thumbnails``). Asking for a
+thumbnail that does not exist yet renders it on the spot instead, so
+assets that arrived before their job ran still show up. Pyramids are only
+built by jobs: a large image can take seconds to tile.
+"""
+import json
+import threading
+import zlib
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from app.core.config import settings
+from app.core.context import UserContext
+from app.core.derivatives import (
+    DERIVATIVE_CONTENT_TYPE,
+    allow_image_pixels,
+    pick_size,
+    pyramid_key,
+    render,
+    thumbnail_key,
+    tile_key,
+)
+from app.infrastructure.storage import StorageClient
+from app.models.orm.asset import ASSET_STATUS_READY, ASSET_STATUS_UPLOADED
+from app.repositories.asset_repository import AssetRepository
+from app.telemetry.metrics import metrics
+
+
+class DerivativeCache:
+    """Bounded LRU of derivative keys recently generated or found in storage.
+
+    A hit saves the HEAD request that would otherwise confirm the object
+    exists before it is signed. Rendering of one original is serialized
+    through a striped lock, so concurrent misses render it only once.
+    """
+
+    def __init__(self, max_entries: int, stripes: int = 64) -> None:
+        self._max_entries = max_entries
+        self._keys: OrderedDict[str, None] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stripes = [threading.Lock() for _ in range(stripes)]
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            if key not in self._keys:
+                metrics.inc("derivative_cache_misses")
+                return False
+            self._keys.move_to_end(key)
+        metrics.inc("derivative_cache_hits")
+        return True
+
+    def add(self, keys: Iterable[str]) -> None:
+        if self._max_entries <= 0:
+            return
+        with self._lock:
+            for key in keys:
+                self._keys[key] = None
+                self._keys.move_to_end(key)
+            while len(self._keys) > self._max_entries:
+                self._keys.popitem(last=False)
+            size = len(self._keys)
+        metrics.set_gauge("derivative_cache_size", size)
+
+    def lock_for(self, storage_key: str) -> threading.Lock:
+        """The lock that serializes rendering of one original."""
+        return self._stripes[zlib.crc32(storage_key.encode()) % len(self._stripes)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._keys.clear()
+
+
+derivative_cache = DerivativeCache(max_entries=settings.thumbnail_cache_max_entries)
+
+# Every render goes through this module; Pillow's limit must not undercut ours.
+allow_image_pixels(
+    max(settings.thumbnail_max_image_pixels, settings.thumbnail_pyramid_max_image_pixels)
+)
+
+
+class AssetNotReadyError(RuntimeError):
+    """Raised when an asset's bytes have not been uploaded yet."""
+
+
+@dataclass(frozen=True)
+class GeneratedDerivatives:
+    storage_key: str
+    width: int
+    height: int
+    thumbnail_keys: list[str]
+    tiles: int = 0
+
+
+@dataclass(frozen=True)
+class ThumbnailUrl:
+    asset_id: int
+    size: int
+    object_key: str
+    url: str
+    expires_in: int
+    generated: bool
+
+
+def generate_derivatives(
+    storage: StorageClient,
+    storage_key: str,
+    pyramid: bool = True,
+    cache: DerivativeCache | None = None,
+) -> GeneratedDerivatives:
+    """Render and store the thumbnails, and with ``pyramid`` the tiles, of one original.
+
+    Raises ``UnsupportedImageError`` if the original is not an image or is
+    larger than ``thumbnail_max_image_pixels`` (with ``pyramid``,
+    ``thumbnail_pyramid_max_image_pixels``).
+    """
+    data = storage.get_object(storage_key)
+    rendition = render(
+        data,
+        settings.thumbnail_sizes,
+        quality=settings.thumbnail_quality,
+        pyramid_min_px=settings.thumbnail_pyramid_min_px if pyramid else None,
+        tile_size=settings.thumbnail_tile_size,
+        max_pixels=(
+            settings.thumbnail_pyramid_max_image_pixels
+            if pyramid
+            else settings.thumbnail_max_image_pixels
+        ),
+    )
+    del data
+
+    keys = []
+    for size, body in rendition.thumbnails.items():
+        key = thumbnail_key(storage_key, size)
+        storage.put_object(key, body, content_type=DERIVATIVE_CONTENT_TYPE)
+        keys.append(key)
+    tiles = 0
+    if rendition.pyramid is not None:
+        for level, col, row, body in rendition.tiles:
+            storage.put_object(
+                tile_key(storage_key, level, col, row),
+                body,
+                content_type=DERIVATIVE_CONTENT_TYPE,
+            )
+            tiles += 1
+        # The manifest goes last: once it exists, every tile does.
+        storage.put_object(
+            pyramid_key(storage_key),
+            json.dumps(rendition.pyramid).encode(),
+            content_type="application/json",
+        )
+    (cache or derivative_cache).add(keys)
+    metrics.inc("derivatives_generated")
+    return GeneratedDerivatives(
+        storage_key=storage_key,
+        width=rendition.width,
+        height=rendition.height,
+        thumbnail_keys=keys,
+        tiles=tiles,
+    )
+
+
+class ThumbnailService:
+    """Presigned reads of asset thumbnails and pyramid tiles, for callers who may see the asset."""
+
+    def __init__(
+        self,
+        storage: StorageClient,
+        asset_repo: AssetRepository,
+        cache: DerivativeCache | None = None,
+    ):
+        self.storage = storage
+        self._asset_repo = asset_repo
+        self._cache = cache or derivative_cache
+
+    def thumbnail_url(
+        self,
+        asset_id: int,
+        ctx: UserContext,
+        size: int,
+        expires_in: int = 3600,
+    ) -> ThumbnailUrl:
+        """Sign a read of the thumbnail closest to ``size``, rendering it if missing."""
+        source = self._source_key(asset_id, ctx)
+        size = pick_size(size, settings.thumbnail_sizes)
+        key = thumbnail_key(source, size)
+        generated = False
+        if key not in self._cache:
+            with self._cache.lock_for(source):
+                # Another request may have rendered it while this one waited.
+                if key not in self._cache and not self.storage.object_exists(key):
+                    generate_derivatives(self.storage, source, pyramid=False, cache=self._cache)
+                    generated = True
+                    metrics.inc("thumbnails_rendered_on_request")
+                self._cache.add([key])
+        signed = self.storage.presign_get(key, expires_in=expires_in)
+        return ThumbnailUrl(
+            asset_id=asset_id,
+            size=size,
+            object_key=key,
+            url=signed.url,
+            # A cached signature may have less left than was asked for.
+            expires_in=signed.expires_in(),
+            generated=generated,
+        )
+
+    def pyramid(self, asset_id: int, ctx: UserContext) -> dict[str, Any]:
+        """The pyramid manifest of an asset; ``ValueError`` if it has none."""
+        source = self._source_key(asset_id, ctx)
+        try:
+            return json.loads(self.storage.get_object(pyramid_key(source)))
+        except ValueError as exc:
+            raise ValueError(
+                f"Asset {asset_id} has no image pyramid; only images of at least "
+                f"{settings.thumbnail_pyramid_min_px} px get one, from a thumbnails job"
+            ) from exc
+
+    def tile_url(
+        self,
+        asset_id: int,
+        ctx: UserContext,
+        level: int,
+        col: int,
+        row: int,
+        expires_in: int = 3600,
+    ) -> str:
+        """Sign a read of one pyramid tile; the store answers 404 for tiles that do not exist."""
+        source = self._source_key(asset_id, ctx)
+        return self.storage.presign_get_url(
+            tile_key(source, level, col, row),
+            expires_in=expires_in,
+        )
+
+    def _source_key(self, asset_id: int, ctx: UserContext) -> str:
+        found = self._asset_repo.get_with_project(asset_id)
+        # Assets of other tenants (or users) look missing, as datasets do.
+        if found is None or not ctx.can_access(found[1].tenant_id, found[1].created_by):
+            raise ValueError(f"Asset {asset_id} not found")
+        asset = found[0]
+        if asset.status not in (ASSET_STATUS_UPLOADED, ASSET_STATUS_READY):
+            raise AssetNotReadyError(f"Asset {asset_id} is {asset.status}, not uploaded")
+        return asset.storage_key
@@ -2,32 +2,65 @@
 from collections.abc import Sequence
 from typing import Any
 
+from app.core.context import UserContext
 from app.models.orm.dataset import Dataset
 from app.models.schemas.dataset import DatasetCreate
-from app.repositories.dataset_repository import DatasetRepository
+from app.repositories.dataset_repository import AsyncDatasetRepository
+from app.repositories.resource_version_repository import (
+    AsyncResourceVersionRepository,
+    datasets_scope,
+)
 
 
 class UserDatasetService:
     """User-aware dataset service (per-user/tenant rules live here)."""
 
-    def __init__(self, dataset_repo: DatasetRepository):
+    def __init__(
+        self,
+        dataset_repo: AsyncDatasetRepository,
+        version_repo: AsyncResourceVersionRepository | None = None,
+    ):
         self._repo = dataset_repo
+        self._version_repo = version_repo
 
-    def list_datasets_for_user(
+    async def list_datasets_for_user(
         self,
         project_id: int,
         user: Any | None = None,  # later: real user type
     ) -> Sequence[Dataset]:
         # TODO: enforce user/tenant access based on `user`
-        return self._repo.list_by_project(project_id=project_id)
+        return await self._repo.list_by_project(project_id=project_id)
+
+    async def datasets_version(
+        self,
+        project_id: int,
+        user: Any | None = None,
+    ) -> tuple[str, int]:
+        """Scope and change counter of a project's dataset listing, for conditional GETs."""
+        if self._version_repo is None:
+            raise RuntimeError("Listing versions need a version repository")
+        scope = datasets_scope(project_id)
+        return scope, await self._version_repo.get(scope)
+
+    async def get_dataset_for_user(self, dataset_id: int, ctx: UserContext) -> Dataset:
+        """Return a dataset the caller may access.
+
+        Access follows the owning project. Datasets of other tenants (or
+        users) raise the same ``ValueError`` as missing ones, so ids do not
+        leak.
+        """
+        found = await self._repo.get_with_project(dataset_id)
+        if found is None or not ctx.can_access(found[1].tenant_id, found[1].created_by):
+            raise ValueError(f"Dataset {dataset_id} not found")
+        return found[0]
 
-    def create_dataset_for_user(
+    async def create_dataset_for_user(
         self,
         payload: DatasetCreate,
         user: Any | None = None,
     ) -> Dataset:
         # TODO: enforce user/tenant access based on `user`
-        return self._repo.create(
+        return await self._repo.create(
             project_id=payload.project_id,
             name=payload.name,
             description=payload.description,
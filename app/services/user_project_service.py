@@ -1,24 +1,52 @@
 from collections.abc import Sequence
-from typing import Any
 
+from app.core.context import UserContext
 from app.models.orm.project import Project
 from app.models.schemas.project import ProjectCreate
-from app.repositories.project_repository import ProjectRepository
+from app.repositories.project_repository import AsyncProjectRepository
+from app.repositories.resource_version_repository import (
+    AsyncResourceVersionRepository,
+    projects_scope,
+)
 
 
 class UserProjectService:
     """Business logic for users, tenants, projects, memberships."""
 
-    def __init__(self, project_repo: ProjectRepository):
+    def __init__(
+        self,
+        project_repo: AsyncProjectRepository,
+        version_repo: AsyncResourceVersionRepository | None = None,
+    ):
         self._project_repo = project_repo
+        self._version_repo = version_repo
 
-    def create_project(self, payload: ProjectCreate, user: Any | None = None) -> Project:
-        """Create a project (user/tenant rules to come)."""
-        return self._project_repo.create(
+    async def create_project(self, payload: ProjectCreate, ctx: UserContext) -> Project:
+        """Create a project owned by the caller's tenant, or by the caller without one."""
+        return await self._project_repo.create(
             name=payload.name,
             description=payload.description,
+            tenant_id=ctx.tenant_id,
+            created_by=ctx.user_id,
         )
 
-    def list_projects_for_user(self, user: Any | None = None) -> Sequence[Project]:
-        """TODO: filter by user/tenant once auth is wired."""
-        return self._project_repo.list_projects()
+    async def get_project_for_user(self, project_id: int, ctx: UserContext) -> Project:
+        """Return a project the caller may access; others raise ``ValueError`` like missing ones."""
+        project = await self._project_repo.get(project_id)
+        if project is None or not ctx.can_access(project.tenant_id, project.created_by):
+            raise ValueError(f"Project {project_id} not found")
+        return project
+
+    async def list_projects_for_user(self, ctx: UserContext) -> Sequence[Project]:
+        """Projects of the caller's tenant, or the caller's own without one."""
+        return await self._project_repo.list_projects(
+            tenant_id=ctx.tenant_id,
+            created_by=ctx.user_id,
+        )
+
+    async def projects_version(self, ctx: UserContext) -> tuple[str, int]:
+        """Scope and change counter of the caller's project listing, for conditional GETs."""
+        if self._version_repo is None:
+            raise RuntimeError("Listing versions need a version repository")
+        scope = projects_scope(ctx.tenant_id, ctx.user_id)
+        return scope, await self._version_repo.get(scope)
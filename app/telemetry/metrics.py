@@ -1,3 +1,77 @@
+import threading
+from collections import defaultdict
+from typing import Any
+
+LabelKey = tuple[str, tuple[tuple[str, str], ...]]
+
+
+class MetricsRegistry:
+    """Minimal in-process metrics store (counters, gauges and summaries).
+
+    Until an exporter is configured, values are exposed through
+    ``/api/v1/debug/metrics`` when ``DEBUG_METRICS_ENABLED`` is set.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: dict[LabelKey, float] = defaultdict(float)
+        self._gauges: dict[LabelKey, float] = {}
+        self._summaries: dict[LabelKey, list[float]] = {}
+
+    def inc(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] += value
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        key = self._key(name, labels)
+        with self._lock:
+            self._gauges[key] = value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """Record one observation; keeps count, sum and max."""
+        key = self._key(name, labels)
+        with self._lock:
+            summary = self._summaries.get(key)
+            if summary is None:
+                self._summaries[key] = [1, value, value]
+            else:
+                summary[0] += 1
+                summary[1] += value
+                summary[2] = max(summary[2], value)
+
+    def snapshot(self) -> dict[str, list[dict[str, Any]]]:
+        with self._lock:
+            return {
+                "counters": [
+                    self._row(key, value=value) for key, value in self._counters.items()
+                ],
+                "gauges": [self._row(key, value=value) for key, value in self._gauges.items()],
+                "summaries": [
+                    self._row(key, count=count, sum=total, max=maximum)
+                    for key, (count, total, maximum) in self._summaries.items()
+                ],
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._summaries.clear()
+
+    @staticmethod
+    def _key(name: str, labels: dict[str, Any]) -> LabelKey:
+        return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    @staticmethod
+    def _row(key: LabelKey, **values: Any) -> dict[str, Any]:
+        name, labels = key
+        return {"name": name, "labels": dict(labels), **values}
+
+
+metrics = MetricsRegistry()
+
+
 def setup_metrics() -> None:
     """TODO: Configure metrics exporter."""
     pass
@@ -0,0 +1,2 @@
+"""Background workers that execute queued jobs."""
+__all__: list[str] = []
@@ -0,0 +1,332 @@
+"""Dataset import from an archive in the bucket (job type ``import``).
+
+Payload::
+
+    {
+        "dataset_id": 1,
+        "archive_key": "datasets/1/uploads/batch-07.tar.gz",  # tar or zip
+        "prefix": "batch-07/"  # optional folder in the dataset
+    }
+
+The archive must be an object of the dataset itself (``datasets/{id}/...``),
+the same rule the presigned upload and multipart endpoints apply, so a
+caller cannot import another dataset's (or tenant's) uploads.
+
+Every regular file in the archive becomes ``datasets/{id}/{prefix}{path}``
+and an ``uploaded`` asset row carrying its SHA-256. Files whose content is
+already in the dataset, or appeared earlier in the archive, are skipped.
+
+The archive is never written to disk:
+
+* tar archives are read as one stream (``tarfile`` mode ``r|*``), so each
+  member is read in order on the job thread while hashing and uploading
+  happen on ``import_workers`` threads;
+* zip archives are read with ranged GETs: the central directory once, then
+  each worker thread reads and inflates members through its own handle,
+  so extraction itself runs in parallel.
+
+At most ``2 * import_workers`` members are held in memory at a time, and
+members larger than ``import_max_member_mb`` are reported as failures.
+Asset rows are upserted in batches of ``ingest_batch_size`` by a writer
+thread; the bucket notifications for the same objects are harmless.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import mimetypes
+import tarfile
+import threading
+import time
+import zipfile
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.infrastructure.storage import StorageClient, storage_registry
+from app.repositories.asset_repository import AssetRepository
+from app.repositories.dataset_repository import DatasetRepository
+from app.services.presign_service import (
+    check_dataset_key,
+    dataset_object_key,
+    validate_filename,
+)
+from app.telemetry.metrics import metrics
+from app.workers.handlers import JobContext
+
+logger = logging.getLogger(__name__)
+
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+
+# Progress is reported every this many archive members.
+_PROGRESS_EVERY = 500
+# Failed and duplicate member names kept in the job result.
+_MAX_REPORTED = 50
+# Archive clutter that is never imported.
+_IGNORED_NAMES = ("__MACOSX/", ".DS_Store", "Thumbs.db")
+
+
+@dataclass(frozen=True)
+class ImportSpec:
+    dataset_id: int
+    archive_key: str
+    prefix: str = ""
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> ImportSpec:
+        """Validate a job payload; raise ``ValueError`` if it is unusable."""
+        try:
+            spec = cls(
+                dataset_id=int(payload["dataset_id"]),
+                archive_key=str(payload["archive_key"]),
+                prefix=str(payload.get("prefix") or ""),
+            )
+        except KeyError as exc:
+            raise ValueError(f"Import payload is missing {exc.args[0]!r}") from exc
+        if spec.prefix:
+            error = validate_filename(spec.prefix.rstrip("/"))
+            if error is not None or not spec.prefix.endswith("/"):
+                raise ValueError(f"prefix must be a relative folder ending in '/': {error}")
+        check_dataset_key(spec.dataset_id, spec.archive_key)
+        spec.archive_format()
+        return spec
+
+    def archive_format(self) -> str:
+        key = self.archive_key.lower()
+        if key.endswith(".zip"):
+            return "zip"
+        if key.endswith(TAR_SUFFIXES):
+            return "tar"
+        raise ValueError("archive_key must name a .zip or .tar[.gz|.bz2|.xz] archive")
+
+
+def run_import(ctx: JobContext) -> dict[str, Any]:
+    """Job handler: unpack an archive from the bucket into a dataset."""
+    from app.infrastructure.db import SessionLocal
+
+    spec = ImportSpec.from_payload(ctx.payload)
+    storage = storage_registry.get()
+    return DatasetImporter(spec, ctx, SessionLocal, storage).run()
+
+
+class DatasetImporter:
+    def __init__(
+        self,
+        spec: ImportSpec,
+        ctx: JobContext,
+        session_factory: Callable[[], Session],
+        storage: StorageClient,
+    ) -> None:
+        self.spec = spec
+        self.ctx = ctx
+        self._session_factory = session_factory
+        self._storage = storage
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(2 * settings.import_workers)
+        self._max_member = settings.import_max_member_mb * 1024 * 1024
+        self._known: set[str] = set()
+        self._rows: list[dict[str, Any]] = []
+        self._writes: list[Future[None]] = []
+        self._local = threading.local()
+        self._handles: list[zipfile.ZipFile] = []
+        self._total: int | None = None
+        self.entries = 0
+        self.uploaded = 0
+        self.uploaded_bytes = 0
+        self.duplicates: list[str] = []
+        self.failed: list[str] = []
+        self.ignored = 0
+
+    def run(self) -> dict[str, Any]:
+        started = time.perf_counter()
+        spec = self.spec
+        self._known = self._with_db(self._load_known_hashes)
+
+        with (
+            ThreadPoolExecutor(
+                max_workers=settings.import_workers,
+                thread_name_prefix="import",
+            ) as workers,
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="import-write") as writer,
+        ):
+            try:
+                if spec.archive_format() == "zip":
+                    self._read_zip(workers, writer)
+                else:
+                    self._read_tar(workers, writer)
+            finally:
+                workers.shutdown(wait=True)
+                for handle in self._handles:
+                    handle.close()
+            self._flush(writer, force=True)
+            for write in self._writes:
+                write.result()
+
+        elapsed = time.perf_counter() - started
+        metrics.observe("import_seconds", elapsed)
+        return {
+            "dataset_id": spec.dataset_id,
+            "archive_key": spec.archive_key,
+            "entries": self.entries,
+            "uploaded": self.uploaded,
+            "uploaded_bytes": self.uploaded_bytes,
+            "duplicates": len(self.duplicates),
+            "duplicate_names": self.duplicates[:_MAX_REPORTED],
+            "failed": len(self.failed),
+            "failed_names": self.failed[:_MAX_REPORTED],
+            "ignored": self.ignored,
+            "seconds": round(elapsed, 3),
+            "files_per_second": round(self.entries / elapsed, 2) if elapsed else 0.0,
+        }
+
+    def _load_known_hashes(self, db: Session) -> set[str]:
+        if DatasetRepository(db=db).get(self.spec.dataset_id) is None:
+            raise ValueError(f"Dataset {self.spec.dataset_id} not found")
+        return AssetRepository(db=db).content_hashes(self.spec.dataset_id)
+
+    def _read_tar(self, workers: ThreadPoolExecutor, writer: ThreadPoolExecutor) -> None:
+        body = self._storage.open_object(self.spec.archive_key)
+        try:
+            with tarfile.open(fileobj=body, mode="r|*") as archive:
+                for member in archive:
+                    if not member.isfile():
+                        continue
+                    name = self._accept(member.name, member.size)
+                    if name is None:
+                        continue
+                    extracted = archive.extractfile(member)
+                    data = extracted.read() if extracted is not None else b""
+                    self._submit(workers, writer, name, lambda data=data: data)
+        finally:
+            body.close()
+
+    def _read_zip(self, workers: ThreadPoolExecutor, writer: ThreadPoolExecutor) -> None:
+        with zipfile.ZipFile(self._storage.open_ranged(self.spec.archive_key)) as archive:
+            members = [info for info in archive.infolist() if not info.is_dir()]
+        self._total = len(members)
+        for info in members:
+            name = self._accept(info.filename, info.file_size)
+            if name is not None:
+                self._submit(workers, writer, name, lambda info=info: self._read_member(info))
+
+    def _read_member(self, info: zipfile.ZipInfo) -> bytes:
+        # One handle per worker thread: a shared ZipFile serializes reads.
+        handle = getattr(self._local, "zip", None)
+        if handle is None:
+            handle = zipfile.ZipFile(self._storage.open_ranged(self.spec.archive_key))
+            self._local.zip = handle
+            with self._lock:
+                self._handles.append(handle)
+        return handle.read(info)
+
+    def _accept(self, name: str, size: int) -> str | None:
+        """The member's name within the dataset, or None if it is not imported."""
+        while name.startswith("./"):
+            name = name[2:]
+        name = name.lstrip("/")
+        if any(part in name for part in _IGNORED_NAMES):
+            self.ignored += 1
+            return None
+        self.entries += 1
+        error = validate_filename(self.spec.prefix + name)
+        if error is None and size > self._max_member:
+            error = f"larger than {settings.import_max_member_mb} MiB"
+        if error is not None:
+            self._fail(name, error)
+            return None
+        return name
+
+    def _submit(
+        self,
+        workers: ThreadPoolExecutor,
+        writer: ThreadPoolExecutor,
+        name: str,
+        load: Callable[[], bytes],
+    ) -> None:
+        self._slots.acquire()
+        workers.submit(self._import_member, writer, name, load)
+        if self.entries % _PROGRESS_EVERY == 0:
+            self._report()
+
+    def _import_member(
+        self,
+        writer: ThreadPoolExecutor,
+        name: str,
+        load: Callable[[], bytes],
+    ) -> None:
+        digest: str | None = None
+        try:
+            data = load()
+            digest = hashlib.sha256(data).hexdigest()
+            with self._lock:
+                duplicate = digest in self._known
+                self._known.add(digest)
+            if duplicate:
+                digest = None
+                with self._lock:
+                    self.duplicates.append(name)
+                return
+            key = dataset_object_key(self.spec.dataset_id, self.spec.prefix + name)
+            mime_type = mimetypes.guess_type(name)[0]
+            self._storage.put_object(key, data, content_type=mime_type)
+            row = {
+                "dataset_id": self.spec.dataset_id,
+                "object_key": key,
+                "size_bytes": len(data),
+                "mime_type": mime_type,
+                "content_hash": digest,
+                "created_at": datetime.now(timezone.utc),
+            }
+            with self._lock:
+                self.uploaded += 1
+                self.uploaded_bytes += len(data)
+                self._rows.append(row)
+            self._flush(writer)
+        except Exception as exc:
+            if digest is not None:
+                # Let a later copy of the same content be imported instead.
+                with self._lock:
+                    self._known.discard(digest)
+            self._fail(name, f"{type(exc).__name__}: {exc}")
+        finally:
+            self._slots.release()
+
+    def _flush(self, writer: ThreadPoolExecutor, force: bool = False) -> None:
+        with self._lock:
+            if not self._rows or (len(self._rows) < settings.ingest_batch_size and not force):
+                return
+            rows, self._rows = self._rows, []
+            self._writes.append(writer.submit(self._write, rows))
+
+    def _write(self, rows: list[dict[str, Any]]) -> None:
+        self._with_db(lambda db: AssetRepository(db=db).upsert_uploaded(rows))
+
+    def _fail(self, name: str, error: str) -> None:
+        logger.warning("Import of %s failed: %s", name, error)
+        metrics.inc("import_member_failures")
+        with self._lock:
+            self.failed.append(name)
+
+    def _report(self) -> None:
+        with self._lock:
+            progress = {
+                "entries": self.entries,
+                "total": self._total,
+                "uploaded": self.uploaded,
+                "uploaded_bytes": self.uploaded_bytes,
+                "duplicates": len(self.duplicates),
+                "failed": len(self.failed),
+            }
+        self.ctx.report_progress(progress)
+
+    def _with_db(self, fn: Callable[[Session], Any]) -> Any:
+        db = self._session_factory()
+        try:
+            return fn(db)
+        finally:
+            db.close()
@@ -0,0 +1,461 @@
+"""Dataset export to training formats (job type ``export``).
+
+Payload::
+
+    {
+        "dataset_id": 1,
+        "format": "coco",              # "coco", "yolo" or "webdataset"
+        "status": "ready",             # optional asset filter
+        "include_images": false,       # yolo only; webdataset always has images
+        "shard_size_mb": 512,          # webdataset shard size
+        "prefix": "exports/1/42/"      # default: exports/{dataset_id}/{job_id}/
+    }
+
+A custom ``prefix`` must lie under ``exports/{dataset_id}/``, so an export
+never overwrites another dataset's objects.
+
+Outputs, under ``prefix``:
+
+* ``coco``: ``annotations.json`` with ``images``, ``annotations`` and
+  ``categories``; masks are written as compact RLE segmentations,
+  polygons as COCO polygons. Image-level ``class`` annotations have no
+  COCO equivalent and are skipped.
+* ``yolo``: ``yolo.tar`` with ``labels/{asset_id}.txt`` detection labels
+  (normalized boxes; polygons and masks contribute their bbox),
+  optionally ``images/{asset_id}.{ext}``, and ``data.yaml`` with the class
+  names. Assets without known dimensions need ``include_images``.
+* ``webdataset``: ``shard-000000.tar``, ... each holding
+  ``{asset_id}.{ext}`` and ``{asset_id}.json`` (the asset's annotations).
+
+Assets and annotations are read with two server-side cursors, both in
+asset id order, and merge-joined; every output is written through a
+``MultipartWriter``, and images are prefetched by a bounded thread pool.
+Memory therefore stays flat however many assets the dataset has.
+"""
+from __future__ import annotations
+
+import io
+import json
+import logging
+import posixpath
+import tarfile
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass
+from typing import Any
+
+from PIL import Image
+from sqlalchemy.orm import Session
+
+from app.core import rle
+from app.core.config import settings
+from app.infrastructure.storage import MultipartWriter, StorageClient, storage_registry
+from app.models.orm.blob import blob_object_key
+from app.repositories.annotation_repository import AnnotationRepository
+from app.repositories.asset_repository import AssetRepository
+from app.services.presign_service import validate_filename
+from app.telemetry.metrics import metrics
+from app.workers.handlers import JobContext
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("coco", "yolo", "webdataset")
+
+# Progress is reported every this many assets.
+_PROGRESS_EVERY = 1000
+# Failed asset ids kept in the job result.
+_MAX_REPORTED_FAILURES = 50
+
+
+@dataclass(frozen=True)
+class ExportSpec:
+    dataset_id: int
+    format: str
+    prefix: str
+    status: str | None = None
+    include_images: bool = False
+    shard_size_mb: int = 512
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any], job_id: int) -> ExportSpec:
+        """Validate a job payload; raise ``ValueError`` if it is unusable."""
+        try:
+            dataset_id = int(payload["dataset_id"])
+            spec = cls(
+                dataset_id=dataset_id,
+                format=str(payload["format"]),
+                prefix=str(payload.get("prefix") or f"{export_root(dataset_id)}{job_id}/"),
+                status=payload.get("status"),
+                include_images=bool(payload.get("include_images", cls.include_images)),
+                shard_size_mb=int(payload.get("shard_size_mb", cls.shard_size_mb)),
+            )
+        except KeyError as exc:
+            raise ValueError(f"Export payload is missing {exc.args[0]!r}") from exc
+        if spec.format not in EXPORT_FORMATS:
+            raise ValueError(f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+        if spec.shard_size_mb < 1:
+            raise ValueError("shard_size_mb must be at least 1")
+        root = export_root(spec.dataset_id)
+        if not spec.prefix.startswith(root) or validate_filename(
+            spec.prefix[len(root) :].rstrip("/")
+        ):
+            raise ValueError(f"prefix must be a path under {root}")
+        return spec
+
+
+def export_root(dataset_id: int) -> str:
+    """The prefix every export of a dataset is written under."""
+    return f"exports/{dataset_id}/"
+
+
+@dataclass
+class _Sample:
+    asset: Any
+    annotations: list[Any]
+    data: bytes | None = None
+    error: str | None = None
+
+
+def run_export(ctx: JobContext) -> dict[str, Any]:
+    """Job handler: export a dataset and its annotations to object storage."""
+    from app.infrastructure.db import SessionLocal
+
+    spec = ExportSpec.from_payload(ctx.payload, ctx.job_id)
+    storage = storage_registry.get()
+    return DatasetExporter(spec, ctx, SessionLocal, storage).run()
+
+
+class DatasetExporter:
+    def __init__(
+        self,
+        spec: ExportSpec,
+        ctx: JobContext,
+        session_factory: Callable[[], Session],
+        storage: StorageClient,
+    ) -> None:
+        self.spec = spec
+        self.ctx = ctx
+        self._session_factory = session_factory
+        self._storage = storage
+        self._categories: dict[str, int] = {}
+        self._outputs: list[str] = []
+        self._failed: list[int] = []
+        self._processed = 0
+        self._annotations = 0
+        self._skipped_annotations = 0
+        self._total = 0
+        self._mtime = int(time.time())
+
+    def run(self) -> dict[str, Any]:
+        started = time.perf_counter()
+        self._total = self._with_db(
+            lambda db: AssetRepository(db=db).count_assets(self.spec.dataset_id, self.spec.status)
+        )
+        exporters = {
+            "coco": self._export_coco,
+            "yolo": self._export_yolo,
+            "webdataset": self._export_webdataset,
+        }
+        exporters[self.spec.format]()
+
+        elapsed = time.perf_counter() - started
+        metrics.observe("export_seconds", elapsed, format=self.spec.format)
+        return {
+            "dataset_id": self.spec.dataset_id,
+            "format": self.spec.format,
+            "outputs": self._outputs,
+            "assets": self._processed - len(self._failed),
+            "annotations": self._annotations,
+            "skipped_annotations": self._skipped_annotations,
+            "categories": len(self._categories),
+            "failed": len(self._failed),
+            "failed_asset_ids": self._failed[:_MAX_REPORTED_FAILURES],
+            "seconds": round(elapsed, 3),
+        }
+
+    # COCO
+
+    def _export_coco(self) -> None:
+        with self._open("annotations.json", "application/json") as out:
+            out.write(b'{"images":[')
+            # Images and annotations are separate arrays, so the dataset is
+            # read twice rather than held in memory between them.
+            with self._session_factory() as db:
+                assets = AssetRepository(db=db).stream_dataset(
+                    self.spec.dataset_id, self.spec.status
+                )
+                for index, asset in enumerate(assets):
+                    image = {"id": asset.id, "file_name": asset.object_key}
+                    if asset.width is not None and asset.height is not None:
+                        image.update(width=asset.width, height=asset.height)
+                    out.write(b"," if index else b"")
+                    out.write(_json(image))
+
+            out.write(b'],"annotations":[')
+            first = True
+            for sample in self._samples():
+                for annotation in sample.annotations:
+                    record = self._coco_annotation(annotation)
+                    if record is None:
+                        continue
+                    out.write(b"" if first else b",")
+                    out.write(_json(record))
+                    first = False
+                self._advance()
+
+            categories = [
+                {"id": category_id, "name": name}
+                for name, category_id in self._categories.items()
+            ]
+            out.write(b'],"categories":')
+            out.write(_json(categories))
+            out.write(b"}")
+
+    def _coco_annotation(self, annotation: Any) -> dict[str, Any] | None:
+        if annotation.kind == "class" or annotation.bbox is None:
+            self._skipped_annotations += 1
+            return None
+        x, y, w, h = annotation.bbox
+        record: dict[str, Any] = {
+            "id": annotation.id,
+            "image_id": annotation.asset_id,
+            "category_id": self._category(annotation.label),
+            "bbox": annotation.bbox,
+            "area": w * h,
+            "iscrowd": 0,
+        }
+        if annotation.kind == "polygon":
+            points = annotation.geometry["points"]
+            record["segmentation"] = [[coord for point in points for coord in point]]
+            record["area"] = _polygon_area(points)
+        elif annotation.kind == "mask":
+            record["segmentation"] = annotation.geometry
+            record["area"] = rle.area(annotation.geometry)
+        if annotation.score is not None:
+            record["score"] = annotation.score
+        self._annotations += 1
+        return record
+
+    # YOLO
+
+    def _export_yolo(self) -> None:
+        with (
+            self._open("yolo.tar", "application/x-tar") as out,
+            tarfile.open(fileobj=out, mode="w|") as tar,
+        ):
+            for sample in self._samples(with_images=self.spec.include_images):
+                asset = sample.asset
+                if self.spec.include_images and sample.data is None:
+                    self._fail(asset.id, sample.error)
+                    continue
+                size = _image_size(asset, sample.data)
+                if size is None:
+                    self._fail(asset.id, "unknown image size")
+                    continue
+                lines = [
+                    line
+                    for line in (self._yolo_line(a, *size) for a in sample.annotations)
+                    if line is not None
+                ]
+                self._add(tar, f"labels/{asset.id}.txt", "".join(lines).encode())
+                if sample.data is not None:
+                    self._add(tar, f"images/{asset.id}{_extension(asset)}", sample.data)
+                self._advance()
+
+            names = "".join(
+                f"  {category_id}: {json.dumps(name)}\n"
+                for name, category_id in self._categories.items()
+            )
+            data_yaml = f"path: .\ntrain: images\nnc: {len(self._categories)}\nnames:\n{names}"
+            self._add(tar, "data.yaml", data_yaml.encode())
+
+    def _yolo_line(self, annotation: Any, width: int, height: int) -> str | None:
+        if annotation.bbox is None or not width or not height:
+            self._skipped_annotations += 1
+            return None
+        x, y, w, h = annotation.bbox
+        category = self._category(annotation.label, start=0)
+        self._annotations += 1
+        return (
+            f"{category} {(x + w / 2) / width:.6f} {(y + h / 2) / height:.6f} "
+            f"{w / width:.6f} {h / height:.6f}\n"
+        )
+
+    # WebDataset
+
+    def _export_webdataset(self) -> None:
+        shard_bytes = self.spec.shard_size_mb * 1024 * 1024
+        with ExitStack() as stack:
+            out: MultipartWriter | None = None
+            tar: tarfile.TarFile | None = None
+            for sample in self._samples(with_images=True):
+                asset = sample.asset
+                if sample.data is None:
+                    self._fail(asset.id, sample.error)
+                    continue
+                if out is None or out.bytes_written >= shard_bytes:
+                    # Close the previous shard before opening the next.
+                    stack.close()
+                    name = f"shard-{len(self._outputs):06d}.tar"
+                    out = stack.enter_context(self._open(name, "application/x-tar"))
+                    tar = stack.enter_context(tarfile.open(fileobj=out, mode="w|"))
+                key = f"{asset.id:010d}"
+                meta = {
+                    "asset_id": asset.id,
+                    "object_key": asset.object_key,
+                    "width": asset.width,
+                    "height": asset.height,
+                    "annotations": [self._wds_annotation(a) for a in sample.annotations],
+                }
+                self._add(tar, f"{key}{_extension(asset)}", sample.data)
+                self._add(tar, f"{key}.json", _json(meta))
+                self._advance()
+
+    def _wds_annotation(self, annotation: Any) -> dict[str, Any]:
+        record: dict[str, Any] = {
+            "kind": annotation.kind,
+            "label": annotation.label,
+            "category_id": self._category(annotation.label),
+        }
+        if annotation.bbox is not None:
+            record["bbox"] = annotation.bbox
+        if annotation.kind == "polygon":
+            record["points"] = annotation.geometry["points"]
+        elif annotation.kind == "mask":
+            record["mask"] = annotation.geometry
+        if annotation.score is not None:
+            record["score"] = annotation.score
+        if annotation.attributes is not None:
+            record["attributes"] = annotation.attributes
+        self._annotations += 1
+        return record
+
+    # Shared plumbing
+
+    def _samples(self, with_images: bool = False) -> Iterator[_Sample]:
+        """Assets with their annotations, in asset id order."""
+        with self._session_factory() as asset_db, self._session_factory() as annotation_db:
+            assets = AssetRepository(db=asset_db).stream_dataset(
+                self.spec.dataset_id, self.spec.status
+            )
+            annotations = AnnotationRepository(db=annotation_db).stream_dataset(
+                self.spec.dataset_id
+            )
+            samples = _merge(assets, annotations)
+            yield from self._fetch_images(samples) if with_images else samples
+
+    def _fetch_images(self, samples: Iterator[_Sample]) -> Iterator[_Sample]:
+        """Download images ahead of the writer, keeping the output in order."""
+        workers = settings.export_fetch_workers
+        pending: deque[Future[_Sample]] = deque()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="export-fetch") as pool:
+            for sample in samples:
+                pending.append(pool.submit(self._fetch, sample))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def _fetch(self, sample: _Sample) -> _Sample:
+        try:
+            asset = sample.asset
+            key = blob_object_key(asset.blob_sha256) if asset.blob_sha256 else asset.object_key
+            sample.data = self._storage.get_object(key)
+        except Exception as exc:
+            sample.error = f"{type(exc).__name__}: {exc}"
+        return sample
+
+    def _open(self, name: str, content_type: str) -> MultipartWriter:
+        key = posixpath.join(self.spec.prefix, name)
+        self._outputs.append(key)
+        return MultipartWriter(
+            self._storage,
+            key,
+            content_type=content_type,
+            part_size=settings.export_part_size_mb * 1024 * 1024,
+        )
+
+    def _add(self, tar: tarfile.TarFile | None, name: str, data: bytes) -> None:
+        assert tar is not None
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = self._mtime
+        tar.addfile(info, io.BytesIO(data))
+
+    def _category(self, label: str, start: int = 1) -> int:
+        # Ids follow first appearance; COCO counts from 1, YOLO from 0.
+        if label not in self._categories:
+            self._categories[label] = len(self._categories) + start
+        return self._categories[label]
+
+    def _fail(self, asset_id: int, error: str | None) -> None:
+        logger.warning("Export of asset %s failed: %s", asset_id, error)
+        metrics.inc("export_asset_failures")
+        self._failed.append(asset_id)
+        self._advance()
+
+    def _advance(self) -> None:
+        self._processed += 1
+        if self._processed % _PROGRESS_EVERY == 0:
+            self.ctx.report_progress(
+                {
+                    "processed": self._processed,
+                    "total": self._total,
+                    "failed": len(self._failed),
+                    "outputs": len(self._outputs),
+                }
+            )
+
+    def _with_db(self, fn: Callable[[Session], Any]) -> Any:
+        db = self._session_factory()
+        try:
+            return fn(db)
+        finally:
+            db.close()
+
+
+def _merge(assets: Iterator[Any], annotations: Iterator[Any]) -> Iterator[_Sample]:
+    """Join two streams ordered by asset id without holding either in memory."""
+    annotation = next(annotations, None)
+    for asset in assets:
+        # Skip annotations of assets filtered out by status.
+        while annotation is not None and annotation.asset_id < asset.id:
+            annotation = next(annotations, None)
+        sample = _Sample(asset, [])
+        while annotation is not None and annotation.asset_id == asset.id:
+            sample.annotations.append(annotation)
+            annotation = next(annotations, None)
+        yield sample
+
+
+def _json(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+def _polygon_area(points: list[list[float]]) -> float:
+    # Shoelace formula.
+    total = 0.0
+    for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1]):
+        total += x1 * y2 - x2 * y1
+    return abs(total) / 2
+
+
+def _image_size(asset: Any, data: bytes | None) -> tuple[int, int] | None:
+    if asset.width and asset.height:
+        return asset.width, asset.height
+    if data is None:
+        return None
+    try:
+        # Only the header is parsed; pixels are not decoded.
+        with Image.open(io.BytesIO(data)) as image:
+            return image.size
+    except Exception:
+        return None
+
+
+def _extension(asset: Any) -> str:
+    ext = posixpath.splitext(asset.object_key)[1].lower()
+    return ext or ".bin"
@@ -0,0 +1,49 @@
+"""Registry of job handlers, resolved lazily by job type.
+
+Handlers are referenced as ``"module:function"`` strings so the API can
+validate job types without importing heavy worker dependencies.
+"""
+from __future__ import annotations
+
+import importlib
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+JOB_HANDLERS: dict[str, str] = {
+    "noop": "app.workers.handlers:run_noop",
+    "inference": "app.workers.inference:run_inference",
+    "export": "app.workers.export:run_export",
+    "import": "app.workers.dataset_import:run_import",
+    "thumbnails": "app.workers.thumbnails:run_thumbnails",
+}
+
+# Job types that work on the dataset named by ``payload["dataset_id"]``; the
+# API only queues them for callers who may access that dataset.
+DATASET_JOB_TYPES = frozenset({"inference", "export", "import", "thumbnails"})
+
+
+@dataclass
+class JobContext:
+    """What a handler gets to see about the job it runs."""
+
+    job_id: int
+    type: str
+    payload: dict[str, Any]
+    worker_id: str
+    report_progress: Callable[[dict[str, Any]], None] = field(default=lambda progress: None)
+
+
+JobHandler = Callable[[JobContext], "dict[str, Any] | None"]
+
+
+def resolve_handler(job_type: str) -> JobHandler:
+    """Import and return the handler for ``job_type``; raise ``KeyError`` if unknown."""
+    target = JOB_HANDLERS[job_type]
+    module_name, _, attr = target.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def run_noop(ctx: JobContext) -> dict[str, Any]:
+    """Echo the payload back; useful to check that workers are alive."""
+    return {"echo": ctx.payload}
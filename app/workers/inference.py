@@ -0,0 +1,414 @@
+"""Batch inference over the assets of a dataset (job type ``inference``).
+
+Payload::
+
+    {
+        "dataset_id": 1,
+        "model_key": "models/classifier.onnx",   # ONNX model in the bucket
+        "batch_size": 32,
+        "max_batch_latency_ms": 50,
+        "input_size": [224, 224],                 # height, width
+        "resize_mode": "resize",                  # or "letterbox"
+        "status": "uploaded",                     # optional asset filter
+        "top_k": 5
+    }
+
+The stages overlap so the model rarely waits on storage:
+
+* a producer pages asset rows by keyset and submits fetch+decode tasks to a
+  thread pool (S3 reads and PIL decoding both release the GIL), keeping at
+  most ``inference_prefetch`` images in flight;
+* decoding and resizing use ``app.ml.preprocessing``, optionally on
+  ``inference_decode_processes`` worker processes;
+* decoded images are taken in completion order, so one slow object does
+  not hold up the others;
+* a batch closes when it is full or ``max_batch_latency_ms`` after its
+  first image arrived, whichever comes first;
+* ONNX Runtime runs the batch on the CPU;
+* predictions are bulk-inserted by a writer thread while the next batch is
+  computed.
+
+Time spent per stage and throughput are reported as job progress, in the
+job result and as ``inference_*`` metrics.
+"""
+from __future__ import annotations
+
+import functools
+import logging
+import queue
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.infrastructure.storage import StorageClient, storage_registry
+from app.ml.preprocessing import (
+    BatchBuffer,
+    PreprocessConfig,
+    PreprocessPool,
+    ResizeMode,
+    decode_image,
+)
+from app.repositories.asset_repository import AssetRepository
+from app.repositories.prediction_repository import PredictionRepository
+from app.telemetry.metrics import metrics
+from app.workers.handlers import JobContext
+
+logger = logging.getLogger(__name__)
+
+# Asset rows read per keyset page.
+_PAGE_SIZE = 500
+# Failed asset ids kept in the job result.
+_MAX_REPORTED_FAILURES = 50
+
+
+@dataclass(frozen=True)
+class InferenceSpec:
+    dataset_id: int
+    model_key: str
+    batch_size: int = 32
+    max_batch_latency_ms: float = 50.0
+    input_size: tuple[int, int] = (224, 224)
+    resize_mode: ResizeMode = "resize"
+    status: str | None = None
+    top_k: int = 5
+    softmax: bool = True
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> InferenceSpec:
+        """Validate a job payload; raise ``ValueError`` if it is unusable."""
+        try:
+            spec = cls(
+                dataset_id=int(payload["dataset_id"]),
+                model_key=str(payload["model_key"]),
+                batch_size=int(payload.get("batch_size", cls.batch_size)),
+                max_batch_latency_ms=float(
+                    payload.get("max_batch_latency_ms", cls.max_batch_latency_ms)
+                ),
+                input_size=tuple(payload.get("input_size", cls.input_size)),
+                resize_mode=payload.get("resize_mode", cls.resize_mode),
+                status=payload.get("status"),
+                top_k=int(payload.get("top_k", cls.top_k)),
+                softmax=bool(payload.get("softmax", cls.softmax)),
+            )
+        except KeyError as exc:
+            raise ValueError(f"Inference payload is missing {exc.args[0]!r}") from exc
+        if not 1 <= spec.batch_size <= 1024:
+            raise ValueError("batch_size must be between 1 and 1024")
+        if spec.top_k < 1:
+            raise ValueError("top_k must be at least 1")
+        if len(spec.input_size) != 2 or min(spec.input_size) < 1:
+            raise ValueError("input_size must be [height, width]")
+        if spec.resize_mode not in ("resize", "letterbox"):
+            raise ValueError("resize_mode must be 'resize' or 'letterbox'")
+        return spec
+
+
+@dataclass
+class _Decoded:
+    asset_id: int
+    image: np.ndarray | None
+    error: str | None = None
+
+
+class _StageClock:
+    """Accumulates wall time per pipeline stage (thread-safe)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.seconds: dict[str, float] = defaultdict(float)
+
+    def add(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.seconds[stage] += seconds
+        metrics.observe("inference_stage_seconds", seconds, stage=stage)
+
+    def snapshot(self) -> dict[str, float]:
+        with self._lock:
+            return {stage: round(value, 3) for stage, value in self.seconds.items()}
+
+
+def run_inference(ctx: JobContext) -> dict[str, Any]:
+    """Job handler: run a model over a dataset and store its predictions."""
+    from app.infrastructure.db import SessionLocal
+
+    spec = InferenceSpec.from_payload(ctx.payload)
+    storage = storage_registry.get()
+    return InferenceRunner(spec, ctx, SessionLocal, storage).run()
+
+
+class InferenceRunner:
+    def __init__(
+        self,
+        spec: InferenceSpec,
+        ctx: JobContext,
+        session_factory: Callable[[], Session],
+        storage: StorageClient,
+    ) -> None:
+        self.spec = spec
+        self.ctx = ctx
+        self._session_factory = session_factory
+        self._storage = storage
+        self._clock = _StageClock()
+        self._producer_error: BaseException | None = None
+        self._preprocess = PreprocessConfig(size=spec.input_size, mode=spec.resize_mode)
+        self._decode_pool: PreprocessPool | None = None
+
+    def run(self) -> dict[str, Any]:
+        spec = self.spec
+        started = time.perf_counter()
+        session = load_model(spec.model_key)
+        input_meta = session.get_inputs()[0]
+        # A fixed batch dimension means short batches have to be padded.
+        fixed_batch = input_meta.shape[0] if isinstance(input_meta.shape[0], int) else None
+        batch_size = fixed_batch or spec.batch_size
+
+        total = self._with_db(
+            lambda db: AssetRepository(db=db).count_assets(spec.dataset_id, spec.status)
+        )
+        self._with_db(lambda db: PredictionRepository(db=db).delete_for_job(self.ctx.job_id))
+
+        buffer = BatchBuffer(self._preprocess, capacity=batch_size)
+        processed = 0
+        failed: list[int] = []
+        pending_write: Future[None] | None = None
+        stop = threading.Event()
+        decoded: queue.Queue[_Decoded | None] = queue.Queue()
+        slots = threading.BoundedSemaphore(max(settings.inference_prefetch, batch_size))
+
+        if settings.inference_decode_processes:
+            self._decode_pool = PreprocessPool(
+                self._preprocess,
+                processes=settings.inference_decode_processes,
+            )
+        with (
+            ThreadPoolExecutor(
+                max_workers=settings.inference_decode_workers,
+                thread_name_prefix="inference-decode",
+            ) as decoders,
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference-write") as writer,
+        ):
+            producer = threading.Thread(
+                target=self._produce,
+                args=(decoders, decoded, slots, stop),
+                name="inference-producer",
+                daemon=True,
+            )
+            producer.start()
+            try:
+                for batch in self._batches(decoded, slots, batch_size):
+                    ok = [item for item in batch if item.image is not None]
+                    failed.extend(item.asset_id for item in batch if item.image is None)
+                    if ok:
+                        for row, item in enumerate(ok):
+                            buffer.put(row, item.image)
+                        rows = len(ok) if fixed_batch is None else batch_size
+                        outputs = self._infer(session, input_meta.name, buffer, rows)
+                        predictions = self._predictions(ok, outputs[: len(ok)])
+                        if pending_write is not None:
+                            pending_write.result()
+                        pending_write = writer.submit(self._write, predictions)
+                    processed += len(batch)
+                    self._report(processed, total, len(failed), started)
+                if pending_write is not None:
+                    pending_write.result()
+            finally:
+                stop.set()
+                producer.join()
+                if self._decode_pool is not None:
+                    self._decode_pool.close()
+        if self._producer_error is not None:
+            raise RuntimeError("Listing dataset assets failed") from self._producer_error
+
+        elapsed = time.perf_counter() - started
+        succeeded = processed - len(failed)
+        return {
+            "dataset_id": spec.dataset_id,
+            "model_key": spec.model_key,
+            "processed": processed,
+            "succeeded": succeeded,
+            "failed": len(failed),
+            "failed_asset_ids": failed[:_MAX_REPORTED_FAILURES],
+            "seconds": round(elapsed, 3),
+            "images_per_second": round(succeeded / elapsed, 2) if elapsed else 0.0,
+            "stage_seconds": self._clock.snapshot(),
+        }
+
+    def _produce(
+        self,
+        decoders: ThreadPoolExecutor,
+        decoded: queue.Queue[_Decoded | None],
+        slots: threading.BoundedSemaphore,
+        stop: threading.Event,
+    ) -> None:
+        submitted: list[Future[None]] = []
+        try:
+            for asset_id, key in self._iter_assets():
+                while not slots.acquire(timeout=0.5):
+                    if stop.is_set():
+                        return
+                if stop.is_set():
+                    slots.release()
+                    return
+                submitted.append(decoders.submit(self._load, asset_id, key, decoded))
+                if len(submitted) > 4 * _PAGE_SIZE:
+                    submitted = [f for f in submitted if not f.done()]
+        except Exception as exc:
+            self._producer_error = exc
+        finally:
+            # Tasks queue their image before they finish, so the end marker
+            # always comes after the last image.
+            for future in submitted:
+                future.result()
+            decoded.put(None)
+
+    def _iter_assets(self) -> Iterator[tuple[int, str]]:
+        after_id: int | None = None
+        while True:
+            began = time.perf_counter()
+            page = self._with_db(
+                lambda db: [
+                    (asset.id, asset.storage_key)
+                    for asset in AssetRepository(db=db).list_assets(
+                        self.spec.dataset_id,
+                        limit=_PAGE_SIZE,
+                        after_id=after_id,
+                        status=self.spec.status,
+                    )
+                ]
+            )
+            self._clock.add("list", time.perf_counter() - began)
+            if not page:
+                return
+            yield from page
+            after_id = page[-1][0]
+
+    def _load(self, asset_id: int, key: str, decoded: queue.Queue[_Decoded | None]) -> None:
+        try:
+            began = time.perf_counter()
+            data = self._storage.get_object(key)
+            fetched = time.perf_counter()
+            self._clock.add("fetch", fetched - began)
+            if self._decode_pool is not None:
+                image, _ = self._decode_pool.decode(data)
+            else:
+                image, _ = decode_image(data, self._preprocess)
+            self._clock.add("decode", time.perf_counter() - fetched)
+            decoded.put(_Decoded(asset_id, image))
+        except Exception as exc:
+            metrics.inc("inference_asset_failures")
+            decoded.put(_Decoded(asset_id, None, f"{type(exc).__name__}: {exc}"))
+
+    def _batches(
+        self,
+        decoded: queue.Queue[_Decoded | None],
+        slots: threading.BoundedSemaphore,
+        batch_size: int,
+    ) -> Iterator[list[_Decoded]]:
+        """Yield batches closed by size or by the latency deadline."""
+        max_wait = self.spec.max_batch_latency_ms / 1000
+        batch: list[_Decoded] = []
+        deadline = 0.0
+        waiting_since = time.perf_counter()
+        while True:
+            timeout = max(deadline - time.perf_counter(), 0.0) if batch else None
+            try:
+                item = decoded.get(timeout=timeout)
+            except queue.Empty:
+                item = ...
+            if item is None or item is ...:
+                if batch:
+                    self._clock.add("batch_wait", time.perf_counter() - waiting_since)
+                    yield batch
+                    batch, waiting_since = [], time.perf_counter()
+                if item is None:
+                    return
+                continue
+            slots.release()
+            if not batch:
+                deadline = time.perf_counter() + max_wait
+            batch.append(item)
+            if len(batch) >= batch_size:
+                self._clock.add("batch_wait", time.perf_counter() - waiting_since)
+                yield batch
+                batch, waiting_since = [], time.perf_counter()
+
+    def _infer(self, session: Any, input_name: str, buffer: BatchBuffer, rows: int) -> np.ndarray:
+        began = time.perf_counter()
+        outputs = session.run(None, {input_name: buffer.tensor(rows)})[0]
+        self._clock.add("infer", time.perf_counter() - began)
+        return np.asarray(outputs).reshape(rows, -1)
+
+    def _predictions(self, items: list[_Decoded], outputs: np.ndarray) -> list[dict[str, Any]]:
+        scores = _softmax(outputs) if self.spec.softmax else outputs
+        k = min(self.spec.top_k, scores.shape[1])
+        top = np.argsort(-scores, axis=1)[:, :k]
+        now = datetime.utcnow()
+        rows = []
+        for item, row_scores, row_top in zip(items, scores, top):
+            rows.append(
+                {
+                    "job_id": self.ctx.job_id,
+                    "asset_id": item.asset_id,
+                    "model": self.spec.model_key,
+                    "label": int(row_top[0]),
+                    "score": float(row_scores[row_top[0]]),
+                    "output": {
+                        "top_k": [[int(c), float(row_scores[c])] for c in row_top],
+                    },
+                    "created_at": now,
+                }
+            )
+        return rows
+
+    def _write(self, rows: list[dict[str, Any]]) -> None:
+        began = time.perf_counter()
+        self._with_db(lambda db: PredictionRepository(db=db).bulk_insert(rows))
+        self._clock.add("write", time.perf_counter() - began)
+
+    def _report(self, processed: int, total: int, failed: int, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        rate = (processed - failed) / elapsed if elapsed else 0.0
+        metrics.set_gauge("inference_images_per_second", rate, job=self.ctx.job_id)
+        self.ctx.report_progress(
+            {
+                "processed": processed,
+                "total": total,
+                "failed": failed,
+                "images_per_second": round(rate, 2),
+                "stage_seconds": self._clock.snapshot(),
+            }
+        )
+
+    def _with_db(self, fn: Callable[[Session], Any]) -> Any:
+        db = self._session_factory()
+        try:
+            return fn(db)
+        finally:
+            db.close()
+
+
+@functools.lru_cache(maxsize=2)
+def load_model(model_key: str) -> Any:
+    """Load an ONNX model from the bucket, once per worker process."""
+    import onnxruntime as ort  # optional dependency, only needed by inference workers
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    options.intra_op_num_threads = settings.inference_intra_op_threads
+    model = storage_registry.get().get_object(model_key)
+    return ort.InferenceSession(model, sess_options=options, providers=["CPUExecutionProvider"])
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    shifted = logits - logits.max(axis=1, keepdims=True)
+    exp = np.exp(shifted, dtype=np.float32)
+    return exp / exp.sum(axis=1, keepdims=True)
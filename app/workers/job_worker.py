@@ -0,0 +1,274 @@
+"""Job worker processes.
+
+Run with ``python -m app.workers.job_worker --processes 4``. Every process
+claims jobs from the jobs table under a lease (in fair-share order across
+tenants, see ``app.services.job_scheduler``), renews the lease while the
+handler runs and records the outcome. Any number of processes (or hosts)
+can run side by side without processing a job twice.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+import traceback
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.infrastructure.queue import JobBroker, create_job_broker
+from app.models.orm.job import Job
+from app.repositories.job_repository import JobRepository
+from app.services.job_events import job_event
+from app.services.job_scheduler import FairShareScheduler
+from app.workers.handlers import JOB_HANDLERS, JobContext, resolve_handler
+
+logger = logging.getLogger(__name__)
+
+
+class LeaseLostError(RuntimeError):
+    """Raised to a handler when another worker took over its job."""
+
+
+class JobWorker:
+    """Claims and runs jobs until asked to stop."""
+
+    def __init__(
+        self,
+        worker_id: str,
+        session_factory: Callable[[], Session],
+        broker: JobBroker,
+        job_types: Sequence[str] | None = None,
+        lease_seconds: float = 60.0,
+        poll_interval: float = 2.0,
+        scheduler: FairShareScheduler | None = None,
+    ) -> None:
+        self.worker_id = worker_id
+        self._session_factory = session_factory
+        self._broker = broker
+        self._job_types = list(job_types) if job_types else list(JOB_HANDLERS)
+        self._lease_seconds = lease_seconds
+        self._poll_interval = poll_interval
+        self._scheduler = scheduler or FairShareScheduler()
+        self._next_requeue = 0.0
+
+    def run(self, stop: threading.Event) -> None:
+        logger.info("Worker %s started for job types %s", self.worker_id, self._job_types)
+        while not stop.is_set():
+            if not self.run_once():
+                self._broker.wait(self._poll_interval)
+        logger.info("Worker %s stopped", self.worker_id)
+
+    def run_once(self) -> bool:
+        """Claim and run at most one job; return whether one was run."""
+        db = self._session_factory()
+        try:
+            repo = JobRepository(db=db)
+            self._requeue_expired(repo)
+            job = self._scheduler.claim_next(
+                repo,
+                self.worker_id,
+                self._lease_seconds,
+                self._job_types,
+            )
+            if job is None:
+                return False
+            self._broker.publish(job_event(job))
+            self._execute(repo, job)
+            return True
+        finally:
+            db.close()
+
+    def _requeue_expired(self, repo: JobRepository) -> None:
+        # Scan once per lease interval rather than on every poll; a stuck job
+        # waits at most one more interval before it is requeued.
+        now = time.monotonic()
+        if now < self._next_requeue:
+            return
+        self._next_requeue = now + self._lease_seconds
+        repo.requeue_expired()
+
+    def _execute(self, repo: JobRepository, job: Job) -> None:
+        job_id, job_type = job.id, job.type
+        lease = _LeaseKeeper(
+            self._session_factory,
+            self._broker,
+            job_id,
+            self.worker_id,
+            self._lease_seconds,
+        )
+        ctx = JobContext(
+            job_id=job_id,
+            type=job_type,
+            payload=dict(job.payload or {}),
+            worker_id=self.worker_id,
+            report_progress=lease.report_progress,
+        )
+        lease.start()
+        try:
+            result = resolve_handler(job_type)(ctx)
+        except Exception as exc:
+            lease.stop()
+            logger.exception("Job %s (%s) failed", job_id, job_type)
+            if repo.fail(job_id, self.worker_id, _format_error(exc)):
+                self._publish(repo, job_id)
+            return
+        lease.stop()
+        if not repo.complete(job_id, self.worker_id, result):
+            logger.warning("Job %s finished after its lease was lost", job_id)
+            return
+        self._publish(repo, job_id)
+
+    def _publish(self, repo: JobRepository, job_id: int) -> None:
+        job = repo.get(job_id)
+        if job is not None:
+            self._broker.publish(job_event(job))
+
+
+class _LeaseKeeper:
+    """Renews a job lease from a background thread while its handler runs."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        broker: JobBroker,
+        job_id: int,
+        worker_id: str,
+        lease_seconds: float,
+    ) -> None:
+        self._session_factory = session_factory
+        self._broker = broker
+        self._job_id = job_id
+        self._worker_id = worker_id
+        self._lease_seconds = lease_seconds
+        self._progress: dict[str, Any] | None = None
+        self._lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"lease-{job_id}",
+            daemon=True,
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def report_progress(self, progress: dict[str, Any]) -> None:
+        """Remember progress; it is written with the next lease renewal."""
+        if self._lost:
+            raise LeaseLostError(f"Lease on job {self._job_id} was lost")
+        self._progress = progress
+
+    def _run(self) -> None:
+        interval = self._lease_seconds / 3
+        while not self._stop.wait(interval):
+            db = self._session_factory()
+            try:
+                progress, self._progress = self._progress, None
+                repo = JobRepository(db=db)
+                renewed = repo.heartbeat(
+                    self._job_id,
+                    self._worker_id,
+                    self._lease_seconds,
+                    progress=progress,
+                )
+                if renewed and progress is not None:
+                    job = repo.get(self._job_id)
+                    if job is not None:
+                        self._broker.publish(job_event(job))
+            except Exception:
+                logger.exception("Failed to renew lease on job %s", self._job_id)
+                continue
+            finally:
+                db.close()
+            if not renewed:
+                self._lost = True
+                return
+
+
+def _format_error(exc: BaseException) -> str:
+    return "".join(traceback.format_exception_only(type(exc), exc)).strip()
+
+
+def _worker_main(index: int, job_types: Sequence[str] | None) -> None:
+    from app.core.logging import setup_logging
+    from app.infrastructure.db import SessionLocal
+
+    setup_logging()
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    broker = create_job_broker()
+    worker = JobWorker(
+        worker_id=f"{socket.gethostname()}:{os.getpid()}:{index}",
+        session_factory=SessionLocal,
+        broker=broker,
+        job_types=job_types,
+        lease_seconds=settings.job_lease_seconds,
+        poll_interval=settings.job_poll_interval_seconds,
+        scheduler=FairShareScheduler.from_settings(),
+    )
+    try:
+        worker.run(stop)
+    finally:
+        broker.close()
+
+
+def run_pool(processes: int, job_types: Sequence[str] | None = None) -> None:
+    """Run ``processes`` worker processes until SIGTERM/SIGINT."""
+    ctx = multiprocessing.get_context("spawn")
+    children = [
+        ctx.Process(target=_worker_main, args=(index, job_types), name=f"job-worker-{index}")
+        for index in range(processes)
+    ]
+    for child in children:
+        child.start()
+
+    def forward(signum: int, _frame: Any) -> None:
+        for child in children:
+            if child.is_alive():
+                os.kill(child.pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+    for child in children:
+        child.join()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.workers.job_worker")
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=settings.job_worker_processes,
+        help="Number of worker processes",
+    )
+    parser.add_argument(
+        "--types",
+        nargs="*",
+        choices=sorted(JOB_HANDLERS),
+        help="Only run these job types (default: all)",
+    )
+    args = parser.parse_args()
+
+    if settings.db_auto_create:
+        from app.infrastructure.db import init_db
+
+        init_db()
+    run_pool(args.processes, args.types)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""Thumbnail and image pyramid generation (job type ``thumbnails``).
+
+Payload, one of::
+
+    {"keys": ["datasets/1/a.jpg", "blobs/ab/cd/abcd..."]}  # queued on ingest
+    {"dataset_id": 1, "keys": ["datasets/1/a.jpg"]}         # some of a dataset's objects
+    {"dataset_id": 1, "force": false}                       # backfill a dataset
+
+Keys must be dataset objects or blobs; with ``dataset_id`` they must be
+objects of that dataset (the API only queues jobs that name a dataset).
+
+Every original gets ``thumbnail_sizes`` thumbnails and, when its longer
+side reaches ``thumbnail_pyramid_min_px``, a tiled pyramid (see
+``app.core.derivatives``). A dataset backfill skips originals whose
+derivatives already exist unless ``force`` is set; explicit keys are
+always rendered, since a re-upload replaces the original.
+
+Originals are fetched, decoded and encoded on ``thumbnail_workers``
+threads (S3 reads and PIL both release the GIL), with at most twice that
+many in flight. Image sizes learned on the way are written back to assets
+that have none.
+"""
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.derivatives import UnsupportedImageError, pyramid_key, thumbnail_key
+from app.infrastructure.storage import StorageClient, storage_registry
+from app.models.orm.asset import ASSET_STATUS_READY, ASSET_STATUS_UPLOADED
+from app.models.orm.blob import blob_sha256_of
+from app.repositories.asset_repository import AssetRepository
+from app.repositories.dataset_repository import DatasetRepository
+from app.services.presign_service import check_dataset_key
+from app.services.thumbnail_service import generate_derivatives
+from app.telemetry.metrics import metrics
+from app.workers.handlers import JobContext
+
+logger = logging.getLogger(__name__)
+
+# Assets read per query when walking a dataset.
+_PAGE_SIZE = 500
+# Progress is reported every this many originals.
+_PROGRESS_EVERY = 200
+# Failed keys kept in the job result.
+_MAX_REPORTED = 50
+
+_DATASET_KEY = re.compile(r"^datasets/(?P<dataset_id>\d+)/")
+
+
+@dataclass(frozen=True)
+class ThumbnailSpec:
+    keys: tuple[str, ...] = ()
+    dataset_id: int | None = None
+    force: bool = False
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> ThumbnailSpec:
+        """Validate a job payload; raise ``ValueError`` if it is unusable."""
+        keys = payload.get("keys")
+        dataset_id = payload.get("dataset_id")
+        if keys is None and dataset_id is None:
+            raise ValueError("Thumbnail payload needs 'keys', 'dataset_id' or both")
+        if keys is not None and (
+            not isinstance(keys, list) or not all(isinstance(key, str) and key for key in keys)
+        ):
+            raise ValueError("keys must be a list of object keys")
+        spec = cls(
+            keys=tuple(keys or ()),
+            dataset_id=int(dataset_id) if dataset_id is not None else None,
+            force=bool(payload.get("force", False)),
+        )
+        for key in spec.keys:
+            _check_original_key(key, spec.dataset_id)
+        return spec
+
+
+def _check_original_key(key: str, dataset_id: int | None) -> None:
+    """Raise ``ValueError`` unless ``key`` is an object of the dataset (or any dataset or blob)."""
+    if dataset_id is None:
+        if blob_sha256_of(key) is not None:
+            return
+        match = _DATASET_KEY.match(key)
+        if match is None:
+            raise ValueError(f"{key} is neither a dataset object nor a blob")
+        dataset_id = int(match.group("dataset_id"))
+    check_dataset_key(dataset_id, key)
+
+
+def run_thumbnails(ctx: JobContext) -> dict[str, Any]:
+    """Job handler: render thumbnails and pyramids for originals."""
+    from app.infrastructure.db import SessionLocal
+
+    spec = ThumbnailSpec.from_payload(ctx.payload)
+    storage = storage_registry.get()
+    return ThumbnailGenerator(spec, ctx, SessionLocal, storage).run()
+
+
+class ThumbnailGenerator:
+    def __init__(
+        self,
+        spec: ThumbnailSpec,
+        ctx: JobContext,
+        session_factory: Callable[[], Session],
+        storage: StorageClient,
+    ) -> None:
+        self.spec = spec
+        self.ctx = ctx
+        self._session_factory = session_factory
+        self._storage = storage
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(2 * settings.thumbnail_workers)
+        self._sizes: dict[str, tuple[int, int]] = {}
+        self.originals = 0
+        self.rendered = 0
+        self.tiles = 0
+        self.skipped = 0
+        self.unsupported = 0
+        self.failed: list[str] = []
+
+    def run(self) -> dict[str, Any]:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(
+            max_workers=settings.thumbnail_workers,
+            thread_name_prefix="thumbnails",
+        ) as workers:
+            for key in self._originals():
+                self.originals += 1
+                self._slots.acquire()
+                workers.submit(self._render, key)
+                if self.originals % _PROGRESS_EVERY == 0:
+                    self._report()
+                    self._flush_sizes()
+        self._flush_sizes()
+
+        elapsed = time.perf_counter() - started
+        metrics.observe("thumbnail_job_seconds", elapsed)
+        return {
+            "dataset_id": self.spec.dataset_id,
+            "originals": self.originals,
+            "rendered": self.rendered,
+            "tiles": self.tiles,
+            "skipped": self.skipped,
+            "unsupported": self.unsupported,
+            "failed": len(self.failed),
+            "failed_keys": self.failed[:_MAX_REPORTED],
+            "seconds": round(elapsed, 3),
+            "images_per_second": round(self.rendered / elapsed, 2) if elapsed else 0.0,
+        }
+
+    def _originals(self) -> Iterator[str]:
+        if self.spec.keys:
+            yield from dict.fromkeys(self.spec.keys)
+            return
+
+        if self._with_db(lambda db: DatasetRepository(db=db).get(self.spec.dataset_id)) is None:
+            raise ValueError(f"Dataset {self.spec.dataset_id} not found")
+        seen: set[str] = set()
+        after_id: int | None = None
+        while True:
+            # Short-lived sessions per page, so size updates can commit in between.
+            page = self._with_db(
+                lambda db: [
+                    (asset.id, asset.storage_key, asset.status, asset.width, asset.height)
+                    for asset in AssetRepository(db=db).list_assets(
+                        self.spec.dataset_id,
+                        limit=_PAGE_SIZE,
+                        after_id=after_id,
+                    )
+                ]
+            )
+            if not page:
+                return
+            after_id = page[-1][0]
+            for _, key, status, width, height in page:
+                # Datasets sharing content share its derivatives.
+                if status not in (ASSET_STATUS_UPLOADED, ASSET_STATUS_READY) or key in seen:
+                    continue
+                seen.add(key)
+                if not self.spec.force and self._done(key, width, height):
+                    self.skipped += 1
+                    continue
+                yield key
+
+    def _done(self, key: str, width: int | None, height: int | None) -> bool:
+        # Thumbnails are written largest first, so the smallest one marks a full set.
+        if not self._storage.object_exists(thumbnail_key(key, min(settings.thumbnail_sizes))):
+            return False
+        threshold = settings.thumbnail_pyramid_min_px
+        if not threshold or (width and height and max(width, height) < threshold):
+            return True
+        return self._storage.object_exists(pyramid_key(key))
+
+    def _render(self, key: str) -> None:
+        try:
+            generated = generate_derivatives(
+                self._storage,
+                key,
+                pyramid=bool(settings.thumbnail_pyramid_min_px),
+            )
+            with self._lock:
+                self.rendered += 1
+                self.tiles += generated.tiles
+                self._sizes[key] = (generated.width, generated.height)
+        except UnsupportedImageError:
+            with self._lock:
+                self.unsupported += 1
+        except Exception as exc:
+            logger.warning("Rendering derivatives of %s failed: %s", key, exc)
+            metrics.inc("thumbnail_failures")
+            with self._lock:
+                self.failed.append(key)
+        finally:
+            self._slots.release()
+
+    def _flush_sizes(self) -> None:
+        with self._lock:
+            sizes, self._sizes = self._sizes, {}
+        if sizes:
+            self._with_db(lambda db: AssetRepository(db=db).set_dimensions(sizes))
+
+    def _report(self) -> None:
+        with self._lock:
+            progress = {
+                "originals": self.originals,
+                "rendered": self.rendered,
+                "skipped": self.skipped,
+                "failed": len(self.failed),
+            }
+        self.ctx.report_progress(progress)
+
+    def _with_db(self, fn: Callable[[Session], Any]) -> Any:
+        db = self._session_factory()
+        try:
+            return fn(db)
+        finally:
+            db.close()
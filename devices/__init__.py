@@ -0,0 +1,2 @@
+"""Device integrations (cameras and other capture hardware)."""
+__all__: list[str] = []
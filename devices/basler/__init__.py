@@ -0,0 +1,2 @@
+"""Basler camera capture built on pypylon."""
+__all__: list[str] = []
@@ -0,0 +1,589 @@
+"""Camera capture into a preallocated ring buffer.
+
+``CaptureService`` runs the grab loop on a dedicated thread. Each frame is
+written straight into a slot of a ``FrameRingBuffer``: the simulated
+source renders into the slot, and the pylon source copies once from the
+driver buffer (``GetArrayZeroCopy``) and hands that buffer straight back to
+pylon's pool. Consumers read slots in place through a ``FrameReader``
+instead of receiving copies.
+
+The ring never blocks the grab loop. A consumer that falls more than
+``capacity`` frames behind skips ahead and its overrun counter grows;
+frames the camera itself lost (gaps in the block id) count as drops. An
+optional ``admit`` callback lets the owner refuse frames instead (they are
+grabbed into a scratch buffer and counted as backpressure drops).
+
+Run ``python -m devices.basler.capture --simulate`` to try it without a
+camera.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from typing import Any, Protocol
+
+import numpy as np
+
+# Per-slot header fields (int64): sequence number, host receive time
+# (perf_counter_ns), camera timestamp, camera frame id.
+_SEQ, _HOST_NS, _CAMERA_TS, _FRAME_ID = range(4)
+_HEADER_FIELDS = 4
+_EMPTY = -1
+_WRITING = -2
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class GrabInfo:
+    camera_timestamp: int = 0
+    frame_id: int = 0
+    skipped: int = 0  # frames the driver reports as skipped before this one
+
+
+@dataclass(frozen=True)
+class Frame:
+    """A frame in the ring; ``image`` is a view that a later frame overwrites."""
+
+    seq: int
+    host_ns: int
+    camera_timestamp: int
+    frame_id: int
+    image: np.ndarray
+
+    def copy(self) -> Frame:
+        return Frame(
+            self.seq,
+            self.host_ns,
+            self.camera_timestamp,
+            self.frame_id,
+            self.image.copy(),
+        )
+
+
+class FrameRingBuffer:
+    """Fixed-size ring of equally shaped frames with one writer.
+
+    Everything lives in a single buffer (a control word, one header per slot
+    and the frame array), so the ring can also be placed in shared memory.
+    A slot's header holds the sequence number of the frame in it; readers
+    check it before and after using the slot to detect that the writer
+    lapped them.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        shape: tuple[int, ...],
+        dtype: Any = np.uint8,
+        buffer: Any | None = None,
+    ) -> None:
+        if capacity < 2:
+            raise ValueError("Ring capacity must be at least 2")
+        self.capacity = capacity
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        if buffer is None:
+            buffer = bytearray(self.nbytes(capacity, shape, dtype))
+            owned = True
+        else:
+            owned = False
+        header_words = 1 + capacity * _HEADER_FIELDS
+        self._control = np.ndarray((1,), dtype=np.int64, buffer=buffer)
+        self._headers = np.ndarray(
+            (capacity, _HEADER_FIELDS), dtype=np.int64, buffer=buffer, offset=8
+        )
+        self.frames = np.ndarray(
+            (capacity, *self.shape),
+            dtype=self.dtype,
+            buffer=buffer,
+            offset=header_words * 8,
+        )
+        if owned:
+            self.reset()
+
+    @staticmethod
+    def nbytes(capacity: int, shape: tuple[int, ...], dtype: Any = np.uint8) -> int:
+        """Bytes needed for a ring of ``capacity`` frames of ``shape``."""
+        frame_bytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        return (1 + capacity * _HEADER_FIELDS) * 8 + capacity * frame_bytes
+
+    def reset(self) -> None:
+        self._control[0] = 0
+        self._headers[:] = 0
+        self._headers[:, _SEQ] = _EMPTY
+
+    @property
+    def next_seq(self) -> int:
+        """Sequence number the next frame will get (= frames written so far)."""
+        return int(self._control[0])
+
+    def begin_write(self) -> tuple[int, np.ndarray]:
+        """Claim the next slot; return its sequence number and frame view."""
+        seq = int(self._control[0])
+        self._headers[seq % self.capacity, _SEQ] = _WRITING
+        return seq, self.frames[seq % self.capacity]
+
+    def commit(self, seq: int, host_ns: int, info: GrabInfo) -> None:
+        header = self._headers[seq % self.capacity]
+        header[_HOST_NS] = host_ns
+        header[_CAMERA_TS] = info.camera_timestamp
+        header[_FRAME_ID] = info.frame_id
+        header[_SEQ] = seq
+        self._control[0] = seq + 1
+
+    def abort(self, seq: int) -> None:
+        """Give up a claimed slot; the frame it held before is gone."""
+        self._headers[seq % self.capacity, _SEQ] = _EMPTY
+
+    def read(self, seq: int) -> Frame | None:
+        """Return frame ``seq`` if it is still in the ring."""
+        header = self._headers[seq % self.capacity]
+        if int(header[_SEQ]) != seq:
+            return None
+        frame = Frame(
+            seq=seq,
+            host_ns=int(header[_HOST_NS]),
+            camera_timestamp=int(header[_CAMERA_TS]),
+            frame_id=int(header[_FRAME_ID]),
+            image=self.frames[seq % self.capacity],
+        )
+        # The writer may have started on the slot while the header was read.
+        return frame if int(header[_SEQ]) == seq else None
+
+    def is_current(self, seq: int) -> bool:
+        """True while frame ``seq`` has not been overwritten."""
+        return int(self._headers[seq % self.capacity, _SEQ]) == seq
+
+
+class FrameSource(Protocol):
+    shape: tuple[int, ...]
+    dtype: Any
+
+    def open(self) -> None: ...
+
+    def start(self) -> None: ...
+
+    def grab(self, into: np.ndarray, timeout_ms: int) -> GrabInfo | None:
+        """Write the next frame into ``into``; None on timeout."""
+
+    def stop(self) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class GrabError(RuntimeError):
+    """The camera delivered a failed grab result."""
+
+
+class PylonFrameSource:
+    """Frames from a Basler camera through pypylon.
+
+    pylon grabs into ``buffers`` driver buffers. Each frame is copied once
+    into the ring via ``GetArrayZeroCopy`` and the driver buffer goes back
+    to the pool at once, so slow consumers never starve the camera.
+    """
+
+    def __init__(
+        self,
+        serial_number: str | None = None,
+        buffers: int = 16,
+        configure: Callable[[Any], None] | None = None,
+    ) -> None:
+        self.serial_number = serial_number
+        self.buffers = buffers
+        self._configure = configure
+        self._camera: Any = None
+        self._pylon: Any = None
+        self.shape: tuple[int, ...] = ()
+        self.dtype: Any = np.uint8
+
+    def open(self) -> None:
+        from pypylon import pylon  # optional dependency, only needed with a camera
+
+        self._pylon = pylon
+        factory = pylon.TlFactory.GetInstance()
+        if self.serial_number:
+            info = pylon.DeviceInfo()
+            info.SetSerialNumber(self.serial_number)
+            device = factory.CreateDevice(info)
+        else:
+            device = factory.CreateFirstDevice()
+        camera = pylon.InstantCamera(device)
+        camera.Open()
+        if self._configure is not None:
+            self._configure(camera)
+        camera.MaxNumBuffer.Value = self.buffers
+        self.shape, self.dtype = _frame_layout(
+            camera.PixelFormat.Value,
+            camera.Height.Value,
+            camera.Width.Value,
+        )
+        self._camera = camera
+
+    def start(self) -> None:
+        self._camera.StartGrabbing(self._pylon.GrabStrategy_OneByOne)
+
+    def grab(self, into: np.ndarray, timeout_ms: int) -> GrabInfo | None:
+        result = self._camera.RetrieveResult(timeout_ms, self._pylon.TimeoutHandling_Return)
+        if result is None or not result.IsValid():
+            return None
+        try:
+            if not result.GrabSucceeded():
+                raise GrabError(f"{result.GetErrorCode()}: {result.GetErrorDescription()}")
+            with result.GetArrayZeroCopy() as array:
+                np.copyto(into, array)
+            return GrabInfo(
+                camera_timestamp=result.GetTimeStamp(),
+                frame_id=result.GetBlockID(),
+                skipped=result.GetNumberOfSkippedImages(),
+            )
+        finally:
+            result.Release()
+
+    def stop(self) -> None:
+        if self._camera is not None and self._camera.IsGrabbing():
+            self._camera.StopGrabbing()
+
+    def close(self) -> None:
+        if self._camera is not None:
+            self._camera.Close()
+            self._camera = None
+
+
+def _frame_layout(pixel_format: str, height: int, width: int) -> tuple[tuple[int, ...], Any]:
+    if pixel_format in ("RGB8", "BGR8", "RGB8Packed", "BGR8Packed"):
+        return (height, width, 3), np.uint8
+    if pixel_format.startswith("Mono") and pixel_format != "Mono8":
+        return (height, width), np.uint16
+    if pixel_format == "Mono8" or (pixel_format.startswith("Bayer") and pixel_format.endswith("8")):
+        return (height, width), np.uint8
+    raise ValueError(f"Unsupported pixel format {pixel_format!r}; use Mono*, Bayer*8 or RGB8")
+
+
+class SimulatedFrameSource:
+    """Synthetic frames at a fixed rate, for tests and development.
+
+    ``drop_every`` skips a frame id every N frames to exercise drop
+    accounting.
+    """
+
+    def __init__(
+        self,
+        width: int = 1920,
+        height: int = 1200,
+        fps: float = 60.0,
+        channels: int = 1,
+        drop_every: int = 0,
+    ) -> None:
+        self.shape = (height, width) if channels == 1 else (height, width, channels)
+        self.dtype = np.uint8
+        self.fps = fps
+        self.drop_every = drop_every
+        self._ramp = np.add.outer(
+            np.arange(height, dtype=np.uint16),
+            np.arange(width, dtype=np.uint16),
+        ).astype(np.uint8)
+        if channels > 1:
+            self._ramp = np.repeat(self._ramp[..., None], channels, axis=2)
+        self._frame_id = 0
+        self._next_due = 0.0
+
+    def open(self) -> None:
+        pass
+
+    def start(self) -> None:
+        self._next_due = time.perf_counter()
+
+    def grab(self, into: np.ndarray, timeout_ms: int) -> GrabInfo | None:
+        delay = self._next_due - time.perf_counter()
+        if delay > timeout_ms / 1000:
+            time.sleep(timeout_ms / 1000)
+            return None
+        if delay > 0:
+            time.sleep(delay)
+        self._next_due = max(self._next_due + 1 / self.fps, time.perf_counter() - 1 / self.fps)
+        self._frame_id += 1
+        if self.drop_every and self._frame_id % self.drop_every == 0:
+            self._frame_id += 1
+        np.add(self._ramp, self._frame_id % 256, out=into, casting="unsafe")
+        return GrabInfo(camera_timestamp=time.time_ns(), frame_id=self._frame_id)
+
+    def stop(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+@dataclass
+class CaptureStats:
+    frames: int = 0
+    dropped: int = 0  # lost before reaching the host (frame id gaps, skipped)
+    grab_errors: int = 0
+    timeouts: int = 0
+    backpressure_drops: int = 0  # refused by ``admit`` so unread frames survive
+    fps: float = 0.0
+    store_ms_avg: float = 0.0  # RetrieveResult return -> frame committed
+    store_ms_max: float = 0.0
+    error: str | None = None  # why the grab loop stopped, if it failed
+
+
+class CaptureService:
+    """Runs a frame source on a dedicated thread and fills a ring buffer."""
+
+    def __init__(
+        self,
+        source: FrameSource,
+        ring_capacity: int = 64,
+        grab_timeout_ms: int = 1000,
+        ring_factory: Callable[[int, tuple[int, ...], Any], FrameRingBuffer] | None = None,
+        admit: Callable[[], bool] | None = None,
+    ) -> None:
+        self.source = source
+        self._capacity = ring_capacity
+        self._timeout_ms = grab_timeout_ms
+        self._ring_factory = ring_factory or FrameRingBuffer
+        self._admit = admit
+        self._scratch: np.ndarray | None = None
+        self.ring: FrameRingBuffer | None = None
+        self._stats = CaptureStats()
+        self._stats_lock = threading.Lock()
+        self._new_frame = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._started_at = 0.0
+        self._store_ns_total = 0
+        self._last_frame_id: int | None = None
+        self.error: BaseException | None = None
+
+    def start(self) -> None:
+        self.source.open()
+        self.ring = self._ring_factory(self._capacity, self.source.shape, self.source.dtype)
+        if self._admit is not None:
+            self._scratch = np.empty(self.source.shape, dtype=self.source.dtype)
+        self._stop.clear()
+        self.error = None
+        self.source.start()
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="capture", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.source.stop()
+        self.source.close()
+        with self._new_frame:
+            self._new_frame.notify_all()
+
+    def __enter__(self) -> CaptureService:
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def healthy(self) -> bool:
+        """Capturing, and the grab loop has not died on an unexpected error."""
+        return self.running and self.error is None
+
+    def reader(self, from_latest: bool = True) -> FrameReader:
+        if self.ring is None:
+            raise RuntimeError("Capture has not been started")
+        return FrameReader(self.ring, self._new_frame, from_latest=from_latest)
+
+    def stats(self) -> CaptureStats:
+        with self._stats_lock:
+            stats = CaptureStats(**asdict(self._stats))
+        elapsed = time.perf_counter() - self._started_at
+        stats.fps = round(stats.frames / elapsed, 2) if elapsed > 0 else 0.0
+        if stats.frames:
+            stats.store_ms_avg = round(self._store_ns_total / stats.frames / 1e6, 3)
+        if self.error is not None:
+            stats.error = f"{type(self.error).__name__}: {self.error}"
+        return stats
+
+    def _run(self) -> None:
+        try:
+            self._grab_loop()
+        except Exception as exc:
+            # Only GrabError is an expected, per-frame failure; anything else
+            # ends capture, so keep it where owners polling ``healthy`` see it.
+            logger.exception("Capture loop failed")
+            self.error = exc
+            with self._new_frame:
+                self._new_frame.notify_all()
+
+    def _grab_loop(self) -> None:
+        ring = self.ring
+        assert ring is not None
+        while not self._stop.is_set():
+            if self._admit is not None and not self._admit():
+                self._discard_frame()
+                continue
+            seq, slot = ring.begin_write()
+            try:
+                info = self.source.grab(slot, self._timeout_ms)
+            except GrabError:
+                ring.abort(seq)
+                with self._stats_lock:
+                    self._stats.grab_errors += 1
+                continue
+            except BaseException:
+                ring.abort(seq)
+                raise
+            if info is None:
+                ring.abort(seq)
+                with self._stats_lock:
+                    self._stats.timeouts += 1
+                continue
+            received = time.perf_counter_ns()
+            ring.commit(seq, received, info)
+            with self._new_frame:
+                self._new_frame.notify_all()
+            self._account(info, time.perf_counter_ns() - received)
+
+    def _discard_frame(self) -> None:
+        # Keep draining the camera so its buffers do not fill up.
+        try:
+            info = self.source.grab(self._scratch, self._timeout_ms)
+        except GrabError:
+            info = None
+        if info is not None:
+            with self._stats_lock:
+                self._stats.backpressure_drops += 1
+            self._last_frame_id = info.frame_id
+
+    def _account(self, info: GrabInfo, store_ns: int) -> None:
+        dropped = info.skipped
+        if self._last_frame_id is not None and info.frame_id > self._last_frame_id + 1:
+            dropped += info.frame_id - self._last_frame_id - 1
+        self._last_frame_id = info.frame_id
+        with self._stats_lock:
+            self._stats.frames += 1
+            self._stats.dropped += dropped
+            self._store_ns_total += store_ns
+            self._stats.store_ms_max = max(self._stats.store_ms_max, store_ns / 1e6)
+
+
+class FrameReader:
+    """One consumer's cursor into a ring buffer.
+
+    Frames are returned as views; call ``FrameRingBuffer.is_current`` (or
+    ``Frame.copy``) when a frame is used after the next ``next`` call.
+    """
+
+    def __init__(
+        self,
+        ring: FrameRingBuffer,
+        new_frame: threading.Condition | None = None,
+        from_latest: bool = True,
+    ) -> None:
+        self.ring = ring
+        self._new_frame = new_frame
+        self._next = ring.next_seq if from_latest else max(0, ring.next_seq - ring.capacity)
+        self.frames = 0
+        self.overruns = 0
+        self._latency_ns_total = 0
+        self.latency_ms_max = 0.0
+
+    def next(self, timeout: float | None = 1.0) -> Frame | None:
+        """The next unread frame, or None if none arrived within ``timeout``."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            head = self.ring.next_seq
+            if head - self._next > self.ring.capacity:
+                # Lapped by the writer: skip to the oldest frame still held.
+                skip_to = head - self.ring.capacity + 1
+                self.overruns += skip_to - self._next
+                self._next = skip_to
+            if self._next < head:
+                frame = self.ring.read(self._next)
+                self._next += 1
+                if frame is None:
+                    self.overruns += 1
+                    continue
+                self._record(frame)
+                return frame
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return None
+            self._wait(remaining)
+
+    def latest(self) -> Frame | None:
+        """Skip everything unread and return the newest frame, if any."""
+        head = self.ring.next_seq
+        if head == 0:
+            return None
+        self.overruns += max(0, head - 1 - self._next)
+        self._next = head - 1
+        return self.next(timeout=0)
+
+    @property
+    def position(self) -> int:
+        """Sequence number of the next frame this reader will return."""
+        return self._next
+
+    @property
+    def latency_ms_avg(self) -> float:
+        return self._latency_ns_total / self.frames / 1e6 if self.frames else 0.0
+
+    def _record(self, frame: Frame) -> None:
+        latency = time.perf_counter_ns() - frame.host_ns
+        self.frames += 1
+        self._latency_ns_total += latency
+        self.latency_ms_max = max(self.latency_ms_max, latency / 1e6)
+
+    def _wait(self, timeout: float | None) -> None:
+        if self._new_frame is None:
+            time.sleep(min(timeout or 0.001, 0.001))
+            return
+        with self._new_frame:
+            if self.ring.next_seq <= self._next:
+                self._new_frame.wait(timeout)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m devices.basler.capture")
+    parser.add_argument("--simulate", action="store_true", help="Use a synthetic camera")
+    parser.add_argument("--serial", help="Camera serial number (default: first camera)")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--fps", type=float, default=60.0, help="Simulated frame rate")
+    parser.add_argument("--ring", type=int, default=64, help="Ring buffer capacity")
+    args = parser.parse_args()
+
+    source: FrameSource = (
+        SimulatedFrameSource(fps=args.fps) if args.simulate else PylonFrameSource(args.serial)
+    )
+    with CaptureService(source, ring_capacity=args.ring) as capture:
+        reader = capture.reader()
+        deadline = time.monotonic() + args.seconds
+        next_report = time.monotonic() + 1.0
+        while time.monotonic() < deadline:
+            reader.next(timeout=0.5)
+            if time.monotonic() >= next_report:
+                report = asdict(capture.stats())
+                report.update(
+                    reader_overruns=reader.overruns,
+                    reader_latency_ms_avg=round(reader.latency_ms_avg, 3),
+                    reader_latency_ms_max=round(reader.latency_ms_max, 3),
+                )
+                print(json.dumps(report))
+                next_report += 1.0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,545 @@
+"""Run several cameras, one capture process each, over shared memory.
+
+``CaptureOrchestrator`` starts one process per camera. Each process owns a
+``CaptureService`` whose ring buffer lives in a
+``multiprocessing.shared_memory`` block (``SharedFrameRing``). Consumers in
+any process attach to the block with a ``ConsumerHandle`` and read frames
+in place, so frame data is never pickled or piped.
+
+Every consumer holds a cursor slot in the shared block. That lets the
+orchestrator report how far each consumer lags behind its camera. With
+``policy="drop_newest"`` the capture process refuses new frames while the
+slowest consumer would otherwise be lapped, instead of overwriting frames
+nobody has read yet (``"overwrite"``, the default, favours fresh frames).
+Each cursor slot also records the consumer's pid, so the cursor of a
+consumer that exited without ``close`` is released once the ring stalls on
+it, rather than holding the camera back forever.
+
+Run ``python -m devices.basler.orchestrator --simulate 3`` to try it
+without cameras.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from multiprocessing import shared_memory
+from typing import Any, Literal
+
+import numpy as np
+
+from devices.basler.capture import (
+    CaptureService,
+    CaptureStats,
+    Frame,
+    FrameReader,
+    FrameRingBuffer,
+    FrameSource,
+    PylonFrameSource,
+    SimulatedFrameSource,
+)
+
+logger = logging.getLogger(__name__)
+
+BackpressurePolicy = Literal["overwrite", "drop_newest"]
+
+_FREE = -1
+# Cursor slot owners: the consumer's pid, or one of these.
+_UNCLAIMED = 0
+_DETACHED = -1
+
+
+@dataclass(frozen=True)
+class CameraSpec:
+    name: str
+    serial_number: str | None = None
+    simulated: bool = False
+    width: int = 1920
+    height: int = 1200
+    fps: float = 30.0
+
+    def create_source(self) -> FrameSource:
+        if self.simulated:
+            return SimulatedFrameSource(self.width, self.height, fps=self.fps)
+        return PylonFrameSource(self.serial_number)
+
+
+def enumerate_cameras() -> list[CameraSpec]:
+    """Specs for every camera pylon can see, named by serial number."""
+    from pypylon import pylon  # optional dependency, only needed with cameras
+
+    return [
+        CameraSpec(name=device.GetSerialNumber(), serial_number=device.GetSerialNumber())
+        for device in pylon.TlFactory.GetInstance().EnumerateDevices()
+    ]
+
+
+@dataclass(frozen=True)
+class RingLayout:
+    """Everything another process needs to attach to a camera's ring."""
+
+    shm_name: str
+    capacity: int
+    shape: tuple[int, ...]
+    dtype: str
+    max_consumers: int
+
+    @property
+    def ring_bytes(self) -> int:
+        return FrameRingBuffer.nbytes(self.capacity, self.shape, self.dtype)
+
+    @property
+    def total_bytes(self) -> int:
+        # Ring, then one int64 cursor and one int64 owner pid per consumer.
+        return self.ring_bytes + 16 * self.max_consumers
+
+
+class SharedFrameRing:
+    """A ``FrameRingBuffer`` plus consumer cursors in shared memory."""
+
+    def __init__(self, layout: RingLayout, shm: shared_memory.SharedMemory, owner: bool) -> None:
+        self.layout = layout
+        self._shm = shm
+        self._owner = owner
+        self._view = shm.buf[: layout.ring_bytes]
+        self.ring = FrameRingBuffer(layout.capacity, layout.shape, layout.dtype, buffer=self._view)
+        self.cursors = np.ndarray(
+            (layout.max_consumers,),
+            dtype=np.int64,
+            buffer=shm.buf,
+            offset=layout.ring_bytes,
+        )
+        self.owners = np.ndarray(
+            (layout.max_consumers,),
+            dtype=np.int64,
+            buffer=shm.buf,
+            offset=layout.ring_bytes + 8 * layout.max_consumers,
+        )
+
+    @classmethod
+    def create(
+        cls,
+        name: str,
+        capacity: int,
+        shape: tuple[int, ...],
+        dtype: Any,
+        max_consumers: int,
+    ) -> SharedFrameRing:
+        layout = RingLayout(name, capacity, tuple(shape), np.dtype(dtype).str, max_consumers)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=layout.total_bytes)
+        shared = cls(layout, shm, owner=True)
+        shared.ring.reset()
+        shared.cursors[:] = _FREE
+        shared.owners[:] = _UNCLAIMED
+        return shared
+
+    @classmethod
+    def attach(cls, layout: RingLayout) -> SharedFrameRing:
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=layout.shm_name, track=False)
+        else:
+            # Attaching registers the block with the resource tracker too. The
+            # orchestrator's children share its tracker, so that is harmless
+            # for them; unrelated processes should run on Python 3.13+.
+            shm = shared_memory.SharedMemory(name=layout.shm_name)
+        return cls(layout, shm, owner=False)
+
+    def lags(self) -> dict[int, int]:
+        """Frames each registered consumer has not read yet, by cursor slot."""
+        head = self.ring.next_seq
+        return {
+            slot: head - int(cursor)
+            for slot, cursor in enumerate(self.cursors)
+            if cursor != _FREE
+        }
+
+    def admit(self) -> bool:
+        """False while writing would lap the slowest live consumer."""
+        lags = self.lags()
+        if lags and max(lags.values()) >= self.layout.capacity:
+            # Only a stalled ring pays for the liveness checks.
+            if not self.reap_dead_consumers():
+                return False
+            lags = self.lags()
+        return not lags or max(lags.values()) < self.layout.capacity
+
+    def reap_dead_consumers(self) -> list[int]:
+        """Release the cursors of consumers whose process has exited."""
+        reaped = []
+        for slot in range(self.layout.max_consumers):
+            pid = int(self.owners[slot])
+            if self.cursors[slot] != _FREE and pid > 0 and not _pid_alive(pid):
+                self.cursors[slot] = _FREE
+                self.owners[slot] = _DETACHED
+                reaped.append(slot)
+                logger.warning(
+                    "Released cursor slot %d of %s; consumer pid %d exited without closing",
+                    slot,
+                    self.layout.shm_name,
+                    pid,
+                )
+        return reaped
+
+    def close(self) -> None:
+        # Views into the block must go before the mapping can be closed.
+        self.ring = None  # type: ignore[assignment]
+        self.cursors = None  # type: ignore[assignment]
+        self.owners = None  # type: ignore[assignment]
+        self._view.release()
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+def _pid_alive(pid: int) -> bool:
+    if sys.platform == "win32":
+        import ctypes
+
+        # os.kill(pid, 0) would terminate the process on Windows.
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        try:
+            code = ctypes.c_ulong()
+            kernel32.GetExitCodeProcess(handle, ctypes.byref(code))
+            return code.value == 259  # STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+@dataclass(frozen=True)
+class ConsumerHandle:
+    """Picklable ticket that lets a process consume one camera's frames."""
+
+    camera: str
+    layout: RingLayout
+    slot: int
+
+
+class SharedFrameConsumer:
+    """Reads a camera's frames from shared memory in any process."""
+
+    def __init__(self, handle: ConsumerHandle, from_latest: bool = True) -> None:
+        self.handle = handle
+        self._shared = SharedFrameRing.attach(handle.layout)
+        self._reader = FrameReader(self._shared.ring, from_latest=from_latest)
+        # Owner first: the capture process only reaps slots with a cursor.
+        self._shared.owners[handle.slot] = os.getpid()
+        self._shared.cursors[handle.slot] = self._reader.position
+
+    def next(self, timeout: float | None = 1.0) -> Frame | None:
+        """The next frame; its image is valid until the following call."""
+        # Everything before the frame about to be returned has been consumed.
+        frame = self._reader.next(timeout)
+        if frame is not None:
+            self._shared.cursors[self.handle.slot] = frame.seq
+        return frame
+
+    @property
+    def overruns(self) -> int:
+        return self._reader.overruns
+
+    def close(self) -> None:
+        self._shared.cursors[self.handle.slot] = _FREE
+        self._shared.owners[self.handle.slot] = _DETACHED
+        self._reader = None  # type: ignore[assignment]
+        self._shared.close()
+
+    def __enter__(self) -> SharedFrameConsumer:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+@dataclass
+class CameraStatus:
+    name: str
+    alive: bool = False
+    capture: CaptureStats = field(default_factory=CaptureStats)
+    consumer_lag: dict[int, int] = field(default_factory=dict)
+    error: str | None = None
+
+
+def _camera_main(
+    spec: CameraSpec,
+    shm_name: str,
+    ring_capacity: int,
+    max_consumers: int,
+    policy: BackpressurePolicy,
+    events: Any,
+    stop: Any,
+    stats_interval: float,
+) -> None:
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    shared: SharedFrameRing | None = None
+
+    def ring_factory(capacity: int, shape: tuple[int, ...], dtype: Any) -> FrameRingBuffer:
+        nonlocal shared
+        shared = SharedFrameRing.create(shm_name, capacity, shape, dtype, max_consumers)
+        return shared.ring
+
+    def admit() -> bool:
+        return shared is None or shared.admit()
+
+    capture = CaptureService(
+        spec.create_source(),
+        ring_capacity=ring_capacity,
+        ring_factory=ring_factory,
+        admit=admit if policy == "drop_newest" else None,
+    )
+    try:
+        capture.start()
+        events.put(("ready", spec.name, shared.layout))
+        while not stop.wait(stats_interval):
+            events.put(("stats", spec.name, capture.stats()))
+            if capture.error is not None:
+                raise capture.error
+            if not capture.running:
+                raise RuntimeError("Capture thread stopped")
+    except Exception as exc:
+        logger.exception("Camera %s failed", spec.name)
+        events.put(("error", spec.name, f"{type(exc).__name__}: {exc}"))
+    finally:
+        if capture.running:
+            capture.stop()
+        capture.ring = None
+        if shared is not None:
+            shared.close()
+
+
+class CaptureOrchestrator:
+    """Starts, supervises and stops one capture process per camera."""
+
+    def __init__(
+        self,
+        cameras: list[CameraSpec],
+        ring_capacity: int = 32,
+        max_consumers: int = 4,
+        policy: BackpressurePolicy = "overwrite",
+        stats_interval: float = 1.0,
+    ) -> None:
+        names = [camera.name for camera in cameras]
+        if len(set(names)) != len(names):
+            raise ValueError("Camera names must be unique")
+        self.cameras = {camera.name: camera for camera in cameras}
+        self._capacity = ring_capacity
+        self._max_consumers = max_consumers
+        self._policy = policy
+        self._stats_interval = stats_interval
+        self._ctx = multiprocessing.get_context("spawn")
+        self._events = self._ctx.Queue()
+        self._stop = self._ctx.Event()
+        self._processes: dict[str, Any] = {}
+        self._layouts: dict[str, RingLayout] = {}
+        self._rings: dict[str, SharedFrameRing] = {}
+        self._status = {name: CameraStatus(name) for name in self.cameras}
+        self._slots: dict[str, set[int]] = {name: set() for name in self.cameras}
+        self._lock = threading.Lock()
+        self._pump: threading.Thread | None = None
+
+    def start(self, timeout: float = 15.0) -> None:
+        """Start every camera process and wait until their rings exist."""
+        self._stop.clear()
+        for name, spec in self.cameras.items():
+            shm_name = f"mlv1sion-{name}-{multiprocessing.current_process().pid}"
+            process = self._ctx.Process(
+                target=_camera_main,
+                args=(
+                    spec,
+                    shm_name,
+                    self._capacity,
+                    self._max_consumers,
+                    self._policy,
+                    self._events,
+                    self._stop,
+                    self._stats_interval,
+                ),
+                name=f"capture-{name}",
+                daemon=True,
+            )
+            process.start()
+            self._processes[name] = process
+
+        deadline = time.monotonic() + timeout
+        while len(self._layouts) + self._failed() < len(self.cameras):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                self._handle(self._events.get(timeout=remaining))
+            except queue.Empty:
+                break
+        missing = [name for name in self.cameras if name not in self._layouts]
+        if missing:
+            self.stop()
+            errors = {name: self._status[name].error or "timed out" for name in missing}
+            raise RuntimeError(f"Cameras failed to start: {errors}")
+        self._pump = threading.Thread(target=self._pump_events, name="orchestrator", daemon=True)
+        self._pump.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        for process in self._processes.values():
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+        if self._pump is not None:
+            self._pump.join()
+            self._pump = None
+        with self._lock:
+            for shared in self._rings.values():
+                shared.close()
+            self._rings.clear()
+        self._processes.clear()
+
+    def __enter__(self) -> CaptureOrchestrator:
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def consumer(self, camera: str) -> ConsumerHandle:
+        """Reserve a cursor slot on a camera for a new consumer."""
+        with self._lock:
+            layout = self._layouts[camera]
+            shared = self._rings.get(camera)
+            if shared is not None:
+                # Consumers that closed or died without release() give their slot back.
+                shared.reap_dead_consumers()
+                self._slots[camera] -= {
+                    slot for slot in self._slots[camera] if shared.owners[slot] == _DETACHED
+                }
+            free = [slot for slot in range(self._max_consumers) if slot not in self._slots[camera]]
+            if not free:
+                raise RuntimeError(f"Camera {camera} already has {self._max_consumers} consumers")
+            self._slots[camera].add(free[0])
+            if shared is not None:
+                shared.owners[free[0]] = _UNCLAIMED
+        return ConsumerHandle(camera=camera, layout=layout, slot=free[0])
+
+    def release(self, handle: ConsumerHandle) -> None:
+        with self._lock:
+            self._slots[handle.camera].discard(handle.slot)
+            shared = self._rings.get(handle.camera)
+            if shared is not None:
+                shared.cursors[handle.slot] = _FREE
+                shared.owners[handle.slot] = _UNCLAIMED
+
+    def status(self) -> dict[str, CameraStatus]:
+        """Latest capture stats, liveness and consumer lag per camera."""
+        with self._lock:
+            result = {}
+            for name, status in self._status.items():
+                process = self._processes.get(name)
+                shared = self._rings.get(name)
+                if shared is not None:
+                    shared.reap_dead_consumers()
+                result[name] = CameraStatus(
+                    name=name,
+                    alive=bool(process and process.is_alive()),
+                    capture=status.capture,
+                    consumer_lag=shared.lags() if shared is not None else {},
+                    error=status.error,
+                )
+            return result
+
+    def _failed(self) -> int:
+        return sum(1 for status in self._status.values() if status.error)
+
+    def _pump_events(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._handle(self._events.get(timeout=0.5))
+            except queue.Empty:
+                continue
+
+    def _handle(self, event: tuple[str, str, Any]) -> None:
+        kind, name, payload = event
+        with self._lock:
+            if kind == "ready":
+                self._layouts[name] = payload
+                self._rings[name] = SharedFrameRing.attach(payload)
+            elif kind == "stats":
+                self._status[name].capture = payload
+            elif kind == "error":
+                self._status[name].error = payload
+
+
+def _consume(handle: ConsumerHandle, seconds: float, results: Any) -> None:
+    """Example consumer: computes the mean intensity of every frame."""
+    frames = 0
+    deadline = time.monotonic() + seconds
+    with SharedFrameConsumer(handle) as consumer:
+        while time.monotonic() < deadline:
+            frame = consumer.next(timeout=0.5)
+            if frame is not None:
+                float(frame.image.mean())
+                frames += 1
+        results.put((handle.camera, frames, consumer.overruns))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m devices.basler.orchestrator")
+    parser.add_argument("--simulate", type=int, default=0, help="Number of synthetic cameras")
+    parser.add_argument("--fps", type=float, default=30.0, help="Simulated frame rate")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--ring", type=int, default=32, help="Ring slots per camera")
+    parser.add_argument("--policy", choices=["overwrite", "drop_newest"], default="overwrite")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    cameras = (
+        [
+            CameraSpec(name=f"sim{index}", simulated=True, fps=args.fps)
+            for index in range(args.simulate)
+        ]
+        if args.simulate
+        else enumerate_cameras()
+    )
+    if not cameras:
+        parser.error("No cameras found")
+
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    with CaptureOrchestrator(cameras, ring_capacity=args.ring, policy=args.policy) as orchestrator:
+        consumers = [
+            ctx.Process(
+                target=_consume,
+                args=(orchestrator.consumer(camera.name), args.seconds, results),
+            )
+            for camera in cameras
+        ]
+        for process in consumers:
+            process.start()
+        deadline = time.monotonic() + args.seconds
+        while time.monotonic() < deadline:
+            time.sleep(1.0)
+            status = orchestrator.status()
+            print(json.dumps({name: asdict(camera) for name, camera in status.items()}))
+        for process in consumers:
+            process.join()
+    while not results.empty():
+        camera, frames, overruns = results.get()
+        print(json.dumps({"consumer": camera, "frames": frames, "overruns": overruns}))
+
+
+if __name__ == "__main__":
+    main()
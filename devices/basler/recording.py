@@ -0,0 +1,598 @@
+"""Record captured frames into segments and upload them in the background.
+
+Three stages, each with its own thread(s), so capture never waits on I/O:
+
+* ``SegmentRecorder`` follows the capture ring with its own ``FrameReader``,
+  encodes frames (JPEG or PNG) on a small thread pool and appends them to a
+  tar segment that is closed every ``segment_seconds``;
+* ``SegmentSpool`` keeps closed segments on local disk until they are
+  uploaded, and drops the oldest when ``spool_max_bytes`` is exceeded;
+* ``SegmentUploader`` sends spooled segments through presigned URLs with
+  bounded concurrency, using multipart uploads for large segments and
+  retrying with backoff while the network is down.
+
+If the recorder falls behind, it skips frames (counted as overruns) rather
+than slowing the capture thread. Segments left in the spool after a crash
+are uploaded on the next start.
+
+URLs come either from the API (``ApiPresigner``, no bucket credentials on
+the device) or straight from ``StorageClient`` (``StoragePresigner``).
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import logging
+import os
+import queue
+import tarfile
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Literal, Protocol
+
+import httpx
+import numpy as np
+from PIL import Image
+
+from devices.basler.capture import Frame, FrameReader
+
+logger = logging.getLogger(__name__)
+
+# S3 requires every part but the last to be at least 5 MiB.
+MIN_PART_SIZE = 5 * 1024 * 1024
+# Segments are named "<camera>-<UTC start time>.tar".
+_SEGMENT_TIME_FORMAT = "%Y%m%dT%H%M%S%fZ"
+
+ImageFormat = Literal["jpeg", "png"]
+
+
+@dataclass(frozen=True)
+class RecordingConfig:
+    camera: str = "cam0"
+    segment_seconds: float = 10.0
+    image_format: ImageFormat = "jpeg"
+    jpeg_quality: int = 90
+    encode_workers: int = 2
+    spool_dir: Path = Path("spool")
+    spool_max_bytes: int = 2 * 1024**3
+
+
+def encode_frame(image: np.ndarray, image_format: ImageFormat, quality: int = 90) -> bytes:
+    """Encode one frame; 16-bit mono frames are always stored as PNG."""
+    buffer = io.BytesIO()
+    if image.dtype == np.uint16:
+        Image.fromarray(image).save(buffer, format="PNG")
+    elif image_format == "png":
+        Image.fromarray(image).save(buffer, format="PNG", compress_level=1)
+    else:
+        Image.fromarray(image).save(buffer, format="JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+class SegmentSpool:
+    """Local directory of closed segments waiting for upload."""
+
+    def __init__(self, directory: Path, max_bytes: int) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.dropped = 0
+        self._lock = threading.Lock()
+        # A crash leaves half-written segments behind; they are not valid tars.
+        for partial in self.directory.glob("*.partial"):
+            partial.unlink(missing_ok=True)
+
+    def partial_path(self, name: str) -> Path:
+        return self.directory / f"{name}.partial"
+
+    def commit(self, partial: Path) -> Path:
+        """Publish a finished segment and enforce the size limit."""
+        final = partial.with_suffix("")
+        os.replace(partial, final)
+        self._enforce_limit(keep=final)
+        return final
+
+    def pending(self) -> list[Path]:
+        """Segments waiting for upload, oldest capture first across all cameras."""
+        segments = self.directory.glob("*.tar")
+        return sorted(segments, key=lambda path: (_captured_at(path), path.name))
+
+    def remove(self, path: Path) -> None:
+        path.unlink(missing_ok=True)
+
+    def size(self) -> int:
+        return sum(_size(path) for path in self.directory.iterdir())
+
+    def _enforce_limit(self, keep: Path) -> None:
+        with self._lock:
+            total = self.size()
+            for path in self.pending():
+                if total <= self.max_bytes:
+                    return
+                if path == keep:
+                    continue
+                size = _size(path)
+                path.unlink(missing_ok=True)
+                total -= size
+                self.dropped += 1
+                logger.warning(
+                    "Spool over %d bytes; dropped segment %s", self.max_bytes, path.name
+                )
+
+
+def _captured_at(path: Path) -> float:
+    """When a segment's first frame was captured, from its name or else its mtime."""
+    try:
+        started = datetime.strptime(path.stem.rsplit("-", 1)[-1], _SEGMENT_TIME_FORMAT)
+        return started.replace(tzinfo=timezone.utc).timestamp()
+    except ValueError:
+        try:
+            return path.stat().st_mtime
+        except FileNotFoundError:
+            return 0.0
+
+
+def _size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+@dataclass
+class RecorderStats:
+    frames: int = 0
+    overruns: int = 0
+    segments: int = 0
+    bytes_written: int = 0
+    encode_ms_avg: float = 0.0
+
+
+class SegmentRecorder:
+    """Encodes frames from a capture ring into fixed-duration tar segments."""
+
+    def __init__(
+        self,
+        reader: FrameReader,
+        config: RecordingConfig,
+        spool: SegmentSpool,
+        on_segment: Callable[[Path], None] | None = None,
+    ) -> None:
+        self._reader = reader
+        self.config = config
+        self._spool = spool
+        self._on_segment = on_segment
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._pool = ThreadPoolExecutor(
+            max_workers=config.encode_workers,
+            thread_name_prefix=f"encode-{config.camera}",
+        )
+        # Frames are stamped with perf_counter_ns; map them to wall time once.
+        self._wall_offset_ns = time.time_ns() - time.perf_counter_ns()
+        self._segment: tarfile.TarFile | None = None
+        self._segment_path: Path | None = None
+        self._segment_started_ns = 0
+        self._index: list[dict[str, Any]] = []
+        self._pending: deque[tuple[Frame, Future[bytes], int]] = deque()
+        self._stats = RecorderStats()
+        self._encode_ns_total = 0
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"recorder-{self.config.camera}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Finish the current segment and stop."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._pool.shutdown(wait=True)
+
+    def stats(self) -> RecorderStats:
+        stats = RecorderStats(**asdict(self._stats))
+        stats.overruns = self._reader.overruns
+        if stats.frames:
+            stats.encode_ms_avg = round(self._encode_ns_total / stats.frames / 1e6, 3)
+        return stats
+
+    def _run(self) -> None:
+        duration_ns = int(self.config.segment_seconds * 1e9)
+        try:
+            while not self._stop.is_set():
+                frame = self._reader.next(timeout=0.25)
+                if frame is None:
+                    elapsed = time.perf_counter_ns() - self._segment_started_ns
+                    if self._segment is not None and elapsed >= duration_ns:
+                        self._close_segment()
+                    continue
+                if self._segment is None or frame.host_ns - self._segment_started_ns >= duration_ns:
+                    self._close_segment()
+                    self._open_segment(frame)
+                # The ring slot is reused by the capture thread; encode a copy.
+                frame = frame.copy()
+                future = self._pool.submit(self._encode, frame.image)
+                self._pending.append((frame, future, time.perf_counter_ns()))
+                # Write finished frames in order; bound the frames in flight.
+                max_pending = 2 * self.config.encode_workers
+                while self._pending and (
+                    self._pending[0][1].done() or len(self._pending) >= max_pending
+                ):
+                    self._append(*self._pending.popleft())
+        finally:
+            self._close_segment()
+
+    def _encode(self, image: np.ndarray) -> bytes:
+        return encode_frame(image, self.config.image_format, self.config.jpeg_quality)
+
+    def _open_segment(self, frame: Frame) -> None:
+        started = datetime.fromtimestamp(
+            (frame.host_ns + self._wall_offset_ns) / 1e9,
+            tz=timezone.utc,
+        )
+        name = f"{self.config.camera}-{started.strftime(_SEGMENT_TIME_FORMAT)}.tar"
+        self._segment_path = self._spool.partial_path(name)
+        self._segment = tarfile.open(self._segment_path, mode="w")
+        self._segment_started_ns = frame.host_ns
+        self._index = []
+
+    def _append(self, frame: Frame, future: Future[bytes], submitted_ns: int) -> None:
+        data = future.result()
+        self._encode_ns_total += time.perf_counter_ns() - submitted_ns
+        png = frame.image.dtype == np.uint16 or self.config.image_format == "png"
+        extension = "png" if png else "jpg"
+        member = f"{frame.seq:010d}.{extension}"
+        self._add_member(member, data)
+        self._index.append(
+            {
+                "member": member,
+                "seq": frame.seq,
+                "frame_id": frame.frame_id,
+                "camera_timestamp": frame.camera_timestamp,
+                "captured_at_ns": frame.host_ns + self._wall_offset_ns,
+            }
+        )
+        self._stats.frames += 1
+        self._stats.bytes_written += len(data)
+
+    def _add_member(self, name: str, data: bytes) -> None:
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = int(time.time())
+        self._segment.addfile(info, io.BytesIO(data))
+
+    def _close_segment(self) -> None:
+        if self._segment is None:
+            return
+        while self._pending:
+            self._append(*self._pending.popleft())
+        index = {"camera": self.config.camera, "frames": self._index}
+        self._add_member("index.json", json.dumps(index).encode())
+        self._segment.close()
+        self._segment = None
+        path = self._spool.commit(self._segment_path)
+        self._stats.segments += 1
+        if self._on_segment is not None:
+            self._on_segment(path)
+
+
+@dataclass
+class MultipartTicket:
+    upload_id: str
+    object_key: str
+    part_urls: dict[int, str] = field(default_factory=dict)
+
+
+class Presigner(Protocol):
+    def presign_put(self, name: str) -> tuple[str, str]:
+        """Return ``(url, object_key)`` for a single PUT upload."""
+
+    def start_multipart(self, name: str, part_count: int) -> MultipartTicket: ...
+
+    def complete_multipart(self, ticket: MultipartTicket, parts: list[tuple[int, str]]) -> None: ...
+
+    def abort_multipart(self, ticket: MultipartTicket) -> None: ...
+
+
+class ApiPresigner:
+    """Gets presigned URLs from the mlv1sion API for uploads into a dataset."""
+
+    def __init__(self, base_url: str, dataset_id: int, token: str, client: httpx.Client) -> None:
+        self._base = base_url.rstrip("/")
+        self.dataset_id = dataset_id
+        self._headers = {"Authorization": f"Bearer {token}"}
+        self._client = client
+
+    def presign_put(self, name: str) -> tuple[str, str]:
+        body = self._post("/assets/presign", {"dataset_id": self.dataset_id, "filename": name})
+        return body["upload_url"], body["object_key"]
+
+    def start_multipart(self, name: str, part_count: int) -> MultipartTicket:
+        body = self._post(
+            "/assets/multipart",
+            {
+                "dataset_id": self.dataset_id,
+                "filename": name,
+                "part_count": part_count,
+                "content_type": "application/x-tar",
+            },
+        )
+        return MultipartTicket(
+            upload_id=body["upload_id"],
+            object_key=body["object_key"],
+            part_urls={part["part_number"]: part["upload_url"] for part in body["parts"]},
+        )
+
+    def complete_multipart(self, ticket: MultipartTicket, parts: list[tuple[int, str]]) -> None:
+        self._post(
+            "/assets/multipart/complete",
+            {
+                **self._ref(ticket),
+                "parts": [{"part_number": n, "etag": etag} for n, etag in parts],
+            },
+        )
+
+    def abort_multipart(self, ticket: MultipartTicket) -> None:
+        self._post("/assets/multipart/abort", self._ref(ticket))
+
+    def _ref(self, ticket: MultipartTicket) -> dict[str, Any]:
+        return {
+            "dataset_id": self.dataset_id,
+            "object_key": ticket.object_key,
+            "upload_id": ticket.upload_id,
+        }
+
+    def _post(self, path: str, payload: dict[str, Any]) -> dict[str, Any]:
+        response = self._client.post(f"{self._base}{path}", json=payload, headers=self._headers)
+        response.raise_for_status()
+        return response.json()
+
+
+class StoragePresigner:
+    """Signs uploads locally with bucket credentials (``StorageClient``)."""
+
+    def __init__(self, storage: Any, prefix: str = "recordings") -> None:
+        self._storage = storage
+        self._prefix = prefix.strip("/")
+
+    def presign_put(self, name: str) -> tuple[str, str]:
+        key = self._key(name)
+        return self._storage.presign_url(key), key
+
+    def start_multipart(self, name: str, part_count: int) -> MultipartTicket:
+        key = self._key(name)
+        upload_id = self._storage.create_multipart_upload(key, content_type="application/x-tar")
+        urls = self._storage.presign_part_urls(key, upload_id, range(1, part_count + 1))
+        return MultipartTicket(upload_id=upload_id, object_key=key, part_urls=dict(urls))
+
+    def complete_multipart(self, ticket: MultipartTicket, parts: list[tuple[int, str]]) -> None:
+        self._storage.complete_multipart_upload(ticket.object_key, ticket.upload_id, parts)
+
+    def abort_multipart(self, ticket: MultipartTicket) -> None:
+        self._storage.abort_multipart_upload(ticket.object_key, ticket.upload_id)
+
+    def _key(self, name: str) -> str:
+        camera = name.split("-", 1)[0]
+        return f"{self._prefix}/{camera}/{name}"
+
+
+@dataclass
+class UploadStats:
+    uploaded: int = 0
+    bytes: int = 0
+    failures: int = 0
+    queued: int = 0
+    seconds: float = 0.0
+
+    @property
+    def mbit_per_second(self) -> float:
+        return self.bytes * 8 / self.seconds / 1e6 if self.seconds else 0.0
+
+
+class SegmentUploader:
+    """Uploads spooled segments with ``concurrency`` worker threads."""
+
+    def __init__(
+        self,
+        spool: SegmentSpool,
+        presigner: Presigner,
+        client: httpx.Client,
+        concurrency: int = 2,
+        multipart_threshold: int = 16 * 1024 * 1024,
+        part_size: int = 8 * 1024 * 1024,
+        max_backoff_seconds: float = 60.0,
+    ) -> None:
+        if part_size < MIN_PART_SIZE:
+            raise ValueError(f"part_size must be at least {MIN_PART_SIZE} bytes")
+        self._spool = spool
+        self._presigner = presigner
+        self._client = client
+        self._concurrency = concurrency
+        self._threshold = max(multipart_threshold, part_size)
+        self._part_size = part_size
+        self._max_backoff = max_backoff_seconds
+        self._queue: queue.Queue[Path | None] = queue.Queue()
+        self._queued: set[Path] = set()
+        self._lock = threading.Lock()
+        self._stats = UploadStats()
+        self._threads: list[threading.Thread] = []
+        self._stop = threading.Event()
+        self._backoff = 0.0
+
+    def start(self) -> None:
+        self._stop.clear()
+        for path in self._spool.pending():
+            self.submit(path)
+        self._threads = [
+            threading.Thread(target=self._run, name=f"uploader-{index}", daemon=True)
+            for index in range(self._concurrency)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, path: Path) -> None:
+        with self._lock:
+            if path in self._queued:
+                return
+            self._queued.add(path)
+        self._queue.put(path)
+
+    def stop(self, drain_seconds: float = 0.0) -> None:
+        """Stop the workers; give queued segments ``drain_seconds`` to finish first."""
+        deadline = time.monotonic() + drain_seconds
+        while self._queued and time.monotonic() < deadline:
+            time.sleep(0.1)
+        self._stop.set()
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def stats(self) -> UploadStats:
+        with self._lock:
+            stats = UploadStats(**asdict(self._stats))
+            stats.queued = len(self._queued)
+        return stats
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            path = self._queue.get()
+            if path is None:
+                return
+            if not path.exists():
+                # Dropped by the spool size limit in the meantime.
+                self._forget(path)
+                continue
+            began = time.perf_counter()
+            try:
+                size = self._upload(path)
+            except Exception as exc:
+                with self._lock:
+                    self._stats.failures += 1
+                    self._backoff = min(max(self._backoff * 2, 1.0), self._max_backoff)
+                    backoff = self._backoff
+                logger.warning(
+                    "Upload of %s failed (%s); retrying in %.0fs", path.name, exc, backoff
+                )
+                self._stop.wait(backoff)
+                self._queue.put(path)
+                continue
+            self._spool.remove(path)
+            self._forget(path)
+            with self._lock:
+                self._backoff = 0.0
+                self._stats.uploaded += 1
+                self._stats.bytes += size
+                self._stats.seconds += time.perf_counter() - began
+
+    def _forget(self, path: Path) -> None:
+        with self._lock:
+            self._queued.discard(path)
+
+    def _upload(self, path: Path) -> int:
+        size = path.stat().st_size
+        if size <= self._threshold:
+            url, _ = self._presigner.presign_put(path.name)
+            with path.open("rb") as handle:
+                self._put(url, handle.read())
+            return size
+
+        part_count = -(-size // self._part_size)
+        ticket = self._presigner.start_multipart(path.name, part_count)
+        try:
+            parts = []
+            with path.open("rb") as handle:
+                for number in range(1, part_count + 1):
+                    etag = self._put(ticket.part_urls[number], handle.read(self._part_size))
+                    parts.append((number, etag))
+            self._presigner.complete_multipart(ticket, parts)
+        except BaseException:
+            try:
+                self._presigner.abort_multipart(ticket)
+            except Exception:
+                logger.warning("Could not abort multipart upload %s", ticket.upload_id)
+            raise
+        return size
+
+    def _put(self, url: str, data: bytes) -> str:
+        response = self._client.put(url, content=data)
+        response.raise_for_status()
+        return response.headers.get("ETag", "")
+
+
+def main() -> None:
+    from devices.basler.capture import CaptureService, PylonFrameSource, SimulatedFrameSource
+
+    parser = argparse.ArgumentParser(prog="python -m devices.basler.recording")
+    parser.add_argument("--simulate", action="store_true", help="Use a synthetic camera")
+    parser.add_argument("--serial", help="Camera serial number (default: first camera)")
+    parser.add_argument("--camera-name", default="cam0")
+    parser.add_argument("--seconds", type=float, default=30.0, help="How long to record")
+    parser.add_argument("--segment-seconds", type=float, default=10.0)
+    parser.add_argument("--format", choices=["jpeg", "png"], default="jpeg")
+    parser.add_argument("--spool", type=Path, default=Path("spool"))
+    parser.add_argument("--api", help="API base URL, e.g. http://localhost:8000/api/v1")
+    parser.add_argument("--dataset", type=int, help="Dataset to upload into (with --api)")
+    parser.add_argument("--token", default=os.environ.get("MLV1SION_TOKEN"), help="API token")
+    parser.add_argument("--concurrency", type=int, default=2)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    config = RecordingConfig(
+        camera=args.camera_name,
+        segment_seconds=args.segment_seconds,
+        image_format=args.format,
+        spool_dir=args.spool,
+    )
+    client = httpx.Client(timeout=httpx.Timeout(30.0, connect=5.0))
+    if args.api:
+        if args.dataset is None or not args.token:
+            parser.error("--api needs --dataset and --token (or MLV1SION_TOKEN)")
+        presigner: Presigner = ApiPresigner(args.api, args.dataset, args.token, client)
+    else:
+        from app.infrastructure.storage import storage_registry
+
+        presigner = StoragePresigner(storage_registry.get())
+
+    source = SimulatedFrameSource(fps=30) if args.simulate else PylonFrameSource(args.serial)
+    spool = SegmentSpool(config.spool_dir, config.spool_max_bytes)
+    uploader = SegmentUploader(spool, presigner, client, concurrency=args.concurrency)
+    with CaptureService(source) as capture:
+        recorder = SegmentRecorder(capture.reader(), config, spool, on_segment=uploader.submit)
+        uploader.start()
+        recorder.start()
+        try:
+            time.sleep(args.seconds)
+        except KeyboardInterrupt:
+            pass
+        recorder.stop()
+    uploader.stop(drain_seconds=30.0)
+    client.close()
+    print(
+        json.dumps(
+            {
+                "capture": asdict(capture.stats()),
+                "recorder": asdict(recorder.stats()),
+                "upload": asdict(uploader.stats()),
+                "spool_dropped": spool.dropped,
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
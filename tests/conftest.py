@@ -0,0 +1,101 @@
+"""Shared fixtures: a throwaway SQLite database and an in-memory bucket.
+
+Settings are read once at import, so the environment is set up here,
+before any ``app`` module is imported.
+"""
+import os
+import tempfile
+
+_DB_DIR = tempfile.mkdtemp(prefix="mlv1sion-tests-")
+os.environ.update(
+    {
+        "ENV": "test",
+        "DATABASE_URL": f"sqlite:///{_DB_DIR}/test.db",
+        "DB_AUTO_CREATE": "false",
+        "SEED_DEMO_DATA": "false",
+        "VERIFY_SCHEMA_ON_STARTUP": "false",
+        "MINIO_ENDPOINT": "http://localhost:9000",
+        "MINIO_ACCESS_KEY": "test",
+        "MINIO_SECRET_KEY": "test",
+        "MINIO_BUCKET": "test-bucket",
+        "MINIO_PROBE_ON_STARTUP": "false",
+        "BCRYPT_ROUNDS": "4",
+        "LOG_LEVEL": "WARNING",
+    }
+)
+
+from collections.abc import Iterator  # noqa: E402
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.infrastructure.db import SessionLocal, engine  # noqa: E402
+from app.models import orm  # noqa: E402, F401  # register every model
+from app.models.orm.base import Base  # noqa: E402
+from app.telemetry.metrics import metrics  # noqa: E402
+from tests.support import InMemoryS3, auth_headers, memory_storage  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _fresh_state() -> Iterator[None]:
+    """Empty tables and process-wide caches for every test."""
+    from app.api.conditional import list_cache
+    from app.core.security import access_token_cache
+    from app.services.thumbnail_service import derivative_cache
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    for cache in (list_cache, access_token_cache, derivative_cache):
+        cache.clear()
+    metrics.reset()
+    yield
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+def db() -> Iterator[Session]:
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def s3_storage():
+    return memory_storage()
+
+
+@pytest.fixture
+def storage(s3_storage):
+    return s3_storage[0]
+
+
+@pytest.fixture
+def s3(s3_storage) -> InMemoryS3:
+    return s3_storage[1]
+
+
+@pytest.fixture
+def client(storage) -> Iterator[TestClient]:
+    from app.api.deps import get_storage_client
+    from app.main import app
+
+    app.dependency_overrides[get_storage_client] = lambda: storage
+    try:
+        with TestClient(app) as test_client:
+            yield test_client
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def signed_in(client: TestClient) -> TestClient:
+    """``client`` with a token for user 1, the owner in ``make_dataset(db, created_by=1)``."""
+    client.headers.update(auth_headers())
+    return client
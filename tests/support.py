@@ -0,0 +1,185 @@
+"""Test doubles and helpers shared by the test modules."""
+import hashlib
+import io
+import itertools
+import threading
+from typing import Any
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from sqlalchemy.orm import Session
+
+from app.core.security import AuthUser, create_access_token
+from app.infrastructure.storage import StorageClient
+from app.models.orm.dataset import Dataset
+from app.models.orm.project import Project
+
+
+class InMemoryS3:
+    """The subset of the boto3 S3 client API that ``StorageClient`` uses, kept in memory.
+
+    Presigned URLs come from a real (never connected) boto3 client, so
+    they are signed exactly as in production.
+    """
+
+    def __init__(self) -> None:
+        self.objects: dict[str, bytes] = {}
+        self.calls: list[str] = []
+        self._uploads: dict[str, dict[int, bytes]] = {}
+        self._upload_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._signer = boto3.session.Session().client(
+            "s3",
+            endpoint_url="http://localhost:9000",
+            aws_access_key_id="test",
+            aws_secret_access_key="test",
+            region_name="us-east-1",
+            config=Config(signature_version="s3v4", s3={"addressing_style": "path"}),
+        )
+
+    def generate_presigned_url(self, **params: Any) -> str:
+        return self._signer.generate_presigned_url(**params)
+
+    def head_bucket(self, Bucket: str) -> dict[str, Any]:
+        return {}
+
+    def head_object(self, Bucket: str, Key: str) -> dict[str, Any]:
+        self.calls.append("head_object")
+        return {"ContentLength": len(self._get(Key))}
+
+    def get_object(self, Bucket: str, Key: str, Range: str | None = None) -> dict[str, Any]:
+        self.calls.append("get_object")
+        data = self._get(Key)
+        if Range is not None:
+            start, _, end = Range.removeprefix("bytes=").partition("-")
+            data = data[int(start) : int(end) + 1]
+        return {"Body": io.BytesIO(data), "ContentLength": len(data)}
+
+    def put_object(self, Bucket: str, Key: str, Body: bytes, **params: Any) -> dict[str, Any]:
+        self.calls.append("put_object")
+        with self._lock:
+            self.objects[Key] = bytes(Body)
+        return {"ETag": _etag(Body)}
+
+    def copy_object(self, Bucket: str, Key: str, CopySource: dict[str, str]) -> dict[str, Any]:
+        self.calls.append("copy_object")
+        data = self._get(CopySource["Key"])
+        with self._lock:
+            self.objects[Key] = data
+        return {"CopyObjectResult": {"ETag": _etag(data)}}
+
+    def delete_object(self, Bucket: str, Key: str) -> dict[str, Any]:
+        self.calls.append("delete_object")
+        with self._lock:
+            self.objects.pop(Key, None)
+        return {}
+
+    def create_multipart_upload(self, Bucket: str, Key: str, **params: Any) -> dict[str, Any]:
+        upload_id = f"upload-{next(self._upload_ids)}"
+        self._uploads[upload_id] = {}
+        return {"UploadId": upload_id}
+
+    def upload_part(
+        self,
+        Bucket: str,
+        Key: str,
+        UploadId: str,
+        PartNumber: int,
+        Body: bytes,
+    ) -> dict[str, Any]:
+        with self._lock:
+            self._upload(UploadId)[PartNumber] = bytes(Body)
+        return {"ETag": _etag(Body)}
+
+    def list_parts(
+        self,
+        Bucket: str,
+        Key: str,
+        UploadId: str,
+        PartNumberMarker: int = 0,
+    ) -> dict[str, Any]:
+        parts = sorted(self._upload(UploadId).items())
+        return {
+            "Parts": [
+                {"PartNumber": number, "ETag": _etag(data), "Size": len(data)}
+                for number, data in parts
+                if number > PartNumberMarker
+            ],
+            "IsTruncated": False,
+        }
+
+    def complete_multipart_upload(
+        self,
+        Bucket: str,
+        Key: str,
+        UploadId: str,
+        MultipartUpload: dict[str, Any],
+    ) -> dict[str, Any]:
+        stored = self._upload(UploadId)
+        data = b"".join(stored[part["PartNumber"]] for part in MultipartUpload["Parts"])
+        with self._lock:
+            self.objects[Key] = data
+            del self._uploads[UploadId]
+        return {"ETag": _etag(data)}
+
+    def abort_multipart_upload(self, Bucket: str, Key: str, UploadId: str) -> dict[str, Any]:
+        self._upload(UploadId)
+        del self._uploads[UploadId]
+        return {}
+
+    def close(self) -> None:
+        self._signer.close()
+
+    def _get(self, key: str) -> bytes:
+        try:
+            return self.objects[key]
+        except KeyError:
+            raise _client_error("NoSuchKey") from None
+
+    def _upload(self, upload_id: str) -> dict[int, bytes]:
+        try:
+            return self._uploads[upload_id]
+        except KeyError:
+            raise _client_error("NoSuchUpload") from None
+
+
+def memory_storage() -> tuple[StorageClient, InMemoryS3]:
+    """A real ``StorageClient`` over an in-memory bucket."""
+    s3 = InMemoryS3()
+    return StorageClient(client=s3), s3
+
+
+def make_dataset(
+    db: Session,
+    name: str = "dataset",
+    project: Project | None = None,
+    *,
+    tenant_id: int | None = None,
+    created_by: int | None = None,
+) -> Dataset:
+    if project is None:
+        project = Project(name=f"{name} project", tenant_id=tenant_id, created_by=created_by)
+        db.add(project)
+        db.flush()
+    dataset = Dataset(project_id=project.id, name=name)
+    db.add(dataset)
+    db.commit()
+    return dataset
+
+
+def auth_headers(user_id: int = 1, tenant_id: int | None = None) -> dict[str, str]:
+    token = create_access_token(AuthUser(id=user_id, tenant_id=tenant_id, roles=(), permissions=()))
+    return {"Authorization": f"Bearer {token}"}
+
+
+def sha256_hex(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _etag(data: bytes) -> str:
+    return f'"{hashlib.md5(data).hexdigest()}"'
+
+
+def _client_error(code: str) -> ClientError:
+    return ClientError({"Error": {"Code": code, "Message": code}}, "S3")
@@ -0,0 +1,166 @@
+import json
+
+import numpy as np
+import pytest
+
+from app.core import rle
+from app.models.orm.annotation import Annotation
+from app.models.orm.asset import Asset
+from tests.support import make_dataset
+
+pytestmark = pytest.mark.usefixtures("signed_in")
+
+
+def _assets(db, dataset_id, count):
+    assets = [
+        Asset(dataset_id=dataset_id, object_key=f"datasets/{dataset_id}/{i}.jpg", status="uploaded")
+        for i in range(count)
+    ]
+    db.add_all(assets)
+    db.commit()
+    return [asset.id for asset in assets]
+
+
+def _stream(client, dataset_id):
+    response = client.get("/api/v1/annotations/", params={"dataset_id": dataset_id})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_rle_round_trips_and_finds_the_bbox():
+    mask = np.zeros((6, 5), dtype=np.uint8)
+    mask[1:4, 2:4] = 1
+    mask[5, 0] = 1
+
+    encoded = rle.encode(mask)
+
+    assert isinstance(encoded["counts"], str)
+    np.testing.assert_array_equal(rle.decode(encoded), mask)
+    assert rle.area(encoded) == 7
+    assert rle.bbox(encoded) == [0.0, 1.0, 4.0, 5.0]
+    assert rle.normalize({"size": [6, 5], "counts": rle.mask_counts(mask)}) == encoded
+
+
+def test_rle_with_the_wrong_size_is_rejected():
+    with pytest.raises(rle.InvalidRLEError):
+        rle.normalize({"size": [2, 2], "counts": [1, 2]})
+
+
+def test_bulk_upsert_inserts_updates_and_streams_by_asset(client, db):
+    dataset = make_dataset(db, created_by=1)
+    first, second = _assets(db, dataset.id, 2)
+    mask = {"size": [4, 4], "counts": [5, 2, 2, 2, 5]}
+    annotations = [
+        {"asset_id": second, "key": "a", "kind": "box", "label": "cat", "bbox": [1, 2, 3, 4]},
+        {"asset_id": first, "key": "m", "kind": "mask", "label": "dog", "mask": mask},
+        {
+            "asset_id": first,
+            "key": "p",
+            "kind": "polygon",
+            "label": "dog",
+            "points": [[0, 0], [4, 0], [4, 2]],
+        },
+    ]
+
+    response = client.post(
+        "/api/v1/annotations/bulk",
+        json={"dataset_id": dataset.id, "annotations": annotations},
+    )
+    assert response.json() == {"dataset_id": dataset.id, "upserted": 3}
+
+    update = {"asset_id": second, "key": "a", "kind": "class", "label": "bird"}
+    client.post(
+        "/api/v1/annotations/bulk",
+        json={"dataset_id": dataset.id, "annotations": [update]},
+    )
+
+    records = _stream(client, dataset.id)
+    assert [(r["asset_id"], r["key"]) for r in records] == [
+        (first, "m"),
+        (first, "p"),
+        (second, "a"),
+    ]
+    by_key = {record["key"]: record for record in records}
+    assert by_key["m"]["mask"] == {"size": [4, 4], "counts": rle.compress(mask["counts"])}
+    assert by_key["m"]["bbox"] == [1.0, 1.0, 2.0, 2.0]
+    assert by_key["p"]["bbox"] == [0.0, 0.0, 4.0, 2.0]
+    assert by_key["a"]["label"] == "bird" and "bbox" not in by_key["a"]
+    assert db.query(Annotation).count() == 3
+
+
+def test_the_last_write_of_a_key_in_one_request_wins(client, db):
+    dataset = make_dataset(db, created_by=1)
+    (asset,) = _assets(db, dataset.id, 1)
+    annotations = [
+        {"asset_id": asset, "key": "k", "kind": "class", "label": label}
+        for label in ("first", "second")
+    ]
+
+    response = client.post(
+        "/api/v1/annotations/bulk",
+        json={"dataset_id": dataset.id, "annotations": annotations},
+    )
+
+    assert response.json()["upserted"] == 1
+    assert [record["label"] for record in _stream(client, dataset.id)] == ["second"]
+
+
+def test_assets_of_another_dataset_are_rejected(client, db):
+    dataset = make_dataset(db, created_by=1)
+    other = make_dataset(db, "other", created_by=1)
+    (foreign,) = _assets(db, other.id, 1)
+
+    response = client.post(
+        "/api/v1/annotations/bulk",
+        json={
+            "dataset_id": dataset.id,
+            "annotations": [{"asset_id": foreign, "key": "k", "kind": "class", "label": "x"}],
+        },
+    )
+
+    assert response.status_code == 404
+    assert db.query(Annotation).count() == 0
+
+
+def test_geometry_must_match_the_kind(client, db):
+    dataset = make_dataset(db, created_by=1)
+    (asset,) = _assets(db, dataset.id, 1)
+    bad = [
+        {"asset_id": asset, "key": "b", "kind": "box", "label": "x"},
+        {
+            "asset_id": asset,
+            "key": "m",
+            "kind": "mask",
+            "label": "x",
+            "mask": {"size": [2, 2], "counts": [1, 1]},
+        },
+    ]
+
+    for annotation in bad:
+        response = client.post(
+            "/api/v1/annotations/bulk",
+            json={"dataset_id": dataset.id, "annotations": [annotation]},
+        )
+        assert response.status_code == 422
+
+
+def test_streaming_an_unknown_dataset_is_not_found(client):
+    response = client.get("/api/v1/annotations/", params={"dataset_id": 999})
+
+    assert response.status_code == 404
+
+
+def test_annotations_of_another_tenant_are_not_found(client, db):
+    foreign = make_dataset(db, "foreign", tenant_id=2)
+    (asset,) = _assets(db, foreign.id, 1)
+    annotation = {"asset_id": asset, "key": "k", "kind": "class", "label": "x"}
+    bulk = {"dataset_id": foreign.id, "annotations": [annotation]}
+
+    assert client.post("/api/v1/annotations/bulk", json=bulk).status_code == 404
+    listed = client.get("/api/v1/annotations/", params={"dataset_id": foreign.id})
+    assert listed.status_code == 404
+    assert db.query(Annotation).count() == 0
+
+    del client.headers["Authorization"]
+    assert client.post("/api/v1/annotations/bulk", json=bulk).status_code == 401
@@ -0,0 +1,94 @@
+import pytest
+
+from app.core.pagination import encode_cursor
+from app.models.orm.asset import Asset
+from tests.support import auth_headers, make_dataset
+
+pytestmark = pytest.mark.usefixtures("signed_in")
+
+
+def _add_assets(db, dataset_id, count, status="uploaded"):
+    db.add_all(
+        Asset(dataset_id=dataset_id, object_key=f"datasets/{dataset_id}/{i:03d}.jpg", status=status)
+        for i in range(count)
+    )
+    db.commit()
+
+
+def test_pages_walk_every_asset_once_in_id_order(client, db):
+    dataset = make_dataset(db, created_by=1)
+    other = make_dataset(db, "other", created_by=1)
+    _add_assets(db, dataset.id, 25)
+    _add_assets(db, other.id, 5)
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        params = {"dataset_id": dataset.id, "limit": 10}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/api/v1/assets/", params=params).json()
+        seen += [item["id"] for item in page["items"]]
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert len(seen) == 25 and seen == sorted(seen)
+    assert set(seen) == {
+        asset.id for asset in db.query(Asset).filter_by(dataset_id=dataset.id)
+    }
+
+
+def test_exact_multiple_of_the_page_size_has_no_empty_last_page(client, db):
+    dataset = make_dataset(db, created_by=1)
+    _add_assets(db, dataset.id, 10)
+
+    page = client.get("/api/v1/assets/", params={"dataset_id": dataset.id, "limit": 10}).json()
+
+    assert len(page["items"]) == 10
+    assert page["next_cursor"] is None
+
+
+def test_status_filter(client, db):
+    dataset = make_dataset(db, created_by=1)
+    _add_assets(db, dataset.id, 3, status="pending")
+    db.add(Asset(dataset_id=dataset.id, object_key="datasets/x/ready.jpg", status="ready"))
+    db.commit()
+
+    page = client.get(
+        "/api/v1/assets/", params={"dataset_id": dataset.id, "status": "ready"}
+    ).json()
+
+    assert [item["object_key"] for item in page["items"]] == ["datasets/x/ready.jpg"]
+
+
+def test_bad_cursors_are_400_and_unknown_datasets_404(client, db):
+    dataset = make_dataset(db, created_by=1)
+    other = make_dataset(db, "other", created_by=1)
+    foreign = encode_cursor({"dataset_id": other.id, "id": 1})
+
+    malformed = client.get("/api/v1/assets/", params={"dataset_id": dataset.id, "cursor": "!!"})
+    wrong_listing = client.get(
+        "/api/v1/assets/", params={"dataset_id": dataset.id, "cursor": foreign}
+    )
+    missing = client.get("/api/v1/assets/", params={"dataset_id": 404})
+
+    assert malformed.status_code == 400
+    assert wrong_listing.status_code == 400
+    assert missing.status_code == 404
+
+
+def test_assets_of_another_tenant_are_not_listed(client, db):
+    dataset = make_dataset(db, tenant_id=2)
+    _add_assets(db, dataset.id, 1)
+
+    foreign = client.get("/api/v1/assets/", params={"dataset_id": dataset.id})
+    member = client.get(
+        "/api/v1/assets/",
+        params={"dataset_id": dataset.id},
+        headers=auth_headers(user_id=5, tenant_id=2),
+    )
+
+    assert foreign.status_code == 404
+    assert len(member.json()["items"]) == 1
@@ -0,0 +1,68 @@
+import pytest
+
+from app.core.config import settings
+from app.infrastructure.db import (
+    _pool_options,
+    get_async_sessionmaker,
+    resolve_async_database_url,
+)
+from app.models.orm.dataset import Dataset
+from app.repositories.dataset_repository import AsyncDatasetRepository
+from tests.support import auth_headers, make_dataset
+
+
+@pytest.mark.parametrize(
+    ("database_url", "expected"),
+    [
+        ("postgresql://u:p@db:5432/app", "postgresql+asyncpg://u:p@db:5432/app"),
+        ("postgresql+psycopg2://u:p@db/app", "postgresql+asyncpg://u:p@db/app"),
+        ("sqlite:///./dev.db", "sqlite+aiosqlite:///./dev.db"),
+    ],
+)
+def test_async_url_is_derived_from_the_sync_url(monkeypatch, database_url, expected):
+    monkeypatch.setattr(settings, "database_url", database_url)
+    monkeypatch.setattr(settings, "async_database_url", None)
+
+    assert resolve_async_database_url() == expected
+
+
+def test_explicit_async_url_wins_and_unknown_backends_fail(monkeypatch):
+    monkeypatch.setattr(settings, "async_database_url", "postgresql+psycopg://db/app")
+    assert resolve_async_database_url() == "postgresql+psycopg://db/app"
+
+    monkeypatch.setattr(settings, "async_database_url", None)
+    monkeypatch.setattr(settings, "database_url", "mssql+pyodbc://db/app")
+    with pytest.raises(ValueError):
+        resolve_async_database_url()
+
+
+def test_pool_sizing_is_skipped_for_sqlite():
+    assert "pool_size" not in _pool_options("sqlite:///x.db")
+    assert _pool_options("postgresql://db/app")["pool_size"] == settings.database_pool_size
+
+
+@pytest.mark.anyio
+async def test_async_repository_reads_and_writes(db):
+    existing = make_dataset(db, "existing")
+
+    async with get_async_sessionmaker()() as session:
+        repo = AsyncDatasetRepository(session)
+        created = await repo.create(existing.project_id, "created", "new")
+        listed = await repo.list_by_project(existing.project_id)
+
+    assert [d.name for d in listed] == ["existing", "created"]
+    assert db.get(Dataset, created.id).description == "new"
+
+
+def test_project_and_dataset_routes_use_the_async_session(client):
+    project = client.post("/api/v1/projects/", json={"name": "cats"}, headers=auth_headers())
+    assert project.status_code == 201
+    project_id = project.json()["id"]
+
+    dataset = client.post("/api/v1/datasets/", json={"project_id": project_id, "name": "train"})
+    listing = client.get("/api/v1/datasets/", params={"project_id": project_id})
+
+    assert dataset.status_code == 201
+    assert [d["name"] for d in listing.json()] == ["train"]
+    projects = client.get("/api/v1/projects/", headers=auth_headers())
+    assert [p["name"] for p in projects.json()] == ["cats"]
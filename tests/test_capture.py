@@ -0,0 +1,78 @@
+import logging
+import time
+
+import numpy as np
+
+from devices.basler.capture import (
+    CaptureService,
+    FrameReader,
+    FrameRingBuffer,
+    GrabError,
+    GrabInfo,
+    SimulatedFrameSource,
+)
+
+
+class _FailingSource(SimulatedFrameSource):
+    """Raises ``failures[n]`` on the n-th grab, if given."""
+
+    def __init__(self, failures):
+        super().__init__(width=8, height=4, fps=1000)
+        self._failures = dict(failures)
+        self.grabs = 0
+
+    def grab(self, into, timeout_ms):
+        self.grabs += 1
+        failure = self._failures.get(self.grabs)
+        if failure is not None:
+            raise failure
+        return super().grab(into, timeout_ms)
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+def test_grab_errors_are_counted_and_capture_continues():
+    source = _FailingSource({2: GrabError("incomplete frame")})
+    with CaptureService(source, ring_capacity=4) as capture:
+        _wait_for(lambda: capture.stats().frames >= 5)
+        assert capture.healthy
+
+    stats = capture.stats()
+    assert stats.grab_errors == 1 and stats.error is None
+
+
+def test_unexpected_errors_are_logged_and_reported(caplog):
+    source = _FailingSource({3: OSError("device removed")})
+    with caplog.at_level(logging.ERROR, logger="devices.basler.capture"):
+        capture = CaptureService(source, ring_capacity=4)
+        capture.start()
+        _wait_for(lambda: not capture.running)
+
+    assert not capture.healthy
+    assert isinstance(capture.error, OSError)
+    assert capture.stats().error == "OSError: device removed"
+    assert "Capture loop failed" in caplog.text
+    # The slot claimed for the failed grab is not left half-written.
+    reader = capture.reader(from_latest=False)
+    assert [reader.next(timeout=0).frame_id for _ in range(2)] == [1, 2]
+    assert reader.next(timeout=0) is None
+    capture.stop()
+
+
+def test_readers_that_fall_behind_skip_ahead_and_count_overruns():
+    ring = FrameRingBuffer(4, (2, 2), np.uint8)
+    reader = FrameReader(ring, from_latest=False)
+    for frame_id in range(1, 11):
+        seq, slot = ring.begin_write()
+        slot[:] = frame_id
+        ring.commit(seq, time.perf_counter_ns(), GrabInfo(camera_timestamp=0, frame_id=frame_id))
+
+    frames = [reader.next(timeout=0) for _ in range(3)]
+
+    assert [frame.frame_id for frame in frames] == [8, 9, 10]
+    assert reader.overruns == 7
@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.infrastructure.db import SessionLocal
+from app.models.orm.asset import Asset
+from app.models.orm.blob import blob_object_key, blob_upload_key
+from app.models.orm.project import Project
+from app.services.ingest_service import AssetIngestQueue, parse_bucket_notification
+from tests.support import make_dataset, sha256_hex
+
+pytestmark = pytest.mark.usefixtures("signed_in")
+
+CONTENT = b"the same bytes"
+SHA = sha256_hex(CONTENT)
+
+
+@pytest.fixture(autouse=True)
+def _no_thumbnail_jobs(monkeypatch):
+    monkeypatch.setattr(settings, "thumbnail_on_ingest", False)
+
+
+def _presign(client, dataset_id, *filenames):
+    response = client.post(
+        "/api/v1/assets/presign/content",
+        json={
+            "dataset_id": dataset_id,
+            "files": [{"filename": name, "sha256": SHA} for name in filenames],
+        },
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def _upload_and_ingest(s3, storage, key):
+    """What the client's PUT and the bucket notification do."""
+    s3.objects[key] = CONTENT
+    record = {
+        "eventName": "s3:ObjectCreated:Put",
+        "s3": {"bucket": {"name": "test-bucket"}, "object": {"key": key, "size": len(CONTENT)}},
+    }
+    events, _ = parse_bucket_notification({"Records": [record]})
+    queue = AssetIngestQueue(SessionLocal, storage_factory=lambda: storage)
+    asyncio.run(queue.submit(events))
+    asyncio.run(queue.flush())
+
+
+def _statuses(db, dataset):
+    db.expire_all()
+    return [asset.status for asset in db.query(Asset).filter_by(dataset_id=dataset.id)]
+
+
+def test_new_content_is_uploaded_once_per_project_and_then_reused(client, db, s3, storage):
+    project = Project(name="p", created_by=1)
+    db.add(project)
+    db.commit()
+    first = make_dataset(db, "first", project)
+    second = make_dataset(db, "second", project)
+
+    body = _presign(client, first.id, "a.jpg", "b.jpg")
+    assert (body["uploads"], body["reused"]) == (1, 0)
+    assert [item["exists"] for item in body["items"]] == [False, False]
+    assert f"/{blob_upload_key(project.id, SHA)}?" in body["items"][0]["upload_url"]
+    assert _statuses(db, first) == ["pending", "pending"]
+
+    _upload_and_ingest(s3, storage, blob_upload_key(project.id, SHA))
+
+    assert _statuses(db, first) == ["uploaded", "uploaded"]
+    assert s3.objects[blob_object_key(SHA)] == CONTENT
+    assert blob_upload_key(project.id, SHA) not in s3.objects
+
+    body = _presign(client, second.id, "c.jpg")
+    assert (body["uploads"], body["reused"]) == (0, 1)
+    assert body["items"][0]["upload_url"] is None
+    assert _statuses(db, second) == ["uploaded"]
+
+
+def test_knowing_the_hash_of_another_projects_content_is_not_enough(client, db, s3, storage):
+    owner = make_dataset(db, "owner", created_by=1)
+    other = make_dataset(db, "other", created_by=1)
+    _presign(client, owner.id, "a.jpg")
+    _upload_and_ingest(s3, storage, blob_upload_key(owner.project_id, SHA))
+
+    body = _presign(client, other.id, "guess.jpg")
+
+    item = body["items"][0]
+    assert item["exists"] is False and item["upload_url"] is not None
+    assert f"/{blob_upload_key(other.project_id, SHA)}?" in item["upload_url"]
+    assert _statuses(db, other) == ["pending"]
+
+    # Only the project's own upload releases its assets; the blob is not copied twice.
+    copies = s3.calls.count("copy_object")
+    _upload_and_ingest(s3, storage, blob_upload_key(other.project_id, SHA))
+    assert _statuses(db, other) == ["uploaded"]
+    assert s3.calls.count("copy_object") == copies
+
+
+def test_an_upload_does_not_release_other_projects_assets(client, db, s3, storage):
+    first = make_dataset(db, "first", created_by=1)
+    second = make_dataset(db, "second", created_by=1)
+    _presign(client, first.id, "a.jpg")
+    _presign(client, second.id, "a.jpg")
+
+    _upload_and_ingest(s3, storage, blob_upload_key(first.project_id, SHA))
+
+    assert _statuses(db, first) == ["uploaded"]
+    assert _statuses(db, second) == ["pending"]
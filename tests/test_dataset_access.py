@@ -0,0 +1,136 @@
+import pytest
+
+from app.models.orm.job import Job
+from app.models.orm.project import Project
+from app.workers.export import ExportSpec
+from app.workers.thumbnails import ThumbnailSpec
+from tests.support import auth_headers, make_dataset
+
+_JOBS = [
+    ("export", {"format": "coco"}),
+    ("import", {"archive_key": "datasets/{id}/upload.zip"}),
+    ("thumbnails", {}),
+]
+
+
+def _submit(client, dataset_id, job, payload, headers):
+    body = {key: value.format(id=dataset_id) for key, value in payload.items()}
+    return client.post(f"/api/v1/datasets/{dataset_id}/{job}", json=body, headers=headers)
+
+
+@pytest.mark.parametrize(("job", "payload"), _JOBS)
+def test_datasets_of_the_callers_tenant_accept_jobs(client, db, job, payload):
+    dataset = make_dataset(db, tenant_id=7, created_by=1)
+
+    response = _submit(client, dataset.id, job, payload, auth_headers(user_id=2, tenant_id=7))
+
+    assert response.status_code == 202
+    assert response.json()["tenant_id"] == 7
+
+
+@pytest.mark.parametrize(("job", "payload"), _JOBS)
+def test_datasets_of_other_tenants_look_missing(client, db, job, payload):
+    dataset = make_dataset(db, tenant_id=7, created_by=1)
+
+    foreign = _submit(client, dataset.id, job, payload, auth_headers(user_id=1, tenant_id=8))
+    missing = _submit(client, 999, job, payload, auth_headers(user_id=1, tenant_id=8))
+
+    assert foreign.status_code == missing.status_code == 404
+    assert db.query(Job).count() == 0
+
+
+def test_without_a_tenant_only_the_creator_has_access(client, db):
+    dataset = make_dataset(db, created_by=1)
+
+    own = _submit(client, dataset.id, "export", {"format": "coco"}, auth_headers(user_id=1))
+    other = _submit(client, dataset.id, "export", {"format": "coco"}, auth_headers(user_id=2))
+    tenant = _submit(
+        client, dataset.id, "export", {"format": "coco"}, auth_headers(user_id=1, tenant_id=7)
+    )
+
+    assert (own.status_code, other.status_code, tenant.status_code) == (202, 404, 404)
+
+
+def test_projects_without_owners_are_not_accessible(client, db):
+    dataset = make_dataset(db)
+
+    response = _submit(client, dataset.id, "export", {"format": "coco"}, auth_headers())
+
+    assert response.status_code == 404
+
+
+def test_created_projects_record_their_owner(client, db):
+    response = client.post(
+        "/api/v1/projects/",
+        json={"name": "cats"},
+        headers=auth_headers(user_id=3, tenant_id=7),
+    )
+
+    project = db.get(Project, response.json()["id"])
+    assert (project.tenant_id, project.created_by) == (7, 3)
+
+
+def test_creating_a_project_needs_authentication(client):
+    assert client.post("/api/v1/projects/", json={"name": "cats"}).status_code == 401
+
+
+@pytest.mark.parametrize(("job", "payload"), _JOBS + [("inference", {"model_key": "m.onnx"})])
+def test_generic_job_submission_checks_the_dataset(client, db, job, payload):
+    own = make_dataset(db, "own", tenant_id=7)
+    foreign = make_dataset(db, "foreign", tenant_id=8)
+    headers = auth_headers(tenant_id=7)
+
+    def submit(dataset_id, **body):
+        job_payload = {key: value.format(id=dataset_id) for key, value in payload.items()}
+        return client.post(
+            "/api/v1/jobs/",
+            json={"type": job, "payload": {"dataset_id": dataset_id, **job_payload}, **body},
+            headers=headers,
+        )
+
+    accepted = submit(own.id)
+    assert accepted.status_code == 202
+    assert accepted.json()["project_id"] == own.project_id
+    assert submit(foreign.id).status_code == 404
+    assert submit(own.id, project_id=foreign.project_id).status_code == 422
+    unnamed = client.post("/api/v1/jobs/", json={"type": job, "payload": {}}, headers=headers)
+    assert unnamed.status_code == 422
+    assert db.query(Job).count() == 1
+
+
+def test_generic_jobs_can_only_name_the_callers_projects(client, db):
+    own = make_dataset(db, "own", tenant_id=7)
+    foreign = make_dataset(db, "foreign", tenant_id=8)
+    headers = auth_headers(tenant_id=7)
+
+    def submit(project_id):
+        body = {"type": "noop", "project_id": project_id}
+        return client.post("/api/v1/jobs/", json=body, headers=headers).status_code
+
+    assert (submit(own.project_id), submit(foreign.project_id)) == (202, 404)
+
+
+@pytest.mark.parametrize("prefix", ["exports/2/x/", "exports/1/../2/", "datasets/1/", "exports/1/"])
+def test_exports_stay_under_their_datasets_prefix(prefix):
+    payload = {"dataset_id": 1, "format": "coco", "prefix": prefix}
+
+    with pytest.raises(ValueError, match="prefix"):
+        ExportSpec.from_payload(payload, job_id=5)
+
+    custom = ExportSpec.from_payload({**payload, "prefix": "exports/1/nightly/"}, job_id=5)
+    assert custom.prefix == "exports/1/nightly/"
+    assert ExportSpec.from_payload({**payload, "prefix": None}, job_id=5).prefix == "exports/1/5/"
+
+
+def test_thumbnail_keys_must_belong_to_the_dataset():
+    sha = "ab" * 32
+    blob = f"blobs/ab/ab/{sha}"
+    ingest = ThumbnailSpec.from_payload({"keys": ["datasets/1/a.jpg", blob]})
+    assert ingest.keys == ("datasets/1/a.jpg", blob)
+
+    for keys in (["datasets/2/a.jpg"], ["datasets/1/../2/a.jpg"], [blob]):
+        with pytest.raises(ValueError):
+            ThumbnailSpec.from_payload({"dataset_id": 1, "keys": keys})
+    for key in ("exports/1/coco.json", "datasets/1/../../x"):
+        with pytest.raises(ValueError):
+            ThumbnailSpec.from_payload({"keys": [key]})
@@ -0,0 +1,84 @@
+import io
+import tarfile
+import zipfile
+
+import pytest
+
+from app.infrastructure.db import SessionLocal
+from app.models.orm.asset import Asset
+from app.models.orm.job import Job
+from app.repositories.job_repository import JobRepository
+from app.workers.dataset_import import DatasetImporter, ImportSpec
+from app.workers.handlers import JobContext
+from tests.support import auth_headers, make_dataset, sha256_hex
+
+_FILES = {"a.jpg": b"first", "sub/b.jpg": b"second", "copy.jpg": b"first"}
+
+
+def _tar(files):
+    out = io.BytesIO()
+    with tarfile.open(fileobj=out, mode="w:gz") as archive:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return out.getvalue()
+
+
+def _zip(files):
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w") as archive:
+        for name, data in files.items():
+            archive.writestr(name, data)
+    return out.getvalue()
+
+
+def _run(db, storage, payload):
+    job = JobRepository(db).create("import", payload)
+    ctx = JobContext(job_id=job.id, type="import", payload=payload, worker_id="w")
+    return DatasetImporter(ImportSpec.from_payload(payload), ctx, SessionLocal, storage).run()
+
+
+@pytest.mark.parametrize(
+    "archive_key",
+    [
+        "uploads/batch.zip",
+        "datasets/2/batch.zip",
+        "datasets/1/../2/batch.zip",
+        "datasets/10/batch.zip",
+    ],
+)
+def test_archives_outside_the_dataset_are_rejected(archive_key):
+    with pytest.raises(ValueError, match="does not belong to dataset 1"):
+        ImportSpec.from_payload({"dataset_id": 1, "archive_key": archive_key})
+
+
+def test_the_import_route_rejects_foreign_keys_before_queueing(client, db):
+    dataset = make_dataset(db, created_by=1)
+    other = make_dataset(db, "other", created_by=2)
+
+    response = client.post(
+        f"/api/v1/datasets/{dataset.id}/import",
+        json={"archive_key": f"datasets/{other.id}/private.zip"},
+        headers=auth_headers(user_id=1),
+    )
+
+    assert response.status_code == 422
+    assert db.query(Job).count() == 0
+
+
+@pytest.mark.parametrize(("name", "build"), [("upload.tar.gz", _tar), ("upload.zip", _zip)])
+def test_archives_are_unpacked_into_the_dataset_without_duplicates(db, storage, s3, name, build):
+    dataset = make_dataset(db)
+    s3.objects[f"datasets/{dataset.id}/{name}"] = build(_FILES)
+
+    result = _run(
+        db,
+        storage,
+        {"dataset_id": dataset.id, "archive_key": f"datasets/{dataset.id}/{name}", "prefix": "in/"},
+    )
+
+    assert (result["entries"], result["uploaded"], result["duplicates"]) == (3, 2, 1)
+    hashes = [a.content_hash for a in db.query(Asset).filter_by(dataset_id=dataset.id)]
+    assert sorted(hashes) == sorted([sha256_hex(b"first"), sha256_hex(b"second")])
+    assert s3.objects[f"datasets/{dataset.id}/in/sub/b.jpg"] == b"second"
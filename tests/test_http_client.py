@@ -0,0 +1,83 @@
+import httpx
+import pytest
+
+from app.infrastructure.http import HttpClientManager, request_with_retry
+
+
+def _client(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def _flaky(failures, then):
+    calls = []
+
+    def handler(request):
+        calls.append(request.method)
+        if len(calls) <= len(failures):
+            failure = failures[len(calls) - 1]
+            if isinstance(failure, int):
+                return httpx.Response(failure)
+            raise failure("boom", request=request)
+        return httpx.Response(then)
+
+    return handler, calls
+
+
+@pytest.mark.anyio
+async def test_manager_reuses_one_client_until_closed():
+    manager = HttpClientManager()
+    first = manager.get()
+
+    assert manager.get() is first
+    await manager.close()
+    assert first.is_closed
+    assert manager.get() is not first
+    await manager.close()
+
+
+@pytest.mark.anyio
+async def test_gets_retry_gateway_errors_and_read_timeouts():
+    handler, calls = _flaky([503, httpx.ReadTimeout], then=200)
+    async with _client(handler) as client:
+        response = await request_with_retry(
+            client, "GET", "https://api.example/user", timeout=1, retries=2, backoff=0
+        )
+
+    assert response.status_code == 200
+    assert len(calls) == 3
+
+
+@pytest.mark.anyio
+async def test_posts_are_not_replayed_once_sent():
+    handler, calls = _flaky([503], then=200)
+    async with _client(handler) as client:
+        response = await request_with_retry(
+            client, "POST", "https://api.example/token", timeout=1, retries=2, backoff=0
+        )
+    assert response.status_code == 503
+
+    handler, calls = _flaky([httpx.ReadTimeout], then=200)
+    async with _client(handler) as client:
+        with pytest.raises(httpx.ReadTimeout):
+            await request_with_retry(
+                client, "POST", "https://api.example/token", timeout=1, retries=2, backoff=0
+            )
+    assert len(calls) == 1
+
+
+@pytest.mark.anyio
+async def test_connection_failures_are_retried_for_any_method_up_to_the_limit():
+    handler, calls = _flaky([httpx.ConnectError], then=200)
+    async with _client(handler) as client:
+        response = await request_with_retry(
+            client, "POST", "https://api.example/token", timeout=1, retries=1, backoff=0
+        )
+    assert response.status_code == 200
+
+    handler, calls = _flaky([httpx.ConnectError] * 3, then=200)
+    async with _client(handler) as client:
+        with pytest.raises(httpx.ConnectError):
+            await request_with_retry(
+                client, "GET", "https://api.example/user", timeout=1, retries=2, backoff=0
+            )
+    assert len(calls) == 3
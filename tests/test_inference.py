@@ -0,0 +1,88 @@
+import io
+
+import onnxruntime as ort
+import pytest
+from onnx import TensorProto, helper
+from PIL import Image
+
+from app.core.config import settings
+from app.infrastructure.db import SessionLocal
+from app.models.orm.asset import Asset
+from app.models.orm.prediction import Prediction
+from app.repositories.job_repository import JobRepository
+from app.workers.handlers import JobContext
+from app.workers.inference import InferenceRunner, InferenceSpec
+from tests.support import make_dataset
+
+
+def _channel_mean_model() -> bytes:
+    """Scores each image by the mean of its RGB channels (3 "classes")."""
+    graph = helper.make_graph(
+        [helper.make_node("ReduceMean", ["x"], ["y"], axes=[2, 3], keepdims=0)],
+        "channel-mean",
+        [helper.make_tensor_value_info("x", TensorProto.FLOAT, ["n", 3, 8, 8])],
+        [helper.make_tensor_value_info("y", TensorProto.FLOAT, ["n", 3])],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8
+    return model.SerializeToString()
+
+
+def _png(color) -> bytes:
+    out = io.BytesIO()
+    Image.new("RGB", (16, 16), color).save(out, format="PNG")
+    return out.getvalue()
+
+
+@pytest.mark.parametrize(
+    ("payload", "message"),
+    [
+        ({"model_key": "m.onnx"}, "dataset_id"),
+        ({"dataset_id": 1, "model_key": "m.onnx", "top_k": 0}, "top_k"),
+        ({"dataset_id": 1, "model_key": "m.onnx", "top_k": -3}, "top_k"),
+        ({"dataset_id": 1, "model_key": "m.onnx", "batch_size": 0}, "batch_size"),
+        ({"dataset_id": 1, "model_key": "m.onnx", "input_size": [8]}, "input_size"),
+        ({"dataset_id": 1, "model_key": "m.onnx", "resize_mode": "crop"}, "resize_mode"),
+    ],
+)
+def test_unusable_payloads_are_rejected_up_front(payload, message):
+    with pytest.raises(ValueError, match=message):
+        InferenceSpec.from_payload(payload)
+
+
+@pytest.mark.parametrize("decode_processes", [0, 2])
+def test_runner_stores_top_k_predictions_and_reports_failures(
+    db, storage, s3, monkeypatch, decode_processes
+):
+    monkeypatch.setattr(settings, "inference_decode_processes", decode_processes)
+    model = ort.InferenceSession(_channel_mean_model(), providers=["CPUExecutionProvider"])
+    monkeypatch.setattr("app.workers.inference.load_model", lambda key: model)
+    dataset = make_dataset(db)
+    colors = {"red.png": (255, 0, 0), "green.png": (0, 255, 0), "blue.png": (0, 0, 255)}
+    for name, color in colors.items():
+        key = f"datasets/{dataset.id}/{name}"
+        s3.objects[key] = _png(color)
+        db.add(Asset(dataset_id=dataset.id, object_key=key, status="uploaded"))
+    db.add(Asset(dataset_id=dataset.id, object_key=f"datasets/{dataset.id}/gone.png"))
+    db.commit()
+    job = JobRepository(db).create("inference", {})
+    spec = InferenceSpec.from_payload(
+        {
+            "dataset_id": dataset.id,
+            "model_key": "m.onnx",
+            "input_size": [8, 8],
+            "batch_size": 2,
+            "top_k": 2,
+        }
+    )
+    ctx = JobContext(job_id=job.id, type="inference", payload={}, worker_id="w")
+
+    result = InferenceRunner(spec, ctx, SessionLocal, storage).run()
+
+    assert (result["processed"], result["succeeded"], result["failed"]) == (4, 3, 1)
+    labels = {
+        db.get(Asset, p.asset_id).object_key.rsplit("/", 1)[1]: (p.label, len(p.output["top_k"]))
+        for p in db.query(Prediction).filter_by(job_id=job.id)
+    }
+    assert labels == {"red.png": (0, 2), "green.png": (1, 2), "blue.png": (2, 2)}
+
@@ -0,0 +1,212 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from app.core.config import settings
+from app.infrastructure.db import SessionLocal
+from app.models.orm.asset import Asset
+from app.models.orm.ingest_event import IngestEvent
+from app.repositories.asset_repository import AssetRepository
+from app.repositories.ingest_event_repository import IngestEventRepository
+from app.services.ingest_service import (
+    AssetIngestQueue,
+    IngestBackpressureError,
+    ObjectCreated,
+    asset_ingest_queue,
+    parse_bucket_notification,
+)
+from tests.support import make_dataset
+
+
+@pytest.fixture(autouse=True)
+def _no_thumbnail_jobs(monkeypatch):
+    monkeypatch.setattr(settings, "thumbnail_on_ingest", False)
+
+
+def _record(key, size=10, event="s3:ObjectCreated:Put", bucket="test-bucket"):
+    return {
+        "eventName": event,
+        "eventTime": "2026-10-18T10:00:00.000Z",
+        "s3": {
+            "bucket": {"name": bucket},
+            "object": {"key": key, "size": size, "contentType": "image/jpeg"},
+        },
+    }
+
+
+def _event(dataset_id, name, size=10):
+    return ObjectCreated(
+        dataset_id=dataset_id,
+        object_key=f"datasets/{dataset_id}/{name}",
+        size_bytes=size,
+        mime_type="image/jpeg",
+        event_time=datetime(2026, 10, 18),
+    )
+
+
+def _queue(**options):
+    return AssetIngestQueue(SessionLocal, batch_size=options.pop("batch_size", 100), **options)
+
+
+def test_parse_keeps_dataset_objects_and_blob_uploads_only():
+    payload = {
+        "Records": [
+            _record("datasets/7/a%20b.jpg"),
+            _record("blobs/incoming/3/" + "abcd" * 16),
+            _record("blobs/ab/cd/" + "abcd" * 16),
+            _record("exports/1/coco.json"),
+            _record("datasets/7/x.jpg", event="s3:ObjectRemoved:Delete"),
+            _record("datasets/7/y.jpg", bucket="elsewhere"),
+            "garbage",
+        ]
+    }
+
+    events, ignored = parse_bucket_notification(payload, bucket="test-bucket")
+
+    assert ignored == 5
+    assert [(e.dataset_id, e.object_key) for e in events] == [
+        (7, "datasets/7/a b.jpg"),
+        (None, "blobs/incoming/3/" + "abcd" * 16),
+    ]
+    assert (events[1].blob_project_id, events[1].blob_sha256) == (3, "abcd" * 16)
+
+
+def test_submitted_events_survive_a_restart(db):
+    dataset = make_dataset(db)
+    crashed = _queue()
+    asyncio.run(crashed.submit([_event(dataset.id, "a.jpg"), _event(dataset.id, "b.jpg")]))
+    # The process dies before flushing; a new one picks the events up.
+    del crashed
+
+    assert db.query(IngestEvent).count() == 2
+    written = asyncio.run(_queue().flush())
+
+    assert written == 2
+    assert {a.object_key for a in db.query(Asset)} == {
+        f"datasets/{dataset.id}/a.jpg",
+        f"datasets/{dataset.id}/b.jpg",
+    }
+    assert db.query(IngestEvent).count() == 0
+
+
+def test_batches_coalesce_repeated_events_and_drop_unknown_datasets(db):
+    dataset = make_dataset(db)
+    queue = _queue()
+    asyncio.run(
+        queue.submit(
+            [_event(dataset.id, "a.jpg", 1), _event(404, "x.jpg"), _event(dataset.id, "a.jpg", 2)]
+        )
+    )
+
+    assert asyncio.run(queue.flush()) == 3
+
+    assets = db.query(Asset).all()
+    assert [(a.object_key, a.size_bytes, a.status) for a in assets] == [
+        (f"datasets/{dataset.id}/a.jpg", 2, "uploaded")
+    ]
+
+
+def test_events_claimed_by_a_dead_flusher_are_retried_after_the_lease(db):
+    dataset = make_dataset(db)
+    asyncio.run(_queue().submit([_event(dataset.id, "a.jpg")]))
+    repo = IngestEventRepository(db)
+    assert len(repo.claim("busy", 10, lease_seconds=60)) == 1
+    assert asyncio.run(_queue().flush()) == 0
+
+    # The holder dies; once its lease runs out the events are free again.
+    db.query(IngestEvent).update({"lease_expires_at": datetime(2000, 1, 1)})
+    db.commit()
+
+    assert asyncio.run(_queue().flush()) == 1
+    assert db.query(Asset).count() == 1
+
+
+def test_failed_write_is_retried_after_a_back_off(db, monkeypatch):
+    dataset = make_dataset(db)
+    queue = _queue(retry_seconds=60)
+    asyncio.run(queue.submit([_event(dataset.id, "a.jpg")]))
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("database went away")
+
+    with monkeypatch.context() as patch:
+        patch.setattr("app.repositories.asset_repository.AssetRepository.upsert_uploaded", broken)
+        assert asyncio.run(queue.flush()) == 0
+
+    event = db.query(IngestEvent).one()
+    assert (event.attempts, event.status, event.lease_owner) == (1, "pending", None)
+    assert asyncio.run(queue.flush()) == 0  # not due yet
+
+    db.query(IngestEvent).update({"lease_expires_at": datetime(2000, 1, 1)})
+    db.commit()
+    assert asyncio.run(queue.flush()) == 1
+    assert db.query(Asset).count() == 1
+
+
+def test_a_poison_event_is_dead_lettered_without_holding_up_the_batch(db, monkeypatch):
+    dataset = make_dataset(db)
+    queue = _queue(max_attempts=2, retry_seconds=0)
+    events = [_event(dataset.id, name) for name in ("a.jpg", "poison.jpg", "b.jpg")]
+    asyncio.run(queue.submit(events))
+    upsert = AssetRepository.upsert_uploaded
+
+    def picky(self, rows):
+        if any(row["object_key"].endswith("poison.jpg") for row in rows):
+            raise ValueError("cannot ingest this one")
+        return upsert(self, rows)
+
+    monkeypatch.setattr(AssetRepository, "upsert_uploaded", picky)
+
+    assert asyncio.run(queue.flush()) == 2
+    assert sorted(a.object_key for a in db.query(Asset)) == [
+        f"datasets/{dataset.id}/a.jpg",
+        f"datasets/{dataset.id}/b.jpg",
+    ]
+    assert asyncio.run(queue.flush()) == 0
+
+    db.expire_all()
+    dead = db.query(IngestEvent).one()
+    assert (dead.object_key, dead.attempts, dead.status) == (
+        f"datasets/{dataset.id}/poison.jpg",
+        2,
+        "dead",
+    )
+    assert asyncio.run(queue.flush()) == 0
+    # Dead letters are kept but no longer count against the backlog limit.
+    assert IngestEventRepository(db).count() == 0
+
+
+def test_backlog_limit_rejects_new_events(db):
+    dataset = make_dataset(db)
+    queue = _queue(max_pending=2)
+    asyncio.run(queue.submit([_event(dataset.id, "a.jpg"), _event(dataset.id, "b.jpg")]))
+
+    with pytest.raises(IngestBackpressureError):
+        asyncio.run(queue.submit([_event(dataset.id, "c.jpg")]))
+
+
+def test_webhook_commits_events_before_acknowledging(client, db, monkeypatch):
+    monkeypatch.setattr(settings, "ingest_webhook_token", "hook-secret")
+    dataset = make_dataset(db)
+    body = {"Records": [_record(f"datasets/{dataset.id}/a.jpg"), _record("other/x")]}
+
+    unauthorized = client.post("/api/v1/ingest/s3-events", json=body)
+    accepted = client.post(
+        "/api/v1/ingest/s3-events", json=body, headers={"Authorization": "Bearer hook-secret"}
+    )
+
+    assert unauthorized.status_code == 401
+    assert accepted.status_code == 202
+    assert accepted.json() == {"accepted": 1, "ignored": 1}
+    # Either already written by the background flusher or still stored.
+    asyncio.run(asset_ingest_queue.flush())
+    assert db.query(Asset).filter_by(dataset_id=dataset.id).count() == 1
+
+
+def test_webhook_is_off_without_a_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "ingest_webhook_token", None)
+
+    response = client.post("/api/v1/ingest/s3-events", json={"Records": []})
+
+    assert response.status_code == 503
@@ -0,0 +1,89 @@
+import json
+
+import pytest
+
+from app.api.v1.jobs import _event_stream
+from app.core.config import settings
+from app.core.context import UserContext
+from app.services.job_events import JobEventHub
+from tests.support import auth_headers
+
+
+class _Request:
+    async def is_disconnected(self) -> bool:
+        return True
+
+
+def _event(job_id, tenant_id=None, created_by=None, project_id=1):
+    return {
+        "id": job_id,
+        "status": "running",
+        "project_id": project_id,
+        "tenant_id": tenant_id,
+        "created_by": created_by,
+    }
+
+
+def _job(client, headers):
+    return client.post("/api/v1/jobs/", json={"type": "noop"}, headers=headers).json()["id"]
+
+
+def test_job_stream_requires_the_jobs_owner(client):
+    owner = auth_headers(user_id=1)
+    job_id = _job(client, owner)
+    client.post(f"/api/v1/jobs/{job_id}/cancel", headers=owner)
+
+    anonymous = client.get(f"/api/v1/jobs/{job_id}/events")
+    stranger = client.get(f"/api/v1/jobs/{job_id}/events", headers=auth_headers(user_id=2))
+    own = client.get(f"/api/v1/jobs/{job_id}/events", headers=owner)
+
+    assert anonymous.status_code == 401
+    assert stranger.status_code == 404
+    # The job is already final, so the stream ends after its snapshot.
+    assert own.status_code == 200
+    event = json.loads(own.text.split("data: ", 1)[1])
+    assert (event["id"], event["status"]) == (job_id, "cancelled")
+
+
+def test_project_stream_requires_authentication(client):
+    assert client.get("/api/v1/jobs/events", params={"project_id": 1}).status_code == 401
+
+
+@pytest.mark.anyio
+async def test_project_stream_skips_other_tenants_jobs(monkeypatch):
+    monkeypatch.setattr(settings, "job_events_keepalive_seconds", 0.01)
+    hub = JobEventHub()
+    subscription = hub.subscribe(project_id=1)
+    ctx = UserContext(user_id=1, tenant_id=5, roles=(), permissions=())
+    hub.publish(_event(10, tenant_id=6))
+    hub.publish(_event(11, created_by=1))
+    hub.publish(_event(12, tenant_id=5, created_by=2))
+
+    response = _event_stream(_Request(), subscription, [], ctx, until_final=False)
+    chunks = [chunk async for chunk in response.body_iterator]
+
+    delivered = [
+        json.loads(chunk.split("data: ", 1)[1])["id"] for chunk in chunks if "data" in chunk
+    ]
+    assert delivered == [12]
+    assert not hub.has_subscribers
+
+
+@pytest.mark.anyio
+async def test_a_full_subscription_keeps_the_latest_and_every_final_event():
+    hub = JobEventHub(queue_size=2)
+    subscription = hub.subscribe(project_id=1)
+    hub.publish({**_event(1), "status": "succeeded"})
+    hub.publish(_event(2))
+    hub.publish({**_event(2), "progress": {"done": 1}})
+    hub.publish(_event(3))
+    hub.publish({**_event(4), "status": "failed"})
+
+    received = []
+    while (event := await subscription.get(timeout=0.01)) is not None:
+        received.append((event["id"], event["status"]))
+
+    # Job 2's newer snapshot replaced its queued one, then made room for 3;
+    # job 3 made room for 4's final event, and job 1's final event stayed.
+    assert received == [(1, "succeeded"), (4, "failed")]
+    subscription.close()
@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from app.infrastructure.db import SessionLocal
+from app.infrastructure.queue import LocalJobBroker
+from app.models.orm.job import Job
+from app.repositories.job_repository import JobRepository
+from app.workers.job_worker import JobWorker
+from tests.support import auth_headers
+
+
+def _index_ddl(name):
+    index = next(index for index in Job.__table__.indexes if index.name == name)
+    return str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+
+
+def _expire_leases(db):
+    db.query(Job).update({"lease_expires_at": datetime.utcnow() - timedelta(seconds=1)})
+    db.commit()
+
+
+def test_claim_index_matches_the_claim_order():
+    assert "(status, priority DESC, id)" in _index_ddl("ix_jobs_status_priority_id")
+
+
+def test_claims_are_exclusive_and_in_priority_order(db):
+    repo = JobRepository(db)
+    low = repo.create("noop", {}, priority=0)
+    high = repo.create("noop", {}, priority=5)
+
+    first = repo.claim_next("w1", lease_seconds=60)
+    with SessionLocal() as other:
+        second = JobRepository(other).claim_next("w2", lease_seconds=60)
+
+    assert (first.id, second.id) == (high.id, low.id)
+    assert repo.claim_next("w3", lease_seconds=60) is None
+    assert not repo.heartbeat(high.id, "w2", lease_seconds=60)
+    assert repo.complete(high.id, "w1", {"ok": True})
+
+
+def test_expired_leases_are_requeued_until_attempts_run_out(db):
+    repo = JobRepository(db)
+    job = repo.create("noop", {}, max_attempts=2)
+
+    repo.claim_next("dead", lease_seconds=60)
+    _expire_leases(db)
+    assert repo.requeue_expired() == 1
+    repo.claim_next("dead-again", lease_seconds=60)
+    _expire_leases(db)
+    assert repo.requeue_expired() == 0
+
+    db.expire_all()
+    assert (db.get(Job, job.id).status, db.get(Job, job.id).error) == ("failed", "Lease expired")
+
+
+def test_worker_scans_for_expired_leases_once_per_lease_interval(monkeypatch):
+    scans = []
+    monkeypatch.setattr(JobRepository, "requeue_expired", lambda self: scans.append(1))
+    clock = iter([100.0, 110.0, 161.0])
+    monkeypatch.setattr("app.workers.job_worker.time.monotonic", lambda: next(clock))
+    worker = JobWorker("w", SessionLocal, LocalJobBroker(), lease_seconds=60)
+
+    for _ in range(3):
+        assert worker.run_once() is False
+
+    assert len(scans) == 2
+
+
+def test_worker_runs_the_handler_and_records_the_result(db):
+    job = JobRepository(db).create("noop", {"echo": 1})
+    worker = JobWorker("w", SessionLocal, LocalJobBroker(), lease_seconds=60)
+
+    assert worker.run_once() is True
+
+    db.expire_all()
+    assert db.get(Job, job.id).status == "succeeded"
+
+
+def test_job_routes_only_show_the_callers_jobs(client, db):
+    mine = auth_headers(user_id=1)
+    theirs = auth_headers(user_id=2)
+    tenant = auth_headers(user_id=3, tenant_id=9)
+    job_id = client.post("/api/v1/jobs/", json={"type": "noop"}, headers=mine).json()["id"]
+    client.post("/api/v1/jobs/", json={"type": "noop"}, headers=tenant)
+
+    assert [j["id"] for j in client.get("/api/v1/jobs/", headers=mine).json()] == [job_id]
+    assert client.get("/api/v1/jobs/", headers=theirs).json() == []
+    assert len(client.get("/api/v1/jobs/", headers=auth_headers(4, tenant_id=9)).json()) == 1
+    assert client.get("/api/v1/jobs/").status_code == 401
+
+    assert client.get(f"/api/v1/jobs/{job_id}", headers=theirs).status_code == 404
+    assert client.get(f"/api/v1/jobs/{job_id}", headers=tenant).status_code == 404
+    assert client.post(f"/api/v1/jobs/{job_id}/cancel", headers=theirs).status_code == 404
+    assert client.get(f"/api/v1/jobs/{job_id}", headers=mine).json()["status"] == "queued"
+
+    cancelled = client.post(f"/api/v1/jobs/{job_id}/cancel", headers=mine)
+    assert cancelled.status_code == 200
+    assert client.post(f"/api/v1/jobs/{job_id}/cancel", headers=mine).status_code == 409
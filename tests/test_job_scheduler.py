@@ -0,0 +1,87 @@
+from datetime import datetime
+
+from app.core.config import settings
+from app.models.orm.project import Project
+from app.repositories.job_repository import JobRepository
+from app.services.job_scheduler import FairShareScheduler, TenantLoad
+from tests.support import auth_headers
+
+
+def _queue(db, tenant_id, count, project_id=None, priority=0):
+    repo = JobRepository(db)
+    return [
+        repo.create("noop", {}, tenant_id=tenant_id, project_id=project_id, priority=priority)
+        for _ in range(count)
+    ]
+
+
+def test_least_served_tenant_goes_first_and_caps_are_respected():
+    scheduler = FairShareScheduler(max_running_per_tenant=2, weights={2: 4.0})
+    loads = [
+        TenantLoad(1, queued=5, running=1, oldest_queued_at=datetime(2026, 1, 1)),
+        TenantLoad(2, queued=5, running=3, oldest_queued_at=datetime(2026, 1, 2)),
+        TenantLoad(3, queued=5, running=1, oldest_queued_at=datetime(2025, 1, 1)),
+        TenantLoad(4, queued=0, running=0),
+    ]
+
+    # Tenant 2 is over the cap; 3 ties with 1 but has waited longer.
+    assert scheduler.order(loads) == [3, 1]
+    assert FairShareScheduler(weights={2: 4.0}).order(loads) == [2, 3, 1]
+
+
+def test_a_busy_tenant_does_not_starve_the_others(db):
+    _queue(db, tenant_id=1, count=10, priority=10)
+    _queue(db, tenant_id=2, count=2)
+    scheduler = FairShareScheduler()
+    repo = JobRepository(db)
+
+    claimed = [scheduler.claim_next(repo, "w", 60).tenant_id for _ in range(4)]
+
+    assert sorted(claimed) == [1, 1, 2, 2]
+
+
+def test_projects_at_their_cap_are_skipped(db):
+    busy, quiet = Project(name="busy"), Project(name="quiet")
+    db.add_all([busy, quiet])
+    db.commit()
+    _queue(db, tenant_id=None, count=2, project_id=busy.id, priority=10)
+    _queue(db, tenant_id=None, count=1, project_id=quiet.id)
+    scheduler = FairShareScheduler(max_running_per_project=1)
+    repo = JobRepository(db)
+
+    claimed = [scheduler.claim_next(repo, "w", 60) for _ in range(3)]
+
+    assert [job and job.project_id for job in claimed] == [busy.id, quiet.id, None]
+
+
+def test_tenant_quota_rejects_new_jobs(client, monkeypatch):
+    monkeypatch.setattr(settings, "job_tenant_max_queued", 1)
+    headers = auth_headers(user_id=1, tenant_id=5)
+
+    assert client.post("/api/v1/jobs/", json={"type": "noop"}, headers=headers).status_code == 202
+    assert client.post("/api/v1/jobs/", json={"type": "noop"}, headers=headers).status_code == 429
+
+
+def test_queue_gauges_come_from_the_database(client, db, monkeypatch):
+    monkeypatch.setattr(settings, "debug_metrics_enabled", True)
+    _queue(db, tenant_id=7, count=3)
+    # Claimed by a worker process, whose own metrics the API never sees.
+    JobRepository(db).claim_next("elsewhere", 60)
+
+    snapshot = client.get("/api/v1/debug/metrics", headers=auth_headers()).json()
+
+    gauges = {
+        (row["name"], row["labels"].get("tenant")): row["value"] for row in snapshot["gauges"]
+    }
+    assert gauges[("job_queue_depth", "7")] == 2
+    assert gauges[("jobs_running", "7")] == 1
+
+
+def test_queue_stats_show_only_the_callers_tenant(client, db):
+    _queue(db, tenant_id=7, count=3)
+    _queue(db, tenant_id=8, count=1)
+
+    response = client.get("/api/v1/jobs/stats", headers=auth_headers(tenant_id=7))
+
+    assert [(row["tenant_id"], row["queued"]) for row in response.json()] == [(7, 3)]
+    assert client.get("/api/v1/jobs/stats").status_code == 401
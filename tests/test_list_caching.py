@@ -0,0 +1,105 @@
+from app.api import conditional
+from app.core.list_cache import ListResponseCache
+from app.repositories.dataset_repository import DatasetRepository
+from tests.support import auth_headers, make_dataset
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _list(client, project_id, etag=None):
+    headers = {"If-None-Match": etag} if etag else {}
+    return client.get("/api/v1/datasets/", params={"project_id": project_id}, headers=headers)
+
+
+def test_unchanged_listings_answer_304_until_a_write(client, db):
+    dataset = make_dataset(db)
+    first = _list(client, dataset.project_id)
+    etag = first.headers["ETag"]
+
+    unchanged = _list(client, dataset.project_id, etag)
+    weak = _list(client, dataset.project_id, f'"other", W/{etag}')
+    client.post("/api/v1/datasets/", json={"project_id": dataset.project_id, "name": "new"})
+    changed = _list(client, dataset.project_id, etag)
+
+    assert first.status_code == 200 and first.headers["Cache-Control"] == "private, no-cache"
+    assert (unchanged.status_code, unchanged.content) == (304, b"")
+    assert unchanged.headers["ETag"] == etag
+    assert weak.status_code == 304
+    assert changed.status_code == 200 and changed.headers["ETag"] != etag
+    assert [d["name"] for d in changed.json()] == ["dataset", "new"]
+
+
+def test_listings_of_other_projects_keep_their_etag(client, db):
+    dataset = make_dataset(db)
+    other = make_dataset(db, "other")
+    etag = _list(client, dataset.project_id).headers["ETag"]
+
+    client.post("/api/v1/datasets/", json={"project_id": other.project_id, "name": "new"})
+
+    assert _list(client, dataset.project_id, etag).status_code == 304
+
+
+def test_project_listing_etag_follows_project_writes(client):
+    owner, other = auth_headers(tenant_id=1), auth_headers(user_id=2, tenant_id=2)
+    etag = client.get("/api/v1/projects/", headers=owner).headers["ETag"]
+    other_etag = client.get("/api/v1/projects/", headers=other).headers["ETag"]
+
+    for name in ("cats", "dogs"):
+        client.post("/api/v1/projects/", json={"name": name}, headers=owner)
+    response = client.get("/api/v1/projects/", headers={**owner, "If-None-Match": etag})
+    foreign = client.get("/api/v1/projects/", headers={**other, "If-None-Match": other_etag})
+
+    assert response.status_code == 200 and response.headers["ETag"] != etag
+    assert [p["name"] for p in response.json()] == ["cats", "dogs"]
+    assert foreign.status_code == 304
+    assert client.get("/api/v1/projects/", headers=other).json() == []
+    assert client.get("/api/v1/projects/").status_code == 401
+
+
+def test_cached_listings_see_other_processes_writes_after_the_ttl(client, db, monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(
+        conditional,
+        "list_cache",
+        ListResponseCache(max_entries=10, ttl_seconds=5, clock=clock),
+    )
+    dataset = make_dataset(db)
+    etag = _list(client, dataset.project_id).headers["ETag"]
+
+    # Another process: the version moves on, but this process's cache does not know.
+    DatasetRepository(db).create(dataset.project_id, "elsewhere")
+    assert _list(client, dataset.project_id, etag).status_code == 304
+
+    clock.now = 5
+    fresh = _list(client, dataset.project_id, etag)
+    assert fresh.status_code == 200
+    assert [d["name"] for d in fresh.json()] == ["dataset", "elsewhere"]
+
+
+def test_list_cache_expires_evicts_and_invalidates():
+    clock = _Clock()
+    cache = ListResponseCache(max_entries=2, ttl_seconds=5, clock=clock)
+    cache.put("a", '"a.1"', b"[]")
+    cache.put("b", '"b.1"', b"[]")
+    cache.get("a")
+    cache.put("c", '"c.1"', b"[]")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == ('"a.1"', b"[]")
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    clock.now = 5
+    assert cache.get("c") is None
+
+
+def test_a_zero_ttl_disables_the_list_cache():
+    cache = ListResponseCache(max_entries=10, ttl_seconds=0)
+    cache.put("a", '"a.1"', b"[]")
+
+    assert cache.get("a") is None
@@ -0,0 +1,115 @@
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from tests.support import make_dataset
+
+pytestmark = pytest.mark.usefixtures("signed_in")
+
+
+def _start(client, dataset_id, filename="video.mp4", part_count=3):
+    return client.post(
+        "/api/v1/assets/multipart",
+        json={"dataset_id": dataset_id, "filename": filename, "part_count": part_count},
+    )
+
+
+def test_upload_can_be_resumed_and_completed(client, db, storage):
+    dataset = make_dataset(db, created_by=1)
+
+    created = _start(client, dataset.id)
+    assert created.status_code == 201
+    upload = created.json()
+    key = upload["object_key"]
+    assert key == f"datasets/{dataset.id}/video.mp4"
+    assert [part["part_number"] for part in upload["parts"]] == [1, 2, 3]
+    query = parse_qs(urlparse(upload["parts"][1]["upload_url"]).query)
+    assert query["partNumber"] == ["2"] and query["uploadId"] == [upload["upload_id"]]
+
+    # The client uploads part 1, then resumes with the parts it still lacks.
+    storage.upload_part(key, upload["upload_id"], 1, b"a" * 10)
+    listed = client.get(
+        "/api/v1/assets/multipart/parts",
+        params={"dataset_id": dataset.id, "object_key": key, "upload_id": upload["upload_id"]},
+    ).json()
+    assert [part["part_number"] for part in listed["parts"]] == [1]
+    resigned = client.post(
+        "/api/v1/assets/multipart/parts",
+        json={
+            "dataset_id": dataset.id,
+            "object_key": key,
+            "upload_id": upload["upload_id"],
+            "part_numbers": [2, 3],
+        },
+    ).json()
+    assert [part["part_number"] for part in resigned["parts"]] == [2, 3]
+    etags = {1: listed["parts"][0]["etag"]}
+    etags[2] = storage.upload_part(key, upload["upload_id"], 2, b"b" * 10)
+    etags[3] = storage.upload_part(key, upload["upload_id"], 3, b"c")
+
+    completed = client.post(
+        "/api/v1/assets/multipart/complete",
+        json={
+            "dataset_id": dataset.id,
+            "object_key": key,
+            "upload_id": upload["upload_id"],
+            "parts": [{"part_number": n, "etag": etag} for n, etag in sorted(etags.items())],
+        },
+    )
+
+    assert completed.status_code == 200
+    assert storage.get_object(key) == b"a" * 10 + b"b" * 10 + b"c"
+
+
+def test_abort_discards_the_upload(client, db):
+    dataset = make_dataset(db, created_by=1)
+    upload = _start(client, dataset.id).json()
+    ref = {"dataset_id": dataset.id, "object_key": upload["object_key"]}
+
+    aborted = client.post(
+        "/api/v1/assets/multipart/abort", json={**ref, "upload_id": upload["upload_id"]}
+    )
+    again = client.post(
+        "/api/v1/assets/multipart/abort", json={**ref, "upload_id": upload["upload_id"]}
+    )
+
+    assert aborted.status_code == 204
+    assert again.status_code == 404
+
+
+def test_invalid_requests_are_422_and_missing_things_404(client, db):
+    dataset = make_dataset(db, created_by=1)
+    other = make_dataset(db, "other", created_by=1)
+    upload = _start(client, dataset.id).json()
+    ref = {"object_key": upload["object_key"], "upload_id": upload["upload_id"]}
+
+    bad_filename = _start(client, dataset.id, filename="../escape.bin")
+    foreign_key = client.post(
+        "/api/v1/assets/multipart/parts",
+        json={**ref, "dataset_id": other.id, "part_numbers": [1]},
+    )
+    traversal = client.post(
+        "/api/v1/assets/multipart/parts",
+        json={
+            **ref,
+            "dataset_id": dataset.id,
+            "object_key": f"datasets/{dataset.id}/../{other.id}/x",
+            "part_numbers": [1],
+        },
+    )
+    bad_part = client.post(
+        "/api/v1/assets/multipart/parts",
+        json={**ref, "dataset_id": dataset.id, "part_numbers": [0, 10_001]},
+    )
+    missing_dataset = _start(client, 404)
+    missing_upload = client.get(
+        "/api/v1/assets/multipart/parts",
+        params={"dataset_id": dataset.id, "object_key": ref["object_key"], "upload_id": "nope"},
+    )
+
+    assert bad_filename.status_code == 422
+    assert foreign_key.status_code == 422
+    assert traversal.status_code == 422
+    assert bad_part.status_code == 422
+    assert missing_dataset.status_code == 404
+    assert missing_upload.status_code == 404
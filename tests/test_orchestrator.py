@@ -0,0 +1,85 @@
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+import uuid
+
+import numpy as np
+import pytest
+
+from devices.basler.capture import GrabInfo
+from devices.basler.orchestrator import (
+    CameraSpec,
+    CaptureOrchestrator,
+    ConsumerHandle,
+    SharedFrameConsumer,
+    SharedFrameRing,
+)
+
+
+def _dead_pid() -> int:
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def _fill(ring, count):
+    for frame_id in range(count):
+        seq, _ = ring.begin_write()
+        ring.commit(seq, time.perf_counter_ns(), GrabInfo(frame_id=frame_id))
+
+
+def _attach_and_die(handle: ConsumerHandle) -> None:
+    consumer = SharedFrameConsumer(handle, from_latest=False)
+    consumer.next(timeout=5)
+    os._exit(1)  # no close(): the cursor stays behind
+
+
+@pytest.fixture
+def shared():
+    ring = SharedFrameRing.create(f"mlv1sion-test-{uuid.uuid4().hex[:8]}", 4, (2, 2), np.uint8, 2)
+    try:
+        yield ring
+    finally:
+        ring.close()
+
+
+def test_a_stalled_live_consumer_holds_the_ring(shared):
+    handle = ConsumerHandle("cam", shared.layout, 0)
+    with SharedFrameConsumer(handle, from_latest=False) as consumer:
+        _fill(shared.ring, 4)
+
+        assert not shared.admit()
+        assert shared.reap_dead_consumers() == []
+        # The frame just returned is still in use; the one before it is free.
+        consumer.next(timeout=0)
+        consumer.next(timeout=0)
+        assert shared.admit()
+
+
+def test_the_cursor_of_a_dead_consumer_is_released(shared):
+    with SharedFrameConsumer(ConsumerHandle("cam", shared.layout, 1), from_latest=False):
+        _fill(shared.ring, 4)
+        shared.owners[1] = _dead_pid()
+
+        assert shared.admit()
+        assert shared.lags() == {}
+
+
+def test_orchestrator_reuses_the_slot_of_a_crashed_consumer():
+    camera = CameraSpec(name=f"sim-{uuid.uuid4().hex[:6]}", simulated=True, width=8, height=4)
+    with CaptureOrchestrator(
+        [camera], ring_capacity=4, max_consumers=1, policy="drop_newest", stats_interval=0.1
+    ) as orchestrator:
+        handle = orchestrator.consumer(camera.name)
+        child = multiprocessing.get_context("spawn").Process(target=_attach_and_die, args=(handle,))
+        child.start()
+        child.join(timeout=30)
+        assert child.exitcode == 1
+
+        # Without the pid check the ring would stay full and the slot taken forever.
+        replacement = orchestrator.consumer(camera.name)
+        assert replacement.slot == handle.slot
+        with SharedFrameConsumer(replacement) as consumer:
+            assert consumer.next(timeout=5) is not None
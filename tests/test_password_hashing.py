@@ -0,0 +1,62 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+from app.core.security import PasswordHasher
+from app.models.orm.user import User
+
+
+@pytest.mark.anyio
+async def test_calls_beyond_the_pending_limit_get_503():
+    hasher = PasswordHasher(max_workers=1, max_pending=1)
+    release = threading.Event()
+    try:
+        blocked = asyncio.ensure_future(hasher._run(release.wait))
+        await asyncio.sleep(0.05)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await hasher.hash("secret")
+
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.headers == {"Retry-After": "1"}
+        release.set()
+        assert await blocked is True
+        assert await hasher.verify_and_update("secret", await hasher.hash("secret")) == (
+            True,
+            None,
+        )
+    finally:
+        release.set()
+        hasher.shutdown()
+
+
+def test_register_then_login(client):
+    credentials = {"email": "ada@example.com", "password": "correct horse"}
+
+    registered = client.post("/api/v1/auth/register", json=credentials)
+    duplicate = client.post("/api/v1/auth/register", json=credentials)
+    login = client.post("/api/v1/auth/login", json=credentials)
+    wrong = client.post("/api/v1/auth/login", json={**credentials, "password": "nope"})
+
+    assert registered.status_code == 200 and registered.json()["access_token"]
+    assert duplicate.status_code == 409
+    assert login.status_code == 200
+    assert wrong.status_code == 401
+
+
+def test_login_rehashes_passwords_stored_with_an_old_cost(client, db):
+    old_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=5).hash("pw")
+    db.add(User(email="old@example.com", password_hash=old_hash))
+    db.commit()
+
+    response = client.post(
+        "/api/v1/auth/login", json={"email": "old@example.com", "password": "pw"}
+    )
+
+    assert response.status_code == 200
+    db.expire_all()
+    stored = db.query(User).filter_by(email="old@example.com").one().password_hash
+    assert stored != old_hash and stored.startswith("$2b$04$")
@@ -0,0 +1,71 @@
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from app.ml.preprocessing import (
+    BatchBuffer,
+    PreprocessConfig,
+    PreprocessPool,
+    decode_image,
+    preprocess_batch,
+)
+
+
+def _encode(image: Image.Image, fmt: str = "PNG") -> bytes:
+    out = io.BytesIO()
+    image.save(out, format=fmt)
+    return out.getvalue()
+
+
+def test_resize_stretches_to_the_model_size():
+    data = _encode(Image.new("RGB", (40, 20), (10, 20, 30)))
+
+    pixels, meta = decode_image(data, PreprocessConfig(size=(8, 16)))
+
+    assert pixels.shape == (8, 16, 3) and pixels.dtype == np.uint8
+    assert (meta.width, meta.height, meta.scale_x, meta.scale_y) == (40, 20, 0.4, 0.4)
+    assert (pixels == (10, 20, 30)).all()
+
+
+def test_letterbox_keeps_the_aspect_ratio_and_pads():
+    data = _encode(Image.new("L", (40, 20), 200))
+    config = PreprocessConfig(size=(16, 16), mode="letterbox", pad_value=0)
+
+    pixels, meta = decode_image(data, config)
+
+    assert pixels.shape == (16, 16, 3)
+    assert (meta.scale_x, meta.pad_x, meta.pad_y) == (0.4, 0, 4)
+    assert (pixels[:4] == 0).all() and (pixels[12:] == 0).all()
+    assert (pixels[4:12] == 200).all()
+
+
+def test_normalization_matches_the_textbook_formula():
+    config = PreprocessConfig(size=(4, 4))
+    rng = np.random.default_rng(0)
+    images = rng.integers(0, 256, size=(3, 4, 4, 3), dtype=np.uint8)
+    buffer = BatchBuffer(config, capacity=4)
+    for row, image in enumerate(images):
+        buffer.put(row, image)
+
+    tensor = buffer.tensor(3)
+
+    mean = np.asarray(config.mean).reshape(1, 3, 1, 1)
+    std = np.asarray(config.std).reshape(1, 3, 1, 1)
+    expected = (images.transpose(0, 3, 1, 2) / 255.0 - mean) / std
+    assert tensor.shape == (3, 3, 4, 4) and tensor.dtype == np.float32
+    np.testing.assert_allclose(tensor, expected, rtol=1e-5, atol=1e-5)
+
+
+@pytest.mark.parametrize("use_threads", [True, False])
+def test_pool_decodes_in_order(use_threads):
+    config = PreprocessConfig(size=(4, 4))
+    items = [_encode(Image.new("RGB", (8, 8), (value, 0, 0)), "JPEG") for value in (0, 128, 255)]
+
+    with PreprocessPool(config, processes=2, use_threads=use_threads) as pool:
+        tensor, metas = preprocess_batch(items, config, pool=pool)
+
+    reds = tensor[:, 0].mean(axis=(1, 2))
+    assert len(metas) == 3
+    assert reds[0] < reds[1] < reds[2]
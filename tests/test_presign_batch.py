@@ -0,0 +1,95 @@
+import json
+from urllib.parse import urlparse
+
+import pytest
+
+from tests.support import make_dataset
+
+pytestmark = pytest.mark.usefixtures("signed_in")
+
+
+def test_batch_signs_every_valid_file_and_reports_the_rest(client, db):
+    dataset = make_dataset(db, created_by=1)
+
+    response = client.post(
+        "/api/v1/assets/presign/batch",
+        json={
+            "dataset_id": dataset.id,
+            "filenames": ["a.jpg", "sub/b.png", "../escape.jpg", "a.jpg", ""],
+            "expires_in": 600,
+        },
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["bucket"] == "test-bucket"
+    assert body["failed"] == 3
+    items = {(item["filename"], item["error"] is None): item for item in body["items"]}
+    signed = items[("a.jpg", True)]
+    assert signed["object_key"] == f"datasets/{dataset.id}/a.jpg"
+    url = urlparse(signed["upload_url"])
+    assert url.path == f"/test-bucket/datasets/{dataset.id}/a.jpg"
+    assert "X-Amz-Expires=600" in url.query
+    assert items[("sub/b.png", True)]["object_key"] == f"datasets/{dataset.id}/sub/b.png"
+    assert items[("../escape.jpg", False)]["error"] == "Filename contains an invalid path segment"
+    assert items[("a.jpg", False)]["error"] == "Duplicate filename in batch"
+    assert items[("", False)]["upload_url"] is None
+
+
+def test_batch_streams_ndjson_in_request_order(client, db):
+    dataset = make_dataset(db, created_by=1)
+    filenames = [f"img/{i:04d}.jpg" for i in range(250)]
+
+    response = client.post(
+        "/api/v1/assets/presign/batch?stream=true",
+        json={"dataset_id": dataset.id, "filenames": filenames},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["filename"] for line in lines] == filenames
+    assert all("error" not in line and line["upload_url"] for line in lines)
+
+
+def test_batch_for_unknown_dataset_is_404(client):
+    response = client.post(
+        "/api/v1/assets/presign/batch",
+        json={"dataset_id": 404, "filenames": ["a.jpg"]},
+    )
+
+    assert response.status_code == 404
+
+
+def test_batch_size_is_bounded(client, db):
+    dataset = make_dataset(db, created_by=1)
+
+    response = client.post(
+        "/api/v1/assets/presign/batch",
+        json={"dataset_id": dataset.id, "filenames": [f"{i}.jpg" for i in range(10_001)]},
+    )
+
+    assert response.status_code == 422
+
+
+def test_upload_routes_need_the_datasets_owner(client, db):
+    foreign = make_dataset(db, "foreign", tenant_id=2)
+    ref = {"dataset_id": foreign.id, "object_key": f"datasets/{foreign.id}/a", "upload_id": "u"}
+    file = {"filename": "a", "sha256": "0" * 64}
+    requests = {
+        "/api/v1/assets/presign": {"dataset_id": foreign.id, "filename": "a.jpg"},
+        "/api/v1/assets/presign/batch": {"dataset_id": foreign.id, "filenames": ["a"]},
+        "/api/v1/assets/presign/content": {"dataset_id": foreign.id, "files": [file]},
+        "/api/v1/assets/multipart": {"dataset_id": foreign.id, "filename": "a", "part_count": 1},
+        "/api/v1/assets/multipart/parts": {**ref, "part_numbers": [1]},
+        "/api/v1/assets/multipart/complete": {**ref, "parts": [{"part_number": 1, "etag": "e"}]},
+        "/api/v1/assets/multipart/abort": ref,
+    }
+
+    for url, body in requests.items():
+        assert client.post(url, json=body).status_code == 404, url
+    assert client.get("/api/v1/assets/multipart/parts", params=ref).status_code == 404
+
+    del client.headers["Authorization"]
+    for url, body in requests.items():
+        assert client.post(url, json=body).status_code == 401, url
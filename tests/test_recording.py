@@ -0,0 +1,67 @@
+import calendar
+import os
+import tarfile
+import time
+
+from devices.basler.capture import CaptureService, SimulatedFrameSource
+from devices.basler.recording import RecordingConfig, SegmentRecorder, SegmentSpool
+
+
+def _segment(spool, name, size=10, mtime=None):
+    path = spool.directory / name
+    path.write_bytes(b"x" * size)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_pending_is_ordered_by_capture_time_across_cameras(tmp_path):
+    spool = SegmentSpool(tmp_path, max_bytes=1 << 20)
+    _segment(spool, "a-cam-20261018T100005000000Z.tar")
+    _segment(spool, "z-cam-20261018T100001000000Z.tar")
+    _segment(spool, "m-cam-20261018T100003000000Z.tar")
+
+    assert [path.name[0] for path in spool.pending()] == ["z", "m", "a"]
+
+
+def test_unparseable_names_fall_back_to_mtime(tmp_path):
+    spool = SegmentSpool(tmp_path, max_bytes=1 << 20)
+    captured = calendar.timegm((2026, 10, 18, 10, 0, 2))
+    _segment(spool, "cam-20261018T100005000000Z.tar")
+    _segment(spool, "renamed.tar", mtime=captured)
+
+    assert [path.name for path in spool.pending()][0] == "renamed.tar"
+
+
+def test_over_the_limit_the_oldest_capture_is_dropped(tmp_path):
+    spool = SegmentSpool(tmp_path, max_bytes=25)
+    _segment(spool, "b-20261018T100001000000Z.tar")
+    _segment(spool, "a-20261018T100002000000Z.tar")
+    (tmp_path / "c-20261018T100003000000Z.tar.partial").write_bytes(b"x" * 10)
+
+    kept = spool.commit(tmp_path / "c-20261018T100003000000Z.tar.partial")
+
+    assert [path.name for path in spool.pending()] == [
+        "a-20261018T100002000000Z.tar",
+        kept.name,
+    ]
+    assert spool.dropped == 1
+
+
+def test_recorder_writes_closed_segments_to_the_spool(tmp_path):
+    config = RecordingConfig(camera="cam0", segment_seconds=0.05, image_format="png")
+    spool = SegmentSpool(tmp_path, max_bytes=1 << 30)
+    source = SimulatedFrameSource(width=16, height=8, fps=200)
+
+    with CaptureService(source, ring_capacity=16) as capture:
+        recorder = SegmentRecorder(capture.reader(), config, spool)
+        recorder.start()
+        time.sleep(0.3)
+        recorder.stop()
+
+    segments = spool.pending()
+    assert len(segments) >= 2
+    assert all(path.name.startswith("cam0-") for path in segments)
+    with tarfile.open(segments[0]) as tar:
+        assert any(name.endswith(".png") for name in tar.getnames())
+    assert recorder.stats().frames > 0
@@ -0,0 +1,115 @@
+import pytest
+
+from app.core.signed_urls import SignedUrl, SignedUrlCache
+from app.models.orm.asset import Asset
+from app.models.orm.blob import BLOB_STATUS_STORED, Blob, blob_object_key
+from tests.support import make_dataset, memory_storage, sha256_hex
+
+
+class _Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _signed(url, clock, lifetime=100):
+    return SignedUrl(url=url, expires_at=clock.now + lifetime)
+
+
+def test_urls_are_reused_until_the_reuse_fraction_of_their_lifetime():
+    clock = _Clock()
+    cache = SignedUrlCache(max_entries=10, reuse_fraction=0.5, clock=clock)
+    cache.put("k", _signed("u", clock), signed_at=clock.now)
+
+    clock.now += 49
+    assert cache.get("k").url == "u"
+    assert cache.get("k").expires_in(clock.now) == 51
+    clock.now += 1
+    assert cache.get("k") is None
+
+
+def test_least_recently_used_urls_are_evicted():
+    clock = _Clock()
+    cache = SignedUrlCache(max_entries=2, reuse_fraction=0.5, clock=clock)
+    cache.put("a", _signed("a", clock), clock.now)
+    cache.put("b", _signed("b", clock), clock.now)
+    cache.get("a")
+
+    cache.put("c", _signed("c", clock), clock.now)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+
+def test_a_disabled_cache_keeps_nothing():
+    clock = _Clock()
+    for cache in (
+        SignedUrlCache(max_entries=0, reuse_fraction=0.5, clock=clock),
+        SignedUrlCache(max_entries=10, reuse_fraction=0, clock=clock),
+    ):
+        cache.put("k", _signed("u", clock), clock.now)
+        assert not cache.enabled and cache.get("k") is None
+
+
+def test_presign_get_signs_once_per_key_and_lifetime():
+    storage, _ = memory_storage()
+
+    first = storage.presign_get("datasets/1/a.jpg", expires_in=3600)
+    again = storage.presign_get("datasets/1/a.jpg", expires_in=3600)
+    shorter = storage.presign_get("datasets/1/a.jpg", expires_in=600)
+
+    assert again == first
+    assert shorter.url != first.url
+    assert "X-Amz-Expires=600" in shorter.url
+
+
+@pytest.mark.usefixtures("signed_in")
+def test_read_batch_signs_readable_assets_at_their_storage_key(client, db):
+    dataset = make_dataset(db, created_by=1)
+    sha = sha256_hex(b"shared")
+    db.add(Blob(sha256=sha, status=BLOB_STATUS_STORED, ref_count=1))
+    db.add_all(
+        [
+            Asset(dataset_id=dataset.id, object_key="plain.jpg", status="uploaded"),
+            Asset(dataset_id=dataset.id, object_key="shared.jpg", status="ready", blob_sha256=sha),
+            Asset(dataset_id=dataset.id, object_key="waiting.jpg", status="pending"),
+        ]
+    )
+    db.commit()
+    payload = {
+        "dataset_id": dataset.id,
+        "object_keys": ["plain.jpg", "shared.jpg", "waiting.jpg", "missing.jpg"],
+    }
+
+    body = client.post("/api/v1/assets/presign/read", json=payload).json()
+    again = client.post("/api/v1/assets/presign/read", json=payload).json()
+
+    items = body["items"]
+    assert "/plain.jpg?" in items[0]["url"]
+    assert f"/{blob_object_key(sha)}?" in items[1]["url"]
+    assert [item["error"] for item in items] == [None, None, "Asset is pending", "Asset not found"]
+    assert body["failed"] == 2
+    assert [item["url"] for item in again["items"]] == [item["url"] for item in items]
+
+
+@pytest.mark.usefixtures("signed_in")
+def test_read_batch_for_an_unknown_or_foreign_dataset_is_404(client, db):
+    foreign = make_dataset(db, tenant_id=2)
+    db.add(Asset(dataset_id=foreign.id, object_key="a.jpg", status="uploaded"))
+    db.commit()
+
+    for dataset_id in (999, foreign.id):
+        response = client.post(
+            "/api/v1/assets/presign/read",
+            json={"dataset_id": dataset_id, "object_keys": ["a.jpg"]},
+        )
+        assert response.status_code == 404
+
+    del client.headers["Authorization"]
+    anonymous = client.post(
+        "/api/v1/assets/presign/read",
+        json={"dataset_id": foreign.id, "object_keys": ["a.jpg"]},
+    )
+    assert anonymous.status_code == 401
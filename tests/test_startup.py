@@ -0,0 +1,71 @@
+import asyncio
+import logging
+import subprocess
+import sys
+
+import pytest
+from sqlalchemy import create_engine, inspect
+
+from app.core.config import Settings, settings
+from app.infrastructure.db import engine
+from app.infrastructure.migrations import expected_heads, verify_schema_revision
+from app.main import StartupTimer
+
+
+def test_importing_the_app_does_not_touch_the_schema(tmp_path):
+    db_path = tmp_path / "untouched.db"
+    script = "import app.main"
+    env = {
+        "DATABASE_URL": f"sqlite:///{db_path}",
+        "ENV": "dev",
+        "PATH": "",
+    }
+
+    subprocess.run([sys.executable, "-c", script], check=True, env=env)
+
+    assert inspect(create_engine(f"sqlite:///{db_path}")).get_table_names() == []
+
+
+def test_production_defaults_verify_instead_of_creating(monkeypatch):
+    for name in ("DB_AUTO_CREATE", "SEED_DEMO_DATA", "VERIFY_SCHEMA_ON_STARTUP"):
+        monkeypatch.delenv(name)
+    prod = Settings(env="production", _env_file=None)
+    dev = Settings(env="dev", _env_file=None)
+    explicit = Settings(env="prod", db_auto_create=True, _env_file=None)
+
+    assert (prod.db_auto_create, prod.seed_demo_data, prod.verify_schema_on_startup) == (
+        False,
+        False,
+        True,
+    )
+    assert (dev.db_auto_create, dev.seed_demo_data, dev.verify_schema_on_startup) == (
+        True,
+        True,
+        False,
+    )
+    assert explicit.db_auto_create is True
+
+
+def test_migrations_have_a_single_head():
+    assert len(expected_heads()) == 1
+
+
+def test_unmigrated_database_fails_the_revision_check():
+    with pytest.raises(RuntimeError, match="alembic upgrade head"):
+        verify_schema_revision(engine)
+
+
+def test_timer_warns_when_over_budget(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "startup_time_budget_ms", 0.0)
+    timer = StartupTimer(started=0.0)
+
+    async def run():
+        async with timer.step("probe"):
+            pass
+
+    asyncio.run(run())
+    with caplog.at_level(logging.INFO, logger="app.main"):
+        total = timer.report()
+
+    assert total > 0
+    assert "over the 0 ms budget (probe=0ms)" in caplog.text
@@ -0,0 +1,64 @@
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.deps import get_storage_client
+from app.core.config import settings
+from app.infrastructure.storage import StorageClientRegistry, storage_registry
+
+
+def test_registry_shares_one_client_per_configuration():
+    registry = StorageClientRegistry()
+    try:
+        first = registry.get()
+        assert registry.get() is first
+        assert registry.get(bucket="other-bucket") is not first
+        assert registry.get(bucket="other-bucket").bucket == "other-bucket"
+    finally:
+        registry.close()
+
+
+def test_concurrent_first_use_builds_a_single_client():
+    registry = StorageClientRegistry()
+    clients = []
+    barrier = threading.Barrier(8)
+
+    def get():
+        barrier.wait()
+        clients.append(registry.get())
+
+    threads = [threading.Thread(target=get) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    try:
+        assert len({id(client) for client in clients}) == 1
+    finally:
+        registry.close()
+
+
+def test_close_forgets_clients():
+    registry = StorageClientRegistry()
+    first = registry.get()
+    registry.close()
+
+    second = registry.get()
+    try:
+        assert second is not first
+    finally:
+        registry.close()
+
+
+def test_dependency_answers_503_when_storage_is_not_configured(monkeypatch):
+    storage_registry.close()
+    monkeypatch.setattr(settings, "minio_bucket", None)
+    try:
+        with pytest.raises(HTTPException) as raised:
+            get_storage_client()
+    finally:
+        storage_registry.close()
+
+    assert raised.value.status_code == 503
+    assert "minio_bucket" in raised.value.detail
@@ -0,0 +1,127 @@
+import io
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from app.core.config import settings
+from app.core.derivatives import UnsupportedImageError, allow_image_pixels, render
+from app.models.orm.asset import Asset
+from app.services.thumbnail_service import ThumbnailService, generate_derivatives
+from tests.support import auth_headers, make_dataset
+
+pytestmark = pytest.mark.usefixtures("signed_in")
+
+
+def _png(image: Image.Image) -> bytes:
+    out = io.BytesIO()
+    image.save(out, format="PNG")
+    return out.getvalue()
+
+
+def _decoded(jpeg: bytes) -> np.ndarray:
+    return np.asarray(Image.open(io.BytesIO(jpeg)).convert("L"))
+
+
+def _asset(db, s3, data, status="uploaded"):
+    dataset = make_dataset(db, created_by=1)
+    asset = Asset(dataset_id=dataset.id, object_key=f"datasets/{dataset.id}/a.png", status=status)
+    db.add(asset)
+    db.commit()
+    s3.objects[asset.object_key] = data
+    return asset
+
+
+def test_16_bit_images_are_stretched_instead_of_clipped():
+    ramp = np.linspace(1000, 4000, 64 * 32).reshape(32, 64).astype(np.uint16)
+    image = Image.fromarray(ramp)
+    assert image.mode.startswith("I;16")
+
+    thumbnail = _decoded(render(_png(image), [64]).thumbnails[64])
+
+    assert thumbnail.min() < 10 and thumbnail.max() > 245
+    assert thumbnail[:, 0].mean() < thumbnail[:, -1].mean()
+
+
+def test_pillows_limit_is_raised_once_and_still_applies(monkeypatch):
+    data = _png(Image.new("RGB", (64, 64), (10, 20, 30)))
+
+    # Importing the thumbnail service made room for the configured limits.
+    assert Image.MAX_IMAGE_PIXELS >= settings.thumbnail_pyramid_max_image_pixels
+    assert render(data, [32], max_pixels=64 * 64).width == 64
+    with pytest.raises(UnsupportedImageError, match="exceeds the limit"):
+        render(data, [32], max_pixels=64 * 64 - 1)
+
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 100)
+    with pytest.raises(UnsupportedImageError, match="decompression bomb"):
+        render(data, [32], max_pixels=64 * 64)
+    allow_image_pixels(50)
+    assert Image.MAX_IMAGE_PIXELS == 100
+
+
+def test_pyramid_jobs_use_the_higher_pixel_limit(storage, s3, monkeypatch):
+    s3.objects["big.png"] = _png(Image.new("L", (64, 48), 128))
+    monkeypatch.setattr(settings, "thumbnail_max_image_pixels", 1000)
+    monkeypatch.setattr(settings, "thumbnail_pyramid_max_image_pixels", 64 * 48)
+    monkeypatch.setattr(settings, "thumbnail_pyramid_min_px", 32)
+    monkeypatch.setattr(settings, "thumbnail_tile_size", 32)
+
+    with pytest.raises(UnsupportedImageError):
+        generate_derivatives(storage, "big.png", pyramid=False)
+    generated = generate_derivatives(storage, "big.png", pyramid=True)
+
+    assert generated.tiles == 4 + 1
+
+
+def test_thumbnails_render_on_request(client, db, s3):
+    asset = _asset(db, s3, _png(Image.new("RGB", (600, 300), (200, 0, 0))))
+
+    response = client.get(f"/api/v1/assets/{asset.id}/thumbnail", params={"size": 100})
+
+    assert response.status_code == 200
+    assert response.json()["size"] == 128 and response.json()["generated"] is True
+
+
+def test_thumbnail_errors_map_to_their_status(client, db, s3, monkeypatch):
+    pending = _asset(db, s3, b"", status="pending")
+    broken = _asset(db, s3, b"not an image")
+    monkeypatch.setattr(settings, "thumbnail_max_image_pixels", 100)
+    large = _asset(db, s3, _png(Image.new("L", (20, 20))))
+
+    def status_of(asset_id):
+        return client.get(f"/api/v1/assets/{asset_id}/thumbnail").status_code
+
+    assert status_of(pending.id) == 409
+    assert status_of(broken.id) == 415
+    assert status_of(large.id) == 415
+    assert status_of(999) == 404
+
+
+def test_unexpected_errors_are_server_errors(client, db, s3, monkeypatch):
+    asset = _asset(db, s3, _png(Image.new("L", (20, 20))))
+
+    def fail(self, *args, **kwargs):
+        raise RuntimeError("bug")
+
+    monkeypatch.setattr(ThumbnailService, "thumbnail_url", fail)
+    lenient = TestClient(client.app, raise_server_exceptions=False, headers=client.headers)
+
+    assert lenient.get(f"/api/v1/assets/{asset.id}/thumbnail").status_code == 500
+
+
+def test_derivatives_of_another_tenants_asset_are_not_found(client, db, s3):
+    asset = _asset(db, s3, _png(Image.new("RGB", (64, 64))))
+    urls = [
+        f"/api/v1/assets/{asset.id}/thumbnail",
+        f"/api/v1/assets/{asset.id}/pyramid",
+        f"/api/v1/assets/{asset.id}/tiles/0/0/0",
+    ]
+
+    for url in urls:
+        response = client.get(url, headers=auth_headers(tenant_id=7), follow_redirects=False)
+        assert response.status_code == 404, url
+    assert not any(key.startswith("derived/") for key in s3.objects)
+
+    del client.headers["Authorization"]
+    assert all(client.get(url).status_code == 401 for url in urls)
@@ -0,0 +1,63 @@
+from app.core.config import settings
+from app.core.token_cache import VerifiedTokenCache
+from app.telemetry.metrics import metrics
+from tests.support import auth_headers
+
+
+def _counter(snapshot, name):
+    return sum(row["value"] for row in snapshot["counters"] if row["name"] == name)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entries_expire_at_the_earlier_of_token_exp_and_ttl():
+    clock = _Clock()
+    cache = VerifiedTokenCache(max_entries=10, ttl_seconds=60, clock=clock)
+    cache.put("short", "a", token_expires_at=clock.now + 5)
+    cache.put("long", "b", token_expires_at=clock.now + 3600)
+
+    clock.now += 10
+    assert cache.get("short") is None
+    assert cache.get("long") == "b"
+    clock.now += 60
+    assert cache.get("long") is None
+
+
+def test_lru_eviction_and_invalidation():
+    cache = VerifiedTokenCache(max_entries=2, ttl_seconds=60)
+    cache.put("a", 1, token_expires_at=float("inf"), subject=7)
+    cache.put("b", 2, token_expires_at=float("inf"), subject=8)
+    cache.get("a")
+    cache.put("c", 3, token_expires_at=float("inf"), subject=7)
+
+    assert cache.get("b") is None
+    cache.invalidate_subject(7)
+    assert cache.get("a") is None and cache.get("c") is None
+    assert _counter(metrics.snapshot(), "token_cache_evictions") == 1
+
+
+def test_metrics_route_is_hidden_by_default(client):
+    response = client.get("/api/v1/debug/metrics", headers=auth_headers())
+
+    assert response.status_code == 404
+
+
+def test_metrics_route_requires_authentication(client, monkeypatch):
+    monkeypatch.setattr(settings, "debug_metrics_enabled", True)
+
+    anonymous = client.get("/api/v1/debug/metrics")
+    forged = client.get("/api/v1/debug/metrics", headers={"Authorization": "Bearer nope"})
+    headers = auth_headers()
+    client.get("/api/v1/debug/metrics", headers=headers)
+    signed_in = client.get("/api/v1/debug/metrics", headers=headers)
+
+    assert anonymous.status_code == 401
+    assert forged.status_code == 401
+    assert signed_in.status_code == 200
+    assert _counter(signed_in.json(), "token_cache_hits") >= 1